@@ -13,6 +13,7 @@ NEW IN v2.0:
 ------------
 - Enhanced analysis with historical context (optional)
 - Predictive warnings for next trade
+- Streaming mode: update(trade) emits insights as each trade arrives
 - Contextual alerts based on market conditions
 - All features work standalone OR with UserBehaviorProfile integration
 
@@ -21,7 +22,8 @@ FEATURES:
 - Detects 10 behavioral patterns (8 negative, 1 positive, 1 neutral)
 - Severity classification (High, Medium, Positive)
 - Configurable pattern detection
-- No external dependencies except Python standard library
+- Vectorized NumPy engine: timestamps parsed once per trade, all detectors
+  run over columnar arrays (see agents/behaviour_engine.py)
 
 DETECTED PATTERNS:
 ------------------
@@ -84,9 +86,11 @@ API REFERENCE:
 See class documentation below for detailed method signatures.
 """
 
-from datetime import datetime
 from typing import List, Dict, Optional
 
+from agents.behaviour_engine import TradeColumns, detect_patterns
+from agents.behaviour_stream import BehaviourStream
+
 
 class BehaviorMonitorAgent:
     """
@@ -113,11 +117,13 @@ class BehaviorMonitorAgent:
         self.check_revenge_trading = check_revenge_trading
         self.check_overtrading = check_overtrading
         self.check_emotional_patterns = check_emotional_patterns
+        self._stream: Optional[BehaviourStream] = None
 
     def run(self, context: dict) -> dict:
         """Pipeline integration method. Expects context with user_trades from frontend."""
         trades = context.get("user_trades", [])
         patterns = self.analyze_session(trades)
+        context["insights"] = patterns
         
         if patterns:
             context["behavior_label"] = patterns[0]["type"]
@@ -152,42 +158,17 @@ class BehaviorMonitorAgent:
             >>> for insight in insights:
             ...     print(f"{insight['type']}: {insight['details']}")
         """
-        insights = []
-        
         if not trades:
             return [{"type": "No Activity", "details": "No trades recorded in this session."}]
 
-        # Sort trades chronologically
-        sorted_trades = sorted(trades, key=lambda x: x['timestamp'])
-        
-        # Run pattern detection
-        if self.check_revenge_trading:
-            revenge_insight = self._detect_revenge_trading(sorted_trades)
-            if revenge_insight:
-                insights.append(revenge_insight)
-
-        if self.check_overtrading:
-            overtrading_insight = self._detect_overtrading(sorted_trades)
-            if overtrading_insight:
-                insights.append(overtrading_insight)
-        
-        if self.check_emotional_patterns:
-            # Emotional pattern suite
-            patterns_to_check = [
-                self._detect_fomo_trading,
-                self._detect_ego_trading,
-                self._detect_impulsive_decisions,
-                self._detect_calculated_risk,
-                self._detect_loss_aversion,
-                self._detect_quick_profit_taking,
-                self._detect_averaging_down,
-                self._detect_hesitation
-            ]
-            
-            for pattern_func in patterns_to_check:
-                result = pattern_func(sorted_trades)
-                if result:
-                    insights.append(result)
+        # Parse the session once into sorted columns; every detector reads those
+        columns = TradeColumns.from_trades(trades)
+        insights = detect_patterns(
+            columns,
+            check_revenge_trading=self.check_revenge_trading,
+            check_overtrading=self.check_overtrading,
+            check_emotional_patterns=self.check_emotional_patterns
+        )
                 
         if not insights:
             insights.append({
@@ -197,6 +178,59 @@ class BehaviorMonitorAgent:
             
         return insights
     
+    # ==================== STREAMING MODE ====================
+
+    def update(self, trade: Dict) -> List[Dict]:
+        """
+        Streaming mode: add the next trade of a live session.
+        
+        Each call is O(1); the session is never rescanned. Trades are
+        expected in chronological order.
+        
+        Args:
+            trade: Trade dictionary (same fields as analyze_session)
+        
+        Returns:
+            List[Dict]: Insights newly triggered by this trade (usually empty)
+        
+        Example:
+            >>> monitor = BehaviorMonitorAgent()
+            >>> for trade in live_feed:
+            ...     for insight in monitor.update(trade):
+            ...         send_alert(insight)
+        """
+        if self._stream is None:
+            self._stream = BehaviourStream(
+                check_revenge_trading=self.check_revenge_trading,
+                check_overtrading=self.check_overtrading,
+                check_emotional_patterns=self.check_emotional_patterns
+            )
+        return self._stream.update(trade)
+
+    def stream_insights(self) -> List[Dict]:
+        """
+        All insights for the streamed session so far.
+        
+        Returns the same list analyze_session would for the trades passed
+        to update().
+        """
+        if self._stream is None:
+            return [{"type": "No Activity", "details": "No trades recorded in this session."}]
+        return self._stream.insights()
+
+    def session_state(self) -> Dict:
+        """
+        Current streaks and recent activity of the streamed session, ready
+        to pass to predict_next_risk().
+        """
+        if self._stream is None:
+            return {"consecutive_losses": 0, "consecutive_wins": 0, "trades_in_last_hour": 0}
+        return self._stream.session_state()
+
+    def reset_stream(self):
+        """Start a new streamed session."""
+        self._stream = None
+
     def generate_contextual_alert(self, pattern: str, market_context: Dict,
                                    historical_tendency: float = 0.0) -> str:
         """
@@ -332,215 +366,6 @@ class BehaviorMonitorAgent:
             'recommended_action': recommended_action
         }
 
-    # ==================== PATTERN DETECTION METHODS ====================
-
-    def _detect_revenge_trading(self, trades: List[Dict]) -> Optional[Dict]:
-        """Detects revenge trading: 3+ consecutive losses within 10 minutes."""
-        consecutive_losses = 0
-        loss_timestamps = []
-        
-        for trade in trades:
-            if trade['pnl'] < 0:
-                consecutive_losses += 1
-                try:
-                    ts = datetime.strptime(trade['timestamp'], "%Y-%m-%d %H:%M:%S")
-                    loss_timestamps.append(ts)
-                except ValueError:
-                    continue
-            else:
-                consecutive_losses = 0
-                loss_timestamps = []
-            
-            if consecutive_losses >= 3 and len(loss_timestamps) >= 3:
-                time_diff = (loss_timestamps[-1] - loss_timestamps[-3]).total_seconds() / 60
-                if time_diff <= 10:
-                    return {
-                        "type": "Revenge Trading",
-                        "severity": "High",
-                        "details": f"Detected {consecutive_losses} consecutive losses within {int(time_diff)} minutes. This indicates potential tilt or chasing."
-                    }
-        return None
-
-    def _detect_overtrading(self, trades: List[Dict]) -> Optional[Dict]:
-        """Detects overtrading: More than 10 trades in a session."""
-        if len(trades) > 10:
-            return {
-                "type": "Overtrading",
-                "severity": "Medium",
-                "details": f"High trade count ({len(trades)}) for a single session. Ensure quality over quantity."
-            }
-        return None
-
-    def _detect_fomo_trading(self, trades: List[Dict]) -> Optional[Dict]:
-        """Detects FOMO: Rapid re-entry on same asset after a win."""
-        for i in range(len(trades) - 2):
-            if trades[i]['pnl'] > 0:
-                try:
-                    t1 = datetime.strptime(trades[i]['timestamp'], "%Y-%m-%d %H:%M:%S")
-                    t2 = datetime.strptime(trades[i+1]['timestamp'], "%Y-%m-%d %H:%M:%S")
-                    
-                    time_diff = (t2 - t1).total_seconds() / 60
-                    if time_diff <= 5 and trades[i]['symbol'] == trades[i+1]['symbol']:
-                        return {
-                            "type": "FOMO Trading",
-                            "severity": "Medium",
-                            "details": "Detected rapid re-entry on same asset after a win. This suggests Fear Of Missing Out (FOMO) rather than strategic planning."
-                        }
-                except ValueError:
-                    continue
-        return None
-
-    def _detect_ego_trading(self, trades: List[Dict]) -> Optional[Dict]:
-        """Detects ego trading: Large loss after win streak."""
-        wins_streak = 0
-        for trade in trades:
-            if trade['pnl'] > 0:
-                wins_streak += 1
-            else:
-                if wins_streak >= 2 and trade['pnl'] < -150:
-                    return {
-                        "type": "Ego Trading",
-                        "severity": "High",
-                        "details": f"After {wins_streak} consecutive wins, took a large loss (${abs(trade['pnl'])}). This suggests overconfidence and excessive risk-taking."
-                    }
-                wins_streak = 0
-        return None
-
-    def _detect_impulsive_decisions(self, trades: List[Dict]) -> Optional[Dict]:
-        """Detects impulsive decisions: Trades executed within 60 seconds."""
-        rapid_trades = 0
-        for i in range(len(trades) - 1):
-            try:
-                t1 = datetime.strptime(trades[i]['timestamp'], "%Y-%m-%d %H:%M:%S")
-                t2 = datetime.strptime(trades[i+1]['timestamp'], "%Y-%m-%d %H:%M:%S")
-                
-                if (t2 - t1).total_seconds() <= 60:
-                    rapid_trades += 1
-            except ValueError:
-                continue
-        
-        if rapid_trades >= 3:
-            return {
-                "type": "Impulsive Decisions",
-                "severity": "Medium",
-                "details": f"Detected {rapid_trades} trades executed within 60 seconds of each other. Suggests insufficient analysis and impulsive behavior."
-            }
-        return None
-
-    def _detect_calculated_risk(self, trades: List[Dict]) -> Optional[Dict]:
-        """Detects calculated risk: Win rate > 40% with controlled losses."""
-        if len(trades) < 3:
-            return None
-        
-        wins = sum(1 for t in trades if t['pnl'] > 0)
-        win_rate = (wins / len(trades)) * 100
-        max_loss = min((t['pnl'] for t in trades if t['pnl'] < 0), default=0)
-        
-        if win_rate >= 40 and max_loss >= -200:
-            return {
-                "type": "Calculated Risk",
-                "severity": "Positive",
-                "details": f"Win rate of {win_rate:.1f}% with controlled losses. This indicates disciplined risk management and calculated decision-making."
-            }
-        return None
-
-    def _detect_loss_aversion(self, trades: List[Dict]) -> Optional[Dict]:
-        """Detects loss aversion: Holding losers 2x longer than winners."""
-        losing_duration, winning_duration = [], []
-        
-        for i in range(len(trades) - 1):
-            if trades[i]['status'] == 'OPEN' and i + 1 < len(trades):
-                if trades[i+1]['symbol'] == trades[i]['symbol']:
-                    try:
-                        t1 = datetime.strptime(trades[i]['timestamp'], "%Y-%m-%d %H:%M:%S")
-                        t2 = datetime.strptime(trades[i+1]['timestamp'], "%Y-%m-%d %H:%M:%S")
-                        duration = (t2 - t1).total_seconds() / 60
-                        
-                        if trades[i+1]['pnl'] < 0:
-                            losing_duration.append(duration)
-                        elif trades[i+1]['pnl'] > 0:
-                            winning_duration.append(duration)
-                    except ValueError:
-                        continue
-        
-        if losing_duration and winning_duration:
-            avg_loss = sum(losing_duration) / len(losing_duration)
-            avg_win = sum(winning_duration) / len(winning_duration)
-            
-            if avg_loss > avg_win * 2:
-                return {
-                    "type": "Loss Aversion",
-                    "severity": "High",
-                    "details": f"Losing trades held {avg_loss:.1f} min on average vs {avg_win:.1f} min for winners. This suggests holding onto losers hoping they'll recover."
-                }
-        return None
-
-    def _detect_quick_profit_taking(self, trades: List[Dict]) -> Optional[Dict]:
-        """Detects quick profit taking: Winning trades closed 3x faster than losers."""
-        winning_duration, losing_duration = [], []
-        
-        for i in range(len(trades) - 1):
-            if trades[i]['status'] == 'OPEN' and i + 1 < len(trades):
-                if trades[i+1]['symbol'] == trades[i]['symbol']:
-                    try:
-                        t1 = datetime.strptime(trades[i]['timestamp'], "%Y-%m-%d %H:%M:%S")
-                        t2 = datetime.strptime(trades[i+1]['timestamp'], "%Y-%m-%d %H:%M:%S")
-                        duration = (t2 - t1).total_seconds() / 60
-                        
-                        if trades[i+1]['pnl'] > 0:
-                            winning_duration.append(duration)
-                        elif trades[i+1]['pnl'] < 0:
-                            losing_duration.append(duration)
-                    except ValueError:
-                        continue
-        
-        if winning_duration and losing_duration:
-            avg_win = sum(winning_duration) / len(winning_duration)
-            avg_loss = sum(losing_duration) / len(losing_duration)
-            
-            if avg_loss > avg_win * 3 and avg_win < 3:
-                return {
-                    "type": "Quick Profit Taking",
-                    "severity": "Medium",
-                    "details": f"Winning trades closed in {avg_win:.1f} min vs {avg_loss:.1f} min for losers. Cutting profits too early limits upside potential."
-                }
-        return None
-
-    def _detect_averaging_down(self, trades: List[Dict]) -> Optional[Dict]:
-        """Detects averaging down: Adding to losing positions."""
-        for i in range(len(trades) - 2):
-            if trades[i]['pnl'] < 0:
-                if trades[i+1]['symbol'] == trades[i]['symbol'] and trades[i+1]['action'] == 'BUY':
-                    if i + 2 < len(trades) and trades[i+2]['pnl'] < 0:
-                        return {
-                            "type": "Averaging Down",
-                            "severity": "High",
-                            "details": f"Multiple entries on {trades[i]['symbol']} while in losing position. Averaging down increases risk instead of cutting losses."
-                        }
-        return None
-
-    def _detect_hesitation(self, trades: List[Dict]) -> Optional[Dict]:
-        """Detects hesitation: Large time gaps (>60 min) between trades."""
-        large_gaps = 0
-        
-        for i in range(len(trades) - 1):
-            try:
-                t1 = datetime.strptime(trades[i]['timestamp'], "%Y-%m-%d %H:%M:%S")
-                t2 = datetime.strptime(trades[i+1]['timestamp'], "%Y-%m-%d %H:%M:%S")
-                
-                if (t2 - t1).total_seconds() / 60 > 60:
-                    large_gaps += 1
-            except ValueError:
-                continue
-        
-        if len(trades) > 3 and large_gaps >= (len(trades) - 1) * 0.3:
-            return {
-                "type": "Hesitation / Analysis Paralysis",
-                "severity": "Medium",
-                "details": f"Detected {large_gaps} large time gaps (>60 min) between trades. This suggests fear or overthinking, causing missed opportunities."
-            }
-        return None
-
 
 # ==================== STANDALONE USAGE EXAMPLE ====================
 
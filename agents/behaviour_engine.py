@@ -0,0 +1,447 @@
+"""
+Vectorized Behaviour Detection Engine
+=====================================
+
+Columnar implementation of the ten ``BehaviorMonitorAgent`` detectors.
+
+A session is converted once into NumPy arrays (timestamps parsed to epoch
+seconds, PnL, symbol codes, BUY and OPEN flags) in chronological order, and
+every detector is computed from those arrays with vectorized diffs, masks
+and run-length arithmetic. Timestamps are parsed exactly once per trade and
+the detectors themselves cost well under a millisecond per thousand trades;
+reading the trade dicts into columns dominates large sessions
+(see benchmark_behaviour_engine.py).
+
+Results (pattern order, which occurrence is reported, message text) match
+the original per-trade loops.
+
+Columns can also be built straight from arrays (``TradeColumns.from_arrays``),
+e.g. memory-mapped from the trade archive, without any trade dicts.
+
+Usage:
+    columns = TradeColumns.from_trades(trades)
+    insights = detect_patterns(columns)
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_TIMESTAMP_LENGTH = 19
+
+# Detector thresholds
+REVENGE_WINDOW_MINUTES = 10       # Three consecutive losses within this window
+FOMO_REENTRY_MINUTES = 5          # Same-symbol re-entry after a win
+EGO_MIN_WIN_STREAK = 2
+EGO_LARGE_LOSS = -150
+IMPULSIVE_GAP_SECONDS = 60
+IMPULSIVE_MIN_TRADES = 3
+OVERTRADING_MAX_TRADES = 10
+CALCULATED_MIN_WIN_RATE = 40      # Percent
+CALCULATED_MAX_LOSS = -200
+LOSS_AVERSION_RATIO = 2           # Losers held this many times longer than winners
+QUICK_PROFIT_RATIO = 3
+QUICK_PROFIT_MAX_MINUTES = 3
+HESITATION_GAP_MINUTES = 60
+HESITATION_GAP_SHARE = 0.3        # Share of gaps that must be large
+
+
+def parse_timestamps(raw: np.ndarray) -> np.ndarray:
+    """
+    Parse "YYYY-MM-DD HH:MM:SS" strings to epoch seconds.
+
+    Returns:
+        float64 array; unparseable timestamps are NaN
+    """
+    seconds = np.full(len(raw), np.nan)
+    if len(raw) == 0:
+        return seconds
+
+    # Same shape strptime accepts; anything else stays NaN
+    shaped = (np.char.str_len(raw) == _TIMESTAMP_LENGTH) & (np.char.find(raw, " ") == 10)
+    candidates = raw[shaped]
+    try:
+        parsed = candidates.astype("datetime64[s]")
+        valid = ~np.isnat(parsed)
+        values = np.where(valid, parsed.astype("int64"), 0).astype(np.float64)
+        values[~valid] = np.nan
+    except ValueError:
+        # At least one malformed value: fall back to per-trade parsing
+        values = np.array([_parse_one(value) for value in candidates], dtype=np.float64)
+    seconds[shaped] = values
+    return seconds
+
+
+def format_timestamp(seconds: float) -> str:
+    """Epoch seconds back to "YYYY-MM-DD HH:MM:SS"."""
+    return str(np.datetime64(int(seconds), "s")).replace("T", " ")
+
+
+def _parse_one(value: str) -> float:
+    try:
+        return (datetime.strptime(value, TIMESTAMP_FORMAT) - datetime(1970, 1, 1)).total_seconds()
+    except ValueError:
+        return np.nan
+
+# Pattern -> (severity, details template); shared by the batch detectors
+# and the streaming monitor so both report identical messages
+PATTERNS = {
+    "Revenge Trading": ("High", "Detected {consecutive_losses} consecutive losses within {minutes} minutes. This indicates potential tilt or chasing."),
+    "Overtrading": ("Medium", "High trade count ({count}) for a single session. Ensure quality over quantity."),
+    "FOMO Trading": ("Medium", "Detected rapid re-entry on same asset after a win. This suggests Fear Of Missing Out (FOMO) rather than strategic planning."),
+    "Ego Trading": ("High", "After {wins_streak} consecutive wins, took a large loss (${loss}). This suggests overconfidence and excessive risk-taking."),
+    "Impulsive Decisions": ("Medium", "Detected {rapid_trades} trades executed within 60 seconds of each other. Suggests insufficient analysis and impulsive behavior."),
+    "Calculated Risk": ("Positive", "Win rate of {win_rate:.1f}% with controlled losses. This indicates disciplined risk management and calculated decision-making."),
+    "Loss Aversion": ("High", "Losing trades held {avg_loss:.1f} min on average vs {avg_win:.1f} min for winners. This suggests holding onto losers hoping they'll recover."),
+    "Quick Profit Taking": ("Medium", "Winning trades closed in {avg_win:.1f} min vs {avg_loss:.1f} min for losers. Cutting profits too early limits upside potential."),
+    "Averaging Down": ("High", "Multiple entries on {symbol} while in losing position. Averaging down increases risk instead of cutting losses."),
+    "Hesitation / Analysis Paralysis": ("Medium", "Detected {large_gaps} large time gaps (>60 min) between trades. This suggests fear or overthinking, causing missed opportunities."),
+}
+
+
+def make_insight(pattern: str, **values) -> Dict:
+    """Build the insight dict for ``pattern`` with its details filled in."""
+    severity, template = PATTERNS[pattern]
+    return {"type": pattern, "severity": severity, "details": template.format(**values)}
+
+
+@dataclass
+class TradeColumns:
+    """
+    A trading session as chronologically sorted columns.
+
+    Attributes:
+        trades (List[Dict]): Original trade dicts, in input order (used for
+            messages); None for columns built from arrays
+        order (np.ndarray): Indices into ``trades`` in chronological order
+        ts (np.ndarray): Epoch seconds, NaN where the timestamp did not parse
+        pnl (np.ndarray): Profit/loss per trade
+        symbol (np.ndarray): Integer symbol codes (equal codes = same symbol)
+        buy (np.ndarray): True where action is "BUY"
+        open (np.ndarray): True where status is "OPEN"
+        symbol_names (Tuple[str, ...]): Symbol for each code
+    """
+    trades: Optional[List[Dict]]
+    order: np.ndarray
+    ts: np.ndarray
+    pnl: np.ndarray
+    symbol: np.ndarray
+    buy: np.ndarray
+    open: np.ndarray
+    symbol_names: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_trades(cls, trades: List[Dict]) -> "TradeColumns":
+        """Build columns from trade dicts, sorting by timestamp (stable, like ``sorted``)."""
+        count = len(trades)
+        timestamps = np.array([t["timestamp"] for t in trades], dtype=str)
+        seconds = parse_timestamps(timestamps)
+
+        # Numeric order equals string order for well-formed timestamps;
+        # malformed ones keep their lexicographic position
+        if np.isnan(seconds).any():
+            order = np.argsort(timestamps, kind="stable")
+        else:
+            order = np.argsort(seconds, kind="stable")
+
+        codes: Dict[str, int] = {}
+        symbol_codes = np.fromiter(
+            (codes.setdefault(t["symbol"], len(codes)) for t in trades), dtype=np.int64, count=count
+        )
+
+        return cls(
+            trades=trades,
+            order=order,
+            ts=seconds[order],
+            pnl=np.array([t["pnl"] for t in trades], dtype=np.float64)[order],
+            symbol=symbol_codes[order],
+            buy=np.fromiter((t.get("action") == "BUY" for t in trades), dtype=bool, count=count)[order],
+            open=np.fromiter((t.get("status") == "OPEN" for t in trades), dtype=bool, count=count)[order],
+            symbol_names=tuple(codes),
+        )
+
+    @classmethod
+    def from_arrays(cls,
+                    ts: np.ndarray,
+                    pnl: np.ndarray,
+                    symbol: np.ndarray,
+                    buy: np.ndarray,
+                    open: np.ndarray,
+                    symbol_names: Sequence[str]) -> "TradeColumns":
+        """
+        Wrap columns that are already in chronological order.
+
+        The arrays are used as given (no copy), so read-only memory maps work.
+        """
+        return cls(
+            trades=None,
+            order=np.arange(len(pnl)),
+            ts=ts,
+            pnl=pnl,
+            symbol=symbol,
+            buy=buy,
+            open=open,
+            symbol_names=tuple(symbol_names),
+        )
+
+    def trade(self, position: int) -> Dict:
+        """Original trade dict at chronological ``position`` (rebuilt from the columns if there is none)."""
+        if self.trades is not None:
+            return self.trades[self.order[position]]
+        ts = self.ts[position]
+        return {
+            "timestamp": None if np.isnan(ts) else format_timestamp(ts),
+            "symbol": self.symbol_names[self.symbol[position]],
+            "action": "BUY" if self.buy[position] else "SELL",
+            "pnl": float(self.pnl[position]),
+            "status": "OPEN" if self.open[position] else "CLOSED",
+        }
+
+    def slice(self, start: int, stop: int) -> "TradeColumns":
+        """Chronological positions ``start:stop`` as columns (views, no copy)."""
+        return TradeColumns(
+            trades=self.trades,
+            order=self.order[start:stop],
+            ts=self.ts[start:stop],
+            pnl=self.pnl[start:stop],
+            symbol=self.symbol[start:stop],
+            buy=self.buy[start:stop],
+            open=self.open[start:stop],
+            symbol_names=self.symbol_names,
+        )
+
+    def split_days(self) -> List[Tuple[str, "TradeColumns"]]:
+        """
+        Split into one session per calendar day of the timestamps.
+
+        Returns:
+            List of ("YYYY-MM-DD", columns) in chronological order
+
+        Raises:
+            ValueError: If any timestamp did not parse
+        """
+        if np.isnan(self.ts).any():
+            raise ValueError("Cannot split sessions with unparseable timestamps")
+        if not len(self.ts):
+            return []
+        days = (self.ts // 86400).astype(np.int64)
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        starts = np.concatenate(([0], bounds))
+        stops = np.concatenate((bounds, [len(days)]))
+        return [
+            (str(np.datetime64(int(days[a]), "D")), self.slice(a, b))
+            for a, b in zip(starts, stops)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.pnl)
+
+    @cached_property
+    def gaps(self) -> np.ndarray:
+        """Seconds between consecutive trades (NaN if either timestamp is invalid)."""
+        return np.diff(self.ts)
+
+    @cached_property
+    def same_symbol_as_next(self) -> np.ndarray:
+        """True at i where trade i+1 is on the same symbol."""
+        return self.symbol[:-1] == self.symbol[1:]
+
+    @cached_property
+    def hold_durations(self):
+        """
+        Minutes an OPEN trade was held until the next same-symbol trade,
+        split by that closing trade's outcome.
+
+        Returns:
+            Tuple of (winning_durations, losing_durations)
+        """
+        held = self.open[:-1] & self.same_symbol_as_next & ~np.isnan(self.gaps)
+        durations = self.gaps[held] / 60
+        closing_pnl = self.pnl[1:][held]
+        return durations[closing_pnl > 0], durations[closing_pnl < 0]
+
+
+def _first(mask: np.ndarray) -> Optional[int]:
+    """Index of the first True in ``mask``, or None."""
+    index = int(np.argmax(mask)) if len(mask) else 0
+    return index if len(mask) and mask[index] else None
+
+
+def _run_starts(flag: np.ndarray) -> np.ndarray:
+    """For each position, the index where its current run of True values began."""
+    index = np.arange(len(flag))
+    breaks = np.where(~flag, index + 1, 0)
+    return np.maximum.accumulate(breaks)
+
+
+# ==================== DETECTORS ====================
+
+
+def detect_revenge_trading(columns: TradeColumns) -> Optional[Dict]:
+    """Revenge trading: 3+ consecutive losses, the last three within 10 minutes."""
+    loss = columns.pnl < 0
+    run_start = _run_starts(loss)
+
+    # Only losses with a valid timestamp count towards the 10 minute window
+    timed = np.flatnonzero(loss & ~np.isnan(columns.ts))
+    if len(timed) < 3:
+        return None
+    same_run = run_start[timed[2:]] == run_start[timed[:-2]]
+    window = (columns.ts[timed[2:]] - columns.ts[timed[:-2]]) / 60
+    hit = _first(same_run & (window <= REVENGE_WINDOW_MINUTES))
+    if hit is None:
+        return None
+
+    index = timed[hit + 2]
+    consecutive_losses = index - run_start[index] + 1
+    return make_insight("Revenge Trading", consecutive_losses=consecutive_losses, minutes=int(window[hit]))
+
+
+def detect_overtrading(columns: TradeColumns) -> Optional[Dict]:
+    """Overtrading: more than 10 trades in a session."""
+    if len(columns) > OVERTRADING_MAX_TRADES:
+        return make_insight("Overtrading", count=len(columns))
+    return None
+
+
+def detect_fomo_trading(columns: TradeColumns) -> Optional[Dict]:
+    """FOMO: re-entry on the same asset within 5 minutes of a win."""
+    count = len(columns)
+    if count < 3:
+        return None
+    # The original loop never looks at the final pair
+    reentry = (columns.pnl[:count - 2] > 0) & (columns.gaps[:count - 2] / 60 <= FOMO_REENTRY_MINUTES) & columns.same_symbol_as_next[:count - 2]
+    if reentry.any():
+        return make_insight("FOMO Trading")
+    return None
+
+
+def detect_ego_trading(columns: TradeColumns) -> Optional[Dict]:
+    """Ego trading: a large loss (< -150) straight after 2+ consecutive wins."""
+    win = columns.pnl > 0
+    if len(columns) < 3:
+        return None
+    # Wins immediately before each trade
+    streak = np.arange(len(columns)) - np.concatenate(([0], _run_starts(win)[:-1]))
+    hit = _first(~win & (streak >= EGO_MIN_WIN_STREAK) & (columns.pnl < EGO_LARGE_LOSS))
+    if hit is None:
+        return None
+
+    return make_insight("Ego Trading", wins_streak=streak[hit], loss=abs(columns.trade(hit)["pnl"]))
+
+
+def detect_impulsive_decisions(columns: TradeColumns) -> Optional[Dict]:
+    """Impulsive decisions: 3+ trades within 60 seconds of the previous one."""
+    rapid_trades = int(np.count_nonzero(columns.gaps <= IMPULSIVE_GAP_SECONDS))
+    if rapid_trades >= IMPULSIVE_MIN_TRADES:
+        return make_insight("Impulsive Decisions", rapid_trades=rapid_trades)
+    return None
+
+
+def detect_calculated_risk(columns: TradeColumns) -> Optional[Dict]:
+    """Calculated risk: win rate of 40%+ with no loss worse than -200."""
+    count = len(columns)
+    if count < 3:
+        return None
+
+    win_rate = (np.count_nonzero(columns.pnl > 0) / count) * 100
+    losses = columns.pnl[columns.pnl < 0]
+    max_loss = losses.min() if len(losses) else 0
+
+    if win_rate >= CALCULATED_MIN_WIN_RATE and max_loss >= CALCULATED_MAX_LOSS:
+        return make_insight("Calculated Risk", win_rate=win_rate)
+    return None
+
+
+def detect_loss_aversion(columns: TradeColumns) -> Optional[Dict]:
+    """Loss aversion: losers held more than 2x longer than winners."""
+    if len(columns) < 2:
+        return None
+    winning_duration, losing_duration = columns.hold_durations
+    if len(losing_duration) and len(winning_duration):
+        avg_loss = losing_duration.sum() / len(losing_duration)
+        avg_win = winning_duration.sum() / len(winning_duration)
+
+        if avg_loss > avg_win * LOSS_AVERSION_RATIO:
+            return make_insight("Loss Aversion", avg_loss=avg_loss, avg_win=avg_win)
+    return None
+
+
+def detect_quick_profit_taking(columns: TradeColumns) -> Optional[Dict]:
+    """Quick profit taking: winners closed 3x faster than losers, in under 3 minutes."""
+    if len(columns) < 2:
+        return None
+    winning_duration, losing_duration = columns.hold_durations
+    if len(winning_duration) and len(losing_duration):
+        avg_win = winning_duration.sum() / len(winning_duration)
+        avg_loss = losing_duration.sum() / len(losing_duration)
+
+        if avg_loss > avg_win * QUICK_PROFIT_RATIO and avg_win < QUICK_PROFIT_MAX_MINUTES:
+            return make_insight("Quick Profit Taking", avg_win=avg_win, avg_loss=avg_loss)
+    return None
+
+
+def detect_averaging_down(columns: TradeColumns) -> Optional[Dict]:
+    """Averaging down: a same-symbol BUY after a loss, followed by another loss."""
+    count = len(columns)
+    if count < 3:
+        return None
+    loss = columns.pnl < 0
+    adding = loss[:-2] & columns.same_symbol_as_next[:-1] & columns.buy[1:-1] & loss[2:]
+    hit = _first(adding)
+    if hit is None:
+        return None
+    return make_insight("Averaging Down", symbol=columns.trade(hit)["symbol"])
+
+
+def detect_hesitation(columns: TradeColumns) -> Optional[Dict]:
+    """Hesitation: at least 30% of gaps between trades exceed 60 minutes."""
+    count = len(columns)
+    large_gaps = int(np.count_nonzero(columns.gaps / 60 > HESITATION_GAP_MINUTES))
+    if count > 3 and large_gaps >= (count - 1) * HESITATION_GAP_SHARE:
+        return make_insight("Hesitation / Analysis Paralysis", large_gaps=large_gaps)
+    return None
+
+
+# Emotional pattern suite, in reporting order
+EMOTIONAL_DETECTORS = (
+    detect_fomo_trading,
+    detect_ego_trading,
+    detect_impulsive_decisions,
+    detect_calculated_risk,
+    detect_loss_aversion,
+    detect_quick_profit_taking,
+    detect_averaging_down,
+    detect_hesitation,
+)
+
+
+def detect_patterns(columns: TradeColumns,
+                    check_revenge_trading: bool = True,
+                    check_overtrading: bool = True,
+                    check_emotional_patterns: bool = True) -> List[Dict]:
+    """
+    Run the enabled detectors over a session.
+
+    Returns:
+        Insights in the same order ``BehaviorMonitorAgent.analyze_session``
+        has always reported them (without the "Disciplined" fallback)
+    """
+    detectors = []
+    if check_revenge_trading:
+        detectors.append(detect_revenge_trading)
+    if check_overtrading:
+        detectors.append(detect_overtrading)
+    if check_emotional_patterns:
+        detectors.extend(EMOTIONAL_DETECTORS)
+
+    insights = []
+    for detector in detectors:
+        insight = detector(columns)
+        if insight:
+            insights.append(insight)
+    return insights
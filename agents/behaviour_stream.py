@@ -0,0 +1,256 @@
+"""
+Streaming Behaviour Detection
+=============================
+
+Incremental version of the ``BehaviorMonitorAgent`` detectors for live
+trade feeds. Each ``update(trade)`` costs O(1): every detector keeps a
+constant amount of state (loss and win streaks, the last two trades, gap
+counters, hold-duration sums) instead of rescanning the session.
+
+For trades fed in chronological order, ``insights()`` returns exactly what
+``analyze_session`` would return for the same trades.
+
+Usage:
+    stream = BehaviourStream()
+    for trade in live_feed:
+        for insight in stream.update(trade):
+            alert(insight)
+"""
+
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from agents.behaviour_engine import (
+    CALCULATED_MAX_LOSS,
+    CALCULATED_MIN_WIN_RATE,
+    EGO_LARGE_LOSS,
+    EGO_MIN_WIN_STREAK,
+    FOMO_REENTRY_MINUTES,
+    HESITATION_GAP_MINUTES,
+    HESITATION_GAP_SHARE,
+    IMPULSIVE_GAP_SECONDS,
+    IMPULSIVE_MIN_TRADES,
+    LOSS_AVERSION_RATIO,
+    OVERTRADING_MAX_TRADES,
+    PATTERNS,
+    QUICK_PROFIT_MAX_MINUTES,
+    QUICK_PROFIT_RATIO,
+    REVENGE_WINDOW_MINUTES,
+    TIMESTAMP_FORMAT,
+    make_insight,
+)
+
+REVENGE_PATTERNS = ("Revenge Trading",)
+OVERTRADING_PATTERNS = ("Overtrading",)
+EMOTIONAL_PATTERNS = tuple(p for p in PATTERNS if p not in REVENGE_PATTERNS + OVERTRADING_PATTERNS)
+
+
+class _Trade:
+    """The fields the detectors need from one trade, parsed once."""
+
+    __slots__ = ("ts", "pnl", "symbol", "buy", "open")
+
+    def __init__(self, trade: Dict):
+        try:
+            self.ts: Optional[datetime] = datetime.strptime(trade["timestamp"], TIMESTAMP_FORMAT)
+        except (TypeError, ValueError):
+            self.ts = None
+        self.pnl = trade["pnl"]
+        self.symbol = trade["symbol"]
+        self.buy = trade.get("action") == "BUY"
+        self.open = trade.get("status") == "OPEN"
+
+
+def _seconds_between(earlier: _Trade, later: _Trade) -> Optional[float]:
+    if earlier.ts is None or later.ts is None:
+        return None
+    return (later.ts - earlier.ts).total_seconds()
+
+
+class BehaviourStream:
+    """
+    Per-session streaming detector state.
+
+    Attributes:
+        patterns (tuple): Pattern names this stream evaluates
+        count (int): Trades seen so far
+    """
+
+    def __init__(self,
+                 check_revenge_trading: bool = True,
+                 check_overtrading: bool = True,
+                 check_emotional_patterns: bool = True):
+        enabled = set()
+        if check_revenge_trading:
+            enabled.update(REVENGE_PATTERNS)
+        if check_overtrading:
+            enabled.update(OVERTRADING_PATTERNS)
+        if check_emotional_patterns:
+            enabled.update(EMOTIONAL_PATTERNS)
+        self.patterns = tuple(p for p in PATTERNS if p in enabled)
+
+        self.count = 0
+        self._previous: deque = deque(maxlen=2)  # Last two trades
+
+        # Revenge trading: current loss run and its last two valid loss timestamps
+        self._loss_streak = 0
+        self._loss_times: deque = deque(maxlen=2)
+        # Ego trading: current win run
+        self._win_streak = 0
+        # Aggregates for the session-level rules
+        self._wins = 0
+        self._max_loss = 0
+        self._rapid_trades = 0
+        self._large_gaps = 0
+        self._win_hold = [0.0, 0]   # Sum of minutes, count
+        self._loss_hold = [0.0, 0]
+        # Recent valid timestamps for trades_in_last_hour
+        self._last_hour: deque = deque()
+
+        # First-occurrence patterns keep the insight from when they fired
+        self._fired: Dict[str, Dict] = {}
+        self._active_types: set = set()
+
+    # ---------------------------------------------------------------- updates
+
+    def update(self, trade: Dict) -> List[Dict]:
+        """
+        Add the next trade of the session.
+
+        Returns:
+            Insights that became active with this trade
+        """
+        current = _Trade(trade)
+
+        self._update_sequences(current)
+        self._update_aggregates(current)
+
+        self._previous.append(current)
+        self.count += 1
+
+        active = self._active()
+        triggered = [insight for insight in active if insight["type"] not in self._active_types]
+        self._active_types = {insight["type"] for insight in active}
+        return triggered
+
+    def _update_sequences(self, current: _Trade):
+        """Streak and window rules that report their first occurrence."""
+        # Revenge trading
+        if current.pnl < 0:
+            self._loss_streak += 1
+            if current.ts is not None:
+                if len(self._loss_times) == 2:
+                    window = (current.ts - self._loss_times[0]).total_seconds() / 60
+                    if window <= REVENGE_WINDOW_MINUTES:
+                        self._fire("Revenge Trading", consecutive_losses=self._loss_streak, minutes=int(window))
+                self._loss_times.append(current.ts)
+        else:
+            self._loss_streak = 0
+            self._loss_times.clear()
+
+        # Ego trading
+        if current.pnl > 0:
+            self._win_streak += 1
+        else:
+            if self._win_streak >= EGO_MIN_WIN_STREAK and current.pnl < EGO_LARGE_LOSS:
+                self._fire("Ego Trading", wins_streak=self._win_streak, loss=abs(current.pnl))
+            self._win_streak = 0
+
+        if len(self._previous) == 2:
+            first, second = self._previous
+            # FOMO: a pair only counts once a third trade follows it
+            if first.pnl > 0 and first.symbol == second.symbol:
+                gap = _seconds_between(first, second)
+                if gap is not None and gap / 60 <= FOMO_REENTRY_MINUTES:
+                    self._fire("FOMO Trading")
+            # Averaging down: loss, same-symbol BUY, loss
+            if first.pnl < 0 and second.symbol == first.symbol and second.buy and current.pnl < 0:
+                self._fire("Averaging Down", symbol=first.symbol)
+
+    def _update_aggregates(self, current: _Trade):
+        """Counters behind the session-level rules."""
+        if current.pnl > 0:
+            self._wins += 1
+        elif current.pnl < 0:
+            self._max_loss = min(self._max_loss, current.pnl)
+
+        if current.ts is not None:
+            self._last_hour.append(current.ts)
+            while (current.ts - self._last_hour[0]).total_seconds() > 3600:
+                self._last_hour.popleft()
+
+        if not self._previous:
+            return
+        previous = self._previous[-1]
+        gap = _seconds_between(previous, current)
+        if gap is None:
+            return
+
+        if gap <= IMPULSIVE_GAP_SECONDS:
+            self._rapid_trades += 1
+        minutes = gap / 60
+        if minutes > HESITATION_GAP_MINUTES:
+            self._large_gaps += 1
+        if previous.open and previous.symbol == current.symbol:
+            if current.pnl > 0:
+                self._win_hold[0] += minutes
+                self._win_hold[1] += 1
+            elif current.pnl < 0:
+                self._loss_hold[0] += minutes
+                self._loss_hold[1] += 1
+
+    def _fire(self, pattern: str, **values):
+        if pattern in self.patterns and pattern not in self._fired:
+            self._fired[pattern] = make_insight(pattern, **values)
+
+    # ---------------------------------------------------------------- results
+
+    def _session_rule(self, pattern: str) -> Optional[Dict]:
+        """Evaluate a session-level rule against the current counters."""
+        count = self.count
+        if pattern == "Overtrading" and count > OVERTRADING_MAX_TRADES:
+            return make_insight(pattern, count=count)
+        if pattern == "Impulsive Decisions" and self._rapid_trades >= IMPULSIVE_MIN_TRADES:
+            return make_insight(pattern, rapid_trades=self._rapid_trades)
+        if pattern == "Calculated Risk" and count >= 3:
+            win_rate = (self._wins / count) * 100
+            if win_rate >= CALCULATED_MIN_WIN_RATE and self._max_loss >= CALCULATED_MAX_LOSS:
+                return make_insight(pattern, win_rate=win_rate)
+        if pattern in ("Loss Aversion", "Quick Profit Taking") and self._win_hold[1] and self._loss_hold[1]:
+            avg_win = self._win_hold[0] / self._win_hold[1]
+            avg_loss = self._loss_hold[0] / self._loss_hold[1]
+            if pattern == "Loss Aversion" and avg_loss > avg_win * LOSS_AVERSION_RATIO:
+                return make_insight(pattern, avg_loss=avg_loss, avg_win=avg_win)
+            if (pattern == "Quick Profit Taking" and avg_loss > avg_win * QUICK_PROFIT_RATIO
+                    and avg_win < QUICK_PROFIT_MAX_MINUTES):
+                return make_insight(pattern, avg_win=avg_win, avg_loss=avg_loss)
+        if (pattern == "Hesitation / Analysis Paralysis" and count > 3
+                and self._large_gaps >= (count - 1) * HESITATION_GAP_SHARE):
+            return make_insight(pattern, large_gaps=self._large_gaps)
+        return None
+
+    def _active(self) -> List[Dict]:
+        active = []
+        for pattern in self.patterns:
+            insight = self._fired.get(pattern) or self._session_rule(pattern)
+            if insight:
+                active.append(insight)
+        return active
+
+    def insights(self) -> List[Dict]:
+        """Insights for the session so far, as ``analyze_session`` reports them."""
+        if not self.count:
+            return [{"type": "No Activity", "details": "No trades recorded in this session."}]
+        return self._active() or [{
+            "type": "Disciplined",
+            "details": "No negative patterns detected. Good adherence to plan."
+        }]
+
+    def session_state(self) -> Dict:
+        """Current streaks and recent activity, in the shape ``predict_next_risk`` expects."""
+        return {
+            "consecutive_losses": self._loss_streak,
+            "consecutive_wins": self._win_streak,
+            "trades_in_last_hour": len(self._last_hour),
+        }
@@ -98,19 +98,68 @@ API REFERENCE:
 See class documentation below for detailed method signatures.
 """
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import List, Dict, Tuple
+import weakref
+from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
+from llm_council.core.config import settings
+from llm_council.services.rate_limiter import estimate_tokens, get_rate_limiter, parse_retry_after
+from services.batch_behaviour import summarize_trades
+from services.executor import run_blocking
+from services.result_cache import AsyncResultCache
+from services.trade_archive import get_trade_archive, history_trends
+
 # Make groq import optional
 try:
-    from groq import Groq
+    import httpx
+    from groq import AsyncGroq, DefaultAsyncHttpxClient, Groq
     GROQ_AVAILABLE = True
 except ImportError:
     GROQ_AVAILABLE = False
     print("WARNING: groq module not installed. NarratorAgent AI features will be disabled.")
     print("To enable: pip install groq")
 
+NARRATOR_MODEL = "llama-3.1-8b-instant"
+
+# Loaded once per process rather than in every constructor
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
+
+
+def summary_cache_key(kind: str, system_prompt: str, user_prompt: str) -> str:
+    """
+    Cache key for a generated summary.
+
+    The prompts contain everything the narrative depends on (persona,
+    insights, trade summary, market context, risk assessment).
+    """
+    payload = json.dumps([kind, NARRATOR_MODEL, system_prompt, user_prompt])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_summary(text: str) -> bool:
+    """Only cache real narratives, not error messages."""
+    return not text.startswith("❌")
+
+
+# Singleton instance
+_summary_cache = None
+
+
+def get_summary_cache() -> AsyncResultCache:
+    """Get singleton instance of the narrator summary cache."""
+    global _summary_cache
+    if _summary_cache is None:
+        _summary_cache = AsyncResultCache(
+            name="narrator",
+            ttl=settings.NARRATOR_CACHE_TTL,
+            max_entries=settings.NARRATOR_CACHE_MAX_ENTRIES,
+            should_cache=_is_summary,
+        )
+    return _summary_cache
 
 
 class NarratorAgent:
@@ -121,8 +170,14 @@ class NarratorAgent:
         persona_name (str): Name of the coaching persona
         api_key (str): Groq API key
         client (Groq): Groq client instance
+
+    The async methods share one pooled AsyncGroq client per event loop; close
+    it on shutdown with ``await NarratorAgent.close_async_clients()``.
     """
     
+    # One pooled async client per event loop (httpx clients cannot cross loops)
+    _async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGroq]" = weakref.WeakKeyDictionary()
+    
     def __init__(self, persona_name: str = "The Trading Coach"):
         """
         Initialize the Narrator Agent.
@@ -136,10 +191,6 @@ class NarratorAgent:
         """
         self.persona_name = persona_name
         
-        # Load environment variables
-        env_path = os.path.join(os.path.dirname(__file__), '.env')
-        load_dotenv(dotenv_path=env_path)
-        
         self.api_key = os.getenv("groq_api")
         self.client = None
         
@@ -154,16 +205,141 @@ class NarratorAgent:
             print("WARNING: Groq API key not found. Set 'groq_api' environment variable.")
 
 
+    def _chat_completion(self, system_prompt: str, user_prompt: str, expected_tokens: int = 600) -> str:
+        """
+        Call the Groq chat API through the shared Groq rate limiter.
+        A 429 pauses every Groq caller for the provider's Retry-After.
+        ``expected_tokens`` is the completion size reserved against the
+        tokens-per-minute budget until the actual usage is known.
+        """
+        limiter = get_rate_limiter("groq", NARRATOR_MODEL)
+        with limiter.limit_sync(tokens=estimate_tokens(system_prompt + user_prompt) + expected_tokens) as slot:
+            try:
+                completion = self.client.chat.completions.create(
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    model=NARRATOR_MODEL,
+                    temperature=0.7,
+                )
+            except Exception as e:
+                if getattr(e, "status_code", None) == 429:
+                    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+                    limiter.penalize(parse_retry_after(headers.get("retry-after")))
+                raise
+            usage = getattr(completion, "usage", None)
+            slot["actual_tokens"] = getattr(usage, "total_tokens", None)
+        return completion.choices[0].message.content
+
+    def _async_client(self) -> "AsyncGroq":
+        """Get the pooled AsyncGroq client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed() or client.api_key != self.api_key:
+            http_client = DefaultAsyncHttpxClient(limits=httpx.Limits(
+                max_connections=settings.HTTP_POOL_LIMIT,
+                max_keepalive_connections=settings.HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_TIMEOUT,
+            ))
+            client = AsyncGroq(api_key=self.api_key, http_client=http_client)
+            self._async_clients[loop] = client
+        return client
+
+    @classmethod
+    async def close_async_clients(cls):
+        """Close the pooled AsyncGroq client bound to the running event loop."""
+        client = cls._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None and not client.is_closed():
+            await client.close()
+
+    async def _chat_completion_async(self, system_prompt: str, user_prompt: str, expected_tokens: int = 600) -> str:
+        """Async ``_chat_completion`` on the pooled client, through the same Groq rate limiter."""
+        limiter = get_rate_limiter("groq", NARRATOR_MODEL)
+        async with limiter.limit(tokens=estimate_tokens(system_prompt + user_prompt) + expected_tokens) as slot:
+            try:
+                completion = await self._async_client().chat.completions.create(
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    model=NARRATOR_MODEL,
+                    temperature=0.7,
+                )
+            except Exception as e:
+                if getattr(e, "status_code", None) == 429:
+                    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+                    limiter.penalize(parse_retry_after(headers.get("retry-after")))
+                raise
+            usage = getattr(completion, "usage", None)
+            slot["actual_tokens"] = getattr(usage, "total_tokens", None)
+        return completion.choices[0].message.content
+
+    @property
+    def has_llm_access(self) -> bool:
+        """Whether summaries can be generated (Groq installed and a key configured)."""
+        return self.client is not None
+
     def run(self, context: dict) -> dict:
+        """
+        Synchronous pipeline method (same output as ``run_async``).
+
+        Uses the blocking Groq client, so it is safe to call whether or not an
+        event loop is running; it does not use the summary cache.
+        """
+        insights, market_context, trade_summary = self._summary_inputs(context)
+        trends = self._load_history_trends(context.get("user_id"))
+        if trends and trends["historical_risk_score"] is not None:
+            context["session_summary"] = self.generate_summary_with_trends(
+                insights, market_context, trade_summary,
+                trends["trend_summary"], trends["historical_risk_score"]
+            )
+        else:
+            context["session_summary"] = self.generate_session_summary(
+                insights, market_context, trade_summary
+            )
+        return context
+
+    async def run_async(self, context: dict) -> dict:
         """
         Pipeline integration method.
-        Expects context with market_opinions and behavior analysis from previous agents.
+        Expects context with user_trades, insights and market_opinions from previous agents.
         Outputs session summary for PersonaAgent.
+
+        Uses the pooled, cached async path. When the trade archive holds earlier
+        sessions for the user, the summary also covers their historical trends.
         """
-        # TODO: Implement logic using context["market_opinions"] and behavior analysis
-        context["session_summary"] = "Session summary goes here."
+        insights, market_context, trade_summary = self._summary_inputs(context)
+        trends = await run_blocking(self._load_history_trends, context.get("user_id"))
+        if trends and trends["historical_risk_score"] is not None:
+            context["session_summary"] = await self.generate_summary_with_trends_async(
+                insights, market_context, trade_summary,
+                trends["trend_summary"], trends["historical_risk_score"]
+            )
+        else:
+            context["session_summary"] = await self.generate_session_summary_async(
+                insights, market_context, trade_summary
+            )
         return context
 
+    @staticmethod
+    def _summary_inputs(context: dict) -> tuple:
+        """Insights, market context text and trade summary from the pipeline context."""
+        insights = context.get("insights") or []
+        market_context = "\n".join(context.get("market_opinions") or []) or "No market commentary available."
+        return insights, market_context, summarize_trades(context.get("user_trades") or [])
+
+    def _load_history_trends(self, user_id: Optional[str]) -> Optional[Dict]:
+        """Historical trends from the trade archive (None without an archive or user; blocking)."""
+        archive = get_trade_archive()
+        if archive is None or not user_id:
+            return None
+        try:
+            return history_trends(archive.load(user_id), self.calculate_risk_score)
+        except Exception as e:
+            print(f"Narrator: could not load history trends for {user_id}: {e}")
+            return None
+
     def calculate_risk_score(self, behavioral_insights: List[Dict]) -> int:
         """
         Calculate risk score from behavioral patterns.
@@ -293,6 +469,55 @@ class NarratorAgent:
         if not self.client:
             return "❌ Narrator Error: Groq API Key missing. Cannot generate summary."
         
+        system_prompt, user_prompt, risk_score, readiness = self._session_prompts(
+            behavioral_insights, market_context, trade_summary
+        )
+
+        try:
+            # Call Groq LLM
+            summary = self._chat_completion(system_prompt, user_prompt)
+            return summary + self._session_banner(risk_score, readiness)
+        except Exception as e:
+            return f"❌ Error generating narrative: {e}"
+
+    async def generate_session_summary_async(
+        self,
+        behavioral_insights: List[Dict],
+        market_context: str,
+        trade_summary: Dict
+    ) -> str:
+        """
+        Async version of generate_session_summary on the pooled AsyncGroq client.
+        
+        Summaries are cached by a hash of the prompts (insights, trade
+        summary, market context, risk assessment), so an unchanged session
+        returns the stored narrative instead of calling the LLM again.
+        Errors are returned as messages and never cached.
+        """
+        if not self.client:
+            return "❌ Narrator Error: Groq API Key missing. Cannot generate summary."
+        
+        system_prompt, user_prompt, risk_score, readiness = self._session_prompts(
+            behavioral_insights, market_context, trade_summary
+        )
+
+        async def generate() -> str:
+            try:
+                summary = await self._chat_completion_async(system_prompt, user_prompt)
+                return summary + self._session_banner(risk_score, readiness)
+            except Exception as e:
+                return f"❌ Error generating narrative: {e}"
+
+        key = summary_cache_key("session", system_prompt, user_prompt)
+        return await get_summary_cache().get_or_compute(key, generate)
+
+    def _session_prompts(
+        self,
+        behavioral_insights: List[Dict],
+        market_context: str,
+        trade_summary: Dict
+    ) -> Tuple[str, str, int, Dict]:
+        """System prompt, user prompt, risk score and readiness for a session summary."""
         # Calculate risk metrics
         risk_score = self.calculate_risk_score(behavioral_insights)
         readiness = self.assess_market_readiness(risk_score, behavioral_insights)
@@ -351,28 +576,17 @@ Be direct and honest. If the trader made emotional mistakes, call them out clear
 If the risk score is high (>60), STRONGLY recommend taking a break from trading.
 """
 
-        try:
-            # Call Groq LLM
-            completion = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                model="llama-3.1-8b-instant",
-                temperature=0.7,
-            )
-            summary = completion.choices[0].message.content
-            
-            # Append risk assessment banner
-            risk_banner = f"\\n\\n{'='*60}\\n🎯 RISK ASSESSMENT\\n{'='*60}\\n"
-            risk_banner += f"Risk Score: {risk_score}/100\\n"
-            risk_banner += f"Market Readiness: {readiness['recommendation']}\\n"
-            risk_banner += f"Recommendation: {readiness['reason']}\\n"
-            risk_banner += "="*60
-            
-            return summary + risk_banner
-        except Exception as e:
-            return f"❌ Error generating narrative: {e}"
+        return system_prompt, user_prompt, risk_score, readiness
+
+    @staticmethod
+    def _session_banner(risk_score: int, readiness: Dict) -> str:
+        """Risk assessment banner appended to session summaries."""
+        risk_banner = f"\\n\\n{'='*60}\\n🎯 RISK ASSESSMENT\\n{'='*60}\\n"
+        risk_banner += f"Risk Score: {risk_score}/100\\n"
+        risk_banner += f"Market Readiness: {readiness['recommendation']}\\n"
+        risk_banner += f"Recommendation: {readiness['reason']}\\n"
+        risk_banner += "="*60
+        return risk_banner
     
     def generate_summary_with_trends(
         self,
@@ -407,6 +621,54 @@ If the risk score is high (>60), STRONGLY recommend taking a break from trading.
         if not self.client:
             return "❌ Narrator Error: Groq API Key missing. Cannot generate summary."
         
+        system_prompt, user_prompt, risk_score, readiness = self._trend_prompts(
+            behavioral_insights, market_context, trade_summary, trend_summary, historical_risk_score
+        )
+
+        try:
+            summary = self._chat_completion(system_prompt, user_prompt)
+            return summary + self._trend_banner(risk_score, readiness, historical_risk_score)
+        except Exception as e:
+            return f"❌ Error generating enhanced narrative: {e}"
+
+    async def generate_summary_with_trends_async(
+        self,
+        behavioral_insights: List[Dict],
+        market_context: str,
+        trade_summary: Dict,
+        trend_summary: str = None,
+        historical_risk_score: int = None
+    ) -> str:
+        """
+        Async version of generate_summary_with_trends, cached like
+        generate_session_summary_async.
+        """
+        if not self.client:
+            return "❌ Narrator Error: Groq API Key missing. Cannot generate summary."
+        
+        system_prompt, user_prompt, risk_score, readiness = self._trend_prompts(
+            behavioral_insights, market_context, trade_summary, trend_summary, historical_risk_score
+        )
+
+        async def generate() -> str:
+            try:
+                summary = await self._chat_completion_async(system_prompt, user_prompt)
+                return summary + self._trend_banner(risk_score, readiness, historical_risk_score)
+            except Exception as e:
+                return f"❌ Error generating enhanced narrative: {e}"
+
+        key = summary_cache_key("trends", system_prompt, user_prompt)
+        return await get_summary_cache().get_or_compute(key, generate)
+
+    def _trend_prompts(
+        self,
+        behavioral_insights: List[Dict],
+        market_context: str,
+        trade_summary: Dict,
+        trend_summary: Optional[str],
+        historical_risk_score: Optional[int]
+    ) -> Tuple[str, str, int, Dict]:
+        """System prompt, user prompt, risk score and readiness for a summary with trends."""
         # Calculate current risk
         risk_score = self.calculate_risk_score(behavioral_insights)
         readiness = self.assess_market_readiness(risk_score, behavioral_insights)
@@ -485,29 +747,19 @@ If risk increased from historical average, emphasize what changed.
 If patterns are improving, reinforce positive momentum.
 """
 
-        try:
-            completion = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                model="llama-3.1-8b-instant",
-                temperature=0.7,
-            )
-            summary = completion.choices[0].message.content
-            
-            # Enhanced risk banner
-            risk_banner = f"\n\n{'='*60}\n🎯 ENHANCED RISK ASSESSMENT\n{'='*60}\n"
-            risk_banner += f"Current Risk Score: {risk_score}/100\n"
-            if historical_risk_score is not None:
-                risk_banner += f"Historical Average: {historical_risk_score}/100\n"
-            risk_banner += f"Market Readiness: {readiness['recommendation']}\n"
-            risk_banner += f"Recommendation: {readiness['reason']}\n"
-            risk_banner += "="*60
-            
-            return summary + risk_banner
-        except Exception as e:
-            return f"❌ Error generating enhanced narrative: {e}"
+        return system_prompt, user_prompt, risk_score, readiness
+
+    @staticmethod
+    def _trend_banner(risk_score: int, readiness: Dict, historical_risk_score: Optional[int]) -> str:
+        """Enhanced risk assessment banner appended to summaries with trends."""
+        risk_banner = f"\n\n{'='*60}\n🎯 ENHANCED RISK ASSESSMENT\n{'='*60}\n"
+        risk_banner += f"Current Risk Score: {risk_score}/100\n"
+        if historical_risk_score is not None:
+            risk_banner += f"Historical Average: {historical_risk_score}/100\n"
+        risk_banner += f"Market Readiness: {readiness['recommendation']}\n"
+        risk_banner += f"Recommendation: {readiness['reason']}\n"
+        risk_banner += "="*60
+        return risk_banner
 
 
 # ==================== STANDALONE USAGE EXAMPLE ====================
@@ -1,92 +1,75 @@
-import requests
+import asyncio
 import json
 import os
-import time
+
+import aiohttp
 from dotenv import load_dotenv
 
+from llm_council.services.llm_client import LLMClient
+from llm_council.services.rate_limiter import RateLimitedError, estimate_tokens, get_rate_limiter, parse_retry_after
+
+MISTRAL_URL = "https://api.mistral.ai/v1/chat/completions"
+PERSONA_MODEL = "mistral-small-latest"
+MAX_RETRIES = 2
+
+# Deadline for each Mistral call (seconds)
+PERSONA_CALL_TIMEOUT = float(os.getenv("PERSONA_CALL_TIMEOUT", "10"))
+
+
 class PersonaAgent:
+    """
+    Turns the council's market opinions into an X post and a LinkedIn post.
+
+    Both posts come from one structured JSON completion on the pooled LLM
+    HTTP session. If the reply is not the expected JSON, the two formats are
+    requested separately and concurrently. ``run_async`` is cancellable and
+    every Mistral call has its own deadline (PERSONA_CALL_TIMEOUT).
+    """
+
     def __init__(self):
         """Initialize PersonaAgent with API key from environment."""
         # Load environment variables - try agents folder first, then parent
         env_path = os.path.join(os.path.dirname(__file__), '.env')
         load_dotenv(dotenv_path=env_path)
-        
+
         self.api_key = os.getenv("MISTRAL_API_KEY")
-        
+        self.base_url = MISTRAL_URL
+        self.call_timeout = PERSONA_CALL_TIMEOUT
+
         # If not found, try parent directory
         if not self.api_key:
             parent_env_path = os.path.join(os.path.dirname(__file__), '..', '.env')
             load_dotenv(dotenv_path=parent_env_path, override=True)
             self.api_key = os.getenv("MISTRAL_API_KEY")
-        
+
         if not self.api_key:
             print("WARNING: Mistral API key not found. Set 'MISTRAL_API_KEY' environment variable.")
             print(f"Checked paths: {env_path} and {parent_env_path if 'parent_env_path' in locals() else 'N/A'}")
 
     def run(self, context: dict) -> dict:
-        # Expects context with session_summary from NarratorAgent
+        """Sync wrapper for run_async."""
+        async def run_and_close():
+            try:
+                return await self.run_async(context)
+            finally:
+                # The pooled session is bound to this short-lived loop
+                await LLMClient.close_sessions()
+
+        return asyncio.run(run_and_close())
+
+    async def run_async(self, context: dict) -> dict:
+        # Expects context with market_opinions from MarketWatcherAgent
         market_opinions = context.get("market_opinions", [])
         asset = context.get("asset", "")
         price_change_pct = context.get("price_change_pct", "")
-        persona_style = context.get("persona_style", "Meme Style")
 
         merged_summary = " ".join(market_opinions)
-        prompt_x = f"Format this as a viral, emoji-heavy tweet about {asset} moving {price_change_pct}%: {merged_summary}"
-        prompt_linkedin = f"Format this as a professional LinkedIn post about {asset} moving {price_change_pct}%: {merged_summary}"
-
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        base_url = "https://api.mistral.ai/v1/chat/completions"
-        model = "mistral-small-latest"
-
-        def query_mistral(prompt):
-            if not self.api_key:
-                # Fallback message when API key is not configured
-                if "tweet" in prompt.lower() or "emoji" in prompt.lower():
-                    return f"🚀 {asset} just moved {price_change_pct}%! Market analysis shows interesting signals. #Trading #Markets"
-                else:
-                    return f"Market Analysis Update: {asset} moved {price_change_pct}%. Our 5-agent LLM council has completed analysis."
-            
-            payload = {
-                "model": model,
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": 200
-            }
-            
-            # Try with retry logic for rate limits
-            max_retries = 2
-            for attempt in range(max_retries):
-                try:
-                    response = requests.post(base_url, headers=headers, data=json.dumps(payload), timeout=10)
-                    response.raise_for_status()
-                    result = response.json()
-                    return result["choices"][0]["message"]["content"].strip()
-                except requests.exceptions.HTTPError as e:
-                    if response.status_code == 429:  # Rate limit
-                        if attempt < max_retries - 1:
-                            print(f"Rate limited, waiting 2s before retry {attempt + 1}/{max_retries}...")
-                            time.sleep(2)
-                            continue
-                        else:
-                            # Fallback message for rate limit
-                            print(f"Mistral API rate limited after retries")
-                            if "tweet" in prompt.lower() or "emoji" in prompt.lower():
-                                return f"🚀 {asset} just moved {price_change_pct}%! Market signals detected. Analysis complete. #Trading"
-                            else:
-                                return f"Professional Market Analysis: {asset} moved {price_change_pct}%. Our multi-agent system has completed comprehensive analysis. Key insights available in the full report."
-                    print(f"Mistral API error: {e}")
-                    return f"[Error: {str(e)}]"
-                except Exception as e:
-                    print(f"Mistral API error: {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(1)
-                        continue
-                    return f"[Error: {str(e)}]"
-
-        x_post = query_mistral(prompt_x)
-        linkedin_post = query_mistral(prompt_linkedin)
+        if not self.api_key:
+            # Fallback messages when API key is not configured
+            x_post = f"🚀 {asset} just moved {price_change_pct}%! Market analysis shows interesting signals. #Trading #Markets"
+            linkedin_post = f"Market Analysis Update: {asset} moved {price_change_pct}%. Our 5-agent LLM council has completed analysis."
+        else:
+            x_post, linkedin_post = await self._generate_posts(asset, price_change_pct, merged_summary)
 
         context["persona_post"] = {
             "x": x_post,
@@ -95,3 +78,100 @@ class PersonaAgent:
         print("X post:", x_post)
         print("LinkedIn post:", linkedin_post)
         return context
+
+    async def _generate_posts(self, asset: str, price_change_pct, merged_summary: str):
+        """Both posts from one JSON completion, or two concurrent calls if the JSON is unusable."""
+        prompt = (
+            f"Write two posts about {asset} moving {price_change_pct}% based on this market analysis: {merged_summary}\n"
+            "Respond with a JSON object with exactly two string fields: "
+            '"x" - a viral, emoji-heavy tweet, and "linkedin" - a professional LinkedIn post.'
+        )
+        try:
+            content = await self._query_mistral(prompt, max_tokens=400, json_mode=True)
+            posts = json.loads(content)
+            if isinstance(posts, dict) and isinstance(posts.get("x"), str) and isinstance(posts.get("linkedin"), str):
+                return posts["x"].strip(), posts["linkedin"].strip()
+            print("Mistral JSON reply incomplete, requesting each format separately")
+        except json.JSONDecodeError:
+            print("Mistral reply was not JSON, requesting each format separately")
+        except RateLimitedError:
+            print(f"Mistral API rate limited after retries")
+            return self._fallback_posts(asset, price_change_pct)
+        except asyncio.TimeoutError:
+            print(f"Mistral API call missed its {self.call_timeout}s deadline")
+            return self._fallback_posts(asset, price_change_pct)
+        except Exception as e:
+            print(f"Mistral API error: {e}")
+            return f"[Error: {str(e)}]", f"[Error: {str(e)}]"
+
+        prompt_x = f"Format this as a viral, emoji-heavy tweet about {asset} moving {price_change_pct}%: {merged_summary}"
+        prompt_linkedin = f"Format this as a professional LinkedIn post about {asset} moving {price_change_pct}%: {merged_summary}"
+        fallback_x, fallback_linkedin = self._fallback_posts(asset, price_change_pct)
+
+        async def single(prompt: str, fallback: str) -> str:
+            try:
+                return await self._query_mistral(prompt, max_tokens=200)
+            except (RateLimitedError, asyncio.TimeoutError) as e:
+                print(f"Mistral API unavailable ({type(e).__name__}), using the fallback post")
+                return fallback
+            except Exception as e:
+                print(f"Mistral API error: {e}")
+                return f"[Error: {str(e)}]"
+
+        x_post, linkedin_post = await asyncio.gather(
+            single(prompt_x, fallback_x), single(prompt_linkedin, fallback_linkedin)
+        )
+        return x_post, linkedin_post
+
+    @staticmethod
+    def _fallback_posts(asset: str, price_change_pct):
+        """Canned posts used when Mistral is rate limited or too slow."""
+        return (
+            f"🚀 {asset} just moved {price_change_pct}%! Market signals detected. Analysis complete. #Trading",
+            f"Professional Market Analysis: {asset} moved {price_change_pct}%. Our multi-agent system has completed comprehensive analysis. Key insights available in the full report."
+        )
+
+    async def _query_mistral(self, prompt: str, max_tokens: int = 200, json_mode: bool = False) -> str:
+        """
+        One Mistral chat completion on the pooled session.
+
+        A 429 pauses every Mistral caller for the provider's Retry-After and
+        is retried once the limiter admits the call again.
+
+        Raises:
+            RateLimitedError: Still rate limited after MAX_RETRIES attempts
+            asyncio.TimeoutError: The call missed its deadline
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        payload = {
+            "model": PERSONA_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens
+        }
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+
+        limiter = get_rate_limiter("mistral", PERSONA_MODEL)
+        for attempt in range(MAX_RETRIES):
+            # Shared provider budget; waits out any Retry-After pause
+            async with limiter.limit(tokens=estimate_tokens(prompt) + max_tokens) as slot:
+                async with LLMClient.http_session().post(
+                    self.base_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=self.call_timeout)
+                ) as response:
+                    if response.status == 429:
+                        limiter.penalize(parse_retry_after(response.headers.get("Retry-After")), attempt)
+                        if attempt < MAX_RETRIES - 1:
+                            print(f"Rate limited, retrying when Mistral allows ({attempt + 1}/{MAX_RETRIES})...")
+                            continue
+                        raise RateLimitedError("Mistral rate limited")
+                    response.raise_for_status()
+                    result = await response.json()
+                content = result["choices"][0]["message"]["content"].strip()
+                slot["actual_tokens"] = estimate_tokens(prompt + content)
+            return content
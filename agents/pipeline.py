@@ -0,0 +1,161 @@
+"""
+Agent Pipeline Scheduler
+========================
+
+Runs pipeline stages as a dependency graph instead of a fixed sequence.
+
+Each stage declares the context keys it reads and writes. The declaration
+order is treated as the reference sequential order, and a stage only waits
+for earlier stages it actually conflicts with:
+
+- read-after-write: it reads a key an earlier stage writes
+- write-after-write: it writes a key an earlier stage also writes
+- write-after-read: it writes a key an earlier stage still has to read
+
+Stages without conflicts run at the same time, so the behaviour analysis,
+calendar fetch and metrics fetch can overlap with the LLM council debate.
+Synchronous stages run on the shared blocking executor, never on the event
+loop, and every stage can carry its own timeout. A timed-out worker thread
+cannot be stopped, so synchronous stages get a shallow copy of the context
+and only their declared ``writes`` are merged back, once they succeed.
+
+Stage failures are recorded as ``<name>_error`` in the context (the same
+convention the sequential ``agent_flow`` loop used) and do not stop the
+stages that depend on them.
+
+USAGE EXAMPLE:
+--------------
+```python
+pipeline = AgentPipeline([
+    PipelineStage("BehaviorMonitorAgent", BehaviorMonitorAgent().run,
+                  reads=("user_trades",), writes=("behavior_label", "behavior_reason")),
+    PipelineStage("MarketWatcherAgent", MarketWatcherAgent().run_async,
+                  reads=("asset",), writes=("market_opinions",)),
+])
+context = await pipeline.run(context)
+```
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from services.executor import StageTimeoutError, run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineStage:
+    """
+    A single unit of work in the agent pipeline.
+
+    Attributes:
+        name (str): Stage name, used for logging and ``<name>_error`` keys
+        func (Callable): ``func(context) -> context``, sync or ``async def``
+        reads (tuple): Context keys the stage reads
+        writes (tuple): Context keys the stage writes
+        timeout (float): Optional stage timeout in seconds
+    """
+
+    def __init__(self,
+                 name: str,
+                 func: Callable[[dict], dict],
+                 reads: Iterable[str] = (),
+                 writes: Iterable[str] = (),
+                 timeout: Optional[float] = None):
+        self.name = name
+        self.func = func
+        self.reads = tuple(reads)
+        self.writes = tuple(writes)
+        self.timeout = timeout
+        self.is_async = asyncio.iscoroutinefunction(func)
+
+    def conflicts_with(self, earlier: "PipelineStage") -> bool:
+        """Return True if this stage must wait for an earlier stage."""
+        earlier_writes = set(earlier.writes)
+        return bool(
+            earlier_writes.intersection(self.reads)
+            or earlier_writes.intersection(self.writes)
+            or set(earlier.reads).intersection(self.writes)
+        )
+
+    def __repr__(self) -> str:
+        return f"PipelineStage({self.name!r}, reads={self.reads}, writes={self.writes})"
+
+
+class AgentPipeline:
+    """Dependency-graph scheduler for agent pipeline stages."""
+
+    def __init__(self, stages: List[PipelineStage]):
+        names = [stage.name for stage in stages]
+        if len(names) != len(set(names)):
+            raise ValueError(f"Duplicate pipeline stage names: {names}")
+
+        self.stages = list(stages)
+        self.dependencies: Dict[str, Set[str]] = {}
+        for i, stage in enumerate(self.stages):
+            self.dependencies[stage.name] = {
+                earlier.name for earlier in self.stages[:i]
+                if stage.conflicts_with(earlier)
+            }
+
+    async def run(self,
+                  context: dict,
+                  on_stage_complete: Optional[Callable[[str, dict], None]] = None) -> dict:
+        """
+        Run all stages, overlapping the ones that do not depend on each other.
+
+        Args:
+            context: Shared pipeline context, updated in place
+            on_stage_complete: Optional callback ``(stage_name, context)``
+                invoked after each stage finishes (successfully or not)
+
+        Returns:
+            The updated context
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+        timings: Dict[str, float] = {}
+
+        async def run_stage(stage: PipelineStage) -> None:
+            deps = [tasks[name] for name in self.dependencies[stage.name]]
+            if deps:
+                await asyncio.gather(*deps)
+
+            started = time.perf_counter()
+            try:
+                logger.info(f"Running {stage.name}...")
+                if stage.is_async:
+                    try:
+                        result = await asyncio.wait_for(stage.func(context), timeout=stage.timeout)
+                    except asyncio.TimeoutError:
+                        raise StageTimeoutError(f"{stage.name} timed out after {stage.timeout}s")
+                    if isinstance(result, dict) and result is not context:
+                        context.update(result)
+                else:
+                    # A thread that outlives its timeout only touches its own copy
+                    local = dict(context)
+                    result = await run_blocking(stage.func, local, timeout=stage.timeout)
+                    if not isinstance(result, dict):
+                        result = local
+                    context.update({key: result[key] for key in stage.writes if key in result})
+                logger.info(f"✓ {stage.name} completed")
+            except Exception as e:
+                logger.error(f"✗ {stage.name} failed: {e}")
+                context[f"{stage.name}_error"] = str(e)
+            finally:
+                timings[stage.name] = round(time.perf_counter() - started, 3)
+
+            if on_stage_complete:
+                on_stage_complete(stage.name, context)
+
+        for stage in self.stages:
+            tasks[stage.name] = asyncio.create_task(run_stage(stage))
+
+        await asyncio.gather(*tasks.values())
+        logger.info(f"Pipeline stage timings (s): {timings}")
+        return context
+
+    def describe(self) -> Dict[str, List[str]]:
+        """Return the dependency graph as ``{stage: [dependencies]}``."""
+        return {name: sorted(deps) for name, deps in self.dependencies.items()}
@@ -0,0 +1,155 @@
+"""
+Load benchmark for concurrent /analyze-asset throughput.
+
+Compares blocking calls executed inline on the event loop (the legacy
+behaviour, BLOCKING_POOL_SIZE=0) against the bounded blocking executor.
+
+External services are replaced by stand-ins with fixed latencies so the run
+is reproducible and needs no API keys or network access:
+    - yfinance lookups (validation, calendar, VIX, volatility) -> time.sleep
+    - LLM council debate -> asyncio.sleep
+    - NarratorAgent / PersonaAgent / ModeratorAgent LLM calls -> asyncio.sleep
+
+Usage:
+    python benchmark_analyze_asset.py
+    python benchmark_analyze_asset.py --requests 50 --concurrency 25
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+
+import main
+from agents.moderator import ModeratorAgent
+from agents.narrator import NarratorAgent
+from agents.persona import PersonaAgent
+from llm_council.models.schemas import AgentArgument, ConfidenceLevel
+from services.asset_validator import AssetValidator
+from services.economic_calendar import EconomicCalendarService
+from services.executor import configure_blocking_executor
+from services.market_metrics import MarketMetricsService
+
+# Simulated upstream latencies (seconds)
+YFINANCE_LATENCY = 0.15
+COUNCIL_LATENCY = 1.0
+LLM_HTTP_LATENCY = 0.3
+
+
+def install_stand_ins():
+    """Replace network-bound calls with fixed-latency stand-ins."""
+
+    def validate_symbol(self, symbol):
+        time.sleep(YFINANCE_LATENCY)
+        return True, None
+
+    def get_stock_events(self, symbol):
+        time.sleep(YFINANCE_LATENCY)
+        return self._get_fallback_events(symbol)
+
+    def get_vix(self):
+        time.sleep(YFINANCE_LATENCY)
+        return 18.0
+
+    def get_market_volatility(self, symbol, period="30d"):
+        time.sleep(YFINANCE_LATENCY)
+        return 22.0
+
+    async def get_council_analysis(symbol, economic_context="", **callbacks):
+        await asyncio.sleep(COUNCIL_LATENCY)
+        return {
+            "agent_arguments": [
+                AgentArgument(agent_name="🤔 Skeptic", thesis="Benchmark thesis",
+                              supporting_points=[], confidence=ConfidenceLevel.MODERATE)
+            ],
+            "consensus_points": [],
+            "disagreement_points": [],
+            "judge_summary": "Benchmark debate",
+            "market_context": {"price": 100.0, "move_pct": 1.0, "move_direction": "UP", "volume": 1000},
+        }
+
+    async def narrator_run_async(self, context):
+        await asyncio.sleep(LLM_HTTP_LATENCY)  # one Groq completion
+        context["session_summary"] = "Benchmark summary"
+        return context
+
+    async def persona_run_async(self, context):
+        await asyncio.sleep(LLM_HTTP_LATENCY)  # one JSON-mode Mistral completion
+        context["persona_post"] = {"x": "x", "linkedin": "linkedin"}
+        return context
+
+    async def moderator_run_async(self, context):
+        await asyncio.sleep(LLM_HTTP_LATENCY)  # concurrent OpenRouter reviews of ambiguous posts
+        context["moderation"] = {"x": {"verdict": "POST"}, "linkedin": {"verdict": "POST"}}
+        return context
+
+    AssetValidator.validate_symbol = validate_symbol
+    EconomicCalendarService.get_stock_events = get_stock_events
+    MarketMetricsService.get_vix = get_vix
+    MarketMetricsService.get_market_volatility = get_market_volatility
+    main.get_council_analysis = get_council_analysis
+    # The pipeline registers the bound run_async methods when it is built, after this runs
+    NarratorAgent.has_llm_access = True  # The stage is only built with a Groq key
+    NarratorAgent.run_async = narrator_run_async
+    PersonaAgent.run_async = persona_run_async
+    ModeratorAgent.run_async = moderator_run_async
+
+
+async def run_load(num_requests: int, concurrency: int) -> dict:
+    """Fire num_requests /analyze-asset calls with bounded concurrency."""
+    transport = httpx.ASGITransport(app=main.app)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        async def one_request(i: int):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/analyze-asset", params={"asset": "AAPL", "user_id": f"bench_{i}"})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[one_request(i) for i in range(num_requests)])
+        wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "wall_s": wall,
+        "throughput_rps": num_requests / wall,
+        "p50_s": statistics.median(latencies),
+        "p95_s": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=40, help="Total requests per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent in-flight requests")
+    parser.add_argument("--pool-size", type=int, default=64, help="Blocking executor size for the 'after' run")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    install_stand_ins()
+
+    print("=" * 70)
+    print(f"/analyze-asset load benchmark: {args.requests} requests, concurrency {args.concurrency}")
+    print("=" * 70)
+
+    results = {}
+    for label, pool_size in [("before (inline on event loop)", 0), (f"after (pool of {args.pool_size})", args.pool_size)]:
+        configure_blocking_executor(pool_size)
+        results[label] = asyncio.run(run_load(args.requests, args.concurrency))
+        r = results[label]
+        print(f"{label:<32} {r['throughput_rps']:6.2f} req/s   "
+              f"p50 {r['p50_s']:6.2f}s   p95 {r['p95_s']:6.2f}s   wall {r['wall_s']:6.2f}s")
+
+    before, after = results.values()
+    print(f"\nThroughput speed-up: {after['throughput_rps'] / before['throughput_rps']:.1f}x")
+
+
+if __name__ == "__main__":
+    main_cli()
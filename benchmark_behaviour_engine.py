@@ -0,0 +1,81 @@
+"""
+Benchmark for BehaviorMonitorAgent.analyze_session on large sessions.
+
+Generates synthetic prop-desk sessions (random symbols, outcomes and
+inter-trade gaps) and times the two phases of the vectorized engine:
+building the columnar representation (timestamp parsing, sorting) and
+running all ten detectors over it.
+
+Usage:
+    python benchmark_behaviour_engine.py
+    python benchmark_behaviour_engine.py --sizes 10000 100000 1000000 --repeat 3
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime
+
+import numpy as np
+
+from agents.behaviour_agent import BehaviorMonitorAgent
+from agents.behaviour_engine import TradeColumns, detect_patterns
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "TSLA", "SPY", "QQQ", "BTC-USD", "EURUSD"]
+
+
+def make_session(size: int, seed: int = 7) -> list:
+    """Synthetic session of ``size`` trades, shuffled so sorting is exercised."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2026, 2, 7, 0, 0).timestamp()
+    times = start + np.cumsum(rng.integers(1, 120, size))
+    timestamps = np.array(times.astype("datetime64[s]").astype(str))
+    pnl = np.round(rng.normal(5, 120, size), 2)
+    symbols = rng.choice(SYMBOLS, size)
+    actions = rng.choice(["BUY", "SELL"], size)
+    statuses = rng.choice(["OPEN", "CLOSED"], size)
+
+    trades = [
+        {"timestamp": ts.replace("T", " "), "symbol": str(symbol), "action": str(action),
+         "price": 100.0, "pnl": float(p), "status": str(status)}
+        for ts, symbol, action, p, status in zip(timestamps, symbols, actions, pnl, statuses)
+    ]
+    rng.shuffle(trades)
+    return trades
+
+
+def time_call(func, repeat: int) -> float:
+    """Median wall time in seconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    monitor = BehaviorMonitorAgent()
+    print(f"{'trades':>10} {'columns':>10} {'detectors':>10} {'total':>10} {'trades/s':>12}  patterns")
+    for size in args.sizes:
+        trades = make_session(size)
+        columns = TradeColumns.from_trades(trades)
+
+        build = time_call(lambda: TradeColumns.from_trades(trades), args.repeat)
+        detect = time_call(lambda: detect_patterns(TradeColumns(
+            columns.trades, columns.order, columns.ts, columns.pnl, columns.symbol, columns.buy, columns.open
+        )), args.repeat)
+        total = time_call(lambda: monitor.analyze_session(trades), args.repeat)
+        patterns = [insight["type"] for insight in monitor.analyze_session(trades)]
+
+        print(f"{size:>10,} {build * 1000:>8.1f}ms {detect * 1000:>8.1f}ms {total * 1000:>8.1f}ms "
+              f"{size / total:>12,.0f}  {len(patterns)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -929,6 +929,35 @@ document.body.appendChild(app);
 setTimeout(loadInitialMetrics, 500);
 
 // API Integration Functions
+const COUNCIL_AGENT_ORDER = ['Macro Hawk', 'Micro Forensic', 'Flow Detective', 'Tech Interpreter', 'Skeptic'];
+
+// Read a Server-Sent Events response body, calling onEvent(event, payload) per message
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const message = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let event = 'message';
+            let data = '';
+            message.split('\n').forEach(line => {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            });
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+}
+
 async function runAnalysis() {
     if (isAnalyzing) return;
     
@@ -951,11 +980,14 @@ async function runAnalysis() {
     statusEl.textContent = 'Running 5-agent LLM council...';
     statusEl.style.color = '#ff8888';
     
+    // Drop the previous run's result so a cut-off stream is not shown as complete
+    currentAnalysisData = null;
+    
     try {
-        const response = await fetch(`${API_BASE_URL}/analyze-asset?asset=${encodeURIComponent(asset)}&user_id=${encodeURIComponent(userId)}`, {
+        const response = await fetch(`${API_BASE_URL}/analyze-asset/stream?asset=${encodeURIComponent(asset)}&user_id=${encodeURIComponent(userId)}`, {
             method: 'POST',
             headers: {
-                'Content-Type': 'application/json'
+                'Accept': 'text/event-stream'
             }
         });
         
@@ -969,7 +1001,59 @@ async function runAnalysis() {
             throw new Error(`API Error: ${response.status}`);
         }
         
-        currentAnalysisData = await response.json();
+        // Render each agent's output as soon as the server streams it
+        const councilOpinions = COUNCIL_AGENT_ORDER.map(() => '⏳ Waiting for agent...');
+        const councilDone = new Set();
+        
+        await readEventStream(response, (event, payload) => {
+            switch (event) {
+                case 'start':
+                    updateDashboard({ trade_history: payload.trade_history, persona_selected: payload.persona_selected });
+                    statusEl.textContent = 'Running 5-agent LLM council...';
+                    break;
+                case 'economic_calendar':
+                    updateDashboard({ economic_calendar: payload });
+                    break;
+                case 'behaviour':
+                    updateDashboard({ behavioral_analysis: payload });
+                    break;
+                case 'council_partial': {
+                    const slot = COUNCIL_AGENT_ORDER.findIndex(name => payload.agent_name.includes(name));
+                    if (slot >= 0 && !councilDone.has(slot)) {
+                        councilOpinions[slot] = `${payload.agent_name} (writing...): ${payload.thesis}▍`;
+                        updateDashboard({ market_analysis: { council_opinions: councilOpinions } });
+                    }
+                    break;
+                }
+                case 'council_argument': {
+                    let slot = COUNCIL_AGENT_ORDER.findIndex(name => payload.agent_name.includes(name));
+                    if (slot < 0) slot = councilOpinions.length;
+                    councilDone.add(slot);
+                    councilOpinions[slot] = `${payload.agent_name} (${payload.confidence}): ${payload.thesis}`;
+                    statusEl.textContent = `LLM council: ${councilDone.size}/${COUNCIL_AGENT_ORDER.length} agents reported...`;
+                    updateDashboard({ market_analysis: { council_opinions: councilOpinions } });
+                    break;
+                }
+                case 'council_summary':
+                    updateDashboard({ asset: asset.toUpperCase(), market_analysis: payload });
+                    statusEl.textContent = 'Council complete - writing narrative...';
+                    break;
+                case 'market_metrics':
+                    updateMarketMetrics(payload);
+                    break;
+                case 'complete':
+                    currentAnalysisData = payload;
+                    break;
+                case 'error':
+                    throw new Error(`API Error: ${payload.status_code} - ${JSON.stringify(payload.detail)}`);
+                default:
+                    console.log(`Stream event ${event}:`, payload);
+            }
+        });
+        
+        if (!currentAnalysisData) {
+            throw new Error('Analysis stream ended before completion');
+        }
         
         // Debug: Log the entire response to see structure
         console.log('Full API Response:', currentAnalysisData);
@@ -0,0 +1,126 @@
+"""
+Benchmark: pooled vs per-call aiohttp sessions for council debates.
+
+Starts a local mock chat-completion server and runs council-shaped debates
+(4 OpenRouter + 1 Mistral call in parallel) against it, once with a new
+ClientSession per call (the previous behaviour) and once through the pooled
+LLMClient session. Reports p50/p99 latency per debate and how many TCP
+connections the server saw.
+
+The mock server speaks plain HTTP, so the savings shown here are TCP
+handshakes and connection setup only; against the real HTTPS endpoints
+every avoided connection also skips a TLS handshake.
+
+Usage:
+    python -m llm_council.benchmark_llm_pool
+    python -m llm_council.benchmark_llm_pool --debates 300 --server-delay-ms 30
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+# Add parent directory to path so we can import llm_council
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llm_council.services.llm_client import LLMClient
+
+COMPLETION = '{"thesis": "Benchmark thesis", "supporting_points": ["a", "b", "c"], "confidence": "high"}'
+
+
+class MockCompletionServer:
+    """Local OpenAI-compatible /chat/completions endpoint with fixed latency."""
+
+    def __init__(self, delay_s: float):
+        self.delay_s = delay_s
+        self.connections = set()
+        self.runner = None
+        self.base_url = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.connections.add(request.transport.get_extra_info("peername"))
+        await request.json()
+        await asyncio.sleep(self.delay_s)
+        return web.json_response({"choices": [{"message": {"content": COMPLETION}}]})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/v1"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+def build_council(base_url: str) -> list:
+    """Council-shaped set of clients pointed at the mock server."""
+    clients = [
+        LLMClient(provider_type="openrouter", api_key="bench", model="mistralai/mistral-7b-instruct"),
+        LLMClient(provider_type="openrouter", api_key="bench", model="gryphe/mythomax-l2-13b"),
+        LLMClient(provider_type="openrouter", api_key="bench", model="mistralai/mistral-7b-instruct"),
+        LLMClient(provider_type="openrouter", api_key="bench", model="gryphe/mythomax-l2-13b"),
+        LLMClient(provider_type="mistral", api_key="bench"),
+    ]
+    for client in clients:
+        client.provider.base_url = base_url
+    return clients
+
+
+async def run_debates(clients: list, debates: int, pooled: bool) -> list:
+    """Run debates one after another and return per-debate latencies."""
+    latencies = []
+    for _ in range(debates):
+        started = time.perf_counter()
+        if pooled:
+            results = await asyncio.gather(*[c.complete_async("prompt", "system") for c in clients])
+        else:
+            results = await asyncio.gather(*[c.provider.complete_async("prompt", "system") for c in clients])
+        latencies.append(time.perf_counter() - started)
+        assert all(r == COMPLETION for r in results), results
+    return latencies
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def main(debates: int, delay_ms: float):
+    print("=" * 70)
+    print(f"LLM connection pool benchmark: {debates} debates x 5 calls, server delay {delay_ms}ms")
+    print("=" * 70)
+
+    for label, pooled in [("per-call sessions (before)", False), ("pooled session (after)", True)]:
+        server = MockCompletionServer(delay_ms / 1000)
+        await server.start()
+        clients = build_council(server.base_url)
+
+        await run_debates(clients, 5, pooled)  # warm-up
+        server.connections.clear()
+        latencies = await run_debates(clients, debates, pooled)
+
+        print(f"{label:<28} p50 {percentile(latencies, 50) * 1000:7.2f}ms   "
+              f"p99 {percentile(latencies, 99) * 1000:7.2f}ms   "
+              f"mean {statistics.mean(latencies) * 1000:7.2f}ms   "
+              f"connections {len(server.connections)}")
+
+        await LLMClient.close_sessions()
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--debates", type=int, default=200, help="Number of debates per mode")
+    parser.add_argument("--server-delay-ms", type=float, default=20.0, help="Mock completion latency")
+    args = parser.parse_args()
+    asyncio.run(main(args.debates, args.server_delay_ms))
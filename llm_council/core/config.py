@@ -31,12 +31,42 @@ class Settings:
     # LLM Settings
     MAX_TOKENS: int = int(os.getenv("MAX_TOKENS", "2048"))
     TEMPERATURE: float = float(os.getenv("TEMPERATURE", "0.7"))
+    LLM_STREAMING: bool = os.getenv("LLM_STREAMING", "true").lower() == "true"  # Stream council responses
+
+    # Pooled HTTP connections for async LLM calls
+    HTTP_POOL_LIMIT: int = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+    HTTP_DNS_CACHE_TTL: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60"))
+
+    # Per-provider rate limits as JSON, merged over the defaults in rate_limiter.py
+    LLM_RATE_LIMITS: str = os.getenv("LLM_RATE_LIMITS", "")
 
     # Debate Arena Settings
     NUM_AGENTS: int = 5  # Macro Hawk, Forensic, Flow Detective, Tech Interpreter, Skeptic
     DEBATE_MAX_ROUNDS: int = 3
     DEBATE_CONSENSUS_THRESHOLD: float = 0.65
     
+    # Debate latency budget (0 disables). Agents still running at the deadline
+    # get a fallback argument; after DEBATE_HEDGE_DELAY (roughly the p95 agent
+    # latency) a duplicate request goes to an alternate provider.
+    DEBATE_LATENCY_BUDGET: float = float(os.getenv("DEBATE_LATENCY_BUDGET", "45"))
+    DEBATE_HEDGE_DELAY: float = float(os.getenv("DEBATE_HEDGE_DELAY", "15"))
+    
+    # Debate result cache (TTL 0 disables caching)
+    DEBATE_CACHE_TTL: float = float(os.getenv("DEBATE_CACHE_TTL", "60"))
+    DEBATE_CACHE_STALE_TTL: float = float(os.getenv("DEBATE_CACHE_STALE_TTL", "240"))
+    DEBATE_CACHE_MAX_ENTRIES: int = int(os.getenv("DEBATE_CACHE_MAX_ENTRIES", "256"))
+    DEBATE_CACHE_MOVE_BUCKET: float = float(os.getenv("DEBATE_CACHE_MOVE_BUCKET", "0.25"))  # % move
+    DEBATE_CACHE_PRICE_SIG_FIGS: int = int(os.getenv("DEBATE_CACHE_PRICE_SIG_FIGS", "3"))
+    
+    # Narrator summary cache, keyed by a hash of the summary prompts (TTL 0 disables)
+    NARRATOR_CACHE_TTL: float = float(os.getenv("NARRATOR_CACHE_TTL", "900"))
+    NARRATOR_CACHE_MAX_ENTRIES: int = int(os.getenv("NARRATOR_CACHE_MAX_ENTRIES", "512"))
+    
+    # Deadline (seconds) for LLM review of posts the local moderation rules find ambiguous
+    MODERATION_LLM_TIMEOUT: float = float(os.getenv("MODERATION_LLM_TIMEOUT", "8"))
+    
     # Market Data Configuration (optional - uses yfinance by default)
     MARKET_DATA_PROVIDER: str = os.getenv("MARKET_DATA_PROVIDER", "yfinance")
 
@@ -44,6 +74,14 @@ class Settings:
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")  # "json" or "text"
 
+    def reload_api_keys(self) -> None:
+        """Re-read LLM API keys from the environment and .env file in place."""
+        load_dotenv(override=True)
+        self.OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+        self.GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+        self.MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
+        self.GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -52,6 +52,7 @@ class AgentArgument(BaseModel):
     supporting_points: list[str] = Field(..., description="Evidence points")
     confidence: ConfidenceLevel = Field(..., description="Confidence in argument")
     references: list[DocumentReference] = Field(default=[], description="Sources")
+    is_fallback: bool = Field(default=False, description="Canned argument used when the LLM failed or timed out")
 
 
 class ConsensusPoint(BaseModel):
@@ -79,6 +80,8 @@ class DebateResult(BaseModel):
     disagreement_points: list[DisagreementPoint]
     judge_summary: str = Field(..., description="Synthesized view")
     market_context: dict = Field(default={}, description="Market data context")
+    hedged_agents: list[str] = Field(default=[], description="Agents that got a hedged request to an alternate provider")
+    timed_out_agents: list[str] = Field(default=[], description="Agents that missed the latency budget (fallback used)")
 
 
 class DebateRequest(BaseModel):
@@ -0,0 +1,71 @@
+"""
+Debate result cache.
+Keys council debates by symbol, price/move bucket and economic calendar digest.
+"""
+
+import hashlib
+import math
+from typing import Dict, Tuple
+
+from services.result_cache import AsyncResultCache
+
+from ..core.config import settings
+
+
+def _price_bucket(price: float, sig_figs: int) -> float:
+    """Round a price to ``sig_figs`` significant figures."""
+    if not price or price <= 0:
+        return 0.0
+    digits = sig_figs - int(math.floor(math.log10(price))) - 1
+    return round(price, digits)
+
+
+def debate_cache_key(symbol: str, price_data: Dict, economic_context: str = "") -> Tuple:
+    """
+    Build the cache key for a debate.
+
+    Debates for the same symbol whose price and daily move fall in the same
+    buckets, with an identical economic context, share one cached result.
+    """
+    move_bucket = settings.DEBATE_CACHE_MOVE_BUCKET
+    change_pct = float(price_data.get("change_percent", 0.0) or 0.0)
+    price = float(price_data.get("price", 0.0) or 0.0)
+    context_digest = hashlib.sha1((economic_context or "").encode("utf-8")).hexdigest()[:16]
+
+    return (
+        symbol.strip().upper(),
+        round(change_pct / move_bucket) if move_bucket > 0 else round(change_pct, 2),
+        _price_bucket(price, settings.DEBATE_CACHE_PRICE_SIG_FIGS),
+        context_digest,
+    )
+
+
+def _is_complete_debate(result: Dict) -> bool:
+    """
+    Only cache debates where every agent produced a real argument.
+
+    Debates with timed-out agents or fallback arguments are served once but
+    not cached, so the next request tries the LLMs again.
+    """
+    arguments = result.get("agent_arguments")
+    if not arguments or result.get("timed_out_agents"):
+        return False
+    return not any(getattr(argument, "is_fallback", False) for argument in arguments)
+
+
+# Singleton instance
+_debate_cache = None
+
+
+def get_debate_cache() -> AsyncResultCache:
+    """Get singleton instance of the debate result cache."""
+    global _debate_cache
+    if _debate_cache is None:
+        _debate_cache = AsyncResultCache(
+            name="debate",
+            ttl=settings.DEBATE_CACHE_TTL,
+            stale_ttl=settings.DEBATE_CACHE_STALE_TTL,
+            max_entries=settings.DEBATE_CACHE_MAX_ENTRIES,
+            should_cache=_is_complete_debate,
+        )
+    return _debate_cache
@@ -3,15 +3,23 @@ Multi-agent debate service using 5 specialized LLM agents.
 Each agent provides real-time analysis from different perspectives.
 """
 
+import hashlib
 import logging
-from typing import List, Dict, Optional
+import threading
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
 import asyncio
 import json
 import re
 
+from services.executor import run_blocking, StageTimeoutError
+from services.market_data import get_market_data_service
+
 from .llm_client import LLMClient
+from .json_stream import IncrementalJSONObject
+from .rate_limiter import backoff_delay
 from .agent_prompts import get_enhanced_system_prompt
+from .debate_cache import debate_cache_key, get_debate_cache
 from ..core.config import settings
 from ..models.schemas import (
     AgentArgument,
@@ -86,23 +94,68 @@ class DebateEngine:
         if not self.llm_providers:
             raise ValueError("No valid LLM providers initialized. Check API keys.")
         
+        # Alternate client per agent for hedged requests
+        self.hedge_providers = {
+            name: self._pick_alternate(client) for name, client in self.llm_providers.items()
+        }
+        
         logger.info(f"✓ Initialized {len(self.llm_providers)} agents")
+    
+    def _pick_alternate(self, client: LLMClient) -> Optional[LLMClient]:
+        """Pick a hedge client for an agent, preferring a different provider, then a different model."""
+        primary = (type(client.provider), client.provider.model)
+        candidates = []
+        for other in self.llm_providers.values():
+            key = (type(other.provider), other.provider.model)
+            if key != primary and all(key != (type(c.provider), c.provider.model) for c in candidates):
+                candidates.append(other)
+        candidates.sort(key=lambda c: type(c.provider) is type(client.provider))
+        return candidates[0] if candidates else None
+    
+    def get_stats(self) -> Dict:
+        """Get per-agent LLM usage statistics accumulated since startup."""
+        agents = {
+            name: {
+                "provider": type(client.provider).__name__,
+                "model": client.provider.model,
+                **client.get_stats()
+            }
+            for name, client in self.llm_providers.items()
+        }
+        return {
+            "agents": agents,
+            "total_calls": sum(a["call_count"] for a in agents.values()),
+            "total_estimated_tokens": sum(a["estimated_tokens"] for a in agents.values()),
+        }
 
     
-    async def debate_move_async(self, symbol: str, economic_context: str = "") -> Dict:
+    async def debate_move_async(
+        self,
+        symbol: str,
+        economic_context: str = "",
+        price_data: Optional[Dict] = None,
+        on_argument: Optional[Callable[[AgentArgument], None]] = None,
+        on_partial: Optional[Callable[[str, str], None]] = None
+    ) -> Dict:
         """
         Run 5-agent debate on a market move using REAL LLM calls.
         
         Args:
             symbol: Stock symbol (e.g., "AAPL", "MSFT")
             economic_context: Optional economic calendar/news context
+            price_data: Optional pre-fetched market data from _get_market_data
+            on_argument: Optional callback invoked with each AgentArgument as
+                soon as that agent's LLM call resolves (used for streaming)
+            on_partial: Optional callback ``(agent_name, thesis_so_far)`` invoked
+                as an agent's thesis is generated (requires LLM_STREAMING)
         
         Returns:
             Dict with debate results including agent arguments, consensus, disagreements
         """
         
         # Get market data
-        price_data = self._get_market_data(symbol)
+        if price_data is None:
+            price_data = await self.get_market_data_async(symbol)
         
         move_pct = price_data.get("change_percent", 0.8)
         move_direction = "UP" if move_pct > 0 else "DOWN"
@@ -155,20 +208,43 @@ Consider the economic calendar events when evaluating market drivers.
             }
         ]
         
+        # Debate latency budget: agents still running at the deadline get a fallback
+        hedged_agents = []
+        timed_out_agents = []
+        budget = settings.DEBATE_LATENCY_BUDGET
+        
+        async def run_agent(agent: Dict) -> AgentArgument:
+            argument = await self._get_hedged_argument_async(
+                hedged_agents=hedged_agents,
+                symbol=symbol,
+                agent_name=agent["name"],
+                market_context=market_context,
+                move_pct=move_pct,
+                move_direction=move_direction,
+                temperature=agent["temperature"],
+                on_partial=on_partial
+            )
+            if on_argument:
+                on_argument(argument)
+            return argument
+        
+        async def run_agent_within_budget(agent: Dict) -> AgentArgument:
+            try:
+                if budget > 0:
+                    return await asyncio.wait_for(run_agent(agent), timeout=budget)
+                return await run_agent(agent)
+            except asyncio.TimeoutError:
+                logger.warning(f"{agent['name']} missed the {budget:.0f}s debate budget, using fallback")
+                timed_out_agents.append(agent["name"])
+                argument = self._generate_fallback_argument(agent["name"], symbol, move_direction, move_pct)
+                if on_argument:
+                    on_argument(argument)
+                return argument
+        
         # Run all 5 agents in parallel using asyncio.gather
         logger.info(f"Starting parallel analysis for {len(agents)} agents...")
         try:
-            agent_arguments = await asyncio.gather(*[
-                self._get_agent_argument_async(
-                    symbol=symbol,
-                    agent_name=agent["name"],
-                    market_context=market_context,
-                    move_pct=move_pct,
-                    move_direction=move_direction,
-                    temperature=agent["temperature"]
-                )
-                for agent in agents
-            ])
+            agent_arguments = await asyncio.gather(*[run_agent_within_budget(agent) for agent in agents])
             
             for agent, arg in zip(agents, agent_arguments):
                 logger.info(f"✓ {agent['name']} analysis complete")
@@ -201,9 +277,59 @@ Consider the economic calendar events when evaluating market drivers.
                 "move_pct": move_pct,
                 "move_direction": move_direction,
                 "volume": volume,
-            }
+            },
+            "hedged_agents": [a["name"] for a in agents if a["name"] in hedged_agents],
+            "timed_out_agents": [a["name"] for a in agents if a["name"] in timed_out_agents],
         }
     
+    async def _get_hedged_argument_async(
+        self,
+        agent_name: str,
+        hedged_agents: List[str],
+        on_partial: Optional[Callable[[str, str], None]] = None,
+        **kwargs
+    ) -> AgentArgument:
+        """
+        Get an agent argument, hedging slow calls.
+        
+        If the agent's own provider has not answered within DEBATE_HEDGE_DELAY,
+        the same prompt is also sent to an alternate provider and the first
+        valid argument wins; the other request is cancelled. Falls back to
+        ``_generate_fallback_argument`` only if every request fails.
+        """
+        tasks = {asyncio.ensure_future(self._get_agent_argument_async(
+            agent_name=agent_name, on_partial=on_partial, use_fallback=False, **kwargs
+        ))}
+        alternate = self.hedge_providers.get(agent_name)
+        hedge_delay = settings.DEBATE_HEDGE_DELAY
+        
+        try:
+            if alternate is not None and hedge_delay > 0:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    logger.warning(
+                        f"{agent_name} slower than {hedge_delay:.0f}s, hedging with "
+                        f"{type(alternate.provider).__name__} ({alternate.provider.model})"
+                    )
+                    hedged_agents.append(agent_name)
+                    tasks.add(asyncio.ensure_future(self._get_agent_argument_async(
+                        agent_name=agent_name, llm=alternate, use_fallback=False, **kwargs
+                    )))
+            
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        logger.error(f"All requests failed for {agent_name}, using fallback")
+        return self._generate_fallback_argument(
+            agent_name, kwargs["symbol"], kwargs["move_direction"], kwargs["move_pct"]
+        )
+    
     async def _get_agent_argument_async(
         self,
         symbol: str,
@@ -212,14 +338,23 @@ Consider the economic calendar events when evaluating market drivers.
         move_pct: float,
         move_direction: str,
         temperature: float = 0.7,
-        max_retries: int = 2
+        max_retries: int = 2,
+        on_partial: Optional[Callable[[str, str], None]] = None,
+        llm: Optional[LLMClient] = None,
+        use_fallback: bool = True
     ) -> AgentArgument:
-        """Get agent argument from respective LLM provider (async version)."""
+        """
+        Get agent argument from respective LLM provider (async version).
+        
+        ``llm`` overrides the agent's own provider (used for hedging). With
+        ``use_fallback=False`` the last error is raised instead of returning
+        a fallback argument.
+        """
         
         logger.info(f"Getting {agent_name} analysis...")
         
         # Get the right LLM for this agent
-        llm = self.llm_providers.get(agent_name)
+        llm = llm or self.llm_providers.get(agent_name)
         if not llm:
             raise ValueError(f"LLM provider not found for {agent_name}")
         
@@ -241,12 +376,17 @@ Respond in JSON format ONLY (no markdown):
         # Try up to max_retries times
         for attempt in range(max_retries):
             try:
-                # Use async version for LLM call
-                response = await llm.complete_async(
-                    prompt=prompt,
-                    system=system_prompt,
-                    temperature=temperature
-                )
+                if settings.LLM_STREAMING:
+                    response = await self._stream_agent_response(
+                        llm, agent_name, prompt, system_prompt, temperature, on_partial
+                    )
+                else:
+                    # Use async version for LLM call
+                    response = await llm.complete_async(
+                        prompt=prompt,
+                        system=system_prompt,
+                        temperature=temperature
+                    )
                 logger.info(f"{agent_name} response length: {len(response)}")
                 
                 # Parse JSON response with aggressive cleaning
@@ -282,15 +422,52 @@ Respond in JSON format ONLY (no markdown):
             except Exception as e:
                 logger.warning(f"{agent_name} attempt {attempt + 1} failed: {e}")
                 if attempt == max_retries - 1:
+                    if not use_fallback:
+                        raise
                     # Last attempt failed - use fallback
                     logger.error(f"All retries failed for {agent_name}, using fallback")
                     return self._generate_fallback_argument(agent_name, symbol, move_direction, move_pct)
-                # Wait a bit before retry
-                await asyncio.sleep(0.5)
+                # Jittered backoff before retry (429s are already paced by the rate limiter)
+                await asyncio.sleep(backoff_delay(attempt))
         
-        # Should never reach here, but just in case
+        # Reached only if every response lacked the required fields
+        if not use_fallback:
+            raise ValueError(f"{agent_name} returned no valid argument")
         return self._generate_fallback_argument(agent_name, symbol, move_direction, move_pct)
     
+    async def _stream_agent_response(
+        self,
+        llm: LLMClient,
+        agent_name: str,
+        prompt: str,
+        system_prompt: str,
+        temperature: float,
+        on_partial: Optional[Callable[[str, str], None]] = None
+    ) -> str:
+        """
+        Stream an agent's response, parsing the JSON incrementally.
+        
+        The stream is closed as soon as the JSON object is complete, so the
+        provider stops generating any trailing commentary.
+        """
+        parser = IncrementalJSONObject()
+        last_thesis = None
+        
+        stream = llm.stream_async(prompt=prompt, system=system_prompt, temperature=temperature)
+        try:
+            async for chunk in stream:
+                if parser.feed(chunk):
+                    break
+                if on_partial:
+                    thesis = parser.partial_string("thesis")
+                    if thesis and thesis != last_thesis:
+                        last_thesis = thesis
+                        on_partial(agent_name, thesis)
+        finally:
+            await stream.aclose()
+        
+        return parser.document
+    
     def _clean_json_response(self, response: str) -> str:
         """Aggressively clean LLM response to extract valid JSON."""
         text = response.strip()
@@ -349,7 +526,8 @@ Respond in JSON format ONLY (no markdown):
                 "Technical levels being tested"
             ],
             confidence=ConfidenceLevel.MODERATE,
-            references=[]
+            references=[],
+            is_fallback=True
         )
     
     def _build_consensus(self, agent_arguments: List[AgentArgument], symbol: str) -> List[ConsensusPoint]:
@@ -442,13 +620,18 @@ Respond in JSON format ONLY (no markdown):
         
         return summary
     
+    async def get_market_data_async(self, symbol: str) -> Dict:
+        """Get market data without blocking the event loop."""
+        try:
+            return await run_blocking(self._get_market_data, symbol, timeout=30)
+        except StageTimeoutError as e:
+            logger.warning(f"Market data fetch for {symbol} timed out: {e}")
+            return {"symbol": symbol}
+    
     def _get_market_data(self, symbol: str) -> Dict:
-        """Get market data using yfinance."""
+        """Get market data from the shared market data cache."""
         try:
-            import yfinance as yf
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            hist = ticker.history(period="2d")
+            hist = get_market_data_service().get_history(symbol, "2d")
             
             if not hist.empty and len(hist) >= 2:
                 current_price = hist['Close'].iloc[-1]
@@ -474,21 +657,130 @@ Respond in JSON format ONLY (no markdown):
         }
 
 
+# ============================================================================
+# Engine registry - one long-lived DebateEngine per process
+# ============================================================================
+
+_engine: Optional[DebateEngine] = None
+_engine_fingerprint: Optional[str] = None
+_engine_lock = threading.Lock()
+
+
+def _api_key_fingerprint() -> str:
+    """Digest of the configured API keys (the keys themselves are not stored)."""
+    keys = "|".join(
+        key or "" for key in (
+            settings.OPENROUTER_API_KEY,
+            settings.MISTRAL_API_KEY,
+            settings.GEMINI_API_KEY,
+            settings.GROQ_API_KEY,
+        )
+    )
+    return hashlib.sha256(keys.encode("utf-8")).hexdigest()
+
+
+def _build_engine(previous: Optional[DebateEngine]) -> DebateEngine:
+    """Build a new engine, carrying usage counters over from the previous one."""
+    engine = DebateEngine()
+    if previous is not None:
+        for name, client in engine.llm_providers.items():
+            old_client = previous.llm_providers.get(name)
+            if old_client is not None:
+                client.call_count = old_client.call_count
+                client.token_estimate = old_client.token_estimate
+    return engine
+
+
+def get_debate_engine() -> DebateEngine:
+    """
+    Get the shared DebateEngine, building it on first use.
+    
+    Raises:
+        ValueError: If no LLM API keys are configured
+    """
+    global _engine, _engine_fingerprint
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _build_engine(None)
+                _engine_fingerprint = _api_key_fingerprint()
+    return _engine
+
+
+def init_debate_engine() -> Optional[DebateEngine]:
+    """Initialise the shared engine at app startup (logs instead of raising)."""
+    try:
+        return get_debate_engine()
+    except ValueError as e:
+        logger.error(f"LLM council not initialised at startup: {e}")
+        return None
+
+
+def reload_debate_engine(force: bool = False) -> bool:
+    """
+    Re-read API keys and rebuild the shared engine if they changed.
+    
+    Args:
+        force: Rebuild even if the keys are unchanged
+    
+    Returns:
+        True if a new engine was built
+    
+    Raises:
+        ValueError: If the new configuration has no usable LLM API keys
+            (the previous engine is kept in that case)
+    """
+    global _engine, _engine_fingerprint
+    with _engine_lock:
+        settings.reload_api_keys()
+        fingerprint = _api_key_fingerprint()
+        if not force and _engine is not None and fingerprint == _engine_fingerprint:
+            logger.info("LLM API keys unchanged, keeping current debate engine")
+            return False
+        
+        _engine = _build_engine(_engine)
+        _engine_fingerprint = fingerprint
+        logger.info("✓ Debate engine reloaded with updated API keys")
+        return True
+
+
 # Convenience function for easy access
-async def get_council_analysis(symbol: str, economic_context: str = "") -> Dict:
+async def get_council_analysis(
+    symbol: str,
+    economic_context: str = "",
+    on_argument: Optional[Callable[[AgentArgument], None]] = None,
+    on_partial: Optional[Callable[[str, str], None]] = None
+) -> Dict:
     """
     Get 5-agent council analysis for a symbol.
     
+    Results are cached by symbol, price/move bucket and economic context
+    digest; concurrent requests for the same key share one debate.
+    
     Args:
         symbol: Stock ticker symbol
         economic_context: Optional economic calendar/news context
+        on_argument: Optional per-argument callback (see debate_move_async).
+            Not called for cached results or for requests that join a debate
+            already in flight; those arguments arrive with the final result.
+        on_partial: Optional partial-thesis callback (same caveats)
     
     Usage:
         result = await get_council_analysis("AAPL", economic_context="Earnings tomorrow")
     """
     try:
-        engine = DebateEngine()
-        return await engine.debate_move_async(symbol, economic_context)
+        engine = get_debate_engine()
+        price_data = await engine.get_market_data_async(symbol)
+        key = debate_cache_key(symbol, price_data, economic_context)
+        return await get_debate_cache().get_or_compute(
+            key,
+            lambda: engine.debate_move_async(
+                symbol, economic_context, price_data=price_data,
+                on_argument=on_argument, on_partial=on_partial
+            ),
+            # A stale hit is answered at once; its refresh must not call back into that request
+            refresh=lambda: engine.debate_move_async(symbol, economic_context, price_data=price_data)
+        )
     except ValueError as e:
         # Handle missing API keys gracefully
         error_msg = str(e)
@@ -508,5 +800,7 @@ async def get_council_analysis(symbol: str, economic_context: str = "") -> Dict:
                 "move_pct": 0,
                 "move_direction": "UNKNOWN",
                 "volume": 0
-            }
+            },
+            "hedged_agents": [],
+            "timed_out_agents": []
         }
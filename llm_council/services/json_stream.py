@@ -0,0 +1,92 @@
+"""
+Incremental JSON parsing for streamed LLM responses.
+Detects when the first top-level JSON object is complete so a stream can be
+aborted early, and exposes partially generated string fields.
+"""
+
+import json
+import re
+from typing import Optional
+
+
+class IncrementalJSONObject:
+    """
+    Tracks the first top-level JSON object in text that arrives in chunks.
+
+    Text before the opening brace (markdown fences, preambles) is ignored and
+    anything after the closing brace is never waited for.
+
+    Usage:
+        parser = IncrementalJSONObject()
+        async for chunk in stream:
+            if parser.feed(chunk):
+                break
+        data = json.loads(parser.document)
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def complete(self) -> bool:
+        """True once the top-level object's closing brace has been received."""
+        return self._end is not None
+
+    @property
+    def document(self) -> str:
+        """The complete JSON object, or all text received so far."""
+        if self.complete:
+            return self.text[self._start:self._end]
+        return self.text
+
+    def feed(self, chunk: str) -> bool:
+        """Add a chunk of text. Returns True once the object is complete."""
+        offset = len(self.text)
+        self.text += chunk
+        if self.complete:
+            return True
+
+        for i, char in enumerate(chunk, start=offset):
+            if self._start is None:
+                if char == "{":
+                    self._start = i
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end = i + 1
+                    return True
+
+        return False
+
+    def partial_string(self, field: str) -> Optional[str]:
+        """
+        Value of a top-level string ``field`` as generated so far, or None if
+        the field has not started yet.
+        """
+        match = re.search(rf'"{re.escape(field)}"\s*:\s*"((?:[^"\\]|\\.)*)(\\?)', self.text)
+        if not match:
+            return None
+        try:
+            return json.loads(f'"{match.group(1)}"')
+        except json.JSONDecodeError:
+            # Cut inside an escape sequence such as \u00
+            return match.group(1)
@@ -4,14 +4,74 @@ Supports multiple LLM providers: OpenRouter, Gemini, Mistral
 """
 import json
 import logging
-from typing import Optional
+import threading
+import weakref
+from contextlib import aclosing
+from typing import AsyncIterator, Optional
 from abc import ABC, abstractmethod
 import requests
 import asyncio
 import aiohttp
 
+from services.executor import run_blocking
+from .rate_limiter import RateLimitedError, estimate_tokens, get_rate_limiter, parse_retry_after
+from ..core.config import settings
+
 logger = logging.getLogger(__name__)
 
+# Expected completion size reserved against tokens-per-minute budgets
+# (settled against the actual size once the call returns)
+COMPLETION_TOKEN_ESTIMATE = 512
+
+# Retries after a 429, each waiting for Retry-After or a jittered backoff
+RATE_LIMIT_RETRIES = 2
+
+
+class LLMStreamError(Exception):
+    """Raised when a streaming completion fails (HTTP error or provider error)."""
+    pass
+
+
+async def _iter_chat_stream(session: aiohttp.ClientSession, url: str, headers: dict, payload: dict,
+                            provider_name: str) -> AsyncIterator[str]:
+    """
+    POST an OpenAI-compatible chat completion with ``stream=True`` and yield
+    content deltas from the server-sent events.
+
+    Closing the generator early (``aclose()`` or breaking out of ``async for``)
+    drops the connection, which stops generation on the provider side.
+    """
+    async with session.post(
+        url,
+        headers=headers,
+        json={**payload, "stream": True},
+        timeout=aiohttp.ClientTimeout(total=60)
+    ) as response:
+        if response.status == 429:
+            raise RateLimitedError(
+                f"{provider_name} rate limited",
+                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+            )
+        if response.status != 200:
+            logger.error(f"{provider_name} stream error: {response.status}")
+            raise LLMStreamError(f"{provider_name} error: {response.status}")
+        
+        async for raw_line in response.content:
+            line = raw_line.decode("utf-8").strip()
+            if not line.startswith("data:"):
+                continue  # Blank separators and ": keep-alive" comments
+            data = line[5:].strip()
+            if data == "[DONE]":
+                return
+            
+            event = json.loads(data)
+            if "error" in event:
+                raise LLMStreamError(f"{provider_name} error: {event['error']}")
+            choices = event.get("choices") or [{}]
+            delta = choices[0].get("delta", {}).get("content")
+            if delta:
+                yield delta
+
 
 class LLMProvider(ABC):
     """Abstract base for LLM providers."""
@@ -58,15 +118,28 @@ class OpenRouterProvider(LLMProvider):
             if response.status_code == 200:
                 result = response.json()
                 return result["choices"][0]["message"]["content"]
+            elif response.status_code == 429:
+                raise RateLimitedError(
+                    f"OpenRouter rate limited",
+                    retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                )
             else:
                 logger.error(f"OpenRouter error: {response.status_code}")
                 return f"Error: {response.status_code}"
+        except RateLimitedError:
+            raise
         except Exception as e:
             logger.error(f"OpenRouter error: {e}")
             return f"Error: {str(e)}"
     
-    async def complete_async(self, prompt: str, system: str = "", temperature: float = 0.7) -> str:
-        """Async version for parallel execution."""
+    async def complete_async(
+        self,
+        prompt: str,
+        system: str = "",
+        temperature: float = 0.7,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> str:
+        """Async version for parallel execution. Reuses ``session`` if given."""
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
@@ -80,27 +153,79 @@ class OpenRouterProvider(LLMProvider):
                 messages.append({"role": "system", "content": system})
             messages.append({"role": "user", "content": prompt})
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json={
-                        "model": self.model,
-                        "messages": messages,
-                        "temperature": temperature,
-                        "max_tokens": 2000
-                    },
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result["choices"][0]["message"]["content"]
-                    else:
-                        logger.error(f"OpenRouter error: {response.status}")
-                        return f"Error: {response.status}"
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": 2000
+            }
+            
+            if session is None:
+                async with aiohttp.ClientSession() as own_session:
+                    return await self._post_async(own_session, headers, payload)
+            return await self._post_async(session, headers, payload)
+        except RateLimitedError:
+            raise
         except Exception as e:
             logger.error(f"OpenRouter async error: {e}")
             return f"Error: {str(e)}"
+    
+    async def _post_async(self, session: aiohttp.ClientSession, headers: dict, payload: dict) -> str:
+        async with session.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=60)
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                return result["choices"][0]["message"]["content"]
+            elif response.status == 429:
+                raise RateLimitedError(
+                    f"OpenRouter rate limited",
+                    retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                )
+            else:
+                logger.error(f"OpenRouter error: {response.status}")
+                return f"Error: {response.status}"
+    
+    async def stream_async(
+        self,
+        prompt: str,
+        system: str = "",
+        temperature: float = 0.7,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> AsyncIterator[str]:
+        """Stream completion text deltas. Raises LLMStreamError on failure."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": "https://llm-council.local",
+            "X-Title": "LLM Council",
+            "Content-Type": "application/json"
+        }
+        
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": 2000
+        }
+        
+        url = f"{self.base_url}/chat/completions"
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                async with aclosing(_iter_chat_stream(own_session, url, headers, payload, "OpenRouter")) as stream:
+                    async for delta in stream:
+                        yield delta
+        else:
+            async with aclosing(_iter_chat_stream(session, url, headers, payload, "OpenRouter")) as stream:
+                async for delta in stream:
+                    yield delta
 
 
 class GeminiProvider(LLMProvider):
@@ -132,8 +257,72 @@ class GeminiProvider(LLMProvider):
             )
             return response.text
         except Exception as e:
+            if type(e).__name__ == "ResourceExhausted":  # google.api_core 429
+                raise RateLimitedError(f"Gemini rate limited: {e}")
             logger.error(f"Gemini error: {e}")
             return f"Error: {str(e)}"
+    
+    async def stream_async(self, prompt: str, system: str = "", temperature: float = 0.7) -> AsyncIterator[str]:
+        """
+        Stream completion text deltas.
+
+        The Gemini SDK only offers a blocking chunk iterator, so it is drained
+        on the shared executor and bridged to the event loop through a queue.
+        Closing the generator early tells the worker to stop after its
+        current chunk.
+        """
+        if not self.client:
+            raise LLMStreamError("Gemini client not initialized")
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+        full_prompt = f"{system}\n\n{prompt}" if system else prompt
+        
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                stop.set()  # Event loop already closed
+        
+        def produce():
+            try:
+                chunks = self.client.generate_content(
+                    full_prompt,
+                    generation_config={
+                        "temperature": temperature,
+                        "max_output_tokens": 2000
+                    },
+                    stream=True
+                )
+                for chunk in chunks:
+                    if stop.is_set():
+                        break
+                    if chunk.text:
+                        put(chunk.text)
+            except Exception as e:
+                if type(e).__name__ == "ResourceExhausted":  # google.api_core 429
+                    put(RateLimitedError(f"Gemini rate limited: {e}"))
+                    return
+                logger.error(f"Gemini stream error: {e}")
+                put(LLMStreamError(f"Gemini error: {e}"))
+            finally:
+                put(done)
+        
+        worker = asyncio.ensure_future(run_blocking(produce))
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            if not worker.done():
+                worker.add_done_callback(lambda f: f.cancelled() or f.exception())
 
 
 class MistralProvider(LLMProvider):
@@ -171,15 +360,28 @@ class MistralProvider(LLMProvider):
             if response.status_code == 200:
                 result = response.json()
                 return result["choices"][0]["message"]["content"]
+            elif response.status_code == 429:
+                raise RateLimitedError(
+                    f"Mistral rate limited",
+                    retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                )
             else:
                 logger.error(f"Mistral error: {response.status_code}")
                 return f"Error: {response.status_code}"
+        except RateLimitedError:
+            raise
         except Exception as e:
             logger.error(f"Mistral error: {e}")
             return f"Error: {str(e)}"
     
-    async def complete_async(self, prompt: str, system: str = "", temperature: float = 0.7) -> str:
-        """Async version for parallel execution."""
+    async def complete_async(
+        self,
+        prompt: str,
+        system: str = "",
+        temperature: float = 0.7,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> str:
+        """Async version for parallel execution. Reuses ``session`` if given."""
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
@@ -191,31 +393,120 @@ class MistralProvider(LLMProvider):
                 messages.append({"role": "system", "content": system})
             messages.append({"role": "user", "content": prompt})
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json={
-                        "model": self.model,
-                        "messages": messages,
-                        "temperature": temperature,
-                        "max_tokens": 2000
-                    },
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result["choices"][0]["message"]["content"]
-                    else:
-                        logger.error(f"Mistral error: {response.status}")
-                        return f"Error: {response.status}"
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": 2000
+            }
+            
+            if session is None:
+                async with aiohttp.ClientSession() as own_session:
+                    return await self._post_async(own_session, headers, payload)
+            return await self._post_async(session, headers, payload)
+        except RateLimitedError:
+            raise
         except Exception as e:
             logger.error(f"Mistral async error: {e}")
             return f"Error: {str(e)}"
+    
+    async def _post_async(self, session: aiohttp.ClientSession, headers: dict, payload: dict) -> str:
+        async with session.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=60)
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                return result["choices"][0]["message"]["content"]
+            elif response.status == 429:
+                raise RateLimitedError(
+                    f"Mistral rate limited",
+                    retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                )
+            else:
+                logger.error(f"Mistral error: {response.status}")
+                return f"Error: {response.status}"
+    
+    async def stream_async(
+        self,
+        prompt: str,
+        system: str = "",
+        temperature: float = 0.7,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> AsyncIterator[str]:
+        """Stream completion text deltas. Raises LLMStreamError on failure."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": 2000
+        }
+        
+        url = f"{self.base_url}/chat/completions"
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                async with aclosing(_iter_chat_stream(own_session, url, headers, payload, "Mistral")) as stream:
+                    async for delta in stream:
+                        yield delta
+        else:
+            async with aclosing(_iter_chat_stream(session, url, headers, payload, "Mistral")) as stream:
+                async for delta in stream:
+                    yield delta
 
 
 class LLMClient:
-    """Unified LLM client for debate system."""
+    """
+    Unified LLM client for debate system.
+    
+    All clients share one pooled ``aiohttp.ClientSession`` per event loop, so
+    council debates reuse keep-alive connections and cached DNS lookups
+    instead of opening a new TCP+TLS connection per call. Close it on
+    shutdown with ``await LLMClient.close_sessions()``.
+    """
+    
+    # One pooled session per event loop (sessions cannot cross loops)
+    _sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+    
+    @classmethod
+    def http_session(cls) -> aiohttp.ClientSession:
+        """Get the pooled HTTP session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = cls._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.HTTP_POOL_LIMIT,
+                limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            cls._sessions[loop] = session
+            logger.info(
+                f"Created pooled LLM HTTP session (limit={settings.HTTP_POOL_LIMIT}, "
+                f"per_host={settings.HTTP_POOL_LIMIT_PER_HOST})"
+            )
+        return session
+    
+    @classmethod
+    async def close_sessions(cls):
+        """Close the pooled HTTP session bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = cls._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+            logger.info("Closed pooled LLM HTTP session")
     
     def __init__(self, provider_type: str, api_key: Optional[str] = None, model: Optional[str] = None, **kwargs):
         """
@@ -237,13 +528,31 @@ class LLMClient:
         else:
             raise ValueError(f"Unknown provider: {provider_type}")
         
+        # Shared with every other client of the same provider
+        self.rate_limiter = get_rate_limiter(provider_type, self.provider.model)
         self.call_count = 0
         self.token_estimate = 0
     
+    def _reserved_tokens(self, prompt: str, system: str) -> int:
+        """Tokens to reserve against the provider's per-minute budget."""
+        return estimate_tokens(system + prompt) + COMPLETION_TOKEN_ESTIMATE
+    
     def complete(self, prompt: str, system: str = "", temperature: float = 0.7) -> str:
         """Get a text completion."""
         try:
-            response = self.provider.complete(prompt, system, temperature)
+            reserved = self._reserved_tokens(prompt, system)
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                with self.rate_limiter.limit_sync(tokens=reserved) as slot:
+                    try:
+                        response = self.provider.complete(prompt, system, temperature)
+                    except RateLimitedError as e:
+                        if attempt == RATE_LIMIT_RETRIES:
+                            raise
+                        self.rate_limiter.penalize(e.retry_after, attempt)
+                        continue
+                    slot["actual_tokens"] = estimate_tokens(system + prompt + response)
+                break
+            
             self.call_count += 1
             self.token_estimate += len(prompt.split()) + len(response.split())
             logger.info(f"LLM call {self.call_count} succeeded")
@@ -255,18 +564,29 @@ class LLMClient:
     async def complete_async(self, prompt: str, system: str = "", temperature: float = 0.7) -> str:
         """Get a text completion asynchronously."""
         try:
-            # For Gemini, we don't have async yet, so use sync in executor
-            if isinstance(self.provider, GeminiProvider):
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    None, 
-                    self.provider.complete, 
-                    prompt, 
-                    system, 
-                    temperature
-                )
-            else:
-                response = await self.provider.complete_async(prompt, system, temperature)
+            reserved = self._reserved_tokens(prompt, system)
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                async with self.rate_limiter.limit(tokens=reserved) as slot:
+                    try:
+                        # For Gemini, we don't have async yet, so use sync in the shared executor
+                        if isinstance(self.provider, GeminiProvider):
+                            response = await run_blocking(
+                                self.provider.complete,
+                                prompt,
+                                system,
+                                temperature
+                            )
+                        else:
+                            response = await self.provider.complete_async(
+                                prompt, system, temperature, session=self.http_session()
+                            )
+                    except RateLimitedError as e:
+                        if attempt == RATE_LIMIT_RETRIES:
+                            raise
+                        self.rate_limiter.penalize(e.retry_after, attempt)
+                        continue
+                    slot["actual_tokens"] = estimate_tokens(system + prompt + response)
+                break
             
             self.call_count += 1
             self.token_estimate += len(prompt.split()) + len(response.split())
@@ -276,6 +596,52 @@ class LLMClient:
             logger.error(f"LLM async call failed: {e}")
             raise
     
+    async def stream_async(self, prompt: str, system: str = "", temperature: float = 0.7) -> AsyncIterator[str]:
+        """
+        Stream a text completion as it is generated.
+        
+        Yields text deltas. Stop early by breaking out of the loop and closing
+        the generator (``await stream.aclose()``); the provider request is then
+        aborted. Usage counters include only the text actually received.
+        A 429 before the first delta is retried through the rate limiter.
+        
+        Raises:
+            LLMStreamError: If the provider returns an error
+            RateLimitedError: If the provider is still rate limiting after retries
+        """
+        received = []
+        reserved = self._reserved_tokens(prompt, system)
+        try:
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                async with self.rate_limiter.limit(tokens=reserved) as slot:
+                    if isinstance(self.provider, GeminiProvider):
+                        stream = self.provider.stream_async(prompt, system, temperature)
+                    else:
+                        stream = self.provider.stream_async(
+                            prompt, system, temperature, session=self.http_session()
+                        )
+                    try:
+                        async with aclosing(stream):
+                            async for delta in stream:
+                                received.append(delta)
+                                yield delta
+                    except RateLimitedError as e:
+                        if received or attempt == RATE_LIMIT_RETRIES:
+                            raise
+                        self.rate_limiter.penalize(e.retry_after, attempt)
+                        continue
+                    finally:
+                        slot["actual_tokens"] = estimate_tokens(system + prompt + "".join(received))
+                break
+        except Exception as e:
+            logger.error(f"LLM stream failed: {e}")
+            raise
+        finally:
+            if received:
+                self.call_count += 1
+                self.token_estimate += len(prompt.split()) + len("".join(received).split())
+                logger.info(f"LLM call {self.call_count} streamed")
+    
     def get_stats(self) -> dict:
         """Get usage statistics."""
         return {
@@ -0,0 +1,348 @@
+"""
+Rate limiting for LLM providers.
+Token-bucket limits per provider (or provider/model) shared by every LLM
+call site, async or threaded.
+
+Features:
+- Requests-per-second and tokens-per-minute budgets
+- A concurrency cap on in-flight requests
+- Priority queue: interactive requests are admitted before background work
+- ``Retry-After`` handling: a 429 pauses the whole provider, not just one caller
+- Jittered exponential backoff when no ``Retry-After`` is given
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Dict, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Admission priority; lower values are admitted first."""
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+
+class RateLimitedError(Exception):
+    """Raised when a provider answers 429 Too Many Requests."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: Priority):
+    """
+    Run LLM calls in this block (and tasks/threads started from it) at ``priority``.
+
+    Usage:
+        with llm_priority(Priority.BACKGROUND):
+            await prefetch_debates()
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Priority of the current context (INTERACTIVE unless set)."""
+    return _priority.get()
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for retry ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return max(1, len(text or "") // 4)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` per second up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` is available (0 if it is now)."""
+        if self.rate <= 0:
+            return 0.0  # Unlimited
+        self._refill(now)
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        """Return (positive) or charge (negative) tokens after the fact."""
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """
+    Rate limiter for one provider (or provider/model).
+
+    Usage:
+        limiter = get_rate_limiter("mistral")
+        async with limiter.limit(tokens=estimate_tokens(prompt) + 200) as slot:
+            response = await call()
+            slot["actual_tokens"] = estimate_tokens(prompt + response)
+
+    Synchronous callers (agents running on the blocking executor) use
+    ``limit_sync`` with the same semantics.
+
+    Attributes:
+        name (str): Limiter key used in logs and stats
+        rps (float): Requests per second (0 = unlimited)
+        tpm (float): Tokens per minute (0 = unlimited)
+        max_concurrency (int): Maximum in-flight requests (0 = unlimited)
+    """
+
+    # How often queued callers re-check when they are not at the head of the queue
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, name: str, rps: float = 0.0, tpm: float = 0.0, max_concurrency: int = 0):
+        self.name = name
+        self.rps = rps
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+
+        self._requests = TokenBucket(rate=rps, capacity=max(1.0, rps))
+        self._tokens = TokenBucket(rate=tpm / 60.0, capacity=tpm)
+        self._lock = threading.Lock()
+        self._queue: list = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._blocked_until = 0.0
+        self.stats = {"admitted": 0, "rate_limited": 0, "waited_seconds": 0.0}
+
+    # ---------------------------------------------------------------- admission
+
+    def _try_admit(self, ticket: tuple, tokens: int) -> float:
+        """Admit ``ticket`` if it is first in line and budgets allow; else return seconds to wait."""
+        with self._lock:
+            if self._queue[0] is not ticket:
+                return self.POLL_INTERVAL
+            if self.max_concurrency and self._active >= self.max_concurrency:
+                return self.POLL_INTERVAL
+
+            now = time.monotonic()
+            wait = max(
+                self._blocked_until - now,
+                self._requests.wait_time(1, now),
+                self._tokens.wait_time(tokens, now) if self.tpm > 0 else 0.0,
+            )
+            if wait > 0:
+                return wait
+
+            heapq.heappop(self._queue)
+            self._requests.consume(1, now)
+            if self.tpm > 0:
+                self._tokens.consume(tokens, now)
+            self._active += 1
+            self.stats["admitted"] += 1
+            return 0.0
+
+    def _enqueue(self, priority: Optional[Priority]) -> tuple:
+        ticket = (int(current_priority() if priority is None else priority), next(self._sequence))
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+        return ticket
+
+    def _dequeue(self, ticket: tuple):
+        with self._lock:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+
+    async def acquire(self, tokens: int = 0, priority: Optional[Priority] = None):
+        """Wait (without blocking the event loop) until a request may be sent."""
+        ticket = self._enqueue(priority)
+        started = time.monotonic()
+        try:
+            while (wait := self._try_admit(ticket, tokens)) > 0:
+                await asyncio.sleep(min(wait, 1.0))
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        self.stats["waited_seconds"] += time.monotonic() - started
+
+    def acquire_sync(self, tokens: int = 0, priority: Optional[Priority] = None):
+        """Blocking variant of ``acquire`` for threaded callers."""
+        ticket = self._enqueue(priority)
+        started = time.monotonic()
+        try:
+            while (wait := self._try_admit(ticket, tokens)) > 0:
+                time.sleep(min(wait, 1.0))
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        self.stats["waited_seconds"] += time.monotonic() - started
+
+    def release(self, reserved_tokens: int = 0, actual_tokens: Optional[int] = None):
+        """Free the concurrency slot and settle the token reservation."""
+        with self._lock:
+            self._active = max(0, self._active - 1)
+            if self.tpm > 0 and actual_tokens is not None:
+                self._tokens.adjust(reserved_tokens - actual_tokens)
+
+    @asynccontextmanager
+    async def limit(self, tokens: int = 0, priority: Optional[Priority] = None):
+        """Async context manager around one request. Set ``slot["actual_tokens"]`` to settle."""
+        await self.acquire(tokens, priority)
+        slot = {"actual_tokens": None}
+        try:
+            yield slot
+        finally:
+            self.release(tokens, slot["actual_tokens"])
+
+    @contextmanager
+    def limit_sync(self, tokens: int = 0, priority: Optional[Priority] = None):
+        """Blocking context manager around one request."""
+        self.acquire_sync(tokens, priority)
+        slot = {"actual_tokens": None}
+        try:
+            yield slot
+        finally:
+            self.release(tokens, slot["actual_tokens"])
+
+    # ---------------------------------------------------------------- 429 handling
+
+    def penalize(self, retry_after: Optional[float] = None, attempt: int = 0) -> float:
+        """
+        Record a 429: pause admissions for ``retry_after`` seconds, or a
+        jittered exponential backoff if the provider did not say.
+
+        Returns:
+            The pause in seconds
+        """
+        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self.stats["rate_limited"] += 1
+        logger.warning(f"[{self.name}] rate limited, pausing requests for {delay:.1f}s")
+        return delay
+
+    def get_stats(self) -> dict:
+        """Get limiter statistics."""
+        with self._lock:
+            return {
+                "rps": self.rps,
+                "tpm": self.tpm,
+                "max_concurrency": self.max_concurrency,
+                "active": self._active,
+                "queued": len(self._queue),
+                "paused_for": round(max(0.0, self._blocked_until - time.monotonic()), 2),
+                **self.stats,
+            }
+
+
+# ============================================================================
+# Registry - limiters shared by every call site in the process
+# ============================================================================
+
+# Free-tier friendly defaults; override with LLM_RATE_LIMITS (JSON), e.g.
+# {"openrouter": {"rps": 5}, "mistral/mistral-small-latest": {"rps": 1, "tpm": 50000}}
+DEFAULT_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+    "openrouter": {"rps": 3, "tpm": 200000, "max_concurrency": 10},
+    "mistral": {"rps": 1, "tpm": 500000, "max_concurrency": 4},
+    "gemini": {"rps": 0.25, "tpm": 1000000, "max_concurrency": 4},
+    "groq": {"rps": 0.5, "tpm": 20000, "max_concurrency": 4},
+}
+
+_limiters: Dict[str, RateLimiter] = {}
+_limits: Optional[Dict[str, Dict[str, float]]] = None
+_registry_lock = threading.Lock()
+
+
+def _load_limits() -> Dict[str, Dict[str, float]]:
+    limits = {key: dict(value) for key, value in DEFAULT_RATE_LIMITS.items()}
+    raw = settings.LLM_RATE_LIMITS
+    if raw:
+        try:
+            for key, value in json.loads(raw).items():
+                limits.setdefault(key.lower(), {}).update(value)
+        except (ValueError, AttributeError) as e:
+            logger.error(f"Ignoring invalid LLM_RATE_LIMITS: {e}")
+    return limits
+
+
+def get_rate_limiter(provider: str, model: Optional[str] = None) -> RateLimiter:
+    """
+    Get the shared limiter for a provider.
+
+    A ``provider/model`` entry in the limits gives that model its own
+    budget; otherwise every model of the provider shares one limiter.
+    Unknown providers are unlimited.
+    """
+    global _limits
+    provider = provider.lower()
+    with _registry_lock:
+        if _limits is None:
+            _limits = _load_limits()
+
+        key = f"{provider}/{model}" if model and f"{provider}/{model}" in _limits else provider
+        limiter = _limiters.get(key)
+        if limiter is None:
+            config = _limits.get(key, {})
+            limiter = RateLimiter(
+                name=key,
+                rps=float(config.get("rps", 0)),
+                tpm=float(config.get("tpm", 0)),
+                max_concurrency=int(config.get("max_concurrency", 0)),
+            )
+            _limiters[key] = limiter
+        return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, dict]:
+    """Stats for every limiter created so far."""
+    with _registry_lock:
+        limiters = dict(_limiters)
+    return {key: limiter.get_stats() for key, limiter in limiters.items()}
@@ -16,6 +16,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from llm_council.services.debate_engine import get_council_analysis
+from llm_council.services.llm_client import LLMClient
 
 
 async def test_council(symbol: str = "AAPL"):
@@ -116,6 +117,8 @@ async def test_council(symbol: str = "AAPL"):
         import traceback
         traceback.print_exc()
         return None
+    finally:
+        await LLMClient.close_sessions()
 
 
 def main():
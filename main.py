@@ -1,24 +1,47 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Header, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional
 import asyncio
+import json
 import logging
+import os
 
 # Import agents
 from agents.behaviour_agent import BehaviorMonitorAgent
-from agents.narrator import NarratorAgent
+from agents.narrator import NarratorAgent, get_summary_cache
 from agents.persona import PersonaAgent
 from agents.moderator import ModeratorAgent
+from agents.pipeline import AgentPipeline, PipelineStage
 
 # Import LLM Council
-from llm_council.services.debate_engine import get_council_analysis
+from llm_council.services.debate_engine import (
+    get_council_analysis,
+    get_debate_engine,
+    init_debate_engine,
+    reload_debate_engine,
+)
+from llm_council.services.debate_cache import get_debate_cache
+from llm_council.services.llm_client import LLMClient
+from llm_council.services.rate_limiter import Priority, get_rate_limiter_stats, llm_priority
 
 # Import services
-from services.economic_calendar import EconomicCalendarService
+from services.economic_calendar import get_economic_calendar_service
 from services.trade_history import get_trade_history_service
 from services.market_metrics import get_market_metrics_service
-from services.asset_validator import validate_asset_symbol, AssetValidationError
+from services.market_data import get_market_data_service
+from services.asset_validator import (
+    validate_asset_symbol, validate_asset_symbols, AssetValidationError, shutdown_check_pool
+)
+from services.validation_cache import get_validation_cache
+from services.executor import run_blocking, StageTimeoutError, shutdown_blocking_executor
+from services.batch_behaviour import DEFAULT_CHUNK_SIZE, analyze_batch_async, shutdown_batch_pool
+from services.trade_archive import get_trade_archive
+from services.tendency_engine import PREDICTED_PATTERNS, get_tendency_engine
+from services.symbol_universe import get_symbol_universe, refresh_symbol_universe, universe_is_stale
+from services.prefetch_scheduler import get_prefetch_scheduler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,12 +58,103 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def startup():
+    """Build long-lived shared services once per process."""
+    init_debate_engine()
+    
+    # Backfill behaviour tendencies from the trade archive without delaying startup
+    archive = get_trade_archive()
+    if archive is not None:
+        app.state.tendency_refresh = asyncio.create_task(
+            run_blocking(get_tendency_engine().refresh_from_archive, archive)
+        )
+    
+    if SYMBOL_UNIVERSE_REFRESH_HOURS > 0:
+        app.state.symbol_refresh = asyncio.create_task(_refresh_symbol_universe_periodically())
+    
+    scheduler = get_prefetch_scheduler()
+    if scheduler.market_interval > 0 and scheduler.watchlist:
+        app.state.prefetch = asyncio.create_task(_prefetch_watchlist_periodically())
+
+
+async def _refresh_symbol_universe_periodically():
+    """Keep the offline symbol universe at most SYMBOL_UNIVERSE_REFRESH_HOURS old."""
+    while True:
+        if universe_is_stale(SYMBOL_UNIVERSE_REFRESH_HOURS):
+            try:
+                await run_blocking(refresh_symbol_universe, timeout=120)
+            except Exception as e:
+                logger.warning(f"Symbol universe refresh failed, keeping {get_symbol_universe().size} symbols: {e}")
+        await asyncio.sleep(SYMBOL_UNIVERSE_REFRESH_HOURS * 3600)
+
+
+async def _prefetch_watchlist_periodically():
+    """Keep watchlist quotes, VIX and calendar data warm on a market-hours cadence."""
+    scheduler = get_prefetch_scheduler()
+    while True:
+        try:
+            # Anything the warm-up triggers yields to interactive requests
+            with llm_priority(Priority.BACKGROUND):
+                await scheduler.run_cycle()
+        except asyncio.TimeoutError:
+            logger.warning(f"Watchlist prefetch still running after {scheduler.cycle_timeout}s")
+        except Exception as e:
+            logger.warning(f"Watchlist prefetch failed: {e}")
+        await asyncio.sleep(scheduler.interval())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release pooled connections, worker threads and batch worker processes."""
+    for name in ("tendency_refresh", "symbol_refresh", "prefetch"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    get_prefetch_scheduler().shutdown()
+    await LLMClient.close_sessions()
+    await NarratorAgent.close_async_clients()
+    shutdown_blocking_executor()
+    shutdown_check_pool()
+    shutdown_batch_pool()
+
+
+# Per-stage timeouts (seconds). The council allows for slow free-tier models.
+VALIDATION_TIMEOUT = 20
+BULK_VALIDATION_TIMEOUT = 60
+MAX_BULK_SYMBOLS = 1000
+SYMBOL_UNIVERSE_REFRESH_HOURS = float(os.getenv("SYMBOL_UNIVERSE_REFRESH_HOURS", "24"))
+MAX_SYMBOL_RESULTS = 50
+STAGE_TIMEOUTS = {
+    "EconomicCalendar": 20,
+    "MarketMetrics": 20,
+    "BehaviorMonitorAgent": 15,
+    "MarketWatcherAgent": 150,
+    "NarratorAgent": 45,
+    "PersonaAgent": 45,
+    "ModeratorAgent": 45,
+}
+
+
 class MarketWatcherAgent:
     """
     Market analysis using 5-agent LLM debate council.
     Provides diverse perspectives from macro, fundamental, flow, technical, and skeptic agents.
     """
     
+    def __init__(self,
+                 on_argument: Optional[Callable[[Any], None]] = None,
+                 on_partial: Optional[Callable[[str, str], None]] = None):
+        """
+        Args:
+            on_argument: Optional callback receiving each council AgentArgument
+                as soon as it resolves (used by the streaming endpoint)
+            on_partial: Optional callback ``(agent_name, thesis_so_far)`` for
+                theses still being generated
+        """
+        self.on_argument = on_argument
+        self.on_partial = on_partial
+    
     async def run_async(self, context: dict) -> dict:
         """Async version for LLM council integration."""
         try:
@@ -48,8 +162,7 @@ class MarketWatcherAgent:
             asset = context.get("asset", "AAPL")  # Default to AAPL if not specified
             
             # Validate asset symbol
-            from services.asset_validator import validate_asset_symbol
-            is_valid, error_msg = validate_asset_symbol(asset)
+            is_valid, error_msg = await run_blocking(validate_asset_symbol, asset, timeout=VALIDATION_TIMEOUT)
             if not is_valid:
                 logger.error(f"Invalid asset symbol: {error_msg}")
                 context["market_opinions"] = [f"Invalid asset symbol '{asset}': {error_msg}"]
@@ -60,16 +173,14 @@ class MarketWatcherAgent:
             asset = asset.strip().upper()
             context["asset"] = asset
             
-            # Get economic calendar data
+            # Economic context for the debate. Read from the shared calendar
+            # service rather than the pipeline context so this stage does not
+            # wait for the EconomicCalendar stage; concurrent callers share one
+            # fetch per field.
             try:
-                economic_service = EconomicCalendarService()
-                economic_data = economic_service.get_stock_events(asset)
-                economic_summary = economic_service.get_market_summary(asset)
-                
-                # Add to context for downstream agents
-                context["economic_calendar"] = economic_data
-                context["economic_summary"] = economic_summary
-                
+                economic_service = get_economic_calendar_service()
+                economic_data = await run_blocking(economic_service.get_stock_events, asset)
+                economic_summary = economic_service.get_market_summary(asset, economic_data)
                 logger.info(f"Economic calendar: {economic_summary[:100]}...")
             except Exception as e:
                 logger.warning(f"Could not fetch economic data: {e}")
@@ -90,7 +201,10 @@ class MarketWatcherAgent:
             logger.info(f"Running LLM council analysis for {symbol}...")
             
             # Get 5-agent council debate with economic context
-            debate_result = await get_council_analysis(symbol, economic_context=economic_summary)
+            debate_result = await get_council_analysis(
+                symbol, economic_context=economic_summary,
+                on_argument=self.on_argument, on_partial=self.on_partial
+            )
             
             # Format market opinions from all 5 agents
             market_opinions = []
@@ -104,6 +218,8 @@ class MarketWatcherAgent:
             context["consensus_points"] = [cp.statement for cp in debate_result["consensus_points"]]
             context["disagreement_topics"] = [dp.topic for dp in debate_result["disagreement_points"]]
             context["judge_summary"] = debate_result["judge_summary"]
+            context["hedged_agents"] = debate_result.get("hedged_agents", [])
+            context["timed_out_agents"] = debate_result.get("timed_out_agents", [])
             
             # Extract market context
             mc = debate_result["market_context"]
@@ -126,7 +242,71 @@ class MarketWatcherAgent:
     
     def run(self, context: dict) -> dict:
         """Sync wrapper for the async method."""
-        return asyncio.run(self.run_async(context))
+        async def run_and_close():
+            try:
+                return await self.run_async(context)
+            finally:
+                # The pooled session is bound to this short-lived loop
+                await LLMClient.close_sessions()
+        
+        return asyncio.run(run_and_close())
+
+
+def build_agent_pipeline(pre_stages: Optional[List[PipelineStage]] = None,
+                         on_argument: Optional[Callable[[Any], None]] = None,
+                         on_partial: Optional[Callable[[str, str], None]] = None) -> AgentPipeline:
+    """
+    Build the agent pipeline as a dependency graph.
+
+    Each stage declares the context keys it reads and writes so that
+    independent stages (e.g. behaviour analysis and the LLM council) run
+    concurrently. ``pre_stages`` are scheduled ahead of the agents in
+    declaration order, which matters only where their keys conflict.
+    ``on_argument`` and ``on_partial`` are passed to the MarketWatcherAgent.
+    The NarratorAgent stage (one Groq call) is left out when no Groq key is
+    configured, so no narrative is produced.
+    """
+    narrator = NarratorAgent()
+    stages = list(pre_stages or [])
+    stages += [
+        PipelineStage(
+            "BehaviorMonitorAgent", BehaviorMonitorAgent().run,
+            reads=("user_trades",),
+            writes=("insights", "behavior_label", "behavior_reason"),
+            timeout=STAGE_TIMEOUTS["BehaviorMonitorAgent"],
+        ),
+        PipelineStage(
+            "MarketWatcherAgent", MarketWatcherAgent(on_argument=on_argument, on_partial=on_partial).run_async,
+            reads=("asset",),
+            writes=(
+                "asset", "market_opinions", "council_debate", "consensus_points",
+                "disagreement_topics", "judge_summary", "hedged_agents",
+                "timed_out_agents", "price_change_pct", "move_direction",
+                "current_price", "volume",
+            ),
+            timeout=STAGE_TIMEOUTS["MarketWatcherAgent"],
+        ),
+        PipelineStage(
+            "PersonaAgent", PersonaAgent().run_async,
+            reads=("market_opinions", "asset", "price_change_pct", "persona_style"),
+            writes=("persona_post",),
+            timeout=STAGE_TIMEOUTS["PersonaAgent"],
+        ),
+        PipelineStage(
+            "ModeratorAgent", ModeratorAgent().run_async,
+            reads=("persona_post", "asset", "price_change_pct", "behavior_label"),
+            writes=("moderation",),
+            timeout=STAGE_TIMEOUTS["ModeratorAgent"],
+        ),
+    ]
+    if narrator.has_llm_access:
+        stages.append(PipelineStage(
+            "NarratorAgent", narrator.run_async,
+            reads=("market_opinions", "insights", "user_trades", "user_id"),
+            writes=("session_summary",),
+            timeout=STAGE_TIMEOUTS["NarratorAgent"],
+        ))
+    return AgentPipeline(stages)
 
 
 class Trade(BaseModel):
@@ -144,177 +324,205 @@ class RunAgentsRequest(BaseModel):
     persona_style: str = "professional"
 
 
-@app.post("/analyze-asset")
-async def analyze_asset(asset: str, user_id: Optional[str] = "default_user"):
-    """
-    Simplified endpoint - only requires asset symbol.
-    Automatically fetches trade history, economic calendar, and runs all agents.
-    
-    Args:
-        asset: Stock symbol (e.g., "SPY", "AAPL", "TSLA")
-        user_id: Optional user identifier for database lookup
-        
-    Returns:
-        Complete multi-agent analysis with economic calendar impacts
-    """
-    # Validate asset symbol first
-    is_valid, error_msg = validate_asset_symbol(asset)
+class BatchUserTrades(BaseModel):
+    user_id: str
+    trades: List[Trade]
+
+
+class BatchBehaviourRequest(BaseModel):
+    users: List[BatchUserTrades]
+    include_narrative: bool = False
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+
+class RiskPredictionRequest(BaseModel):
+    user_id: str
+    consecutive_losses: int = 0
+    consecutive_wins: int = 0
+    trades_in_last_hour: int = 0
+
+
+class BulkValidationRequest(BaseModel):
+    symbols: List[str]
+
+
+async def _validate_requested_asset(asset: str) -> str:
+    """Validate an asset symbol (off the event loop) and return it normalised."""
+    try:
+        is_valid, error_msg = await run_blocking(validate_asset_symbol, asset, timeout=VALIDATION_TIMEOUT)
+    except StageTimeoutError as e:
+        logger.warning(f"Asset validation timed out for {asset}: {e}")
+        raise HTTPException(status_code=504, detail=f"Timed out validating asset symbol '{asset}'")
     if not is_valid:
         logger.warning(f"Invalid asset symbol rejected: {asset} - {error_msg}")
         raise HTTPException(status_code=400, detail=error_msg)
     
     # Normalize symbol to uppercase
-    asset = asset.strip().upper()
-    logger.info(f"Starting automated analysis for {asset} (user: {user_id})")
+    return asset.strip().upper()
+
+
+async def _prepare_analysis_context(asset: str, user_id: str) -> dict:
+    """Fetch trade history, auto-select the persona and build the pipeline context."""
+    # Fetch trade history from database (currently synthetic)
+    trade_service = get_trade_history_service()
+    trade_summary = await run_blocking(trade_service.get_trading_summary, asset, user_id)
+    user_trades = trade_summary["trades"]
     
-    try:
-        # 1. Fetch trade history from database (currently synthetic)
-        trade_service = get_trade_history_service()
-        trade_summary = trade_service.get_trading_summary(asset, user_id)
-        user_trades = trade_summary["trades"]
-        
-        logger.info(f"Found {len(user_trades)} trades for {asset}")
-        
-        # 2. Get economic calendar and news
-        economic_service = EconomicCalendarService()
-        economic_data = economic_service.get_stock_events(asset)
-        economic_summary = economic_service.get_market_summary(asset)
-        
-        logger.info(f"Economic events: {economic_summary[:100]}...")
-        
-        # 3. Auto-select persona based on trading performance
-        persona_style = trade_service.auto_select_persona(user_trades)
-        logger.info(f"Auto-selected persona: {persona_style}")
+    logger.info(f"Found {len(user_trades)} trades for {asset}")
+    
+    # Persona auto-selected from the user's running totals
+    persona_style = trade_summary["persona_style"]
+    logger.info(f"Auto-selected persona: {persona_style}")
+    
+    return {
+        "market_event": f"{asset} analysis requested with economic calendar integration",
+        "user_trades": user_trades,
+        "persona_style": persona_style,
+        "asset": asset,
+        "user_id": user_id,
+        "trade_summary": trade_summary,
+        "auto_generated": True
+    }
+
+
+def _build_analysis_pipeline(asset: str,
+                             on_argument: Optional[Callable[[Any], None]] = None,
+                             on_partial: Optional[Callable[[str, str], None]] = None) -> AgentPipeline:
+    """
+    Agent pipeline for /analyze-asset. Economic calendar and market metrics are
+    fetched as pipeline stages so they overlap with the council debate.
+    """
+    economic_service = get_economic_calendar_service()
+    metrics_service = get_market_metrics_service()
+    
+    def fetch_economic_calendar(ctx: dict) -> dict:
+        ctx["economic_calendar"] = economic_service.get_stock_events(asset)
+        ctx["economic_summary"] = economic_service.get_market_summary(asset, ctx["economic_calendar"])
+        logger.info(f"Economic events: {ctx['economic_summary'][:100]}...")
+        return ctx
+    
+    def fetch_market_metrics(ctx: dict) -> dict:
+        ctx["vix"] = metrics_service.get_vix()
+        ctx["asset_volatility"] = metrics_service.get_market_volatility(asset)
+        return ctx
+    
+    return build_agent_pipeline(pre_stages=[
+        PipelineStage(
+            "EconomicCalendar", fetch_economic_calendar,
+            reads=(),
+            writes=("economic_calendar", "economic_summary"),
+            timeout=STAGE_TIMEOUTS["EconomicCalendar"],
+        ),
+        PipelineStage(
+            "MarketMetrics", fetch_market_metrics,
+            reads=(),
+            writes=("vix", "asset_volatility"),
+            timeout=STAGE_TIMEOUTS["MarketMetrics"],
+        ),
+    ], on_argument=on_argument, on_partial=on_partial)
+
+
+async def _compute_market_metrics(asset: str, context: dict) -> dict:
+    """Calculate market metrics (VIX, regime, risk index) from the pipeline context."""
+    metrics_service = get_market_metrics_service()
+    market_metrics = await run_blocking(
+        metrics_service.get_all_metrics,
+        symbol=asset,
+        agent_data={
+            "consensus_points": context.get("consensus_points", []),
+            "disagreement_topics": context.get("disagreement_topics", []),
+            "council_opinions": context.get("market_opinions", [])
+        },
+        vix=context.get("vix"),
+        volatility=context.get("asset_volatility")
+    )
+    
+    logger.info(f"Market metrics: VIX={market_metrics['vix']}, Regime={market_metrics['market_regime']}, Risk Index={market_metrics['risk_index']}")
+    
+    return {
+        "vix": market_metrics["vix"],
+        "market_regime": market_metrics["market_regime"],
+        "risk_index": market_metrics["risk_index"],
+        "asset_volatility": market_metrics["asset_volatility"],
+        "risk_level": metrics_service.get_risk_level_description(market_metrics["risk_index"]),
+        "regime_color": metrics_service.get_regime_color(market_metrics["market_regime"])
+    }
+
+
+def _format_analysis_response(asset: str, user_id: str, context: dict, market_metrics: dict) -> dict:
+    """Shape the final /analyze-asset response from the pipeline context."""
+    trade_summary = context["trade_summary"]
+    economic_data = context.get("economic_calendar", {})
+    
+    return {
+        "asset": asset,
+        "user_id": user_id,
+        "analysis_type": "automated",
+        "persona_selected": context["persona_style"],
         
-        # 4. Generate market event description
-        market_event = f"{asset} analysis requested with economic calendar integration"
+        # Market metrics (VIX, regime, risk index)
+        "market_metrics": market_metrics,
         
-        # 5. Build context for agent pipeline
-        context = {
-            "market_event": market_event,
-            "user_trades": user_trades,
-            "persona_style": persona_style,
-            "asset": asset,
-            "user_id": user_id,
-            "trade_summary": trade_summary,
-            "economic_calendar": economic_data,
-            "economic_summary": economic_summary,
-            "auto_generated": True
-        }
+        # Trade summary
+        "trade_history": {
+            "total_trades": trade_summary["total_trades"],
+            "total_pnl": trade_summary["total_pnl"],
+            "win_rate": trade_summary["win_rate"],
+            "last_trade": trade_summary.get("last_trade")
+        },
         
-        # 6. Run agent pipeline
-        agent_flow = [
-            ("BehaviorMonitorAgent", BehaviorMonitorAgent, False),
-            ("MarketWatcherAgent", MarketWatcherAgent, True),
-            ("NarratorAgent", NarratorAgent, False),
-            ("PersonaAgent", PersonaAgent, False),
-            ("ModeratorAgent", ModeratorAgent, False)
-        ]
+        # Economic calendar impacts
+        "economic_calendar": {
+            "earnings": economic_data.get("earnings_calendar", {}),
+            "recent_news": economic_data.get("recent_news", [])[:3],
+            "economic_events": economic_data.get("economic_events", []),
+            "summary": context.get("economic_summary", "")
+        },
         
-        for agent_name, agent_cls, is_async in agent_flow:
-            try:
-                logger.info(f"Running {agent_name}...")
-                agent = agent_cls ()
-                
-                if is_async:
-                    context = await agent.run_async(context)
-                else:
-                    context = agent.run(context)
-                    
-                logger.info(f"✓ {agent_name} completed")
-                
-            except Exception as e:
-                logger.error(f"✗ {agent_name} failed: {e}")
-                context[f"{agent_name}_error"] = str(e)
+        # Agent outputs
+        "behavioral_analysis": {
+            "flags": context.get("behavior_flags", []),
+            "insights": context.get("insights", [])
+        },
         
-        # 7. Calculate market metrics (VIX, regime, risk index)
-        metrics_service = get_market_metrics_service()
-        market_metrics = metrics_service.get_all_metrics(
-            symbol=asset,
-            agent_data={
-                "consensus_points": context.get("consensus_points", []),
-                "disagreement_topics": context.get("disagreement_topics", []),
-                "council_opinions": context.get("market_opinions", [])
+        "market_analysis": {
+            "council_opinions": context.get("market_opinions", []),
+            "consensus": context.get("consensus_points", []),
+            "disagreements": context.get("disagreement_topics", []),
+            "judge_summary": context.get("judge_summary", ""),
+            "hedged_agents": context.get("hedged_agents", []),
+            "timed_out_agents": context.get("timed_out_agents", []),
+            "market_context": {
+                "price": context.get("current_price"),
+                "move_direction": context.get("move_direction"),
+                "change_pct": context.get("price_change_pct"),
+                "volume": context.get("volume")
             }
-        )
-        
-        logger.info(f"Market metrics: VIX={market_metrics['vix']}, Regime={market_metrics['market_regime']}, Risk Index={market_metrics['risk_index']}")
+        },
         
-        # 8. Format response
-        response = {
-            "asset": asset,
-            "user_id": user_id,
-            "analysis_type": "automated",
-            "persona_selected": persona_style,
-            
-            # Market metrics (VIX, regime, risk index)
-            "market_metrics": {
-                "vix": market_metrics["vix"],
-                "market_regime": market_metrics["market_regime"],
-                "risk_index": market_metrics["risk_index"],
-                "asset_volatility": market_metrics["asset_volatility"],
-                "risk_level": metrics_service.get_risk_level_description(market_metrics["risk_index"]),
-                "regime_color": metrics_service.get_regime_color(market_metrics["market_regime"])
-            },
-            
-            # Trade summary
-            "trade_history": {
-                "total_trades": trade_summary["total_trades"],
-                "total_pnl": trade_summary["total_pnl"],
-                "win_rate": trade_summary["win_rate"],
-                "last_trade": trade_summary.get("last_trade")
-            },
-            
-            # Economic calendar impacts
-            "economic_calendar": {
-                "earnings": economic_data.get("earnings_calendar", {}),
-                "recent_news": economic_data.get("recent_news", [])[:3],
-                "economic_events": economic_data.get("economic_events", []),
-                "summary": economic_summary
-            },
-            
-            # Agent outputs
-            "behavioral_analysis": {
-                "flags": context.get("behavior_flags", []),
-                "insights": context.get("insights", [])
-            },
-            
-            "market_analysis": {
-                "council_opinions": context.get("market_opinions", []),
-                "consensus": context.get("consensus_points", []),
-                "disagreements": context.get("disagreement_topics", []),
-                "judge_summary": context.get("judge_summary", ""),
-                "market_context": {
-                    "price": context.get("current_price"),
-                    "move_direction": context.get("move_direction"),
-                    "change_pct": context.get("price_change_pct"),
-                    "volume": context.get("volume")
-                }
-            },
-            
-            "narrative": {
-                "summary": context.get("summary", ""),
-                "styled_message": context.get("final_message", ""),
-                "moderated_output": context.get("moderated_output", "")
-            },
-            
-            "persona_post": context.get("persona_post", {"x": "", "linkedin": ""}),
-            
-            # Metadata
-            "timestamp": economic_data.get("timestamp"),
-            "errors": {k: v for k, v in context.items() if k.endswith("_error")}
-        }
+        "narrative": {
+            "summary": context.get("session_summary", ""),
+            "styled_message": context.get("final_message", ""),
+            "moderated_output": context.get("moderated_output", "")
+        },
         
-        logger.info(f"Analysis complete for {asset}")
-        return response
+        "persona_post": context.get("persona_post", {"x": "", "linkedin": ""}),
         
-    except ValueError as e:
+        # Metadata
+        "timestamp": economic_data.get("timestamp"),
+        "errors": {k: v for k, v in context.items() if k.endswith("_error")}
+    }
+
+
+def _analysis_error(asset: str, e: Exception) -> HTTPException:
+    """Map an analysis failure to the HTTP error returned to the client."""
+    if isinstance(e, ValueError):
         # Handle configuration errors (like missing API keys)
         error_msg = str(e)
         logger.error(f"Configuration error for {asset}: {error_msg}")
         
         if "API key" in error_msg or "LLM" in error_msg:
-            raise HTTPException(
+            return HTTPException(
                 status_code=503,
                 detail={
                     "error": "LLM services unavailable",
@@ -322,11 +530,182 @@ async def analyze_asset(asset: str, user_id: Optional[str] = "default_user"):
                     "technical_details": error_msg
                 }
             )
-        raise HTTPException(status_code=400, detail=error_msg)
+        return HTTPException(status_code=400, detail=error_msg)
+    
+    logger.error(f"Analysis failed for {asset}: {e}", exc_info=True)
+    return HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+@app.post("/analyze-asset")
+async def analyze_asset(asset: str, user_id: Optional[str] = "default_user"):
+    """
+    Simplified endpoint - only requires asset symbol.
+    Automatically fetches trade history, economic calendar, and runs all agents.
+    
+    Args:
+        asset: Stock symbol (e.g., "SPY", "AAPL", "TSLA")
+        user_id: Optional user identifier for database lookup
+        
+    Returns:
+        Complete multi-agent analysis with economic calendar impacts
+    """
+    asset = await _validate_requested_asset(asset)
+    logger.info(f"Starting automated analysis for {asset} (user: {user_id})")
+    
+    try:
+        context = await _prepare_analysis_context(asset, user_id)
+        context = await _build_analysis_pipeline(asset).run(context)
+        market_metrics = await _compute_market_metrics(asset, context)
+        response = _format_analysis_response(asset, user_id, context, market_metrics)
+        
+        logger.info(f"Analysis complete for {asset}")
+        return response
         
     except Exception as e:
-        logger.error(f"Analysis failed for {asset}: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        raise _analysis_error(asset, e)
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+def _stage_events(stage: str, context: dict, sent_arguments: set) -> List[tuple]:
+    """Events to emit when a pipeline stage completes."""
+    if stage == "EconomicCalendar":
+        economic_data = context.get("economic_calendar", {})
+        return [("economic_calendar", {
+            "earnings": economic_data.get("earnings_calendar", {}),
+            "recent_news": economic_data.get("recent_news", [])[:3],
+            "economic_events": economic_data.get("economic_events", []),
+            "summary": context.get("economic_summary", "")
+        })]
+    
+    if stage == "BehaviorMonitorAgent":
+        return [("behaviour", {
+            "label": context.get("behavior_label"),
+            "reason": context.get("behavior_reason"),
+            "flags": context.get("behavior_flags", []),
+            "insights": context.get("insights", [])
+        })]
+    
+    if stage == "MarketWatcherAgent":
+        # Cached or coalesced debates produce no per-argument callbacks
+        debate = context.get("council_debate") or {}
+        events = [
+            ("council_argument", argument)
+            for argument in debate.get("agent_arguments", [])
+            if argument.agent_name not in sent_arguments
+        ]
+        events.append(("council_summary", {
+            "council_opinions": context.get("market_opinions", []),
+            "consensus": context.get("consensus_points", []),
+            "disagreements": context.get("disagreement_topics", []),
+            "judge_summary": context.get("judge_summary", ""),
+            "hedged_agents": context.get("hedged_agents", []),
+            "timed_out_agents": context.get("timed_out_agents", []),
+            "market_context": {
+                "price": context.get("current_price"),
+                "move_direction": context.get("move_direction"),
+                "change_pct": context.get("price_change_pct"),
+                "volume": context.get("volume")
+            }
+        }))
+        return events
+    
+    if stage == "NarratorAgent":
+        return [("narrative", {"summary": context.get("session_summary", "")})]
+    
+    if stage == "PersonaAgent":
+        return [("persona_post", context.get("persona_post", {"x": "", "linkedin": ""}))]
+    
+    if stage == "ModeratorAgent":
+        return [("moderation", context.get("moderation", {}))]
+    
+    return []
+
+
+@app.post("/analyze-asset/stream")
+async def analyze_asset_stream(asset: str, user_id: Optional[str] = "default_user"):
+    """
+    Streaming variant of /analyze-asset using Server-Sent Events.
+    
+    The symbol is validated before the stream opens (400/504 as usual). Events
+    are then emitted as soon as each piece is ready:
+        start, economic_calendar, behaviour, council_partial (an agent's
+        thesis as it is generated), council_argument (one per agent, as its
+        LLM call resolves), council_summary, narrative, persona_post,
+        moderation, market_metrics, complete (the full /analyze-asset body)
+    Failures after the stream has opened are sent as an ``error`` event
+    carrying the same status code and detail /analyze-asset would return;
+    a stage that fails on its own is reported as ``stage_error``.
+    """
+    asset = await _validate_requested_asset(asset)
+    logger.info(f"Starting streaming analysis for {asset} (user: {user_id})")
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    sent_arguments: set = set()
+    
+    def on_argument(argument):
+        sent_arguments.add(argument.agent_name)
+        queue.put_nowait(("council_argument", argument))
+    
+    def on_partial(agent_name: str, thesis: str):
+        if agent_name not in sent_arguments:
+            queue.put_nowait(("council_partial", {"agent_name": agent_name, "thesis": thesis}))
+    
+    def on_stage_complete(stage: str, context: dict):
+        error = context.get(f"{stage}_error")
+        if error:
+            queue.put_nowait(("stage_error", {"stage": stage, "error": error}))
+        for event in _stage_events(stage, context, sent_arguments):
+            queue.put_nowait(event)
+    
+    async def produce():
+        try:
+            context = await _prepare_analysis_context(asset, user_id)
+            queue.put_nowait(("start", {
+                "asset": asset,
+                "user_id": user_id,
+                "persona_selected": context["persona_style"],
+                "trade_history": {
+                    "total_trades": context["trade_summary"]["total_trades"],
+                    "total_pnl": context["trade_summary"]["total_pnl"],
+                    "win_rate": context["trade_summary"]["win_rate"],
+                    "last_trade": context["trade_summary"].get("last_trade")
+                }
+            }))
+            
+            pipeline = _build_analysis_pipeline(asset, on_argument=on_argument, on_partial=on_partial)
+            context = await pipeline.run(context, on_stage_complete=on_stage_complete)
+            
+            market_metrics = await _compute_market_metrics(asset, context)
+            queue.put_nowait(("market_metrics", market_metrics))
+            queue.put_nowait(("complete", _format_analysis_response(asset, user_id, context, market_metrics)))
+            logger.info(f"Streaming analysis complete for {asset}")
+        except Exception as e:
+            error = _analysis_error(asset, e)
+            queue.put_nowait(("error", {"status_code": error.status_code, "detail": error.detail}))
+        finally:
+            queue.put_nowait(None)
+    
+    async def event_stream():
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield _sse_event(*item)
+        finally:
+            # Client disconnected (or stream finished): stop any remaining work
+            producer.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @app.post("/run-agents")
@@ -352,35 +731,197 @@ async def run_agents(request: RunAgentsRequest):
         "persona_style": request.persona_style
     }
     
-    # Running agents in sequence
-    agent_flow = [
-        ("BehaviorMonitorAgent", BehaviorMonitorAgent, False),
-        ("MarketWatcherAgent", MarketWatcherAgent, True),
-        ("NarratorAgent", NarratorAgent, False),
-        ("PersonaAgent", PersonaAgent, False),
-        ("ModeratorAgent", ModeratorAgent, False)
-    ]
-    
-    for agent_name, agent_cls, is_async in agent_flow:
-        try:
-            logger.info(f"Running {agent_name}...")
-            agent = agent_cls()
-            
-            if is_async:
-                context = await agent.run_async(context)
-            else:
-                context = agent.run(context)
-                
-            logger.info(f"✓ {agent_name} completed")
-            
-        except Exception as e:
-            logger.error(f"✗ {agent_name} failed: {e}")
-            context[f"{agent_name}_error"] = str(e)
+    # Run agents as a dependency graph (independent agents overlap)
+    pipeline = build_agent_pipeline()
+    context = await pipeline.run(context)
     
     return {
         "message": "Multi-agent pipeline completed",
         "result": context,
-        "agents_run": len(agent_flow)
+        "agents_run": len(pipeline.stages)
+    }
+
+
+@app.post("/behaviour/batch")
+async def behaviour_batch(request: BatchBehaviourRequest):
+    """
+    Behaviour reports for many users in one call.
+    
+    Runs behaviour detection, risk score and market readiness for every user
+    on the batch process pool and streams one NDJSON line per user, in
+    request order. LLM narratives are skipped unless include_narrative is set.
+    For very large jobs use the CLI: python -m services.batch_behaviour
+    """
+    sessions = [
+        (user.user_id, [trade.model_dump() for trade in user.trades])
+        for user in request.users
+    ]
+    logger.info(f"Batch behaviour analysis for {len(sessions)} users")
+    regime = await _current_market_regime()
+    tendencies = get_tendency_engine()
+    # A report covers the user's latest trading day; re-running it does not count that day again
+    session_days = {
+        user_id: max(trade["timestamp"] for trade in trades)[:10]
+        for user_id, trades in sessions if trades
+    }
+    
+    async def ndjson_stream():
+        async for result in analyze_batch_async(
+            sessions,
+            chunk_size=max(1, request.chunk_size),
+            include_narrative=request.include_narrative
+        ):
+            # Each report closes a session: count it towards the user's tendencies
+            if "error" not in result and result["user_id"] in session_days:
+                tendencies.record_session(result["user_id"], result["insights"], regime,
+                                          day=session_days[result["user_id"]])
+            yield json.dumps(result, default=str) + "\n"
+    
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
+
+# Regime -> volatility wording used by contextual alerts
+REGIME_VOLATILITY = {
+    "ULTRA LOW VOLATILITY": "low",
+    "LOW VOLATILITY": "low",
+    "NORMAL VOLATILITY": "moderate",
+    "HIGH VOLATILITY": "high",
+    "EXTREME VOLATILITY": "high",
+}
+
+
+async def _current_market_regime() -> Optional[str]:
+    """Market regime from the (cached) VIX level, or None if VIX is unavailable."""
+    metrics_service = get_market_metrics_service()
+    try:
+        vix = await run_blocking(metrics_service.get_vix, timeout=VALIDATION_TIMEOUT)
+    except Exception as e:
+        # Tendencies fall back to the all-regimes row
+        logger.warning(f"Could not get VIX for the market regime: {e}")
+        return None
+    return metrics_service.get_market_regime(vix)
+
+
+@app.post("/behaviour/predict-risk")
+async def behaviour_predict_risk(request: RiskPredictionRequest):
+    """
+    Predict behavioural risks for a user's next trade.
+    
+    Combines the live session state (streaks, recent activity) with the
+    user's historical pattern tendencies in the current market regime, and
+    returns the prediction plus a contextual alert per predicted pattern.
+    Users without enough history fall back to conservative defaults.
+    """
+    regime = await _current_market_regime()
+    tendencies = get_tendency_engine().get_tendencies(request.user_id, regime)
+    
+    monitor = BehaviorMonitorAgent()
+    prediction = monitor.predict_next_risk(
+        {
+            "consecutive_losses": request.consecutive_losses,
+            "consecutive_wins": request.consecutive_wins,
+            "trades_in_last_hour": request.trades_in_last_hour
+        },
+        tendencies
+    )
+    
+    market_context = {"market_sentiment": {"overall": "neutral", "volatility": REGIME_VOLATILITY.get(regime, "moderate")}}
+    alerts = [
+        monitor.generate_contextual_alert(
+            PREDICTED_PATTERNS.get(pattern, pattern),
+            market_context,
+            get_tendency_engine().tendency_for(request.user_id, pattern, regime)
+        )
+        for pattern in prediction["high_risk_predictions"]
+    ]
+    
+    return {
+        "user_id": request.user_id,
+        "market_regime": regime,
+        "tendencies": tendencies,
+        "prediction": prediction,
+        "alerts": alerts
+    }
+
+
+@app.get("/symbols")
+def search_symbols(q: str, limit: int = 10, asset_type: Optional[str] = Query(None, alias="type")):
+    """
+    Autocomplete asset symbols from the offline symbol universe.
+    
+    Matches symbols starting with ``q`` first, then names with a word
+    starting with it (e.g. ``q=app`` finds AAPL). ``type`` narrows results
+    to one asset type (EQUITY, ETF, CRYPTOCURRENCY, CURRENCY, INDEX, FUTURE).
+    """
+    universe = get_symbol_universe()
+    limit = max(1, min(limit, MAX_SYMBOL_RESULTS))
+    return {
+        "query": q,
+        "results": universe.search(q, limit=limit, asset_type=asset_type),
+        "universe_size": universe.size
+    }
+
+
+@app.post("/validate-assets")
+async def validate_assets(request: BulkValidationRequest):
+    """
+    Validate a list of asset symbols (e.g. a watchlist import).
+    
+    Symbols are normalised and de-duplicated; known and cached symbols are
+    answered immediately and the rest are checked together (one batched
+    history download, then concurrent lookups). Returns one result per
+    unique symbol in request order, plus counts per source and timing.
+    """
+    if len(request.symbols) > MAX_BULK_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_SYMBOLS} symbols per request")
+    try:
+        return await run_blocking(validate_asset_symbols, request.symbols, timeout=BULK_VALIDATION_TIMEOUT)
+    except StageTimeoutError as e:
+        logger.warning(f"Bulk validation of {len(request.symbols)} symbols timed out: {e}")
+        raise HTTPException(status_code=504, detail="Timed out validating asset symbols")
+
+
+@app.get("/council/stats")
+def council_stats():
+    """LLM council usage counters (accumulated since startup), debate cache, rate limiter, market data, calendar, prefetch and validation cache stats."""
+    try:
+        engine_stats = get_debate_engine().get_stats()
+    except ValueError as e:
+        engine_stats = {"error": str(e)}
+    
+    return {
+        "engine": engine_stats,
+        "debate_cache": get_debate_cache().get_stats(),
+        "rate_limits": get_rate_limiter_stats(),
+        "narrator_cache": get_summary_cache().get_stats(),
+        "market_data": get_market_data_service().get_stats(),
+        "economic_calendar": get_economic_calendar_service().get_stats(),
+        "prefetch": get_prefetch_scheduler().get_stats(),
+        "validation_cache": get_validation_cache().get_stats(),
+        "tendencies": get_tendency_engine().get_stats()
+    }
+
+
+@app.post("/admin/reload-llm")
+def reload_llm(force: bool = False, x_admin_token: Optional[str] = Header(None)):
+    """
+    Hot-reload LLM API keys and rebuild the shared debate engine if they changed.
+    Requires the ADMIN_TOKEN environment variable and a matching X-Admin-Token header.
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints disabled (ADMIN_TOKEN not set)")
+    if x_admin_token != admin_token:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    
+    try:
+        reloaded = reload_debate_engine(force=force)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "reloaded": reloaded,
+        "engine": get_debate_engine().get_stats()
     }
 
 
@@ -392,7 +933,13 @@ def root():
         "version": "2.0.0",
         "endpoints": {
             "/analyze-asset": "🚀 NEW - Simplified analysis (asset only)",
+            "/analyze-asset/stream": "Same analysis streamed as Server-Sent Events",
             "/run-agents": "Full agent pipeline (custom inputs)",
+            "/behaviour/batch": "Behaviour reports for many users (NDJSON stream)",
+            "/behaviour/predict-risk": "Next-trade risk from session state and historical tendencies",
+            "/validate-assets": "Validate a list of asset symbols at once",
+            "/symbols": "Symbol autocomplete from the offline symbol universe (?q=)",
+            "/council/stats": "LLM council usage and cache statistics",
             "/health": "Health check",
             "/docs": "API documentation"
         },
@@ -405,7 +952,7 @@ def root():
         },
         "features": {
             "economic_calendar": "Automated earnings and economic event tracking",
-            "trade_history": "Automatic trade history fetching (DB integration ready)",
+            "trade_history": "Trade history from the SQLite trade store (pluggable backends)",
             "auto_persona": "Intelligent persona selection based on performance"
         }
     }
@@ -442,7 +989,7 @@ def health_check():
             "persona": "operational" if has_llm_access else "degraded - no API keys",
             "moderator": "operational",
             "economic_calendar": "operational",
-            "trade_history": "operational (synthetic)"
+            "trade_history": "operational"
         }
     }
 
@@ -2,11 +2,25 @@
 Services package initialization.
 """
 
-from .economic_calendar import EconomicCalendarService
+from .economic_calendar import EconomicCalendarService, get_economic_calendar_service
 from .trade_history import TradeHistoryService, get_trade_history_service
+from .trade_store import TradeStore, SQLiteTradeStore, get_trade_store
+from .trade_archive import TradeArchive, get_trade_archive
+from .validation_cache import ValidationCache, get_validation_cache
+from .symbol_universe import SymbolUniverse, get_symbol_universe
 
 __all__ = [
     'EconomicCalendarService',
+    'get_economic_calendar_service',
     'TradeHistoryService',
-    'get_trade_history_service'
+    'get_trade_history_service',
+    'TradeStore',
+    'SQLiteTradeStore',
+    'get_trade_store',
+    'TradeArchive',
+    'get_trade_archive',
+    'ValidationCache',
+    'get_validation_cache',
+    'SymbolUniverse',
+    'get_symbol_universe'
 ]
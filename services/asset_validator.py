@@ -4,11 +4,47 @@ Validates that asset symbols are genuine before processing.
 """
 
 import logging
-from typing import Tuple, Optional
-import yfinance as yf
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple, Optional
+
+from services.market_data import get_market_data_service
+from services.symbol_universe import SymbolUniverse, get_symbol_universe
+from services.validation_cache import ValidationCache, get_validation_cache
 
 logger = logging.getLogger(__name__)
 
+# Concurrent market data checks across all bulk validations
+BULK_VALIDATION_WORKERS = 8
+
+# History window loaded by the batched download (the widest single-symbol check)
+BULK_HISTORY_PERIOD = "1mo"
+
+
+_check_pool: Optional[ThreadPoolExecutor] = None
+_check_pool_lock = threading.Lock()
+
+
+def _get_check_pool() -> ThreadPoolExecutor:
+    """Thread pool for bulk market data checks, shared by every request."""
+    global _check_pool
+    if _check_pool is None:
+        with _check_pool_lock:
+            if _check_pool is None:
+                _check_pool = ThreadPoolExecutor(max_workers=BULK_VALIDATION_WORKERS,
+                                                 thread_name_prefix="validate")
+    return _check_pool
+
+
+def shutdown_check_pool():
+    """Stop the bulk check threads (a later bulk validation starts a new pool)."""
+    global _check_pool
+    with _check_pool_lock:
+        pool, _check_pool = _check_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
 
 class AssetValidationError(Exception):
     """Raised when an asset symbol is invalid."""
@@ -18,8 +54,23 @@ class AssetValidationError(Exception):
 class AssetValidator:
     """Validates asset symbols using yfinance data."""
     
-    def __init__(self):
-        self.cache = {}  # Cache valid symbols to avoid repeated API calls
+    def __init__(self, cache: Optional[ValidationCache] = None, universe: Optional[SymbolUniverse] = None):
+        self._cache = cache  # Shared tiered cache unless one is given
+        self._universe = universe  # Shared offline symbol master unless one is given
+    
+    @property
+    def universe(self) -> SymbolUniverse:
+        """Offline symbol master; symbols in it are valid without a network call."""
+        if self._universe is None:
+            return get_symbol_universe()  # Not pinned, so a refreshed universe is picked up
+        return self._universe
+    
+    @property
+    def cache(self) -> ValidationCache:
+        """Validation results (valid and invalid) shared across requests and processes."""
+        if self._cache is None:
+            self._cache = get_validation_cache()
+        return self._cache
     
     def validate_symbol(self, symbol: str) -> Tuple[bool, Optional[str]]:
         """
@@ -33,32 +84,142 @@ class AssetValidator:
             - (True, None) if valid
             - (False, error_message) if invalid
         """
-        # Quick validation
+        symbol, error_msg = self._normalize(symbol)
+        if error_msg:
+            return False, error_msg
+        
+        # Known symbols are an in-memory lookup
+        if symbol in self.universe:
+            return True, None
+        
+        # Then the cache (holds invalid symbols too)
+        cached = self.cache.get(symbol)
+        if cached is not None:
+            return cached["valid"], cached["error"]
+        
+        is_valid, error_msg, cacheable = self._check_market_data(symbol)
+        if cacheable:
+            self.cache.set(symbol, is_valid, error_msg)
+        return is_valid, error_msg
+    
+    @staticmethod
+    def _normalize(symbol: str) -> Tuple[str, Optional[str]]:
+        """Quick format validation. Returns (normalised symbol, error_message or None)."""
         if not symbol or not isinstance(symbol, str):
-            return False, "Symbol must be a non-empty string"
+            return str(symbol or ""), "Symbol must be a non-empty string"
         
         symbol = symbol.strip().upper()
         
         if len(symbol) == 0:
-            return False, "Symbol cannot be empty"
+            return symbol, "Symbol cannot be empty"
         
         # Allow longer symbols for crypto (e.g., BTC-USD) and forex
         if len(symbol) > 15:
-            return False, f"Symbol '{symbol}' is too long (max 15 characters)"
+            return symbol, f"Symbol '{symbol}' is too long (max 15 characters)"
         
-        # Check cache first
-        if symbol in self.cache:
-            return True, None
+        return symbol, None
+    
+    def validate_symbols(self, symbols: Iterable[str]) -> Dict:
+        """
+        Validate many symbols at once.
+        
+        Symbols are normalised and de-duplicated. Format errors, universe
+        symbols and cached results are answered immediately. The rest share
+        one batched history download; those without history are rejected
+        there, and the others get the full check on the shared pool of
+        ``BULK_VALIDATION_WORKERS`` threads.
         
+        Args:
+            symbols: Asset symbols in any case, duplicates allowed
+            
+        Returns:
+            Dict with results (one per unique symbol, in request order, with
+            symbol, valid, error and source) and stats (counts per source and
+            elapsed_ms)
+        """
+        started = time.perf_counter()
+        symbols = list(symbols)
+        results: Dict[str, Dict] = {}
+        pending: List[str] = []
+        
+        def answer(symbol: str, valid: bool, error: Optional[str], source: str):
+            results[symbol] = {"symbol": symbol, "valid": valid, "error": error, "source": source}
+        
+        universe = self.universe
+        for raw in symbols:
+            symbol, error_msg = self._normalize(raw)
+            if symbol in results:
+                continue
+            if error_msg:
+                answer(symbol, False, error_msg, "format")
+            elif symbol in universe:
+                answer(symbol, True, None, "universe")
+            else:
+                cached = self.cache.get(symbol)
+                if cached is not None:
+                    answer(symbol, cached["valid"], cached["error"], "cache")
+                else:
+                    results[symbol] = None  # Keeps request order
+                    pending.append(symbol)
+        
+        if pending:
+            self._validate_pending(pending, answer)
+        
+        stats = {"requested": len(symbols), "unique": len(results)}
+        for source in ("format", "universe", "cache", "market_data"):
+            stats[source] = sum(1 for r in results.values() if r["source"] == source)
+        stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return {"results": list(results.values()), "stats": stats}
+    
+    def _validate_pending(self, pending: List[str], answer):
+        """Batched history download, then concurrent full checks for symbols that have history."""
+        market_data = get_market_data_service()
+        to_check = pending
+        try:
+            histories = market_data.prefetch_history(pending, BULK_HISTORY_PERIOD)
+            with_history = [s for s in pending if not histories[s].empty]
+            if with_history:
+                to_check = with_history
+                for symbol in pending:
+                    if histories[symbol].empty:
+                        error_msg = f"Symbol '{symbol}' has no trading history"
+                        self.cache.set(symbol, False, error_msg)
+                        answer(symbol, False, error_msg, "market_data")
+            else:
+                # Nothing came back, more likely a failed download than all-unknown symbols
+                for symbol in pending:
+                    market_data.invalidate(symbol)
+        except Exception as e:
+            logger.warning(f"Batched history download failed for {len(pending)} symbols: {e}")
+        
+        def check(symbol: str):
+            is_valid, error_msg, cacheable = self._check_market_data(symbol)
+            if cacheable:
+                self.cache.set(symbol, is_valid, error_msg)
+            return is_valid, error_msg
+        
+        # Shared by concurrent bulk requests, so yfinance sees at most
+        # BULK_VALIDATION_WORKERS checks at a time
+        for symbol, (is_valid, error_msg) in zip(to_check, _get_check_pool().map(check, to_check)):
+            answer(symbol, is_valid, error_msg, "market_data")
+    
+    def _check_market_data(self, symbol: str) -> Tuple[bool, Optional[str], bool]:
+        """
+        Validate a normalised symbol against yfinance.
+        
+        Returns:
+            Tuple of (is_valid, error_message, cacheable); transient failures
+            are not cacheable
+        """
         # Validate using yfinance (open-source Yahoo Finance API)
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            market_data = get_market_data_service()
+            info = market_data.get_info(symbol)
             
             # Check if we got valid data
             # A valid ticker should have at least some basic info
             if not info or len(info) <= 1:
-                return False, f"Symbol '{symbol}' not found or has no data"
+                return False, f"Symbol '{symbol}' not found or has no data", True
             
             # Enhanced validation: Check multiple indicators
             validation_checks = {
@@ -72,35 +233,33 @@ class AssetValidator:
             # Must pass at least 2 validation checks
             passed_checks = sum(validation_checks.values())
             if passed_checks < 2:
-                return False, f"Symbol '{symbol}' does not appear to be a valid asset (insufficient data)"
+                return False, f"Symbol '{symbol}' does not appear to be a valid asset (insufficient data)", True
             
             # Try to get recent price history as additional validation
-            hist = ticker.history(period="5d")
+            hist = market_data.get_history(symbol, "5d")
             
             if hist.empty:
                 # Some assets might not have 5d history, try 1 month for less liquid assets
-                hist = ticker.history(period="1mo")
+                hist = market_data.get_history(symbol, "1mo")
                 if hist.empty:
-                    return False, f"Symbol '{symbol}' has no trading history"
+                    return False, f"Symbol '{symbol}' has no trading history", True
             
             # Additional check: Make sure we have actual price data
             if 'Close' not in hist.columns or hist['Close'].isna().all():
-                return False, f"Symbol '{symbol}' has invalid price data"
+                return False, f"Symbol '{symbol}' has invalid price data", True
             
-            # Cache valid symbol
-            self.cache[symbol] = True
             asset_type = info.get('quoteType', 'UNKNOWN')
             logger.info(f"✓ Symbol '{symbol}' validated successfully (Type: {asset_type})")
             
-            return True, None
+            return True, None, True
             
         except Exception as e:
             error_str = str(e)
             # Provide helpful error messages
             if '404' in error_str or 'Not Found' in error_str:
-                return False, f"Symbol '{symbol}' not found in market data"
+                return False, f"Symbol '{symbol}' not found in market data", True
             logger.warning(f"Validation failed for '{symbol}': {e}")
-            return False, f"Unable to validate symbol '{symbol}'"
+            return False, f"Unable to validate symbol '{symbol}'", False
     
     def validate_or_raise(self, symbol: str) -> str:
         """
@@ -140,6 +299,19 @@ def validate_asset_symbol(symbol: str) -> Tuple[bool, Optional[str]]:
     return _validator.validate_symbol(symbol)
 
 
+def validate_asset_symbols(symbols: Iterable[str]) -> Dict:
+    """
+    Convenience function to validate many symbols at once.
+    
+    Args:
+        symbols: Asset symbols to validate
+        
+    Returns:
+        Dict with per-symbol results and timing stats (see ``AssetValidator.validate_symbols``)
+    """
+    return _validator.validate_symbols(symbols)
+
+
 def validate_asset_or_raise(symbol: str) -> str:
     """
     Convenience function to validate symbol and raise if invalid.
@@ -0,0 +1,343 @@
+"""
+Batch Behaviour Analysis
+Runs end-of-day behaviour reports for many users at once.
+
+Each user's trades go through ``BehaviorMonitorAgent.analyze_session``,
+``NarratorAgent.calculate_risk_score`` and ``assess_market_readiness`` in a
+process pool. Users are sent to workers in chunks, and results are written
+as NDJSON (one JSON object per user) as soon as each chunk finishes. The
+Narrator's LLM summary is only generated when asked for.
+
+Input formats:
+- JSONL with one user per line: {"user_id": "u1", "trades": [...]}
+- JSONL with one trade per line carrying a "user_id" field
+- Parquet with one trade per row and a "user_id" column (needs pyarrow)
+
+Usage:
+    python -m services.batch_behaviour trades.jsonl -o report.ndjson --workers 8
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50
+BATCH_MARKET_CONTEXT = "End-of-day batch report: no live market context available."
+
+UserSession = Tuple[str, List[Dict]]
+
+
+# ============================================================================
+# Worker side - agents are created once per worker process
+# ============================================================================
+
+_monitor = None
+_narrator = None
+
+
+def _get_agents():
+    global _monitor, _narrator
+    if _monitor is None:
+        # The Narrator prints setup warnings; keep them out of NDJSON on stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            from agents.behaviour_agent import BehaviorMonitorAgent
+            from agents.narrator import NarratorAgent
+            _monitor = BehaviorMonitorAgent()
+            _narrator = NarratorAgent()
+    return _monitor, _narrator
+
+
+def summarize_trades(trades: List[Dict]) -> Dict:
+    """Session totals in the shape ``NarratorAgent.generate_session_summary`` expects."""
+    wins = sum(1 for t in trades if t["pnl"] > 0)
+    losses = sum(1 for t in trades if t["pnl"] < 0)
+    return {
+        "total_trades": len(trades),
+        "net_pnl": round(sum(t["pnl"] for t in trades), 2),
+        "win_rate": round((wins / len(trades)) * 100, 1) if trades else 0.0,
+        "wins": wins,
+        "losses": losses,
+    }
+
+
+def analyze_user(user_id: str, trades: List[Dict], include_narrative: bool = False) -> Dict:
+    """
+    Behaviour report for one user.
+
+    Returns:
+        Dict with user_id, trade_summary, insights, risk_score and readiness
+        (plus narrative when requested), or user_id and error on failure
+    """
+    try:
+        monitor, narrator = _get_agents()
+        insights = monitor.analyze_session(trades)
+        risk_score = narrator.calculate_risk_score(insights)
+        trade_summary = summarize_trades(trades)
+
+        result = {
+            "user_id": user_id,
+            "trade_summary": trade_summary,
+            "insights": insights,
+            "risk_score": risk_score,
+            "readiness": narrator.assess_market_readiness(risk_score, insights),
+        }
+        if include_narrative:
+            result["narrative"] = narrator.generate_session_summary(
+                insights, BATCH_MARKET_CONTEXT, trade_summary
+            )
+        return result
+    except Exception as e:
+        return {"user_id": user_id, "error": f"{type(e).__name__}: {e}"}
+
+
+def analyze_chunk(chunk: List[UserSession], include_narrative: bool = False) -> List[Dict]:
+    """Analyze a chunk of users (runs inside a worker process)."""
+    return [analyze_user(user_id, trades, include_narrative) for user_id, trades in chunk]
+
+
+# ============================================================================
+# Input readers
+# ============================================================================
+
+
+def _group_trade_rows(rows: Iterable[Dict]) -> Iterator[UserSession]:
+    """Group flat trade rows by user_id, keeping first-seen user order."""
+    users: Dict[str, List[Dict]] = {}
+    for row in rows:
+        row = dict(row)
+        user_id = str(row.pop("user_id"))
+        users.setdefault(user_id, []).append(row)
+    return iter(users.items())
+
+
+def read_jsonl(path: str) -> Iterator[UserSession]:
+    """
+    Read user sessions from JSONL.
+
+    Files of per-user records are streamed; files of per-trade rows are
+    grouped in memory.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        records = (json.loads(line) for line in f if line.strip())
+        first = next(records, None)
+        if first is None:
+            return
+        if "trades" in first:
+            yield str(first["user_id"]), first["trades"]
+            for record in records:
+                yield str(record["user_id"]), record["trades"]
+        else:
+            rows = [first]
+            rows.extend(records)
+            yield from _group_trade_rows(rows)
+
+
+def read_parquet(path: str) -> Iterator[UserSession]:
+    """Read user sessions from a Parquet file of trade rows."""
+    import pandas as pd
+    from agents.behaviour_engine import TIMESTAMP_FORMAT
+
+    try:
+        frame = pd.read_parquet(path)
+    except ImportError as e:
+        raise ValueError(f"Reading Parquet requires pyarrow (pip install pyarrow): {e}")
+
+    if "user_id" not in frame.columns:
+        raise ValueError("Parquet input needs a 'user_id' column")
+    if pd.api.types.is_datetime64_any_dtype(frame["timestamp"]):
+        frame["timestamp"] = frame["timestamp"].dt.strftime(TIMESTAMP_FORMAT)
+
+    for user_id, group in frame.groupby("user_id", sort=False):
+        yield str(user_id), group.drop(columns="user_id").to_dict("records")
+
+
+def read_sessions(path: str) -> Iterator[UserSession]:
+    """Pick a reader from the file extension (.parquet/.pq, otherwise JSONL)."""
+    if path.lower().endswith((".parquet", ".pq")):
+        return read_parquet(path)
+    return read_jsonl(path)
+
+
+def _chunks(sessions: Iterable[UserSession], size: int) -> Iterator[List[UserSession]]:
+    chunk = []
+    for session in sessions:
+        chunk.append(session)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ============================================================================
+# Process pool
+# ============================================================================
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def _create_pool(workers: int) -> ProcessPoolExecutor:
+    # spawn: worker processes must not inherit the server's threads and sockets
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def get_batch_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool (sized by BATCH_POOL_SIZE, default CPU count)."""
+    global _pool, _pool_size
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = max(1, int(os.getenv("BATCH_POOL_SIZE", str(os.cpu_count() or 2))))
+                _pool = _create_pool(workers)
+                _pool_size = workers
+                logger.info(f"Batch behaviour pool started with {workers} workers")
+    return _pool
+
+
+def shutdown_batch_pool():
+    """Stop the shared process pool, if it was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def run_batch(sessions: Iterable[UserSession],
+              output: IO[str],
+              workers: Optional[int] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              include_narrative: bool = False) -> Dict:
+    """
+    Analyze every session and write one NDJSON line per user to ``output``.
+
+    Results are written in input order. At most two chunks per worker are
+    in flight, so memory stays bounded for arbitrarily large inputs.
+
+    Args:
+        sessions: Iterable of (user_id, trades)
+        output: Text stream to write NDJSON to
+        workers: Worker processes (default CPU count; 0 runs inline)
+        chunk_size: Users per task sent to a worker
+        include_narrative: Also generate the Narrator's LLM summary
+
+    Returns:
+        Dict with users, errors and seconds
+    """
+    workers = (os.cpu_count() or 2) if workers is None else workers
+    started = time.perf_counter()
+    stats = {"users": 0, "errors": 0}
+
+    def write(results: List[Dict]):
+        for result in results:
+            output.write(json.dumps(result, default=str) + "\n")
+            stats["users"] += 1
+            stats["errors"] += "error" in result
+        output.flush()
+
+    if workers == 0:
+        for chunk in _chunks(sessions, chunk_size):
+            write(analyze_chunk(chunk, include_narrative))
+    else:
+        with _create_pool(workers) as pool:
+            pending: deque = deque()
+            for chunk in _chunks(sessions, chunk_size):
+                pending.append(pool.submit(analyze_chunk, chunk, include_narrative))
+                if len(pending) >= workers * 2:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+async def analyze_batch_async(sessions: Iterable[UserSession],
+                              chunk_size: int = DEFAULT_CHUNK_SIZE,
+                              include_narrative: bool = False):
+    """
+    Async generator yielding per-user results from the shared pool, in input order.
+
+    Used by the /behaviour/batch endpoint to stream NDJSON while workers
+    are still busy with later chunks. Narratives are generated here rather
+    than in the workers, on the Narrator's pooled async client and summary
+    cache, concurrently for each chunk.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_batch_pool()
+    pending: deque = deque()
+
+    async def finish(future) -> List[Dict]:
+        results = await future
+        if include_narrative:
+            await _add_narratives(results)
+        return results
+
+    try:
+        for chunk in _chunks(sessions, chunk_size):
+            pending.append(loop.run_in_executor(pool, analyze_chunk, chunk, False))
+            if len(pending) >= _pool_size * 2:
+                for result in await finish(pending.popleft()):
+                    yield result
+        while pending:
+            for result in await finish(pending.popleft()):
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def _add_narratives(results: List[Dict]):
+    """Add the Narrator's summary to each successful result (async, cached, BACKGROUND LLM priority)."""
+    from llm_council.services.rate_limiter import Priority, llm_priority
+    _, narrator = _get_agents()
+
+    async def add(result: Dict):
+        result["narrative"] = await narrator.generate_session_summary_async(
+            result["insights"], BATCH_MARKET_CONTEXT, result["trade_summary"]
+        )
+
+    # Batch reports queue behind interactive requests for Groq capacity
+    with llm_priority(Priority.BACKGROUND):
+        await asyncio.gather(*(add(result) for result in results if "error" not in result))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch behaviour analysis for many users")
+    parser.add_argument("input", help="JSONL or Parquet file of user trades")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 = inline)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Users per worker task")
+    parser.add_argument("--narrative", action="store_true", help="Also generate LLM session summaries")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = run_batch(
+            read_sessions(args.input), output,
+            workers=args.workers, chunk_size=args.chunk_size, include_narrative=args.narrative
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"Analyzed {stats['users']} users ({stats['errors']} errors) in {stats['seconds']}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,44 +1,121 @@
 """
 Economic Calendar Service
 Fetches economic events and earnings data that may impact stocks.
+
+Each field is cached per symbol for as long as it stays useful: news for
+minutes, earnings for hours and macro events for a day. Concurrent callers
+for the same field wait for one fetch, so the shared service
+(``get_economic_calendar_service``) fetches a symbol's calendar once per
+refresh window however many pipeline stages ask for it. Fallback values
+after a failed fetch are not cached.
+
+The background prefetch passes ``refresh_within`` to refetch fields that
+would expire before its next run, so requests keep hitting the cache.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import yfinance as yf
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from services.market_data import get_market_data_service
 
 logger = logging.getLogger(__name__)
 
 
 class EconomicCalendarService:
-    """Service to fetch economic events and earnings calendar."""
+    """
+    Service to fetch economic events and earnings calendar.
     
-    def __init__(self):
-        self.cache = {}
-        self.cache_duration = timedelta(hours=1)
+    Attributes:
+        news_ttl (float): Seconds recent news stays cached
+        earnings_ttl (float): Seconds earnings data stays cached
+        macro_ttl (float): Seconds macro events stay cached
+    """
     
-    def get_stock_events(self, symbol: str) -> Dict:
+    def __init__(self, news_ttl: float = 600, earnings_ttl: float = 6 * 3600, macro_ttl: float = 24 * 3600):
+        self.news_ttl = news_ttl
+        self.earnings_ttl = earnings_ttl
+        self.macro_ttl = macro_ttl
+        self._entries: Dict[tuple, tuple] = {}  # (field, symbol) -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[tuple, threading.Lock] = {}
+        self.stats = {"hits": 0, "misses": 0}
+    
+    def _lookup(self, key: tuple, refresh_within: float = 0):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] - refresh_within <= time.monotonic():
+                return None
+            self.stats["hits"] += 1
+            return entry[0]
+    
+    def _cached(self, field: str, symbol: str, fetch: Callable, fallback: Callable, refresh_within: float = 0):
+        """
+        Cached ``fetch()`` for one field; ``fallback()`` (not cached) if the fetch fails.
+        
+        Entries expiring within ``refresh_within`` seconds are fetched again.
+        """
+        key = (field, symbol.strip().upper())
+        value = self._lookup(key, refresh_within)
+        if value is not None:
+            return value
+        
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+        # One fetch per field and symbol; other threads wait for it and read the cache
+        with fetch_lock:
+            value = self._lookup(key, refresh_within)
+            if value is not None:
+                return value
+            with self._lock:
+                self.stats["misses"] += 1
+            try:
+                value = fetch()
+            except Exception as e:
+                logger.warning(f"Could not fetch {field} for {symbol}: {e}")
+                return fallback()
+            with self._lock:
+                self._entries[key] = (value, time.monotonic() + getattr(self, f"{field}_ttl"))
+            return value
+    
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached calendar data for one symbol, or everything when ``symbol`` is None."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                symbol = symbol.strip().upper()
+                for key in [k for k in self._entries if k[1] == symbol]:
+                    del self._entries[key]
+    
+    def get_stats(self) -> dict:
+        """Cache hits, misses and cached fields."""
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries))
+    
+    def get_stock_events(self, symbol: str, refresh_within: float = 0) -> Dict:
         """
         Get upcoming economic events and earnings for a stock.
         
         Args:
             symbol: Stock ticker symbol
+            refresh_within: Refetch cached fields expiring within this many seconds
             
         Returns:
             Dict with earnings, news, and economic indicators
         """
         try:
-            ticker = yf.Ticker(symbol)
-            
             # Get earnings dates
-            earnings = self._get_earnings_calendar(ticker, symbol)
+            earnings = self._get_earnings_calendar(symbol, refresh_within)
             
             # Get recent news
-            news = self._get_recent_news(ticker)
+            news = self._get_recent_news(symbol, refresh_within)
             
             # Get economic indicators (for major indices)
-            economic_events = self._get_economic_indicators(symbol)
+            economic_events = self._get_economic_indicators(symbol, refresh_within)
             
             return {
                 "symbol": symbol,
@@ -52,55 +129,55 @@ class EconomicCalendarService:
             logger.error(f"Error fetching events for {symbol}: {e}")
             return self._get_fallback_events(symbol)
     
-    def _get_earnings_calendar(self, ticker, symbol: str) -> Dict:
-        """Get earnings dates and estimates."""
-        try:
-            info = ticker.info
-            
-            earnings_data = {
-                "next_earnings_date": info.get("earningsDate"),
-                "last_earnings_date": info.get("mostRecentQuarter"),
-                "earnings_estimate": {
-                    "eps_estimate": info.get("forwardEps"),
-                    "revenue_estimate": info.get("revenueEstimate")
-                },
-                "last_reported": {
-                    "eps": info.get("trailingEps"),
-                    "revenue": info.get("totalRevenue"),
-                    "earnings_surprise": info.get("earningsSurprise")
-                }
-            }
-            
-            return earnings_data
-            
-        except Exception as e:
-            logger.warning(f"Could not fetch earnings for {symbol}: {e}")
-            return {
-                "next_earnings_date": None,
-                "status": "No upcoming earnings data available"
+    def _get_earnings_calendar(self, symbol: str, refresh_within: float = 0) -> Dict:
+        """Get earnings dates and estimates (cached for ``earnings_ttl``)."""
+        return self._cached("earnings", symbol, lambda: self._fetch_earnings(symbol), lambda: {
+            "next_earnings_date": None,
+            "status": "No upcoming earnings data available"
+        }, refresh_within)
+    
+    def _fetch_earnings(self, symbol: str) -> Dict:
+        info = get_market_data_service().get_info(symbol)
+        if not info:
+            raise ValueError("no quote data")
+        
+        return {
+            "next_earnings_date": info.get("earningsDate"),
+            "last_earnings_date": info.get("mostRecentQuarter"),
+            "earnings_estimate": {
+                "eps_estimate": info.get("forwardEps"),
+                "revenue_estimate": info.get("revenueEstimate")
+            },
+            "last_reported": {
+                "eps": info.get("trailingEps"),
+                "revenue": info.get("totalRevenue"),
+                "earnings_surprise": info.get("earningsSurprise")
             }
+        }
     
-    def _get_recent_news(self, ticker) -> List[Dict]:
-        """Get recent news headlines."""
-        try:
-            news = ticker.news[:5]  # Get top 5 news items
-            
-            formatted_news = []
-            for item in news:
-                formatted_news.append({
-                    "title": item.get("title", ""),
-                    "publisher": item.get("publisher", ""),
-                    "link": item.get("link", ""),
-                    "published": item.get("providerPublishTime")
-                })
-            
-            return formatted_news
-            
-        except Exception as e:
-            logger.warning(f"Could not fetch news: {e}")
-            return []
+    def _get_recent_news(self, symbol: str, refresh_within: float = 0) -> List[Dict]:
+        """Get recent news headlines (cached for ``news_ttl``)."""
+        return self._cached("news", symbol, lambda: self._fetch_news(symbol), list, refresh_within)
+    
+    def _fetch_news(self, symbol: str) -> List[Dict]:
+        news = get_market_data_service().get_news(symbol)[:5]  # Get top 5 news items
+        
+        formatted_news = []
+        for item in news:
+            formatted_news.append({
+                "title": item.get("title", ""),
+                "publisher": item.get("publisher", ""),
+                "link": item.get("link", ""),
+                "published": item.get("providerPublishTime")
+            })
+        
+        return formatted_news
+    
+    def _get_economic_indicators(self, symbol: str, refresh_within: float = 0) -> List[str]:
+        """Get relevant economic indicators (cached for ``macro_ttl``)."""
+        return self._cached("macro", symbol, lambda: self._fetch_economic_indicators(symbol), list, refresh_within)
     
-    def _get_economic_indicators(self, symbol: str) -> List[str]:
+    def _fetch_economic_indicators(self, symbol: str) -> List[str]:
         """
         Get relevant economic indicators based on asset type.
         This is a simplified version - can be enhanced with real API.
@@ -150,11 +227,16 @@ class EconomicCalendarService:
             "timestamp": datetime.utcnow().isoformat()
         }
     
-    def get_market_summary(self, symbol: str) -> str:
+    def get_market_summary(self, symbol: str, events: Optional[Dict] = None) -> str:
         """
         Generate a text summary of economic events for LLM consumption.
+        
+        Args:
+            symbol: Stock ticker symbol
+            events: Result of ``get_stock_events`` if already fetched
         """
-        events = self.get_stock_events(symbol)
+        if events is None:
+            events = self.get_stock_events(symbol)
         
         summary_parts = []
         
@@ -175,3 +257,22 @@ class EconomicCalendarService:
             summary_parts.append(f"Recent headlines: {'; '.join(headlines)}")
         
         return " | ".join(summary_parts) if summary_parts else "No major economic events identified"
+
+
+# Singleton instance
+_economic_calendar_service = None
+_economic_calendar_lock = threading.Lock()
+
+
+def get_economic_calendar_service() -> EconomicCalendarService:
+    """Get singleton instance of EconomicCalendarService (TTLs from ECONOMIC_CALENDAR_*_TTL)."""
+    global _economic_calendar_service
+    if _economic_calendar_service is None:
+        with _economic_calendar_lock:
+            if _economic_calendar_service is None:
+                _economic_calendar_service = EconomicCalendarService(
+                    news_ttl=float(os.getenv("ECONOMIC_CALENDAR_NEWS_TTL", "600")),
+                    earnings_ttl=float(os.getenv("ECONOMIC_CALENDAR_EARNINGS_TTL", "21600")),
+                    macro_ttl=float(os.getenv("ECONOMIC_CALENDAR_MACRO_TTL", "86400")),
+                )
+    return _economic_calendar_service
@@ -0,0 +1,138 @@
+"""
+Blocking Call Executor
+Runs blocking work (yfinance, requests-based agents) off the asyncio event loop.
+
+All synchronous agent ``run()`` methods and yfinance calls made from async
+code go through one bounded thread pool, so a slow upstream only ties up a
+worker thread instead of freezing every request on the uvicorn worker.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 16
+
+
+class StageTimeoutError(Exception):
+    """Raised when a blocking call exceeds its timeout."""
+    pass
+
+
+class BlockingExecutor:
+    """
+    Bounded thread pool for blocking calls made from async code.
+
+    A pool size of 0 runs calls inline on the event loop (the legacy
+    behaviour), which is only useful for debugging and benchmarks.
+
+    Note:
+        A timed-out call cannot be interrupted; its worker thread stays busy
+        until the underlying call returns. Upstream calls should still carry
+        their own network timeouts.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_POOL_SIZE):
+        self.max_workers = max_workers
+        self._pool = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="blocking")
+            if max_workers > 0 else None
+        )
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run ``func(*args, **kwargs)`` in the pool and await its result.
+
+        Args:
+            func: Blocking callable
+            timeout: Optional timeout in seconds
+
+        Returns:
+            The callable's return value
+
+        Raises:
+            StageTimeoutError: If the call does not finish within ``timeout``
+        """
+        call = functools.partial(func, *args, **kwargs)
+
+        if self._pool is None:
+            return call()
+
+        # Carry context variables (e.g. LLM request priority) into the worker
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool, context.run, call)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            name = getattr(func, "__qualname__", repr(func))
+            raise StageTimeoutError(f"{name} timed out after {timeout}s")
+
+    def shutdown(self, wait: bool = False):
+        """Shut down the worker threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+
+
+# Singleton instance
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_blocking_executor() -> BlockingExecutor:
+    """Get singleton instance of BlockingExecutor (sized by BLOCKING_POOL_SIZE)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                size = int(os.getenv("BLOCKING_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+                _executor = BlockingExecutor(max_workers=size)
+                logger.info(f"Blocking executor started with {size} workers")
+    return _executor
+
+
+def configure_blocking_executor(max_workers: int) -> BlockingExecutor:
+    """Replace the singleton executor with one of a different size."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = BlockingExecutor(max_workers=max_workers)
+    return _executor
+
+
+def shutdown_blocking_executor():
+    """Stop the shared executor, if it was started (a later call starts a new one)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+async def run_blocking(
+    func: Callable[..., Any],
+    *args,
+    timeout: Optional[float] = None,
+    **kwargs
+) -> Any:
+    """
+    Convenience function to run a blocking call on the shared executor.
+
+    Usage:
+        info = await run_blocking(validate_asset_symbol, "AAPL", timeout=15)
+    """
+    return await get_blocking_executor().run(func, *args, timeout=timeout, **kwargs)
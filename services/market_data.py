@@ -0,0 +1,321 @@
+"""
+Market Data Service
+One shared yfinance access layer with an in-memory time-series cache.
+
+Every consumer in a request (asset validation, the debate's price data, the
+economic calendar, VIX and volatility metrics) asks this service instead of
+creating its own ``yf.Ticker``. The service:
+- Shares one ``Ticker`` object per symbol
+- Caches ``info``, ``news`` and daily OHLCV history with separate TTLs
+- Fetches history once for the widest window consumers need and answers
+  shorter windows by slicing it
+- Batches multi-symbol history requests into a single ``yf.download`` call
+- Lets concurrent threads asking for the same data share one fetch
+- Keeps at most ``max_tickers`` Ticker objects and ``max_entries`` cached
+  results, evicting the least recently used
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+# Widest history window any consumer needs (30d volatility, 1mo validation)
+DEFAULT_HISTORY_PERIOD = "3mo"
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+
+def period_to_days(period: str) -> int:
+    """Approximate calendar days covered by a yfinance period string ("5d", "1mo", "1y")."""
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period '{period}'")
+    count, unit = int(match.group(1)), match.group(2)
+    return count * {"d": 1, "wk": 7, "mo": 31, "y": 366}[unit]
+
+
+def slice_history(history: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    Slice a daily history down to ``period``.
+
+    As with ``Ticker.history``, "Nd" means the last N trading days (rows);
+    week/month/year periods are calendar windows ending at the last bar.
+    """
+    if history.empty:
+        return history
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period '{period}'")
+    if match.group(2) == "d":
+        return history.iloc[-int(match.group(1)):]
+    cutoff = history.index[-1] - pd.Timedelta(days=period_to_days(period))
+    return history[history.index > cutoff]
+
+
+class MarketDataService:
+    """
+    Shared, cached yfinance access.
+
+    Attributes:
+        info_ttl (float): Seconds ``Ticker.info`` results stay fresh
+        history_ttl (float): Seconds daily history stays fresh
+        news_ttl (float): Seconds news stays fresh
+        empty_ttl (float): Seconds an empty result (unknown symbol) is cached
+        history_period (str): Window fetched for every history miss
+        max_tickers (int): Shared ``Ticker`` objects kept
+        max_entries (int): Cached results kept (info, news and history per symbol)
+    """
+
+    def __init__(self,
+                 info_ttl: float = 900,
+                 history_ttl: float = 300,
+                 news_ttl: float = 600,
+                 empty_ttl: float = 60,
+                 history_period: str = DEFAULT_HISTORY_PERIOD,
+                 max_tickers: int = 512,
+                 max_entries: int = 2048):
+        self.info_ttl = info_ttl
+        self.history_ttl = history_ttl
+        self.news_ttl = news_ttl
+        self.empty_ttl = empty_ttl
+        self.history_period = history_period
+        self.max_tickers = max_tickers
+        self.max_entries = max_entries
+
+        self._tickers: "OrderedDict[str, yf.Ticker]" = OrderedDict()
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # (kind, symbol) -> (value, stored_at, ttl, days)
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[tuple, list] = {}  # key -> [lock, threads using it]
+        self.stats = {"hits": 0, "misses": 0, "batched_downloads": 0}
+
+    # ---------------------------------------------------------------- tickers
+
+    def get_ticker(self, symbol: str) -> yf.Ticker:
+        """Get the shared ``Ticker`` object for a symbol."""
+        symbol = symbol.strip().upper()
+        with self._lock:
+            ticker = self._tickers.get(symbol)
+            if ticker is None:
+                ticker = yf.Ticker(symbol)
+                self._tickers[symbol] = ticker
+                while len(self._tickers) > self.max_tickers:
+                    self._tickers.popitem(last=False)
+            else:
+                self._tickers.move_to_end(symbol)
+            return ticker
+
+    # ---------------------------------------------------------------- cache plumbing
+
+    def _lookup(self, key: tuple, min_days: int = 0):
+        """Return a fresh cached entry's value, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at, ttl, days = entry
+            if time.monotonic() - stored_at >= ttl or days < min_days:
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def _store(self, key: tuple, value, ttl: float, days: int = 0):
+        empty = value is None or (hasattr(value, "__len__") and len(value) == 0)
+        with self._lock:
+            self._entries[key] = (value, time.monotonic(), self.empty_ttl if empty else ttl, days)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @contextmanager
+    def _fetch_lock(self, key: tuple):
+        """Hold the per-key fetch lock; it is dropped once no thread uses it."""
+        with self._lock:
+            holder = self._fetch_locks.get(key)
+            if holder is None:
+                holder = self._fetch_locks[key] = [threading.Lock(), 0]
+            holder[1] += 1
+        try:
+            with holder[0]:
+                yield
+        finally:
+            with self._lock:
+                holder[1] -= 1
+                if holder[1] == 0:
+                    del self._fetch_locks[key]
+
+    def _get_or_fetch(self, key: tuple, fetch: Callable, ttl: float, days: int = 0, min_days: int = 0):
+        value = self._lookup(key, min_days)
+        if value is not None:
+            return value
+
+        # One fetch per key; other threads wait for it and read the cache
+        with self._fetch_lock(key):
+            value = self._lookup(key, min_days)
+            if value is not None:
+                return value
+            with self._lock:
+                self.stats["misses"] += 1
+            value = fetch()
+            self._store(key, value, ttl, days)
+            return value
+
+    # ---------------------------------------------------------------- public API
+
+    def get_info(self, symbol: str) -> Dict:
+        """``Ticker.info`` for a symbol (cached for ``info_ttl``)."""
+        symbol = symbol.strip().upper()
+        return self._get_or_fetch(
+            ("info", symbol),
+            lambda: self.get_ticker(symbol).info or {},
+            self.info_ttl,
+        )
+
+    def get_news(self, symbol: str) -> List[Dict]:
+        """``Ticker.news`` for a symbol (cached for ``news_ttl``)."""
+        symbol = symbol.strip().upper()
+        return self._get_or_fetch(
+            ("news", symbol),
+            lambda: list(self.get_ticker(symbol).news or []),
+            self.news_ttl,
+        )
+
+    def get_history(self, symbol: str, period: str = "5d") -> pd.DataFrame:
+        """
+        Daily OHLCV history for ``period``.
+
+        The first request for a symbol fetches ``history_period`` (or
+        ``period`` if wider) and later requests slice the cached frame.
+        """
+        symbol = symbol.strip().upper()
+        needed = period_to_days(period)
+        fetch_period = period if needed > period_to_days(self.history_period) else self.history_period
+
+        history = self._get_or_fetch(
+            ("history", symbol),
+            lambda: self.get_ticker(symbol).history(period=fetch_period),
+            self.history_ttl,
+            days=period_to_days(fetch_period),
+            min_days=needed,
+        )
+        return slice_history(history, period)
+
+    def prefetch_history(self,
+                         symbols: Iterable[str],
+                         period: Optional[str] = None,
+                         refresh: bool = False,
+                         ttl: Optional[float] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Load daily history for several symbols with one ``yf.download`` call.
+
+        Symbols that are already cached are not downloaded again unless
+        ``refresh`` is set; until the download finishes, readers keep getting
+        the cached frames. A refresh never replaces cached history with an
+        empty frame.
+
+        Args:
+            symbols: Symbols to load
+            period: Window callers need (``history_period`` if not given)
+            refresh: Download every symbol, cached or not
+            ttl: Seconds the downloaded frames stay fresh (``history_ttl`` if not given)
+
+        Returns:
+            Dict mapping each symbol to its history for ``period``
+
+        Raises:
+            ValueError: A refresh download returned no data for any symbol
+                (the cache is left as it was)
+        """
+        period = period or self.history_period
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        needed = period_to_days(period)
+        fetch_period = period if needed > period_to_days(self.history_period) else self.history_period
+
+        missing = symbols if refresh else [s for s in symbols if self._lookup(("history", s), needed) is None]
+        if missing:
+            with self._lock:
+                self.stats["misses"] += len(missing)
+                self.stats["batched_downloads"] += 1
+            logger.info(f"Batch downloading {fetch_period} history for {len(missing)} symbols")
+            frame = yf.download(
+                missing,
+                period=fetch_period,
+                group_by="ticker",
+                auto_adjust=True,
+                progress=False,
+                threads=True,
+            )
+            histories = {symbol: self._split_download(frame, symbol) for symbol in missing}
+            if refresh and all(history.empty for history in histories.values()):
+                # More likely a failed download than all-unknown symbols
+                raise ValueError(f"History refresh for {len(missing)} symbols returned no data")
+            for symbol, history in histories.items():
+                if refresh and history.empty and self._has_history(symbol):
+                    continue  # Keep the cached frame until it expires
+                self._store(("history", symbol), history,
+                            self.history_ttl if ttl is None else ttl, days=period_to_days(fetch_period))
+
+        return {symbol: self.get_history(symbol, period) for symbol in symbols}
+
+    def _has_history(self, symbol: str) -> bool:
+        """Whether a non-empty history frame is cached for ``symbol`` (fresh or not)."""
+        with self._lock:
+            entry = self._entries.get(("history", symbol))
+        return entry is not None and not entry[0].empty
+
+    @staticmethod
+    def _split_download(frame: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """Extract one symbol's columns from a ``yf.download`` result."""
+        if frame is None or frame.empty:
+            return pd.DataFrame()
+        if isinstance(frame.columns, pd.MultiIndex):
+            if symbol not in frame.columns.get_level_values(0):
+                return pd.DataFrame()
+            frame = frame[symbol]
+        return frame.dropna(how="all")
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached data for one symbol, or everything when ``symbol`` is None."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                symbol = symbol.strip().upper()
+                for key in [k for k in self._entries if k[1] == symbol]:
+                    del self._entries[key]
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        with self._lock:
+            return {"entries": len(self._entries), "tickers": len(self._tickers),
+                    "fetch_locks": len(self._fetch_locks), **self.stats}
+
+
+# Singleton instance
+_market_data_service = None
+_market_data_lock = threading.Lock()
+
+
+def get_market_data_service() -> MarketDataService:
+    """Get singleton instance of MarketDataService (TTLs from MARKET_DATA_*_TTL, size from MARKET_DATA_MAX_ENTRIES)."""
+    global _market_data_service
+    if _market_data_service is None:
+        with _market_data_lock:
+            if _market_data_service is None:
+                _market_data_service = MarketDataService(
+                    info_ttl=float(os.getenv("MARKET_DATA_INFO_TTL", "900")),
+                    history_ttl=float(os.getenv("MARKET_DATA_HISTORY_TTL", "300")),
+                    news_ttl=float(os.getenv("MARKET_DATA_NEWS_TTL", "600")),
+                    max_entries=int(os.getenv("MARKET_DATA_MAX_ENTRIES", "2048")),
+                )
+    return _market_data_service
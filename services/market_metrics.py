@@ -6,7 +6,8 @@ Calculates VIX, market regime, and risk index dynamically based on market data a
 import logging
 from typing import Dict, List, Optional
 from datetime import datetime
-import yfinance as yf
+
+from services.market_data import get_market_data_service
 
 logger = logging.getLogger(__name__)
 
@@ -19,22 +20,28 @@ class MarketMetricsService:
         self.cache_timestamp = None
         self.cache_duration_seconds = 300  # Cache for 5 minutes
     
-    def get_vix(self) -> float:
+    def get_vix(self, refresh: bool = False) -> float:
         """
         Fetch current VIX (CBOE Volatility Index) value.
         
+        Args:
+            refresh: Ignore the cached value (the background prefetch uses this)
+            
         Returns:
             Current VIX value, or fallback if unavailable
         """
         # Check cache
-        if (self.vix_cache is not None and 
+        if (not refresh and
+            self.vix_cache is not None and 
             self.cache_timestamp is not None and
             (datetime.now() - self.cache_timestamp).total_seconds() < self.cache_duration_seconds):
             return self.vix_cache
         
+        market_data = get_market_data_service()
         try:
-            ticker = yf.Ticker("^VIX")
-            hist = ticker.history(period="1d")
+            # One batched download covers both VIX and the SPY fallback
+            market_data.prefetch_history(["^VIX", "SPY"])
+            hist = market_data.get_history("^VIX", "1d")
             
             if not hist.empty:
                 vix_value = float(hist['Close'].iloc[-1])
@@ -47,8 +54,7 @@ class MarketMetricsService:
         
         # Fallback: estimate based on SPY volatility
         try:
-            spy = yf.Ticker("SPY")
-            spy_hist = spy.history(period="30d")
+            spy_hist = market_data.get_history("SPY", "30d")
             
             if not spy_hist.empty:
                 returns = spy_hist['Close'].pct_change().dropna()
@@ -171,8 +177,7 @@ class MarketMetricsService:
             Annualized volatility percentage
         """
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period)
+            hist = get_market_data_service().get_history(symbol, period)
             
             if not hist.empty and len(hist) > 5:
                 returns = hist['Close'].pct_change().dropna()
@@ -187,7 +192,9 @@ class MarketMetricsService:
     def get_all_metrics(
         self,
         symbol: str,
-        agent_data: Optional[Dict] = None
+        agent_data: Optional[Dict] = None,
+        vix: Optional[float] = None,
+        volatility: Optional[float] = None
     ) -> Dict:
         """
         Get all market metrics in one call.
@@ -195,13 +202,17 @@ class MarketMetricsService:
         Args:
             symbol: Stock ticker for volatility calculation
             agent_data: Optional agent analysis data
+            vix: Optional pre-fetched VIX value (skips the VIX fetch)
+            volatility: Optional pre-fetched asset volatility (skips the history fetch)
             
         Returns:
             Dict with VIX, market_regime, risk_index, and volatility
         """
-        vix = self.get_vix()
+        if vix is None:
+            vix = self.get_vix()
         regime = self.get_market_regime(vix)
-        volatility = self.get_market_volatility(symbol)
+        if volatility is None:
+            volatility = self.get_market_volatility(symbol)
         risk_index = self.calculate_risk_index(vix, agent_data, volatility)
         
         return {
@@ -0,0 +1,186 @@
+"""
+Prefetch Scheduler
+Keeps market data for a watchlist of popular symbols warm in the shared caches.
+
+Each cycle:
+- Downloads daily history for the whole watchlist (plus ^VIX and SPY) in
+  one ``yf.download`` call. Debate quotes (``DebateEngine._get_market_data``)
+  and asset volatility are computed from this cached history.
+- Recomputes VIX
+- Refetches calendar fields (news, earnings, macro events) that would
+  expire before the next cycle, on a small thread pool of its own
+
+Cycles run every ``market_interval`` seconds while US markets are open and
+every ``closed_interval`` seconds otherwise, on a thread of their own
+(``run_cycle``) so they never hold a slot of the shared blocking executor. Prefetched history stays fresh
+until the next cycle, so interactive requests for watchlist symbols are
+answered from the cache. Exchange holidays count as open days.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as dtime, timezone
+from typing import Iterable, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from services.economic_calendar import get_economic_calendar_service
+from services.market_data import get_market_data_service
+from services.market_metrics import get_market_metrics_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCHLIST = (
+    "SPY", "QQQ", "DIA", "IWM", "AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "META",
+    "TSLA", "AMD", "NFLX", "JPM", "BAC", "XOM", "BTC-USD", "ETH-USD", "GLD", "TLT",
+)
+
+# Symbols the VIX calculation reads
+MARKET_SYMBOLS = ("^VIX", "SPY")
+
+# Extra seconds prefetched data stays fresh after the next cycle is due
+FRESHNESS_MARGIN = 60
+
+MARKET_OPEN = dtime(9, 30)
+MARKET_CLOSE = dtime(16, 0)
+
+try:
+    MARKET_TIMEZONE = ZoneInfo("America/New_York")
+except ZoneInfoNotFoundError:  # No tz database (e.g. Windows without tzdata)
+    MARKET_TIMEZONE = None
+
+
+def market_is_open(now: Optional[datetime] = None) -> bool:
+    """Whether US equity markets are in their regular session (weekdays 9:30-16:00 New York time)."""
+    if MARKET_TIMEZONE is None:
+        return True  # Refresh at the faster cadence rather than let caches go stale
+    now = (now or datetime.now(timezone.utc)).astimezone(MARKET_TIMEZONE)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+class PrefetchScheduler:
+    """
+    Refreshes watchlist market data ahead of requests.
+
+    Attributes:
+        watchlist (List[str]): Symbols kept warm
+        market_interval (float): Seconds between cycles while markets are open
+        closed_interval (float): Seconds between cycles otherwise
+        workers (int): Concurrent calendar fetches per cycle
+        cycle_timeout (float): Seconds ``run_cycle`` waits for a cycle
+    """
+
+    def __init__(self,
+                 watchlist: Iterable[str] = DEFAULT_WATCHLIST,
+                 market_interval: float = 240,
+                 closed_interval: float = 900,
+                 workers: int = 4,
+                 cycle_timeout: float = 180):
+        self.watchlist: List[str] = list(dict.fromkeys(s.strip().upper() for s in watchlist if s and s.strip()))
+        self.market_interval = market_interval
+        self.closed_interval = closed_interval
+        self.workers = workers
+        self.cycle_timeout = cycle_timeout
+        self._cycle_thread: Optional[ThreadPoolExecutor] = None
+        self.stats = {"cycles": 0, "failed_cycles": 0, "history_errors": 0, "calendar_errors": 0,
+                      "last_cycle_at": None, "last_cycle_seconds": None}
+
+    def interval(self, now: Optional[datetime] = None) -> float:
+        """Seconds until the next cycle."""
+        return self.market_interval if market_is_open(now) else self.closed_interval
+
+    def refresh_once(self, now: Optional[datetime] = None) -> dict:
+        """
+        Run one prefetch cycle (blocking).
+
+        Returns:
+            Dict with the symbols refreshed, calendar errors and elapsed seconds
+        """
+        started = time.perf_counter()
+        horizon = self.interval(now) + FRESHNESS_MARGIN
+        try:
+            try:
+                get_market_data_service().prefetch_history(
+                    list(MARKET_SYMBOLS) + self.watchlist, refresh=True, ttl=horizon
+                )
+            except Exception as e:
+                # Cached history is kept; still refresh the calendar
+                self.stats["history_errors"] += 1
+                logger.warning(f"Watchlist history refresh failed: {e}")
+            else:
+                get_market_metrics_service().get_vix(refresh=True)
+
+            calendar = get_economic_calendar_service()
+
+            def refresh_calendar(symbol: str) -> bool:
+                try:
+                    calendar.get_stock_events(symbol, refresh_within=horizon)
+                    return True
+                except Exception as e:
+                    logger.warning(f"Calendar prefetch failed for {symbol}: {e}")
+                    return False
+
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(self.watchlist))),
+                                    thread_name_prefix="prefetch") as pool:
+                calendar_errors = sum(1 for ok in pool.map(refresh_calendar, self.watchlist) if not ok)
+        except Exception:
+            self.stats["failed_cycles"] += 1
+            raise
+
+        elapsed = time.perf_counter() - started
+        self.stats["cycles"] += 1
+        self.stats["calendar_errors"] += calendar_errors
+        self.stats["last_cycle_at"] = datetime.utcnow().isoformat()
+        self.stats["last_cycle_seconds"] = round(elapsed, 2)
+        logger.info(f"Prefetched {len(self.watchlist)} watchlist symbols in {elapsed:.1f}s")
+        return {"symbols": len(self.watchlist), "calendar_errors": calendar_errors, "elapsed_s": round(elapsed, 2)}
+
+    async def run_cycle(self) -> dict:
+        """
+        Run ``refresh_once`` on the scheduler's own thread and wait at most ``cycle_timeout``.
+
+        Context variables (e.g. LLM request priority) are carried into the
+        thread. A cycle that times out keeps running; the next one queues
+        behind it.
+
+        Raises:
+            asyncio.TimeoutError: The cycle did not finish in time
+        """
+        if self._cycle_thread is None:
+            self._cycle_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch-cycle")
+        context = contextvars.copy_context()
+        future = asyncio.get_running_loop().run_in_executor(self._cycle_thread, context.run, self.refresh_once)
+        return await asyncio.wait_for(future, timeout=self.cycle_timeout)
+
+    def shutdown(self):
+        """Stop the cycle thread (a later ``run_cycle`` starts a new one)."""
+        thread, self._cycle_thread = self._cycle_thread, None
+        if thread is not None:
+            thread.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        """Cycle counters and the current cadence."""
+        return dict(self.stats, watchlist=len(self.watchlist), market_open=market_is_open(),
+                    interval=self.interval())
+
+
+# Singleton instance
+_prefetch_scheduler = None
+
+
+def get_prefetch_scheduler() -> PrefetchScheduler:
+    """Get singleton instance of PrefetchScheduler (settings from PREFETCH_*)."""
+    global _prefetch_scheduler
+    if _prefetch_scheduler is None:
+        watchlist = os.getenv("PREFETCH_WATCHLIST", "")
+        _prefetch_scheduler = PrefetchScheduler(
+            watchlist=watchlist.split(",") if watchlist.strip() else DEFAULT_WATCHLIST,
+            market_interval=float(os.getenv("PREFETCH_MARKET_INTERVAL", "240")),
+            closed_interval=float(os.getenv("PREFETCH_CLOSED_INTERVAL", "900")),
+            workers=int(os.getenv("PREFETCH_WORKERS", "4")),
+            cycle_timeout=float(os.getenv("PREFETCH_CYCLE_TIMEOUT", "180")),
+        )
+    return _prefetch_scheduler
@@ -0,0 +1,161 @@
+"""
+Async Result Cache
+TTL + LRU cache for expensive async computations (LLM debates, summaries).
+
+Features:
+- Fresh entries are served directly until ``ttl`` expires
+- Stale entries are served for a further ``stale_ttl`` while one background
+  task recomputes them (stale-while-revalidate) at BACKGROUND LLM priority
+- Concurrent misses for the same key share one in-flight computation
+  (single-flight), so a burst of requests for AAPL runs one debate
+- Least recently used entries are evicted beyond ``max_entries``
+- Failed computations are never cached
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from llm_council.services.rate_limiter import Priority, llm_priority
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncResultCache:
+    """
+    TTL + LRU cache with stale-while-revalidate and single-flight de-duplication.
+
+    Attributes:
+        name (str): Cache name used in logs
+        ttl (float): Seconds an entry is served as fresh
+        stale_ttl (float): Extra seconds a stale entry may be served while refreshing
+        max_entries (int): LRU capacity
+    """
+
+    def __init__(self,
+                 name: str,
+                 ttl: float,
+                 stale_ttl: float = 0.0,
+                 max_entries: int = 256,
+                 should_cache: Optional[Callable[[Any], bool]] = None):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.should_cache = should_cache or (lambda value: True)
+
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refresh_errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    async def get_or_compute(self,
+                             key: Hashable,
+                             compute: Callable[[], Awaitable[Any]],
+                             refresh: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+        """
+        Return the cached value for ``key`` or compute it.
+
+        Args:
+            key: Hashable cache key
+            compute: Zero-argument coroutine function producing the value
+            refresh: Coroutine function used for background refreshes of a
+                stale entry (``compute`` if not given). Pass one when
+                ``compute`` reports progress to the current caller, who has
+                already been answered from the cache by then.
+
+        Returns:
+            Cached or freshly computed value
+        """
+        if not self.enabled:
+            return await compute()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return value
+
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stats["stale_hits"] += 1
+                if self._get_inflight(key) is None:
+                    logger.info(f"[{self.name}] serving stale entry ({age:.0f}s old), refreshing in background")
+                    self._start(key, refresh or compute, background=True)
+                return value
+
+        task = self._get_inflight(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = self._start(key, compute)
+
+        # Shield so one cancelled caller does not cancel the shared computation
+        return await asyncio.shield(task)
+
+    def _get_inflight(self, key: Hashable) -> Optional[asyncio.Task]:
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            return None
+        loop, task = inflight
+        if loop is not asyncio.get_running_loop() or task.done():
+            # Task belongs to another (possibly closed) event loop
+            return None
+        return task
+
+    def _start(self, key: Hashable, compute: Callable[[], Awaitable[Any]], background: bool = False) -> asyncio.Task:
+        async def run():
+            # Refreshes queue behind interactive LLM calls (the task has its own context)
+            priority = llm_priority(Priority.BACKGROUND) if background else contextlib.nullcontext()
+            try:
+                with priority:
+                    value = await compute()
+            except Exception as e:
+                if background:
+                    self.stats["refresh_errors"] += 1
+                    logger.warning(f"[{self.name}] background refresh failed: {e}")
+                raise
+            if self.should_cache(value):
+                self.set(key, value)
+            return value
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._inflight[key] = (asyncio.get_running_loop(), task)
+
+        def done(t: asyncio.Task):
+            if self._inflight.get(key, (None, None))[1] is t:
+                del self._inflight[key]
+            if background and not t.cancelled():
+                t.exception()  # Retrieve so asyncio does not warn about it
+
+        task.add_done_callback(done)
+        return task
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting least recently used entries if needed."""
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one entry, or all entries when ``key`` is None."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        return {"entries": len(self._entries), "inflight": len(self._inflight), **self.stats}
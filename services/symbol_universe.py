@@ -0,0 +1,279 @@
+"""
+Symbol Universe
+Offline symbol master for instant validation and autocomplete.
+
+The universe (equities, ETFs, crypto pairs, forex, indices and futures in
+Yahoo Finance notation) ships as ``services/data/symbols.csv``. It is held
+as sorted NumPy arrays:
+- symbols, searched with ``np.searchsorted`` for exact lookups and prefixes
+- lowercase name words with the row they belong to, for name prefixes
+  ("app" -> AAPL)
+
+``refresh_symbol_universe`` downloads the Nasdaq Trader symbol directory (every US-listed
+stock and ETF), merges it with the shipped non-US-equity rows and writes
+the result to ``SYMBOL_UNIVERSE_PATH``, which later processes load instead
+of the shipped file. The API refreshes it every
+``SYMBOL_UNIVERSE_REFRESH_HOURS`` (0 disables).
+
+Symbols missing from the universe are not rejected; AssetValidator falls
+back to network validation for them.
+"""
+
+import csv
+import io
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+logger = logging.getLogger(__name__)
+
+SHIPPED_PATH = os.path.join(os.path.dirname(__file__), "data", "symbols.csv")
+NASDAQ_TRADED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqtraded.txt"
+FIELDS = ("symbol", "name", "type")
+
+# Types the Nasdaq directory covers; refreshed rows replace the shipped ones
+LISTED_TYPES = ("EQUITY", "ETF")
+
+WORD = re.compile(r"[a-z0-9]+")
+
+
+class SymbolUniverse:
+    """
+    Sorted in-memory symbol master.
+
+    Attributes:
+        size (int): Number of symbols
+        loaded_at (float): Epoch seconds the rows were loaded
+    """
+
+    def __init__(self, rows: Iterable[Dict]):
+        by_symbol = {}
+        for row in rows:
+            symbol = (row.get("symbol") or "").strip().upper()
+            if symbol:
+                by_symbol[symbol] = ((row.get("name") or "").strip(), (row.get("type") or "").strip().upper())
+
+        ordered = sorted(by_symbol)
+        self.types: Tuple[str, ...] = tuple(sorted({kind for _, kind in by_symbol.values()}))
+        type_codes = {kind: code for code, kind in enumerate(self.types)}
+
+        self._symbols = np.array(ordered, dtype=str)
+        self._names = [by_symbol[symbol][0] for symbol in ordered]
+        self._type_codes = np.array([type_codes[by_symbol[symbol][1]] for symbol in ordered], dtype=np.int8)
+
+        words = sorted(
+            (word, row)
+            for row, name in enumerate(self._names)
+            for word in set(WORD.findall(name.lower()))
+        )
+        self._words = np.array([word for word, _ in words], dtype=str)
+        self._word_rows = np.array([row for _, row in words], dtype=np.int32)
+
+        self.size = len(ordered)
+        self.loaded_at = time.time()
+
+    @classmethod
+    def from_csv(cls, path: str) -> "SymbolUniverse":
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls(csv.DictReader(f))
+
+    # ---------------------------------------------------------------- lookups
+
+    def _row(self, index: int) -> Dict:
+        return {
+            "symbol": str(self._symbols[index]),
+            "name": self._names[index],
+            "type": self.types[self._type_codes[index]],
+        }
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.lookup(symbol) is not None
+
+    def lookup(self, symbol: str) -> Optional[Dict]:
+        """The universe row for an exact symbol, or None."""
+        symbol = symbol.strip().upper()
+        index = int(np.searchsorted(self._symbols, symbol))
+        if index < self.size and self._symbols[index] == symbol:
+            return self._row(index)
+        return None
+
+    @staticmethod
+    def _prefix_range(values: np.ndarray, prefix: str) -> Tuple[int, int]:
+        start = int(np.searchsorted(values, prefix, side="left"))
+        stop = int(np.searchsorted(values, prefix + "\uffff", side="left"))
+        return start, stop
+
+    def search(self, query: str, limit: int = 10, asset_type: Optional[str] = None) -> List[Dict]:
+        """
+        Prefix search for autocomplete.
+
+        Exact symbol first, then other symbols starting with the query, then
+        symbols whose name has a word starting with it.
+
+        Args:
+            query: Symbol or name prefix (case-insensitive)
+            limit: Maximum results
+            asset_type: Only return this type (e.g. "ETF")
+        """
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+        wanted = None
+        if asset_type:
+            if asset_type.upper() not in self.types:
+                return []
+            wanted = self.types.index(asset_type.upper())
+
+        rows: List[int] = []
+        seen = set()
+
+        def take(candidates) -> bool:
+            for row in candidates:
+                row = int(row)
+                if row in seen or (wanted is not None and self._type_codes[row] != wanted):
+                    continue
+                seen.add(row)
+                rows.append(row)
+                if len(rows) >= limit:
+                    return True
+            return False
+
+        start, stop = self._prefix_range(self._symbols, query.upper())
+        if not take(range(start, stop)):
+            words = WORD.findall(query.lower())
+            if words:
+                start, stop = self._prefix_range(self._words, words[0])
+                # Shorter names (closer matches) first
+                candidates = sorted(set(self._word_rows[start:stop].tolist()),
+                                    key=lambda row: (len(self._names[row]), row))
+                take(row for row in candidates
+                     if all(any(w.startswith(part) for w in WORD.findall(self._names[row].lower()))
+                            for part in words[1:]))
+        return [self._row(row) for row in rows]
+
+    def get_stats(self) -> dict:
+        """Symbols per type and index memory."""
+        counts = np.bincount(self._type_codes, minlength=len(self.types))
+        return {
+            "symbols": self.size,
+            "types": {kind: int(count) for kind, count in zip(self.types, counts)},
+            "index_bytes": int(self._symbols.nbytes + self._type_codes.nbytes
+                               + self._words.nbytes + self._word_rows.nbytes),
+            "loaded_at": self.loaded_at,
+        }
+
+
+# ============================================================================
+# Refresh
+# ============================================================================
+
+
+def parse_nasdaq_traded(text: str) -> List[Dict]:
+    """
+    Rows from Nasdaq Trader's ``nasdaqtraded.txt`` (pipe-delimited).
+
+    Test issues and symbols Yahoo Finance does not quote (preferreds,
+    warrants with "$" or "=") are dropped; class shares use Yahoo's dash
+    notation (BRK.B -> BRK-B).
+    """
+    rows = []
+    lines = [line for line in text.splitlines() if line and not line.startswith("File Creation Time")]
+    for record in csv.DictReader(io.StringIO("\n".join(lines)), delimiter="|", quoting=csv.QUOTE_NONE):
+        symbol = (record.get("Symbol") or "").strip()
+        if not symbol or record.get("Test Issue") == "Y" or any(c in symbol for c in "$="):
+            continue
+        rows.append({
+            "symbol": symbol.replace(".", "-"),
+            "name": (record.get("Security Name") or "").split(" - ")[0].strip(),
+            "type": "ETF" if record.get("ETF") == "Y" else "EQUITY",
+        })
+    return rows
+
+
+def write_universe(path: str, rows: Iterable[Dict]):
+    """Write universe rows as CSV, replacing ``path`` atomically."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, staging = tempfile.mkstemp(dir=directory, suffix=".csv")
+    with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(staging, path)
+
+
+def refresh_universe(path: str, url: str = NASDAQ_TRADED_URL, timeout: float = 30) -> SymbolUniverse:
+    """
+    Download the listed-securities directory and rebuild the universe file.
+
+    Shipped rows of other types (crypto, forex, indices, futures) are kept.
+
+    Raises:
+        requests.RequestException: The download failed
+        ValueError: The download had no usable rows
+    """
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    listed = parse_nasdaq_traded(response.text)
+    if not listed:
+        raise ValueError(f"No symbols in {url}")
+
+    with open(SHIPPED_PATH, newline="", encoding="utf-8") as f:
+        other = [row for row in csv.DictReader(f) if row["type"] not in LISTED_TYPES]
+    write_universe(path, other + listed)
+    logger.info(f"Symbol universe refreshed: {len(listed)} listed + {len(other)} other symbols")
+    return SymbolUniverse.from_csv(path)
+
+
+def universe_path() -> str:
+    """Where refreshed universes are written (SYMBOL_UNIVERSE_PATH)."""
+    return os.getenv("SYMBOL_UNIVERSE_PATH", os.path.join(tempfile.gettempdir(), "symbol_universe.csv"))
+
+
+def universe_is_stale(max_age_hours: float) -> bool:
+    """Whether the refreshed universe file is missing or older than ``max_age_hours``."""
+    try:
+        return time.time() - os.path.getmtime(universe_path()) > max_age_hours * 3600
+    except OSError:
+        return True
+
+
+# Singleton instance
+_symbol_universe = None
+_symbol_universe_lock = threading.Lock()
+
+
+def get_symbol_universe() -> SymbolUniverse:
+    """Get singleton instance of the symbol universe (refreshed file if present, else the shipped one)."""
+    global _symbol_universe
+    if _symbol_universe is None:
+        with _symbol_universe_lock:
+            if _symbol_universe is None:
+                path = universe_path()
+                try:
+                    _symbol_universe = SymbolUniverse.from_csv(path)
+                except (OSError, csv.Error, KeyError) as e:
+                    if os.path.exists(path):
+                        logger.warning(f"Could not load symbol universe {path}: {e}")
+                    _symbol_universe = SymbolUniverse.from_csv(SHIPPED_PATH)
+                logger.info(f"Symbol universe loaded: {_symbol_universe.size} symbols")
+    return _symbol_universe
+
+
+def refresh_symbol_universe(url: str = NASDAQ_TRADED_URL) -> SymbolUniverse:
+    """Refresh the universe file and swap the singleton to it."""
+    global _symbol_universe
+    universe = refresh_universe(universe_path(), url)
+    with _symbol_universe_lock:
+        _symbol_universe = universe
+    return universe
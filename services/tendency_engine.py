@@ -0,0 +1,270 @@
+"""
+Tendency Engine
+Per-user behaviour pattern frequencies by market regime.
+
+For every user the engine keeps one small integer table: a row per market
+regime (``MarketMetricsService.get_market_regime``) plus an all-regimes
+row, counting sessions and the sessions in which each tracked pattern
+(revenge, FOMO, ego, impulsive) was detected. Tendencies are those counts
+divided by the session count, in the shape
+``BehaviorMonitorAgent.predict_next_risk`` takes as ``historical_tendencies``.
+
+- ``record_session`` adds a closed session in O(1); a session passed with
+  its day is counted once per user and day, however often it is reported
+- ``get_tendencies`` is a dict lookup plus one row read
+- ``refresh_from_archive`` rebuilds users from the trade archive, tagging
+  each past session with the regime of its day from VIX history; it runs as
+  a background job at startup when the archive is configured. Sessions
+  recorded while a user is being rebuilt are added to the rebuilt table.
+"""
+
+import bisect
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from services.trade_archive import TradeArchive, session_insights
+
+logger = logging.getLogger(__name__)
+
+REGIMES = (
+    "ULTRA LOW VOLATILITY",
+    "LOW VOLATILITY",
+    "NORMAL VOLATILITY",
+    "HIGH VOLATILITY",
+    "EXTREME VOLATILITY",
+)
+ALL_REGIMES = len(REGIMES)  # Row index of the all-regimes totals
+
+# Detected pattern -> predict_next_risk tendency key
+TRACKED_PATTERNS = {
+    "Revenge Trading": "revenge_trading_tendency",
+    "FOMO Trading": "fomo_tendency",
+    "Ego Trading": "ego_trading_tendency",
+    "Impulsive Decisions": "impulsive_tendency",
+}
+_PATTERN_COLUMNS = {pattern: column for column, pattern in enumerate(TRACKED_PATTERNS, start=1)}
+
+# predict_next_risk prediction -> detected pattern it anticipates
+PREDICTED_PATTERNS = {
+    "Revenge Trading": "Revenge Trading",
+    "FOMO Trading": "FOMO Trading",
+    "Ego Trading": "Ego Trading",
+    "Impulsive Trading": "Impulsive Decisions",
+}
+
+# Sessions a row needs before its frequencies are trusted
+MIN_SESSIONS = 3
+
+# History used to tag archived sessions with a regime
+REGIME_HISTORY_PERIOD = "5y"
+
+
+def _new_table() -> np.ndarray:
+    # Columns: sessions, then one count per tracked pattern
+    return np.zeros((len(REGIMES) + 1, len(TRACKED_PATTERNS) + 1), dtype=np.int32)
+
+
+def _count_session(table: np.ndarray, insights: List[Dict], regime: Optional[str]):
+    columns = [0] + [_PATTERN_COLUMNS[i["type"]] for i in insights if i.get("type") in _PATTERN_COLUMNS]
+    rows = [ALL_REGIMES]
+    if regime in REGIMES:
+        rows.append(REGIMES.index(regime))
+    for row in rows:
+        table[row, columns] += 1
+
+
+def vix_regime_lookup(period: str = REGIME_HISTORY_PERIOD) -> Callable[[str], Optional[str]]:
+    """
+    Map "YYYY-MM-DD" to the market regime of that day's VIX close.
+
+    Days without a close (weekends, holidays) use the previous trading day.
+    Returns a lookup that always answers None if VIX history is unavailable.
+    """
+    from services.market_data import get_market_data_service
+    from services.market_metrics import get_market_metrics_service
+
+    try:
+        history = get_market_data_service().get_history("^VIX", period)
+    except Exception as e:
+        logger.warning(f"Could not load VIX history for regimes: {e}")
+        return lambda day: None
+    if history.empty:
+        return lambda day: None
+
+    metrics = get_market_metrics_service()
+    days = [index.strftime("%Y-%m-%d") for index in history.index]
+    regimes = [metrics.get_market_regime(float(close)) for close in history["Close"]]
+
+    def lookup(day: str) -> Optional[str]:
+        position = bisect.bisect_right(days, day) - 1
+        return regimes[position] if position >= 0 else None
+
+    return lookup
+
+
+class TendencyEngine:
+    """
+    Lookup table of per-user pattern tendencies by market regime.
+
+    Attributes:
+        min_sessions (int): Sessions a regime needs before its own row is used
+    """
+
+    def __init__(self, min_sessions: int = MIN_SESSIONS):
+        self.min_sessions = min_sessions
+        self._tables: Dict[str, np.ndarray] = {}
+        self._days: Dict[str, Set[str]] = {}  # user -> session days already counted
+        self._rebuilding: Dict[str, list] = {}  # user -> sessions recorded during the rebuild
+        self._lock = threading.Lock()
+
+    def record_session(self, user_id: str, insights: List[Dict], regime: Optional[str] = None,
+                       day: Optional[str] = None) -> bool:
+        """
+        Count a closed session.
+
+        Args:
+            user_id: User identifier
+            insights: The session's insights from ``analyze_session``
+            regime: Market regime during the session (None counts it only
+                towards the all-regimes row)
+            day: Session day ("YYYY-MM-DD"); a day already counted for the
+                user is skipped. Sessions without a day are always counted.
+
+        Returns:
+            Whether the session was counted
+        """
+        with self._lock:
+            if day is not None:
+                days = self._days.setdefault(user_id, set())
+                if day in days:
+                    return False
+                days.add(day)
+            table = self._tables.get(user_id)
+            if table is None:
+                table = self._tables[user_id] = _new_table()
+            _count_session(table, insights, regime)
+            pending = self._rebuilding.get(user_id)
+            if pending is not None:
+                pending.append((insights, regime, day))
+            return True
+
+    def get_tendencies(self, user_id: str, regime: Optional[str] = None) -> Optional[Dict]:
+        """
+        Pattern tendencies for a user, ready for ``predict_next_risk``.
+
+        The regime's own frequencies are used once it has ``min_sessions``
+        sessions, otherwise the user's frequencies across all regimes.
+
+        Returns:
+            Dict with the four tendency keys plus sessions and regime (the row
+            used, "ALL" for the all-regimes row), or None with too little history
+        """
+        table = self._tables.get(user_id)
+        if table is None:
+            return None
+
+        row, label = ALL_REGIMES, "ALL"
+        if regime in REGIMES:
+            index = REGIMES.index(regime)
+            if table[index, 0] >= self.min_sessions:
+                row, label = index, regime
+        counts = table[row].tolist()
+        sessions = counts[0]
+        if sessions < self.min_sessions:
+            return None
+
+        tendencies = {
+            key: round(counts[column] / sessions, 3)
+            for column, key in enumerate(TRACKED_PATTERNS.values(), start=1)
+        }
+        tendencies["sessions"] = sessions
+        tendencies["regime"] = label
+        return tendencies
+
+    def tendency_for(self, user_id: str, pattern: str, regime: Optional[str] = None) -> float:
+        """Tendency (0.0-1.0) for one pattern or prediction name, 0.0 when unknown."""
+        tendencies = self.get_tendencies(user_id, regime)
+        key = TRACKED_PATTERNS.get(PREDICTED_PATTERNS.get(pattern, pattern))
+        if not tendencies or key is None:
+            return 0.0
+        return tendencies[key]
+
+    def rebuild_user(self, user_id: str, archive: TradeArchive,
+                     regime_for_day: Callable[[str], Optional[str]]) -> int:
+        """
+        Recompute a user's table from every archived session.
+
+        Sessions passed to ``record_session`` while the rebuild runs are
+        kept: they are added to the rebuilt table when it replaces the old
+        one, unless the archive already holds their day.
+
+        Returns:
+            Number of sessions counted
+        """
+        with self._lock:
+            self._rebuilding[user_id] = []
+        try:
+            table = _new_table()
+            sessions = session_insights(archive.load(user_id))
+            for session in sessions:
+                _count_session(table, session["insights"], regime_for_day(session["day"]))
+        except Exception:
+            with self._lock:
+                self._rebuilding.pop(user_id, None)
+            raise
+        days = {session["day"] for session in sessions}
+        with self._lock:
+            for insights, regime, day in self._rebuilding.pop(user_id):
+                if day is None or day not in days:
+                    _count_session(table, insights, regime)
+                    if day is not None:
+                        days.add(day)
+            self._tables[user_id] = table
+            self._days[user_id] = days
+        return len(sessions)
+
+    def refresh_from_archive(self, archive: TradeArchive,
+                             regime_for_day: Optional[Callable[[str], Optional[str]]] = None,
+                             users: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Rebuild tendencies for archived users (all of them by default).
+
+        Returns:
+            Dict with users and sessions counted
+        """
+        regime_for_day = regime_for_day or vix_regime_lookup()
+        stats = {"users": 0, "sessions": 0}
+        for user_id in (archive.users() if users is None else users):
+            try:
+                stats["sessions"] += self.rebuild_user(user_id, archive, regime_for_day)
+                stats["users"] += 1
+            except Exception as e:
+                logger.warning(f"Could not rebuild tendencies for {user_id}: {e}")
+        logger.info(f"Tendencies refreshed for {stats['users']} users ({stats['sessions']} sessions)")
+        return stats
+
+    def get_stats(self) -> Dict:
+        """Users tracked and the memory their tables use."""
+        with self._lock:
+            return {
+                "users": len(self._tables),
+                "table_bytes": sum(table.nbytes for table in self._tables.values()),
+            }
+
+
+# Singleton instance
+_tendency_engine = None
+_tendency_engine_lock = threading.Lock()
+
+
+def get_tendency_engine() -> TendencyEngine:
+    """Get singleton instance of the tendency engine."""
+    global _tendency_engine
+    if _tendency_engine is None:
+        with _tendency_engine_lock:
+            if _tendency_engine is None:
+                _tendency_engine = TendencyEngine()
+    return _tendency_engine
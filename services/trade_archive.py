@@ -0,0 +1,372 @@
+"""
+Trade Archive
+Columnar on-disk trade history for long-range behaviour analysis.
+
+Each user's trades are stored per calendar month as one ``.npy`` file per
+column (the ``TradeColumns`` layout: epoch-second timestamps, PnL, symbol
+codes, BUY and OPEN flags) plus the month's symbol table:
+
+    <root>/<user_id>/<YYYY-MM>/ts.npy, pnl.npy, symbol.npy, buy.npy, open.npy, symbols.json
+
+Appends to an existing month are written as new segments in the month
+directory (``seg-*/`` with the same files) instead of rewriting it, so
+ingesting fills one at a time costs the size of the fills. A month is
+compacted back into one partition once it has ``MAX_SEGMENTS`` segments
+or its segments hold as many trades as the compacted part.
+
+Reads memory-map the column files, so a month loads without copying and
+multi-year histories are concatenated by NumPy without building a Python
+object per trade. ``history_trends`` runs the vectorized behaviour engine
+over every archived session to produce the historical risk score and trend
+text that ``NarratorAgent.generate_summary_with_trends`` takes.
+
+The archive is enabled by TRADE_ARCHIVE_DIR; fills recorded through
+TradeHistoryService are then archived as they are ingested.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from agents.behaviour_engine import PATTERNS, TradeColumns, detect_patterns
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("ts", "pnl", "symbol", "buy", "open")
+SYMBOLS_FILE = "symbols.json"
+SEGMENT_PREFIX = "seg-"
+
+# Segments a month may collect before it is compacted
+MAX_SEGMENTS = 32
+
+# Pattern frequency change (relative) reported as a trend
+TREND_MIN_CHANGE = 0.1
+
+
+def _empty_columns() -> TradeColumns:
+    return TradeColumns.from_arrays(
+        np.empty(0), np.empty(0), np.empty(0, dtype=np.int64),
+        np.empty(0, dtype=bool), np.empty(0, dtype=bool), ()
+    )
+
+
+def _concat_columns(parts: List[TradeColumns]) -> TradeColumns:
+    """Concatenate column sets, remapping symbol codes to one shared table."""
+    codes: Dict[str, int] = {}
+    symbols = []
+    for part in parts:
+        remap = np.array([codes.setdefault(name, len(codes)) for name in part.symbol_names], dtype=np.int64)
+        symbols.append(remap[part.symbol])
+
+    return TradeColumns.from_arrays(
+        ts=np.concatenate([p.ts for p in parts]),
+        pnl=np.concatenate([p.pnl for p in parts]),
+        symbol=np.concatenate(symbols),
+        buy=np.concatenate([p.buy for p in parts]),
+        open=np.concatenate([p.open for p in parts]),
+        symbol_names=list(codes),
+    )
+
+
+def _month_keys(ts: np.ndarray) -> np.ndarray:
+    """"YYYY-MM" for each epoch-second timestamp."""
+    return ts.astype("int64").astype("datetime64[s]").astype("datetime64[M]").astype(str)
+
+
+class TradeArchive:
+    """
+    Month-partitioned columnar trade archive.
+
+    Attributes:
+        root (str): Archive directory
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._write_lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    # ---------------------------------------------------------------- layout
+
+    def _user_dir(self, user_id: str) -> str:
+        """
+        Directory for a user; the id is percent-encoded, dots included, so it
+        stays one path component inside the root ("..", "a/b").
+
+        Raises:
+            ValueError: Empty user id
+        """
+        if not user_id:
+            raise ValueError("user_id must be a non-empty string")
+        return os.path.join(self.root, quote(user_id, safe="").replace(".", "%2E"))
+
+    def users(self) -> List[str]:
+        """Archived user ids."""
+        return sorted(unquote(name) for name in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, name)))
+
+    def months(self, user_id: str) -> List[str]:
+        """Archived months ("YYYY-MM") for a user, oldest first."""
+        user_dir = self._user_dir(user_id)
+        if not os.path.isdir(user_dir):
+            return []
+        return sorted(name for name in os.listdir(user_dir) if len(name) == 7 and name[4] == "-")
+
+    # ---------------------------------------------------------------- writes
+
+    def append(self, user_id: str, trades: List[Dict]) -> int:
+        """
+        Archive trades for a user, merging them into their month partitions.
+
+        Trades whose timestamp does not parse are skipped.
+
+        Returns:
+            Number of trades archived
+        """
+        if not trades:
+            return 0
+        columns = TradeColumns.from_trades(trades)
+        valid = ~np.isnan(columns.ts)
+        if not valid.all():
+            logger.warning(f"Skipping {int((~valid).sum())} trades with invalid timestamps for {user_id}")
+
+        months = _month_keys(np.where(valid, columns.ts, 0))
+        with self._write_lock:
+            for month in np.unique(months[valid]):
+                selected = valid & (months == month)
+                self._merge_partition(user_id, str(month), {
+                    "ts": columns.ts[selected],
+                    "pnl": columns.pnl[selected],
+                    "symbol": columns.symbol[selected],
+                    "buy": columns.buy[selected],
+                    "open": columns.open[selected],
+                }, columns.symbol_names)
+        return int(valid.sum())
+
+    def _merge_partition(self, user_id: str, month: str, new: Dict[str, np.ndarray], symbol_names):
+        partition = os.path.join(self._user_dir(user_id), month)
+        # Keep only the symbols this month uses
+        used, new_codes = np.unique(new["symbol"], return_inverse=True)
+        names = [symbol_names[code] for code in used]
+        columns = dict(new, symbol=new_codes.astype(np.int64))
+
+        if not os.path.isdir(partition):
+            self._write_partition(partition, columns, names)
+            return
+
+        # Existing month: add a segment, compact when segments pile up
+        segment = f"{SEGMENT_PREFIX}{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        self._write_partition(os.path.join(partition, segment), columns, names)
+        segments = self._segments(partition)
+        segment_rows = sum(self._rows(path) for path in segments)
+        if len(segments) >= MAX_SEGMENTS or segment_rows >= self._rows(partition):
+            self._compact_partition(partition)
+
+    def _compact_partition(self, partition: str):
+        """Rewrite a month and its segments as one chronological partition."""
+        merged = self._load_month(partition)
+        self._write_partition(partition, {
+            "ts": merged.ts, "pnl": merged.pnl, "symbol": merged.symbol,
+            "buy": merged.buy, "open": merged.open,
+        }, list(merged.symbol_names))
+
+    def compact(self, user_id: str) -> int:
+        """Compact every month of a user that has segments. Returns months compacted."""
+        compacted = 0
+        with self._write_lock:
+            for month in self.months(user_id):
+                partition = os.path.join(self._user_dir(user_id), month)
+                if self._segments(partition):
+                    self._compact_partition(partition)
+                    compacted += 1
+        return compacted
+
+    @staticmethod
+    def _write_partition(partition: str, columns: Dict[str, np.ndarray], symbol_names: List[str]):
+        """Write a partition next to the old one, then swap it in."""
+        staging = f"{partition}.tmp-{uuid.uuid4().hex}"
+        os.makedirs(staging)
+        for name in COLUMNS:
+            np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(columns[name]))
+        with open(os.path.join(staging, SYMBOLS_FILE), "w", encoding="utf-8") as f:
+            json.dump(symbol_names, f)
+
+        # Readers holding memory maps of the old files keep valid mappings
+        retired = None
+        if os.path.isdir(partition):
+            retired = f"{partition}.old-{uuid.uuid4().hex}"
+            os.rename(partition, retired)
+        os.rename(staging, partition)
+        if retired:
+            shutil.rmtree(retired, ignore_errors=True)
+
+    def archive_from_store(self, store, user_id: str) -> int:
+        """Replace a user's archive with everything in the trade store. Returns trades archived."""
+        trades = store.query_trades(user_id, limit=None)
+        with self._write_lock:
+            shutil.rmtree(self._user_dir(user_id), ignore_errors=True)
+        return self.append(user_id, trades)
+
+    # ---------------------------------------------------------------- reads
+
+    @staticmethod
+    def _segments(partition: str) -> List[str]:
+        """A month's appended segments, oldest first."""
+        return [os.path.join(partition, name) for name in sorted(os.listdir(partition))
+                if name.startswith(SEGMENT_PREFIX) and ".tmp-" not in name]
+
+    @staticmethod
+    def _rows(partition: str) -> int:
+        return len(np.load(os.path.join(partition, "ts.npy"), mmap_mode="r"))
+
+    @staticmethod
+    def _load_partition(partition: str) -> TradeColumns:
+        arrays = {name: np.load(os.path.join(partition, f"{name}.npy"), mmap_mode="r") for name in COLUMNS}
+        with open(os.path.join(partition, SYMBOLS_FILE), "r", encoding="utf-8") as f:
+            symbol_names = json.load(f)
+        return TradeColumns.from_arrays(symbol_names=symbol_names, **arrays)
+
+    def _load_month(self, partition: str) -> TradeColumns:
+        """A month's compacted part plus its segments, in chronological order."""
+        segments = self._segments(partition)
+        base = self._load_partition(partition)
+        if not segments:
+            return base
+        merged = _concat_columns([base] + [self._load_partition(path) for path in segments])
+        # Stable: earlier fills keep their place among equal timestamps
+        order = np.argsort(merged.ts, kind="stable")
+        return TradeColumns.from_arrays(
+            ts=merged.ts[order], pnl=merged.pnl[order], symbol=merged.symbol[order],
+            buy=merged.buy[order], open=merged.open[order], symbol_names=merged.symbol_names,
+        )
+
+    def load(self, user_id: str, start_month: Optional[str] = None,
+             end_month: Optional[str] = None) -> TradeColumns:
+        """
+        Load a user's archived trades as chronological columns.
+
+        A single compacted month is returned as read-only memory maps.
+        Several months (or a month with segments) are concatenated column by
+        column, with symbol codes remapped to one shared table.
+
+        Args:
+            user_id: User identifier
+            start_month: First month to include, "YYYY-MM" (inclusive)
+            end_month: Last month to include, "YYYY-MM" (inclusive)
+        """
+        months = [
+            month for month in self.months(user_id)
+            if (start_month is None or month >= start_month) and (end_month is None or month <= end_month)
+        ]
+        partitions = [self._load_month(os.path.join(self._user_dir(user_id), month)) for month in months]
+        if not partitions:
+            return _empty_columns()
+        if len(partitions) == 1:
+            return partitions[0]
+        return _concat_columns(partitions)
+
+
+# ============================================================================
+# Historical trends
+# ============================================================================
+
+
+def session_insights(columns: TradeColumns) -> List[Dict]:
+    """
+    Run the behaviour detectors over each trading day.
+
+    Returns:
+        List of {"day": "YYYY-MM-DD", "trades": int, "insights": [...]} per session
+    """
+    return [
+        {"day": day, "trades": len(session), "insights": detect_patterns(session)}
+        for day, session in columns.split_days()
+    ]
+
+
+def history_trends(columns: TradeColumns,
+                   risk_scorer: Callable[[List[Dict]], int],
+                   recent_sessions: int = 5) -> Dict:
+    """
+    Historical risk score and pattern trends for archived trades.
+
+    The last ``recent_sessions`` trading days are compared with the ones
+    before them: a pattern that became more or less frequent by at least 10%
+    is reported, with positive patterns (e.g. Calculated Risk) counting as an
+    improvement when they grow.
+
+    Args:
+        columns: Chronological trades, e.g. from ``TradeArchive.load``
+        risk_scorer: Scores one session's insights (``NarratorAgent.calculate_risk_score``)
+        recent_sessions: Trading days treated as the current period
+
+    Returns:
+        Dict with sessions, historical_risk_score (None without history) and
+        trend_summary (None when nothing changed), the values
+        ``generate_summary_with_trends`` takes
+    """
+    sessions = session_insights(columns)
+    scores = [risk_scorer(session["insights"]) for session in sessions]
+    result = {
+        "sessions": len(sessions),
+        "historical_risk_score": round(sum(scores) / len(scores)) if scores else None,
+        "trend_summary": None,
+    }
+
+    earlier, recent = sessions[:-recent_sessions], sessions[-recent_sessions:]
+    if not earlier or not recent:
+        return result
+
+    def frequencies(period: List[Dict]) -> Dict[str, float]:
+        counts: Dict[str, int] = {}
+        for session in period:
+            for insight in session["insights"]:
+                counts[insight["type"]] = counts.get(insight["type"], 0) + 1
+        return {pattern: count / len(period) for pattern, count in counts.items()}
+
+    before, now = frequencies(earlier), frequencies(recent)
+    lines = []
+    for pattern, (severity, _) in PATTERNS.items():
+        old, new = before.get(pattern, 0.0), now.get(pattern, 0.0)
+        if old == new:
+            continue
+        if old == 0:
+            hits = round(new * len(recent))
+            marker = "✅ New strength" if severity == "Positive" else "⚠️ New"
+            lines.append(f"{marker}: {pattern} appeared in {hits} of the last {len(recent)} sessions")
+            continue
+        change = (new - old) / old
+        if abs(change) < TREND_MIN_CHANGE:
+            continue
+        improving = (change > 0) == (severity == "Positive")
+        direction = "increased" if change > 0 else "decreased"
+        marker = "✅ Improving" if improving else "⚠️ Worsening"
+        lines.append(f"{marker}: {pattern} {direction} by {abs(change) * 100:.0f}%")
+
+    result["trend_summary"] = "\n".join(lines) or None
+    return result
+
+
+# Singleton instance
+_trade_archive = None
+_trade_archive_lock = threading.Lock()
+
+
+def get_trade_archive() -> Optional[TradeArchive]:
+    """Get singleton instance of the trade archive (None unless TRADE_ARCHIVE_DIR is set)."""
+    global _trade_archive
+    root = os.getenv("TRADE_ARCHIVE_DIR")
+    if _trade_archive is None and root:
+        with _trade_archive_lock:
+            if _trade_archive is None:
+                _trade_archive = TradeArchive(root)
+                logger.info(f"Trade archive opened: {root}")
+    return _trade_archive
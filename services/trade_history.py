@@ -1,125 +1,115 @@
 """
-Trade History Service (Placeholder)
-In production, this would fetch from your database.
-For now, generates synthetic trade history.
+Trade History Service
+Fetches user trade history from the trade store (services/trade_store.py).
+
+Users with no stored history for an asset are seeded with deterministic
+synthetic trades (disable with SEED_SYNTHETIC_TRADES=false), so demos keep
+working until real fills are ingested.
+
+Summaries and persona selection read the store's running rollups, so they
+cost the same for a user with five trades as for one with years of them.
+When TRADE_ARCHIVE_DIR is set, recorded fills are also written to the
+columnar trade archive (services/trade_archive.py).
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict
-import random
+import os
+import threading
+from typing import List, Dict, Optional
+
+from services.trade_archive import TradeArchive, get_trade_archive
+from services.trade_store import TradeStore, generate_synthetic_trades, get_trade_store
 
 logger = logging.getLogger(__name__)
 
+# Most recent trades returned for an analysis
+RECENT_TRADES_LIMIT = 50
+
 
 class TradeHistoryService:
     """
     Service to fetch user trade history.
-    Currently generates synthetic data - replace with real DB queries in production.
+    
+    Attributes:
+        store (TradeStore): Storage backend
+        archive (TradeArchive): Columnar archive recorded fills are copied to (optional)
+        seed_synthetic (bool): Seed fixture trades for users with no history
     """
     
-    def __init__(self):
-        self.db_connected = False  # Flag for future DB integration
+    def __init__(self, store: Optional[TradeStore] = None, seed_synthetic: Optional[bool] = None,
+                 archive: Optional[TradeArchive] = None):
+        self.store = store or get_trade_store()
+        self.archive = archive or get_trade_archive()
+        if seed_synthetic is None:
+            seed_synthetic = os.getenv("SEED_SYNTHETIC_TRADES", "true").lower() == "true"
+        self.seed_synthetic = seed_synthetic
+        self.db_connected = True
+        self._seed_lock = threading.Lock()
     
-    def get_user_trades(self, asset: str, user_id: str = "default_user") -> List[Dict]:
+    def get_user_trades(self, asset: str, user_id: str = "default_user",
+                        limit: int = RECENT_TRADES_LIMIT) -> List[Dict]:
         """
-        Fetch user trade history for an asset.
+        Fetch a user's most recent trades for an asset.
         
         Args:
             asset: Stock symbol
-            user_id: User identifier (for DB lookup)
+            user_id: User identifier
+            limit: Maximum trades returned
             
         Returns:
-            List of trade dictionaries
+            List of trade dictionaries in chronological order
         """
-        # TODO: Replace with real database query
-        # Example: SELECT * FROM trades WHERE user_id = ? AND symbol = ? ORDER BY timestamp DESC LIMIT 10
-        
         logger.info(f"Fetching trade history for {user_id} on {asset}")
         
-        # For now, generate synthetic trades
-        return self._generate_synthetic_trades(asset)
-    
-    def _generate_synthetic_trades(self, asset: str) -> List[Dict]:
-        """
-        Generate synthetic trade history for testing.
-        Replace this with real DB queries in production.
-        """
-        num_trades = random.randint(1, 5)
-        trades = []
-        
-        base_price = self._get_base_price(asset)
-        base_time = datetime.now() - timedelta(hours=random.randint(1, 8))
-        
-        # Generate random trading patterns
-        pattern_type = random.choice(["winning", "losing", "mixed", "revenge"])
-        
-        for i in range(num_trades):
-            trade_time = base_time + timedelta(minutes=i * random.randint(15, 60))
-            
-            # Determine P&L based on pattern
-            if pattern_type == "winning":
-                pnl = random.uniform(100, 500)
-            elif pattern_type == "losing":
-                pnl = -random.uniform(50, 300)
-            elif pattern_type == "revenge":
-                # Losses followed by bigger position
-                pnl = -random.uniform(100, 300) if i < num_trades - 1 else random.uniform(400, 800)
-            else:  # mixed
-                pnl = random.uniform(-200, 400)
-            
-            trades.append({
-                "timestamp": trade_time.strftime("%Y-%m-%d %H:%M:%S"),
-                "symbol": asset,
-                "action": random.choice(["BUY", "SELL"]),
-                "price": base_price + random.uniform(-5, 5),
-                "pnl": round(pnl, 2),
-                "status": "CLOSED"
-            })
-        
-        # Sort by timestamp
-        trades.sort(key=lambda x: x["timestamp"])
+        trades = self.store.query_trades(user_id, symbol=asset, limit=limit, newest_first=True)
+        if not trades and self.seed_synthetic:
+            with self._seed_lock:
+                # Re-check so concurrent requests seed only once
+                if not self.store.count_trades(user_id, symbol=asset):
+                    # Straight into the store: only real fills are archived
+                    self.store.insert_trades(user_id, generate_synthetic_trades(user_id, asset))
+                    logger.info(f"Seeded synthetic trades for {user_id} on {asset}")
+            trades = self.store.query_trades(user_id, symbol=asset, limit=limit, newest_first=True)
         
-        logger.info(f"Generated {len(trades)} synthetic trades for {asset}")
+        trades.reverse()
         return trades
     
-    def _get_base_price(self, asset: str) -> float:
-        """Get approximate base price for asset."""
-        price_map = {
-            "SPY": 480.0,
-            "AAPL": 180.0,
-            "TSLA": 240.0,
-            "MSFT": 380.0,
-            "NVDA": 480.0,
-            "META": 380.0,
-            "GOOGL": 140.0,
-            "AMZN": 155.0
-        }
-        return price_map.get(asset, 100.0)
+    def record_trades(self, user_id: str, trades: List[Dict]) -> int:
+        """Bulk ingest fills for a user. Returns the number stored."""
+        stored = self.store.insert_trades(user_id, trades)
+        if self.archive is not None and user_id:  # The archive rejects empty ids
+            self.archive.append(user_id, trades)
+        return stored
     
     def get_trading_summary(self, asset: str, user_id: str = "default_user") -> Dict:
         """
         Get summary statistics for user's trading on this asset.
+        
+        Totals cover the user's whole history on the asset (from the store's
+        rollups); "trades" holds only the most recent trades.
         """
         trades = self.get_user_trades(asset, user_id)
+        rollup = self.store.get_rollup(user_id, asset) if trades else None
         
-        if not trades:
+        if not rollup:
             return {
                 "total_trades": 0,
                 "total_pnl": 0.0,
                 "win_rate": 0.0,
-                "status": "No trading history"
+                "status": "No trading history",
+                "persona_style": "coach"
             }
         
-        total_pnl = sum(t["pnl"] for t in trades)
-        wins = sum(1 for t in trades if t["pnl"] > 0)
-        win_rate = (wins / len(trades)) * 100 if trades else 0
-        
         return {
-            "total_trades": len(trades),
-            "total_pnl": round(total_pnl, 2),
-            "win_rate": round(win_rate, 1),
-            "last_trade": trades[-1]["timestamp"] if trades else None,
+            "total_trades": rollup["trades"],
+            "total_pnl": rollup["total_pnl"],
+            "win_rate": rollup["win_rate"],
+            "wins": rollup["wins"],
+            "losses": rollup["losses"],
+            "last_trade": rollup["last_trade"],
+            "win_streak": rollup["win_streak"],
+            "loss_streak": rollup["loss_streak"],
+            "persona_style": select_persona(rollup["trades"], rollup["total_pnl"], rollup["wins"]),
             "trades": trades
         }
     
@@ -127,25 +117,38 @@ class TradeHistoryService:
         """
         Auto-select persona style based on trading performance.
         
+        ``get_trading_summary`` already includes the choice for the user's
+        full history as "persona_style"; use this for an arbitrary trade list.
+        
         Returns:
             "coach" | "professional" | "casual" | "analytical"
         """
-        if not trades:
-            return "coach"
-        
         total_pnl = sum(t["pnl"] for t in trades)
         wins = sum(1 for t in trades if t["pnl"] > 0)
-        win_rate = (wins / len(trades)) * 100 if trades else 0
-        
-        # Logic for persona selection
-        if total_pnl < -500 or win_rate < 30:
-            return "coach"  # Struggling trader needs coaching
-        elif len(trades) >= 5 and win_rate > 60:
-            return "professional"  # Successful trader gets professional tone
-        elif len(trades) <= 2:
-            return "casual"  # New trader gets friendly approach
-        else:
-            return "analytical"  # Default for most cases
+        return select_persona(len(trades), total_pnl, wins)
+
+
+def select_persona(total_trades: int, total_pnl: float, wins: int) -> str:
+    """
+    Persona style for a trading record.
+    
+    Returns:
+        "coach" | "professional" | "casual" | "analytical"
+    """
+    if not total_trades:
+        return "coach"
+    
+    win_rate = (wins / total_trades) * 100
+    
+    # Logic for persona selection
+    if total_pnl < -500 or win_rate < 30:
+        return "coach"  # Struggling trader needs coaching
+    elif total_trades >= 5 and win_rate > 60:
+        return "professional"  # Successful trader gets professional tone
+    elif total_trades <= 2:
+        return "casual"  # New trader gets friendly approach
+    else:
+        return "analytical"  # Default for most cases
 
 
 # Singleton instance
@@ -0,0 +1,585 @@
+"""
+Trade Store
+Persistent storage engine behind TradeHistoryService.
+
+``TradeStore`` is the storage interface; ``SQLiteTradeStore`` implements it
+on local SQLite with:
+- A ``(user_id, symbol, timestamp)`` index serving every query
+- Parameterised SQL from fixed statements (compiled once per connection
+  by sqlite3's statement cache)
+- A small connection pool shared by the request threads
+- Limit/offset pagination and inclusive time-range filters
+- Bulk ingest with batched ``executemany`` inside one transaction
+- Rollups per (user, symbol) and per (user, symbol, day), maintained by
+  insert triggers, so summaries never rescan a user's history
+
+Other backends plug in through ``register_trade_store_backend`` and are
+selected by the scheme of ``TRADE_STORE_URL`` (default ``sqlite://:memory:``).
+
+``load_synthetic_fixtures`` fills a store with seeded, deterministic
+trades so demos and benchmarks are reproducible.
+"""
+
+import logging
+import os
+import queue
+import random
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+TRADE_FIELDS = ("timestamp", "symbol", "action", "price", "quantity", "pnl", "status")
+
+
+class TradeStore(ABC):
+    """Storage interface for user trade history."""
+
+    @abstractmethod
+    def insert_trades(self, user_id: str, trades: Iterable[Dict]) -> int:
+        """Bulk insert trades for a user. Returns the number inserted."""
+
+    @abstractmethod
+    def query_trades(self,
+                     user_id: str,
+                     symbol: Optional[str] = None,
+                     start: Optional[str] = None,
+                     end: Optional[str] = None,
+                     limit: Optional[int] = 100,
+                     offset: int = 0,
+                     newest_first: bool = False) -> List[Dict]:
+        """
+        Fetch a page of a user's trades.
+
+        Args:
+            user_id: User identifier
+            symbol: Only this symbol (all symbols if None)
+            start: Inclusive lower bound, "YYYY-MM-DD HH:MM:SS"
+            end: Inclusive upper bound, "YYYY-MM-DD HH:MM:SS"
+            limit: Page size (None for no limit)
+            offset: Rows to skip
+            newest_first: Order by timestamp descending instead of ascending
+        """
+
+    @abstractmethod
+    def count_trades(self, user_id: str, symbol: Optional[str] = None,
+                     start: Optional[str] = None, end: Optional[str] = None) -> int:
+        """Number of trades matching the same filters as ``query_trades``."""
+
+    @abstractmethod
+    def get_rollup(self, user_id: str, symbol: Optional[str] = None) -> Optional[Dict]:
+        """
+        Running totals for a user's trades.
+
+        Returns:
+            Dict with trades, total_pnl, wins, losses, win_rate and last_trade,
+            plus win_streak, loss_streak, max_win_streak and max_loss_streak
+            when a symbol is given; None if there are no trades
+        """
+
+    @abstractmethod
+    def get_daily_rollups(self, user_id: str, symbol: Optional[str] = None,
+                          start_day: Optional[str] = None, end_day: Optional[str] = None) -> List[Dict]:
+        """
+        Per-day totals (day is "YYYY-MM-DD", bounds inclusive), oldest first.
+
+        With a symbol, each day also carries the win/loss streak standing
+        after that day's last trade.
+        """
+
+    def close(self):
+        """Release connections."""
+
+
+# ============================================================================
+# SQLite backend
+# ============================================================================
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS trades (
+        id INTEGER PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        action TEXT,
+        price REAL,
+        quantity REAL,
+        pnl REAL NOT NULL,
+        status TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_trades_user_symbol_ts ON trades (user_id, symbol, timestamp)",
+    """
+    CREATE TABLE IF NOT EXISTS trade_rollups (
+        user_id TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        trades INTEGER NOT NULL,
+        total_pnl REAL NOT NULL,
+        wins INTEGER NOT NULL,
+        losses INTEGER NOT NULL,
+        last_trade TEXT NOT NULL,
+        win_streak INTEGER NOT NULL,
+        loss_streak INTEGER NOT NULL,
+        max_win_streak INTEGER NOT NULL,
+        max_loss_streak INTEGER NOT NULL,
+        streaks_stale INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, symbol)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS trade_daily_rollups (
+        user_id TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        day TEXT NOT NULL,
+        trades INTEGER NOT NULL,
+        total_pnl REAL NOT NULL,
+        wins INTEGER NOT NULL,
+        losses INTEGER NOT NULL,
+        last_trade TEXT NOT NULL,
+        win_streak INTEGER NOT NULL,
+        loss_streak INTEGER NOT NULL,
+        PRIMARY KEY (user_id, symbol, day)
+    ) WITHOUT ROWID
+    """,
+    # Streaks assume fills arrive in time order. A trade older than the
+    # latest one marks the streaks stale; they are recomputed on next read.
+    # Upsert SET expressions see the row as it was before the update.
+    """
+    CREATE TRIGGER IF NOT EXISTS trades_rollup_insert AFTER INSERT ON trades
+    BEGIN
+        INSERT INTO trade_rollups (user_id, symbol, trades, total_pnl, wins, losses, last_trade,
+                                   win_streak, loss_streak, max_win_streak, max_loss_streak)
+        VALUES (NEW.user_id, NEW.symbol, 1, NEW.pnl, NEW.pnl > 0, NEW.pnl < 0, NEW.timestamp,
+                NEW.pnl > 0, NEW.pnl < 0, NEW.pnl > 0, NEW.pnl < 0)
+        ON CONFLICT (user_id, symbol) DO UPDATE SET
+            trades = trades + 1,
+            total_pnl = total_pnl + excluded.total_pnl,
+            wins = wins + excluded.wins,
+            losses = losses + excluded.losses,
+            last_trade = max(last_trade, excluded.last_trade),
+            win_streak = CASE WHEN excluded.wins THEN win_streak + 1 ELSE 0 END,
+            loss_streak = CASE WHEN excluded.losses THEN loss_streak + 1 ELSE 0 END,
+            max_win_streak = max(max_win_streak, CASE WHEN excluded.wins THEN win_streak + 1 ELSE 0 END),
+            max_loss_streak = max(max_loss_streak, CASE WHEN excluded.losses THEN loss_streak + 1 ELSE 0 END),
+            streaks_stale = streaks_stale OR excluded.last_trade < last_trade;
+
+        INSERT INTO trade_daily_rollups (user_id, symbol, day, trades, total_pnl, wins, losses, last_trade,
+                                         win_streak, loss_streak)
+        SELECT NEW.user_id, NEW.symbol, substr(NEW.timestamp, 1, 10), 1, NEW.pnl, NEW.pnl > 0, NEW.pnl < 0,
+               NEW.timestamp, win_streak, loss_streak
+        FROM trade_rollups WHERE user_id = NEW.user_id AND symbol = NEW.symbol
+        ON CONFLICT (user_id, symbol, day) DO UPDATE SET
+            trades = trades + 1,
+            total_pnl = total_pnl + excluded.total_pnl,
+            wins = wins + excluded.wins,
+            losses = losses + excluded.losses,
+            last_trade = max(last_trade, excluded.last_trade),
+            win_streak = excluded.win_streak,
+            loss_streak = excluded.loss_streak;
+    END
+    """,
+)
+
+# Rebuild totals from the trades table (streaks are filled in on next read)
+_REBUILD_ROLLUPS = (
+    "DELETE FROM trade_rollups",
+    "DELETE FROM trade_daily_rollups",
+    """
+    INSERT INTO trade_rollups (user_id, symbol, trades, total_pnl, wins, losses, last_trade,
+                               win_streak, loss_streak, max_win_streak, max_loss_streak, streaks_stale)
+    SELECT user_id, symbol, COUNT(*), SUM(pnl), SUM(pnl > 0), SUM(pnl < 0), MAX(timestamp), 0, 0, 0, 0, 1
+    FROM trades GROUP BY user_id, symbol
+    """,
+    """
+    INSERT INTO trade_daily_rollups (user_id, symbol, day, trades, total_pnl, wins, losses, last_trade,
+                                     win_streak, loss_streak)
+    SELECT user_id, symbol, substr(timestamp, 1, 10), COUNT(*), SUM(pnl), SUM(pnl > 0), SUM(pnl < 0),
+           MAX(timestamp), 0, 0
+    FROM trades GROUP BY user_id, symbol, substr(timestamp, 1, 10)
+    """,
+)
+
+ROLLUP_FIELDS = ("trades", "total_pnl", "wins", "losses", "last_trade")
+STREAK_FIELDS = ("win_streak", "loss_streak", "max_win_streak", "max_loss_streak")
+
+_INSERT_SQL = (
+    "INSERT INTO trades (user_id, symbol, timestamp, action, price, quantity, pnl, status) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class SQLiteTradeStore(TradeStore):
+    """
+    SQLite trade store with a connection pool.
+
+    Attributes:
+        path (str): Database file, or ":memory:" for a private in-memory database
+        pool_size (int): Maximum open connections (always 1 in memory)
+        batch_size (int): Rows per ``executemany`` call during bulk ingest
+    """
+
+    def __init__(self, path: str = ":memory:", pool_size: int = 4, batch_size: int = 5000):
+        self.path = path
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+
+        if path == ":memory:":
+            # Named shared-cache database so it outlives any single connection.
+            # Shared-cache locks are not retried by the busy timeout, so the
+            # in-memory store serialises access through one pooled connection.
+            self._target, self._uri = f"file:trades-{uuid.uuid4().hex}?mode=memory&cache=shared", True
+            self.pool_size = 1
+        else:
+            self._target, self._uri = path, False
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+        with self._connection() as conn:
+            if path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            # Databases written before rollups existed
+            if (conn.execute("SELECT 1 FROM trades LIMIT 1").fetchone()
+                    and not conn.execute("SELECT 1 FROM trade_rollups LIMIT 1").fetchone()):
+                self._rebuild_rollups(conn)
+
+    # ---------------------------------------------------------------- pool
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._target, uri=self._uri, check_same_thread=False,
+            timeout=30, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection (opening one if the pool is not full)."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.pool_size
+                if create:
+                    self._created += 1
+            conn = self._connect() if create else self._idle.get(timeout=30)
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._created = 0
+
+    # ---------------------------------------------------------------- writes
+
+    def insert_trades(self, user_id: str, trades: Iterable[Dict]) -> int:
+        rows = (
+            (user_id, t["symbol"], t["timestamp"], t.get("action"), t.get("price"),
+             t.get("quantity"), t["pnl"], t.get("status"))
+            for t in trades
+        )
+        inserted = 0
+        with self._connection() as conn:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    conn.executemany(_INSERT_SQL, batch)
+                    inserted += len(batch)
+                    batch = []
+            if batch:
+                conn.executemany(_INSERT_SQL, batch)
+                inserted += len(batch)
+            conn.commit()
+        return inserted
+
+    def _rebuild_rollups(self, conn: sqlite3.Connection):
+        for statement in _REBUILD_ROLLUPS:
+            conn.execute(statement)
+        conn.commit()
+        logger.info("Rebuilt trade rollups from stored trades")
+
+    def _refresh_streaks(self, conn: sqlite3.Connection, user_id: str, symbol: str):
+        """Recompute streaks for one (user, symbol) by replaying its trades in time order."""
+        rows = conn.execute(
+            "SELECT timestamp, pnl FROM trades WHERE user_id = ? AND symbol = ? ORDER BY timestamp, id",
+            (user_id, symbol)
+        )
+        win_streak = loss_streak = max_win = max_loss = 0
+        day_ends: Dict[str, tuple] = {}
+        for timestamp, pnl in rows:
+            win_streak = win_streak + 1 if pnl > 0 else 0
+            loss_streak = loss_streak + 1 if pnl < 0 else 0
+            max_win = max(max_win, win_streak)
+            max_loss = max(max_loss, loss_streak)
+            day_ends[timestamp[:10]] = (win_streak, loss_streak)
+
+        conn.executemany(
+            "UPDATE trade_daily_rollups SET win_streak = ?, loss_streak = ? "
+            "WHERE user_id = ? AND symbol = ? AND day = ?",
+            [(w, l, user_id, symbol, day) for day, (w, l) in day_ends.items()]
+        )
+        conn.execute(
+            "UPDATE trade_rollups SET win_streak = ?, loss_streak = ?, max_win_streak = ?, "
+            "max_loss_streak = ?, streaks_stale = 0 WHERE user_id = ? AND symbol = ?",
+            (win_streak, loss_streak, max_win, max_loss, user_id, symbol)
+        )
+        conn.commit()
+
+    # ---------------------------------------------------------------- reads
+
+    @staticmethod
+    def _where(symbol, start, end) -> str:
+        # Only the filters in use: "x IS NULL OR ..." predicates would stop
+        # SQLite using the index. Each filter shape yields the same SQL text,
+        # so it is compiled once per connection and then reused.
+        clauses = ["user_id = :user_id"]
+        if symbol is not None:
+            clauses.append("symbol = :symbol")
+        if start is not None:
+            clauses.append("timestamp >= :start")
+        if end is not None:
+            clauses.append("timestamp <= :end")
+        return "WHERE " + " AND ".join(clauses)
+
+    def query_trades(self,
+                     user_id: str,
+                     symbol: Optional[str] = None,
+                     start: Optional[str] = None,
+                     end: Optional[str] = None,
+                     limit: Optional[int] = 100,
+                     offset: int = 0,
+                     newest_first: bool = False) -> List[Dict]:
+        order = "DESC" if newest_first else "ASC"
+        sql = (
+            f"SELECT {', '.join(TRADE_FIELDS)} FROM trades {self._where(symbol, start, end)} "
+            f"ORDER BY timestamp {order}, id {order} LIMIT :limit OFFSET :offset"
+        )
+        params = {
+            "user_id": user_id, "symbol": symbol, "start": start, "end": end,
+            "limit": -1 if limit is None else limit, "offset": offset,
+        }
+        with self._connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        trades = []
+        for row in rows:
+            trade = dict(row)
+            if trade["quantity"] is None:
+                del trade["quantity"]
+            trades.append(trade)
+        return trades
+
+    def count_trades(self, user_id: str, symbol: Optional[str] = None,
+                     start: Optional[str] = None, end: Optional[str] = None) -> int:
+        sql = f"SELECT COUNT(*) FROM trades {self._where(symbol, start, end)}"
+        with self._connection() as conn:
+            return conn.execute(sql, {"user_id": user_id, "symbol": symbol, "start": start, "end": end}).fetchone()[0]
+
+    @staticmethod
+    def _rollup_dict(row) -> Dict:
+        rollup = dict(row)
+        rollup["total_pnl"] = round(rollup["total_pnl"], 2)
+        rollup["win_rate"] = round((rollup["wins"] / rollup["trades"]) * 100, 1)
+        return rollup
+
+    def get_rollup(self, user_id: str, symbol: Optional[str] = None) -> Optional[Dict]:
+        if symbol is None:
+            sql = (
+                "SELECT SUM(trades) AS trades, SUM(total_pnl) AS total_pnl, SUM(wins) AS wins, "
+                "SUM(losses) AS losses, MAX(last_trade) AS last_trade "
+                "FROM trade_rollups WHERE user_id = ? HAVING COUNT(*) > 0"
+            )
+            with self._connection() as conn:
+                row = conn.execute(sql, (user_id,)).fetchone()
+            return self._rollup_dict(row) if row else None
+
+        sql = (
+            f"SELECT {', '.join(ROLLUP_FIELDS + STREAK_FIELDS)}, streaks_stale "
+            "FROM trade_rollups WHERE user_id = ? AND symbol = ?"
+        )
+        with self._connection() as conn:
+            row = conn.execute(sql, (user_id, symbol)).fetchone()
+            if row is not None and row["streaks_stale"]:
+                self._refresh_streaks(conn, user_id, symbol)
+                row = conn.execute(sql, (user_id, symbol)).fetchone()
+        if row is None:
+            return None
+        rollup = self._rollup_dict(row)
+        del rollup["streaks_stale"]
+        return rollup
+
+    def get_daily_rollups(self, user_id: str, symbol: Optional[str] = None,
+                          start_day: Optional[str] = None, end_day: Optional[str] = None) -> List[Dict]:
+        clauses = ["user_id = :user_id"]
+        if symbol is not None:
+            clauses.append("symbol = :symbol")
+        if start_day is not None:
+            clauses.append("day >= :start_day")
+        if end_day is not None:
+            clauses.append("day <= :end_day")
+        where = "WHERE " + " AND ".join(clauses)
+
+        if symbol is None:
+            sql = (
+                "SELECT day, SUM(trades) AS trades, SUM(total_pnl) AS total_pnl, SUM(wins) AS wins, "
+                f"SUM(losses) AS losses, MAX(last_trade) AS last_trade FROM trade_daily_rollups {where} "
+                "GROUP BY day ORDER BY day"
+            )
+        else:
+            sql = (
+                f"SELECT day, {', '.join(ROLLUP_FIELDS)}, win_streak, loss_streak "
+                f"FROM trade_daily_rollups {where} ORDER BY day"
+            )
+        params = {"user_id": user_id, "symbol": symbol, "start_day": start_day, "end_day": end_day}
+
+        with self._connection() as conn:
+            if symbol is not None:
+                stale = conn.execute(
+                    "SELECT streaks_stale FROM trade_rollups WHERE user_id = ? AND symbol = ?",
+                    (user_id, symbol)
+                ).fetchone()
+                if stale and stale[0]:
+                    self._refresh_streaks(conn, user_id, symbol)
+            rows = conn.execute(sql, params).fetchall()
+        return [self._rollup_dict(row) for row in rows]
+
+
+# ============================================================================
+# Deterministic fixtures
+# ============================================================================
+
+FIXTURE_ANCHOR = datetime(2026, 2, 7, 9, 0, 0)
+
+BASE_PRICES = {
+    "SPY": 480.0,
+    "AAPL": 180.0,
+    "TSLA": 240.0,
+    "MSFT": 380.0,
+    "NVDA": 480.0,
+    "META": 380.0,
+    "GOOGL": 140.0,
+    "AMZN": 155.0
+}
+
+
+def generate_synthetic_trades(user_id: str, asset: str, seed: int = 0,
+                              sessions: int = 1, anchor: datetime = FIXTURE_ANCHOR) -> List[Dict]:
+    """
+    Seeded synthetic trades for one user and asset.
+
+    The same (user_id, asset, seed) always produces the same trades. Each
+    session is one trading day before ``anchor`` with 1-5 trades following a
+    winning, losing, mixed or revenge pattern.
+    """
+    rng = random.Random(f"{seed}:{user_id}:{asset}")
+    base_price = BASE_PRICES.get(asset, 100.0)
+    trades = []
+
+    for session in range(sessions):
+        num_trades = rng.randint(1, 5)
+        base_time = anchor - timedelta(days=sessions - 1 - session, hours=rng.randint(1, 8))
+        pattern_type = rng.choice(["winning", "losing", "mixed", "revenge"])
+
+        for i in range(num_trades):
+            trade_time = base_time + timedelta(minutes=i * rng.randint(15, 60))
+
+            if pattern_type == "winning":
+                pnl = rng.uniform(100, 500)
+            elif pattern_type == "losing":
+                pnl = -rng.uniform(50, 300)
+            elif pattern_type == "revenge":
+                # Losses followed by bigger position
+                pnl = -rng.uniform(100, 300) if i < num_trades - 1 else rng.uniform(400, 800)
+            else:  # mixed
+                pnl = rng.uniform(-200, 400)
+
+            trades.append({
+                "timestamp": trade_time.strftime(TIMESTAMP_FORMAT),
+                "symbol": asset,
+                "action": rng.choice(["BUY", "SELL"]),
+                "price": round(base_price + rng.uniform(-5, 5), 2),
+                "pnl": round(pnl, 2),
+                "status": "CLOSED"
+            })
+
+    trades.sort(key=lambda x: x["timestamp"])
+    return trades
+
+
+def load_synthetic_fixtures(store: TradeStore, user_ids: Iterable[str], assets: Iterable[str],
+                            seed: int = 0, sessions: int = 1) -> int:
+    """Bulk load seeded synthetic trades for every (user, asset). Returns rows inserted."""
+    assets = list(assets)
+    inserted = 0
+    for user_id in user_ids:
+        trades = []
+        for asset in assets:
+            trades.extend(generate_synthetic_trades(user_id, asset, seed=seed, sessions=sessions))
+        inserted += store.insert_trades(user_id, trades)
+    return inserted
+
+
+# ============================================================================
+# Backend registry
+# ============================================================================
+
+_BACKENDS: Dict[str, Callable[[str], TradeStore]] = {
+    "sqlite": lambda location: SQLiteTradeStore(location or ":memory:"),
+}
+
+
+def register_trade_store_backend(scheme: str, factory: Callable[[str], TradeStore]):
+    """Register a backend factory for ``<scheme>://<location>`` store URLs."""
+    _BACKENDS[scheme] = factory
+
+
+def create_trade_store(url: str) -> TradeStore:
+    """
+    Create a store from a URL such as ``sqlite://:memory:`` or
+    ``sqlite:///var/data/trades.db``.
+    """
+    scheme, _, location = url.partition("://")
+    if scheme not in _BACKENDS:
+        raise ValueError(f"Unsupported trade store '{scheme}' (available: {', '.join(_BACKENDS)})")
+    return _BACKENDS[scheme](location)
+
+
+# Singleton instance
+_trade_store = None
+_trade_store_lock = threading.Lock()
+
+
+def get_trade_store() -> TradeStore:
+    """Get singleton instance of the trade store (from TRADE_STORE_URL)."""
+    global _trade_store
+    if _trade_store is None:
+        with _trade_store_lock:
+            if _trade_store is None:
+                url = os.getenv("TRADE_STORE_URL", "sqlite://:memory:")
+                _trade_store = create_trade_store(url)
+                logger.info(f"Trade store opened: {url}")
+    return _trade_store
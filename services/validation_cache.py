@@ -0,0 +1,327 @@
+"""
+Validation Cache
+Shared cache of asset symbol validation results.
+
+Lookups go through tiers, fastest first:
+- An in-process dict, so the second validation of a request is free
+- A local SQLite file (``VALIDATION_CACHE_PATH``, default in the temp
+  directory) shared by every worker process on the host and kept across
+  restarts and warm serverless invocations
+- An optional networked tier from ``VALIDATION_CACHE_URL`` (e.g.
+  ``redis://host:6379/0``) shared across hosts and cold starts
+
+Valid and invalid symbols are cached with separate TTLs, so repeated
+lookups of unknown symbols stop costing yfinance round-trips while a new
+listing is picked up within the invalid TTL. A hit in a lower tier is
+copied into the tiers above it with its remaining lifetime. A failing tier
+is logged and skipped; the cache never fails a validation.
+
+Other networked backends plug in through ``register_validation_cache_backend``.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VALID_TTL = 86400
+DEFAULT_INVALID_TTL = 900
+
+
+class ValidationCacheBackend(ABC):
+    """One cache tier. Entries are ``{"valid": bool, "error": str | None}`` with a wall-clock expiry."""
+
+    name = "backend"
+
+    @abstractmethod
+    def get(self, symbol: str) -> Optional[Tuple[Dict, float]]:
+        """Return (entry, expires_at) for an unexpired entry, or None."""
+
+    @abstractmethod
+    def set(self, symbol: str, entry: Dict, expires_at: float):
+        """Store an entry until ``expires_at`` (epoch seconds)."""
+
+    @abstractmethod
+    def delete(self, symbol: Optional[str] = None):
+        """Drop one symbol, or every entry when ``symbol`` is None."""
+
+    def close(self):
+        pass
+
+
+class MemoryValidationBackend(ValidationCacheBackend):
+    """Per-process LRU tier."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str) -> Optional[Tuple[Dict, float]]:
+        with self._lock:
+            item = self._entries.get(symbol)
+            if item is None:
+                return None
+            if item[1] <= time.time():
+                del self._entries[symbol]
+                return None
+            self._entries.move_to_end(symbol)
+            return item
+
+    def set(self, symbol: str, entry: Dict, expires_at: float):
+        with self._lock:
+            self._entries[symbol] = (dict(entry), expires_at)
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, symbol: Optional[str] = None):
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol, None)
+
+
+class SQLiteValidationBackend(ValidationCacheBackend):
+    """
+    On-disk tier shared by the processes on one host.
+
+    Attributes:
+        path (str): Database file
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS symbol_validations ("
+                "symbol TEXT PRIMARY KEY, valid INTEGER NOT NULL, error TEXT, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, symbol: str) -> Optional[Tuple[Dict, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT valid, error, expires_at FROM symbol_validations WHERE symbol = ? AND expires_at > ?",
+                (symbol, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return {"valid": bool(row[0]), "error": row[1]}, row[2]
+
+    def set(self, symbol: str, entry: Dict, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO symbol_validations (symbol, valid, error, expires_at) VALUES (?, ?, ?, ?)",
+                (symbol, int(entry["valid"]), entry.get("error"), expires_at)
+            )
+            # Expired rows are pruned on write
+            self._conn.execute("DELETE FROM symbol_validations WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def delete(self, symbol: Optional[str] = None):
+        with self._lock:
+            if symbol is None:
+                self._conn.execute("DELETE FROM symbol_validations")
+            else:
+                self._conn.execute("DELETE FROM symbol_validations WHERE symbol = ?", (symbol,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisValidationBackend(ValidationCacheBackend):
+    """
+    Networked tier on Redis; entries expire through Redis TTLs.
+
+    Attributes:
+        prefix (str): Key prefix for validation entries
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "asset-validation:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise ValueError(f"The redis validation cache requires redis (pip install redis): {e}")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def get(self, symbol: str) -> Optional[Tuple[Dict, float]]:
+        pipe = self._client.pipeline()
+        pipe.get(self.prefix + symbol)
+        pipe.pttl(self.prefix + symbol)
+        raw, ttl_ms = pipe.execute()
+        if raw is None or ttl_ms is None or ttl_ms <= 0:
+            return None
+        return json.loads(raw), time.time() + ttl_ms / 1000
+
+    def set(self, symbol: str, entry: Dict, expires_at: float):
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms > 0:
+            self._client.set(self.prefix + symbol, json.dumps(entry), px=ttl_ms)
+
+    def delete(self, symbol: Optional[str] = None):
+        if symbol is not None:
+            self._client.delete(self.prefix + symbol)
+            return
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def close(self):
+        self._client.close()
+
+
+class ValidationCache:
+    """
+    Tiered cache of symbol validation results.
+
+    Attributes:
+        tiers (list): Backends, fastest first
+        valid_ttl (float): Seconds a valid symbol stays cached
+        invalid_ttl (float): Seconds an invalid symbol stays cached
+    """
+
+    def __init__(self, tiers: List[ValidationCacheBackend],
+                 valid_ttl: float = DEFAULT_VALID_TTL,
+                 invalid_ttl: float = DEFAULT_INVALID_TTL):
+        self.tiers = tiers
+        self.valid_ttl = valid_ttl
+        self.invalid_ttl = invalid_ttl
+        self._stats_lock = threading.Lock()
+        self.stats = {"misses": 0, "errors": 0, **{f"{tier.name}_hits": 0 for tier in tiers}}
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Cached ``{"valid", "error"}`` for a symbol, or None on a miss."""
+        for level, tier in enumerate(self.tiers):
+            try:
+                item = tier.get(symbol)
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"Validation cache tier {tier.name} failed reading {symbol}: {e}")
+                continue
+            if item is None:
+                continue
+            entry, expires_at = item
+            self._count(f"{tier.name}_hits")
+            for upper in self.tiers[:level]:
+                self._write(upper, symbol, entry, expires_at)
+            return entry
+        self._count("misses")
+        return None
+
+    def set(self, symbol: str, valid: bool, error: Optional[str] = None):
+        """Cache a validation result in every tier, with the TTL for its outcome."""
+        entry = {"valid": valid, "error": error}
+        expires_at = time.time() + (self.valid_ttl if valid else self.invalid_ttl)
+        for tier in self.tiers:
+            self._write(tier, symbol, entry, expires_at)
+
+    def _write(self, tier: ValidationCacheBackend, symbol: str, entry: Dict, expires_at: float):
+        try:
+            tier.set(symbol, entry, expires_at)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Validation cache tier {tier.name} failed writing {symbol}: {e}")
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop one symbol, or everything when ``symbol`` is None, from every tier."""
+        for tier in self.tiers:
+            try:
+                tier.delete(symbol)
+            except Exception as e:
+                logger.warning(f"Validation cache tier {tier.name} failed invalidating: {e}")
+
+    def get_stats(self) -> dict:
+        """Hits per tier, misses and tier errors."""
+        with self._stats_lock:
+            return dict(self.stats, tiers=[tier.name for tier in self.tiers])
+
+    def close(self):
+        for tier in self.tiers:
+            tier.close()
+
+
+_BACKENDS: Dict[str, Callable[[str], ValidationCacheBackend]] = {
+    "redis": RedisValidationBackend,
+    "rediss": RedisValidationBackend,
+}
+
+
+def register_validation_cache_backend(scheme: str, factory: Callable[[str], ValidationCacheBackend]):
+    """Register a backend factory for ``<scheme>://...`` VALIDATION_CACHE_URL values (called with the full URL)."""
+    _BACKENDS[scheme] = factory
+
+
+def create_validation_cache_backend(url: str) -> ValidationCacheBackend:
+    """Create a networked tier from a URL such as ``redis://host:6379/0``."""
+    scheme = url.partition("://")[0]
+    if scheme not in _BACKENDS:
+        raise ValueError(f"Unsupported validation cache '{scheme}' (available: {', '.join(_BACKENDS)})")
+    return _BACKENDS[scheme](url)
+
+
+def create_validation_cache(path: Optional[str] = None, url: Optional[str] = None) -> ValidationCache:
+    """
+    Build the tiered cache: memory, then the SQLite file at ``path``
+    ("" disables it), then the networked tier at ``url`` (if any).
+    """
+    tiers: List[ValidationCacheBackend] = [MemoryValidationBackend()]
+    if path:
+        try:
+            tiers.append(SQLiteValidationBackend(path))
+        except sqlite3.Error as e:
+            logger.warning(f"Validation cache file {path} unavailable: {e}")
+    if url:
+        try:
+            tiers.append(create_validation_cache_backend(url))
+        except Exception as e:
+            logger.warning(f"Networked validation cache unavailable: {e}")
+    return ValidationCache(
+        tiers,
+        valid_ttl=float(os.getenv("VALIDATION_CACHE_VALID_TTL", DEFAULT_VALID_TTL)),
+        invalid_ttl=float(os.getenv("VALIDATION_CACHE_INVALID_TTL", DEFAULT_INVALID_TTL)),
+    )
+
+
+# Singleton instance
+_validation_cache = None
+_validation_cache_lock = threading.Lock()
+
+
+def get_validation_cache() -> ValidationCache:
+    """Get singleton instance of the validation cache (from VALIDATION_CACHE_PATH / VALIDATION_CACHE_URL)."""
+    global _validation_cache
+    if _validation_cache is None:
+        with _validation_cache_lock:
+            if _validation_cache is None:
+                path = os.getenv("VALIDATION_CACHE_PATH",
+                                 os.path.join(tempfile.gettempdir(), "asset_validation.db"))
+                _validation_cache = create_validation_cache(path, os.getenv("VALIDATION_CACHE_URL"))
+                logger.info(f"Validation cache tiers: {', '.join(t.name for t in _validation_cache.tiers)}")
+    return _validation_cache
@@ -0,0 +1,133 @@
+"""
+Test Agent Pipeline Scheduler
+Checks dependency resolution, overlap of independent stages, isolation of
+synchronous stages and error handling.
+"""
+
+import asyncio
+import time
+
+from agents.pipeline import AgentPipeline, PipelineStage
+
+
+def test_dependencies_follow_declared_keys():
+    """Stages only depend on earlier stages whose keys conflict with theirs."""
+    pipeline = AgentPipeline([
+        PipelineStage("calendar", lambda c: c, reads=("asset",), writes=("economic_summary",)),
+        PipelineStage("behaviour", lambda c: c, reads=("user_trades",), writes=("behavior_label",)),
+        PipelineStage("council", lambda c: c, reads=("economic_summary",), writes=("asset", "market_opinions")),
+        PipelineStage("persona", lambda c: c, reads=("market_opinions",), writes=("persona_post",)),
+        PipelineStage("moderator", lambda c: c, reads=("persona_post", "behavior_label"), writes=("moderation",)),
+    ])
+
+    assert pipeline.describe() == {
+        "calendar": [],
+        "behaviour": [],
+        "council": ["calendar"],  # read-after-write + write-after-read on "asset"
+        "persona": ["council"],
+        "moderator": ["behaviour", "persona"],
+    }
+
+
+def test_independent_stages_overlap():
+    """Independent async and sync stages run concurrently."""
+    async def slow_async(ctx):
+        await asyncio.sleep(0.3)
+        ctx["a"] = 1
+        return ctx
+
+    def slow_sync(ctx):
+        time.sleep(0.3)
+        ctx["b"] = 2
+        return ctx
+
+    def combine(ctx):
+        ctx["c"] = ctx["a"] + ctx["b"]
+        return ctx
+
+    pipeline = AgentPipeline([
+        PipelineStage("async", slow_async, writes=("a",)),
+        PipelineStage("sync", slow_sync, writes=("b",)),
+        PipelineStage("combine", combine, reads=("a", "b"), writes=("c",)),
+    ])
+
+    started = time.perf_counter()
+    context = asyncio.run(pipeline.run({}))
+    elapsed = time.perf_counter() - started
+
+    assert context["c"] == 3
+    assert elapsed < 0.55, f"stages did not overlap ({elapsed:.2f}s)"
+
+
+def test_stage_errors_are_recorded():
+    """A failing stage records <name>_error and dependents still run."""
+    def broken(ctx):
+        raise RuntimeError("provider down")
+
+    completed = []
+    pipeline = AgentPipeline([
+        PipelineStage("Broken", broken, writes=("x",)),
+        PipelineStage("After", lambda c: {**c, "y": c.get("x", "fallback")}, reads=("x",), writes=("y",)),
+    ])
+
+    context = asyncio.run(pipeline.run({}, on_stage_complete=lambda name, ctx: completed.append(name)))
+
+    assert context["Broken_error"] == "provider down"
+    assert context["y"] == "fallback"
+    assert completed == ["Broken", "After"]
+
+
+def test_sync_stages_only_merge_declared_writes():
+    """Sync stages work on a copy: undeclared keys and late writes never reach the context."""
+    def chatty(ctx):
+        ctx["label"] = "ok"
+        ctx["scratch"] = "undeclared"
+        return ctx
+
+    def slow(ctx):
+        time.sleep(0.3)
+        ctx["late"] = "after timeout"
+        return ctx
+
+    pipeline = AgentPipeline([
+        PipelineStage("Chatty", chatty, writes=("label",)),
+        PipelineStage("Slow", slow, writes=("late",), timeout=0.05),
+    ])
+    context = asyncio.run(pipeline.run({"user_trades": []}))
+    time.sleep(0.4)  # The timed-out worker has finished by now
+
+    assert context["label"] == "ok"
+    assert "scratch" not in context
+    assert "late" not in context
+    assert "timed out" in context["Slow_error"]
+
+
+def test_analysis_pipeline_overlaps_calendar_with_council():
+    """The council reads its economic context from the shared service, not the calendar stage."""
+    import main
+
+    dependencies = main._build_analysis_pipeline("AAPL").describe()
+
+    assert dependencies["EconomicCalendar"] == []
+    assert dependencies["MarketMetrics"] == []
+    assert dependencies["MarketWatcherAgent"] == []
+
+
+def test_narrator_stage_needs_a_groq_key(monkeypatch):
+    import main
+
+    monkeypatch.setattr(main.NarratorAgent, "has_llm_access", False)
+    assert "NarratorAgent" not in main.build_agent_pipeline().describe()
+
+    monkeypatch.setattr(main.NarratorAgent, "has_llm_access", True)
+    dependencies = main.build_agent_pipeline().describe()
+    assert dependencies["NarratorAgent"] == ["BehaviorMonitorAgent", "MarketWatcherAgent"]
+
+
+if __name__ == "__main__":
+    test_dependencies_follow_declared_keys()
+    test_independent_stages_overlap()
+    test_stage_errors_are_recorded()
+    test_sync_stages_only_merge_declared_writes()
+    test_analysis_pipeline_overlaps_calendar_with_council()
+    print("All pipeline tests passed! ✓")
@@ -0,0 +1,133 @@
+"""
+Test Streaming Analysis
+Checks that council arguments are reported as each LLM call resolves and
+that /analyze-asset/stream emits stage events before the final result.
+"""
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+from agents.moderator import ModeratorAgent
+from agents.narrator import NarratorAgent
+from agents.persona import PersonaAgent
+from llm_council.services import debate_engine as debate_engine_module
+from llm_council.services.debate_engine import DebateEngine
+
+COMPLETION = '{"thesis": "%s thesis", "supporting_points": ["a", "b"], "confidence": "high"}'
+
+
+class DelayedClient:
+    """LLM client stand-in answering after a fixed delay."""
+
+    def __init__(self, name: str, delay: float):
+        self.name = name
+        self.delay = delay
+
+    async def complete_async(self, prompt: str, system: str = "", temperature: float = 0.7) -> str:
+        await asyncio.sleep(self.delay)
+        return COMPLETION % self.name
+
+    async def stream_async(self, prompt: str, system: str = "", temperature: float = 0.7):
+        await asyncio.sleep(self.delay)
+        completion = COMPLETION % self.name
+        for i in range(0, len(completion), 16):
+            yield completion[i:i + 16]
+
+
+def make_engine() -> DebateEngine:
+    engine = DebateEngine.__new__(DebateEngine)
+    names = ["🦅 Macro Hawk", "🔬 Micro Forensic", "💧 Flow Detective", "📊 Tech Interpreter", "🤔 Skeptic"]
+    delays = [0.05, 0.04, 0.03, 0.02, 0.01]
+    engine.llm_providers = {name: DelayedClient(name, delay) for name, delay in zip(names, delays)}
+    engine.hedge_providers = {}
+    return engine
+
+
+def test_arguments_are_reported_as_they_resolve():
+    """on_argument fires in completion order; the result keeps council order."""
+    engine = make_engine()
+    seen = []
+
+    result = asyncio.run(engine.debate_move_async(
+        "AAPL",
+        price_data={"price": 180.0, "change_percent": 1.5, "volume": 1000},
+        on_argument=lambda argument: seen.append(argument.agent_name),
+    ))
+
+    assert seen == list(reversed(list(engine.llm_providers)))
+    assert [a.agent_name for a in result["agent_arguments"]] == list(engine.llm_providers)
+
+
+def parse_events(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def install_stand_ins(monkeypatch):
+    """Replace yfinance and the LLM providers so the pipeline runs offline."""
+    engine = make_engine()
+    engine._get_market_data = lambda symbol: {"symbol": symbol, "price": 180.0, "change_percent": 1.5, "volume": 1000}
+    monkeypatch.setattr(debate_engine_module, "get_debate_engine", lambda: engine)
+    monkeypatch.setattr(main, "validate_asset_symbol", lambda asset: (asset != "BAD", "Unknown symbol"))
+
+    calendar = main.get_economic_calendar_service()
+    monkeypatch.setattr(calendar, "get_stock_events", lambda symbol, refresh_within=0: calendar._get_fallback_events(symbol))
+    metrics = main.get_market_metrics_service()
+    monkeypatch.setattr(metrics, "get_vix", lambda refresh=False: 18.0)
+    monkeypatch.setattr(metrics, "get_market_volatility", lambda symbol, period="30d": 22.0)
+
+    async def narrator_run_async(self, context):
+        context["session_summary"] = "Summary"
+        return context
+
+    async def persona_run_async(self, context):
+        context["persona_post"] = {"x": "x", "linkedin": "linkedin"}
+        return context
+
+    async def moderator_run_async(self, context):
+        context["moderation"] = {"x": {"verdict": "POST"}, "linkedin": {"verdict": "POST"}}
+        return context
+
+    # The pipeline binds run_async when it is built, per request
+    monkeypatch.setattr(NarratorAgent, "has_llm_access", True)
+    monkeypatch.setattr(NarratorAgent, "run_async", narrator_run_async)
+    monkeypatch.setattr(PersonaAgent, "run_async", persona_run_async)
+    monkeypatch.setattr(ModeratorAgent, "run_async", moderator_run_async)
+    return engine
+
+
+def test_stream_emits_stage_events_then_complete(monkeypatch):
+    """Validation errors stay HTTP errors; a valid run streams every stage."""
+    engine = install_stand_ins(monkeypatch)
+    client = TestClient(main.app)
+
+    assert client.post("/analyze-asset/stream?asset=BAD").status_code == 400
+
+    response = client.post("/analyze-asset/stream?asset=aapl")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "start"
+    assert names[-1] == "complete"
+    for name in ("economic_calendar", "behaviour", "council_summary", "narrative",
+                 "persona_post", "moderation", "market_metrics"):
+        assert names.index(name) < names.index("complete")
+    assert names.index("persona_post") < names.index("moderation")
+
+    arguments = [data["agent_name"] for name, data in events if name == "council_argument"]
+    assert sorted(arguments) == sorted(engine.llm_providers)
+    assert names.index("council_argument") < names.index("council_summary")
+    assert events[-1][1]["market_metrics"]["vix"] == 18.0
+
+
+if __name__ == "__main__":
+    test_arguments_are_reported_as_they_resolve()
+    print("All streaming tests passed! ✓")
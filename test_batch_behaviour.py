@@ -0,0 +1,120 @@
+"""
+Test Batch Behaviour Analysis
+Checks JSONL reading (per-user and per-trade layouts), ordered NDJSON output
+from the process pool, narratives on the async path, and the
+/behaviour/batch endpoint.
+"""
+
+import asyncio
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+from llm_council.services.rate_limiter import Priority, current_priority
+from services import batch_behaviour
+from services.batch_behaviour import read_jsonl, run_batch
+
+
+def trade(ts, pnl, symbol="AAPL"):
+    return {"timestamp": f"2026-02-07 {ts}", "symbol": symbol, "action": "BUY",
+            "price": 100.0, "pnl": pnl, "status": "CLOSED"}
+
+
+REVENGE = [trade("09:00:00", -100), trade("09:05:00", -50), trade("09:08:00", -75)]
+CALM = [trade("09:00:00", 40), trade("11:00:00", 20), trade("13:00:00", -10)]
+
+
+def write_jsonl(path, records):
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+    return str(path)
+
+
+def test_jsonl_layouts(tmp_path):
+    per_user = write_jsonl(tmp_path / "users.jsonl", [
+        {"user_id": "a", "trades": REVENGE}, {"user_id": "b", "trades": CALM}
+    ])
+    per_trade = write_jsonl(tmp_path / "trades.jsonl", [
+        dict(t, user_id="a") for t in REVENGE[:2]
+    ] + [dict(CALM[0], user_id="b"), dict(REVENGE[2], user_id="a")])
+
+    assert [(u, len(t)) for u, t in read_jsonl(per_user)] == [("a", 3), ("b", 3)]
+    sessions = list(read_jsonl(per_trade))
+    assert [(u, len(t)) for u, t in sessions] == [("a", 3), ("b", 1)]
+    assert "user_id" not in sessions[0][1][0]
+
+
+def test_run_batch_keeps_order_across_workers():
+    sessions = [(f"user{i}", REVENGE if i % 2 else CALM) for i in range(7)]
+    sessions.append(("broken", [{"timestamp": "2026-02-07 09:00:00"}]))
+
+    output = io.StringIO()
+    stats = run_batch(sessions, output, workers=2, chunk_size=2)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert [r["user_id"] for r in results] == [u for u, _ in sessions]
+    assert stats["users"] == 8 and stats["errors"] == 1
+    assert results[1]["readiness"]["recommendation"] == "STOP TRADING"
+    assert results[1]["insights"][0]["type"] == "Revenge Trading"
+    assert results[0]["trade_summary"] == {"total_trades": 3, "net_pnl": 50.0, "win_rate": 66.7, "wins": 2, "losses": 1}
+    assert "narrative" not in results[0]
+    assert "error" in results[-1]
+
+    inline = io.StringIO()
+    run_batch(sessions, inline, workers=0, chunk_size=3)
+    assert inline.getvalue() == output.getvalue()
+
+
+def test_batch_endpoint_streams_ndjson(monkeypatch):
+    monkeypatch.setenv("BATCH_POOL_SIZE", "1")
+    monkeypatch.setattr(main.get_market_metrics_service(), "get_vix", lambda: 14.0)
+    batch_behaviour.shutdown_batch_pool()
+    try:
+        client = TestClient(main.app)
+        response = client.post("/behaviour/batch", json={
+            "users": [{"user_id": "a", "trades": REVENGE}, {"user_id": "b", "trades": CALM}],
+            "chunk_size": 1,
+        })
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["user_id"] for r in results] == ["a", "b"]
+        assert results[0]["risk_score"] >= 25
+
+        # Re-running the same report does not count the session again
+        client.post("/behaviour/batch", json={"users": [{"user_id": "a", "trades": REVENGE}]})
+        assert main.get_tendency_engine()._tables["a"][-1, 0] == 1
+    finally:
+        batch_behaviour.shutdown_batch_pool()
+
+
+def test_async_batch_narratives_use_cached_async_path(monkeypatch):
+    calls = []
+
+    class FakeNarrator:
+        async def generate_session_summary_async(self, insights, market_context, trade_summary):
+            calls.append((trade_summary["total_trades"], current_priority()))
+            return f"{len(insights)} insights"
+
+    monkeypatch.setenv("BATCH_POOL_SIZE", "1")
+    monkeypatch.setattr(batch_behaviour, "_get_agents", lambda: (None, FakeNarrator()))
+    batch_behaviour.shutdown_batch_pool()
+
+    async def collect():
+        sessions = [("a", REVENGE), ("broken", [{"timestamp": "2026-02-07 09:00:00"}]), ("b", CALM)]
+        return [r async for r in batch_behaviour.analyze_batch_async(sessions, chunk_size=2, include_narrative=True)]
+
+    try:
+        results = asyncio.run(collect())
+    finally:
+        batch_behaviour.shutdown_batch_pool()
+    assert [r["user_id"] for r in results] == ["a", "broken", "b"]
+    assert results[0]["narrative"] == f"{len(results[0]['insights'])} insights"
+    assert "narrative" not in results[1]
+    assert calls == [(3, Priority.BACKGROUND)] * 2
+
+
+if __name__ == "__main__":
+    test_run_batch_keeps_order_across_workers()
+    print("All batch behaviour tests passed! ✓")
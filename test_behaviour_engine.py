@@ -0,0 +1,91 @@
+"""
+Test Behaviour Engine
+Checks that the columnar detectors report the same patterns, occurrences and
+messages as the original per-trade rules, including unsorted input and
+malformed timestamps.
+"""
+
+import numpy as np
+
+from agents.behaviour_agent import BehaviorMonitorAgent
+from agents.behaviour_engine import TradeColumns, detect_patterns, parse_timestamps
+
+
+def trade(ts, pnl, symbol="BTCUSD", action="BUY", status="CLOSED"):
+    return {"timestamp": f"2026-02-07 {ts}", "symbol": symbol, "action": action,
+            "price": 100, "pnl": pnl, "status": status}
+
+
+def types(insights):
+    return [insight["type"] for insight in insights]
+
+
+def test_parse_timestamps_marks_malformed_values():
+    raw = np.array(["2026-02-07 09:00:00", "garbage", "2026-13-45 99:00:00", "1970-01-01 00:01:00"])
+    seconds = parse_timestamps(raw)
+    assert seconds[3] == 60
+    assert np.isnan(seconds[1]) and np.isnan(seconds[2])
+    assert not np.isnan(seconds[0])
+
+
+def test_revenge_trading_sorted_from_shuffled_input():
+    trades = [
+        trade("09:08:00", -75),
+        trade("09:00:00", -100),
+        trade("10:00:00", 50, symbol="EURUSD"),
+        trade("09:05:00", -50),
+    ]
+    insights = BehaviorMonitorAgent().analyze_session(trades)
+    assert insights[0] == {
+        "type": "Revenge Trading",
+        "severity": "High",
+        "details": "Detected 3 consecutive losses within 8 minutes. This indicates potential tilt or chasing."
+    }
+
+
+def test_win_streak_and_averaging_down_report_first_occurrence():
+    trades = [
+        trade("09:00:00", 20, symbol="AAPL"),
+        trade("09:30:00", 30, symbol="AAPL"),
+        trade("10:00:00", -200, symbol="TSLA"),
+        trade("10:30:00", -10, symbol="TSLA", action="BUY"),
+        trade("11:00:00", -5, symbol="MSFT"),
+    ]
+    insights = {i["type"]: i["details"] for i in detect_patterns(TradeColumns.from_trades(trades))}
+    assert insights["Ego Trading"].startswith("After 2 consecutive wins, took a large loss ($200).")
+    assert insights["Averaging Down"].startswith("Multiple entries on TSLA ")
+
+
+def test_hold_durations_and_rapid_trades():
+    trades = [
+        trade("09:00:00", 0, symbol="A", status="OPEN"),
+        trade("09:01:00", 40, symbol="A"),
+        trade("09:01:30", 0, symbol="B", status="OPEN"),
+        trade("09:21:30", -40, symbol="B"),
+        trade("09:22:00", 0, symbol="C"),
+        trade("09:22:30", 0, symbol="D"),
+    ]
+    detected = types(BehaviorMonitorAgent().analyze_session(trades))
+    assert "Loss Aversion" in detected
+    assert "Quick Profit Taking" in detected
+    assert "Impulsive Decisions" in detected
+
+
+def test_detector_switches_and_empty_session():
+    trades = [trade(f"09:{m:02d}:00", -10) for m in range(12)]
+    assert types(BehaviorMonitorAgent(check_emotional_patterns=False).analyze_session(trades)) == [
+        "Revenge Trading", "Overtrading"
+    ]
+    assert types(BehaviorMonitorAgent(
+        check_revenge_trading=False, check_overtrading=False, check_emotional_patterns=False
+    ).analyze_session(trades)) == ["Disciplined"]
+    assert types(BehaviorMonitorAgent().analyze_session([])) == ["No Activity"]
+
+
+if __name__ == "__main__":
+    test_parse_timestamps_marks_malformed_values()
+    test_revenge_trading_sorted_from_shuffled_input()
+    test_win_streak_and_averaging_down_report_first_occurrence()
+    test_hold_durations_and_rapid_trades()
+    test_detector_switches_and_empty_session()
+    print("All behaviour engine tests passed! ✓")
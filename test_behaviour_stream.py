@@ -0,0 +1,63 @@
+"""
+Test Streaming Behaviour Detection
+Checks that BehaviorMonitorAgent.update() raises each insight on the trade
+that triggers it and that the streamed session ends up with the same
+insights as a batch analyze_session() call.
+"""
+
+from agents.behaviour_agent import BehaviorMonitorAgent
+
+
+def trade(ts, pnl, symbol="BTCUSD", action="BUY", status="CLOSED"):
+    return {"timestamp": f"2026-02-07 {ts}", "symbol": symbol, "action": action,
+            "price": 100, "pnl": pnl, "status": status}
+
+
+SESSION = [
+    trade("09:00:00", -100),
+    trade("09:05:00", -50),
+    trade("09:08:00", -75),
+    trade("10:00:00", 50, symbol="EURUSD"),
+    trade("10:00:30", 60, symbol="EURUSD"),
+    trade("10:00:50", -400, symbol="EURUSD"),
+]
+
+
+def test_insights_emitted_on_triggering_trade():
+    monitor = BehaviorMonitorAgent()
+    emitted = [[i["type"] for i in monitor.update(t)] for t in SESSION]
+
+    assert emitted[:2] == [[], []]
+    assert "Revenge Trading" in emitted[2]
+    assert "Averaging Down" in emitted[2]
+    assert "Ego Trading" in emitted[5]
+    # Sticky patterns are only reported once
+    assert sum(types.count("Revenge Trading") for types in emitted) == 1
+
+
+def test_stream_matches_batch_analysis():
+    monitor = BehaviorMonitorAgent()
+    for t in SESSION:
+        monitor.update(t)
+    assert monitor.stream_insights() == BehaviorMonitorAgent().analyze_session(SESSION)
+
+
+def test_session_state_feeds_risk_prediction():
+    monitor = BehaviorMonitorAgent()
+    assert monitor.stream_insights()[0]["type"] == "No Activity"
+    for t in SESSION[:3]:
+        monitor.update(t)
+
+    state = monitor.session_state()
+    assert state == {"consecutive_losses": 3, "consecutive_wins": 0, "trades_in_last_hour": 3}
+    assert monitor.predict_next_risk(state)["risk_level"] in ("medium", "high")
+
+    monitor.reset_stream()
+    assert monitor.session_state()["consecutive_losses"] == 0
+
+
+if __name__ == "__main__":
+    test_insights_emitted_on_triggering_trade()
+    test_stream_matches_batch_analysis()
+    test_session_state_feeds_risk_prediction()
+    print("All behaviour stream tests passed! ✓")
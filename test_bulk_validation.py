@@ -0,0 +1,151 @@
+"""
+Test Bulk Validation
+Checks that bulk validation normalises and de-duplicates symbols, answers
+universe and cached symbols without market data, downloads history once
+for the rest, checks them concurrently on one shared pool, and that
+/validate-assets returns results with stats.
+"""
+
+import threading
+import time
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import main
+import services.asset_validator as asset_validator
+from services.asset_validator import AssetValidator
+from services.symbol_universe import SymbolUniverse
+from services.validation_cache import MemoryValidationBackend, ValidationCache
+
+LISTED = {"NEWCO", "FRESH", "LATE"}
+
+
+class FakeMarketData:
+    """Market data stand-in: LISTED symbols exist, everything else has no history."""
+
+    def __init__(self, download_fails=False):
+        self.download_fails = download_fails
+        self.prefetches = []
+        self.info_calls = []
+        self.invalidated = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _history(self, symbol):
+        if symbol in LISTED and not self.download_fails:
+            return pd.DataFrame({"Close": [10.0, 10.5]})
+        return pd.DataFrame()
+
+    def prefetch_history(self, symbols, period=None):
+        self.prefetches.append(list(symbols))
+        return {symbol: self._history(symbol) for symbol in symbols}
+
+    def get_history(self, symbol, period="5d"):
+        return pd.DataFrame({"Close": [10.0, 10.5]}) if symbol in LISTED else pd.DataFrame()
+
+    def get_info(self, symbol):
+        with self._lock:
+            self.info_calls.append(symbol)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        if symbol not in LISTED:
+            return {}
+        return {"symbol": symbol, "quoteType": "EQUITY", "shortName": symbol.title(), "currentPrice": 10.5}
+
+    def invalidate(self, symbol=None):
+        self.invalidated.append(symbol)
+
+
+def make_validator(monkeypatch, **fake_options):
+    fake = FakeMarketData(**fake_options)
+    monkeypatch.setattr(asset_validator, "get_market_data_service", lambda: fake)
+    universe = SymbolUniverse([{"symbol": "AAPL", "name": "Apple Inc.", "type": "EQUITY"}])
+    return AssetValidator(cache=ValidationCache([MemoryValidationBackend()]), universe=universe), fake
+
+
+def test_bulk_results_in_order_with_sources(monkeypatch):
+    validator, fake = make_validator(monkeypatch)
+    validator.cache.set("OLDCO", False, "Symbol 'OLDCO' not found or has no data")
+
+    report = validator.validate_symbols(
+        ["aapl", " NEWCO ", "AAPL", "oldco", "", "x" * 20, "GHOST", "fresh", "late", "newco"]
+    )
+    results = report["results"]
+    assert [r["symbol"] for r in results] == ["AAPL", "NEWCO", "OLDCO", "", "X" * 20, "GHOST", "FRESH", "LATE"]
+    assert {r["symbol"]: r["source"] for r in results} == {
+        "AAPL": "universe", "NEWCO": "market_data", "OLDCO": "cache", "": "format",
+        "X" * 20: "format", "GHOST": "market_data", "FRESH": "market_data", "LATE": "market_data",
+    }
+    assert [r["symbol"] for r in results if r["valid"]] == ["AAPL", "NEWCO", "FRESH", "LATE"]
+    assert results[5]["error"] == "Symbol 'GHOST' has no trading history"
+
+    # One batched download; only symbols with history get an info lookup, concurrently
+    assert fake.prefetches == [["NEWCO", "GHOST", "FRESH", "LATE"]]
+    assert sorted(fake.info_calls) == ["FRESH", "LATE", "NEWCO"]
+    assert fake.max_active > 1
+
+    stats = report["stats"]
+    assert stats["requested"] == 10 and stats["unique"] == 8
+    assert (stats["universe"], stats["cache"], stats["format"], stats["market_data"]) == (1, 1, 2, 4)
+    assert stats["elapsed_ms"] >= 0
+
+    # Everything is cached now, including the invalid symbol
+    again = validator.validate_symbols(["NEWCO", "GHOST"])
+    assert [r["source"] for r in again["results"]] == ["cache", "cache"]
+    assert len(fake.prefetches) == 1
+
+
+def test_failed_download_falls_back_to_single_checks(monkeypatch):
+    validator, fake = make_validator(monkeypatch, download_fails=True)
+    report = validator.validate_symbols(["NEWCO", "GHOST"])
+    assert fake.invalidated == ["NEWCO", "GHOST"]
+    assert sorted(fake.info_calls) == ["GHOST", "NEWCO"]
+    assert [r["valid"] for r in report["results"]] == [True, False]
+
+
+def test_concurrent_bulk_requests_share_the_check_pool(monkeypatch):
+    asset_validator.shutdown_check_pool()
+    monkeypatch.setattr(asset_validator, "BULK_VALIDATION_WORKERS", 2)
+    validator, fake = make_validator(monkeypatch)
+    other = AssetValidator(cache=ValidationCache([MemoryValidationBackend()]), universe=validator.universe)
+
+    requests = [threading.Thread(target=v.validate_symbols, args=(sorted(LISTED),)) for v in (validator, other)]
+    for thread in requests:
+        thread.start()
+    for thread in requests:
+        thread.join()
+
+    assert len(fake.info_calls) == 6
+    assert fake.max_active == 2
+    asset_validator.shutdown_check_pool()
+
+
+def test_validate_assets_endpoint():
+    client = TestClient(main.app)
+    body = client.post("/validate-assets", json={"symbols": ["spy", "SPY", "btc-usd", "  "]}).json()
+    assert [(r["symbol"], r["valid"]) for r in body["results"]] == [("SPY", True), ("BTC-USD", True), ("", False)]
+    assert body["stats"]["universe"] == 2
+
+    response = client.post("/validate-assets", json={"symbols": ["AAPL"] * (main.MAX_BULK_SYMBOLS + 1)})
+    assert response.status_code == 400
+
+
+
+def test_endpoint_works_after_app_restart(monkeypatch):
+    # No background refresh jobs (they need the network)
+    monkeypatch.setattr(main, "SYMBOL_UNIVERSE_REFRESH_HOURS", 0)
+    monkeypatch.setattr(main.get_prefetch_scheduler(), "market_interval", 0)
+    for _ in range(2):
+        with TestClient(main.app) as client:
+            response = client.post("/validate-assets", json={"symbols": ["SPY"]})
+            assert response.status_code == 200
+            assert response.json()["results"][0]["valid"]
+
+if __name__ == "__main__":
+    test_validate_assets_endpoint()
+    print("All bulk validation tests passed! ✓")
@@ -0,0 +1,78 @@
+"""
+Test Debate Latency Budget
+Checks hedged requests to an alternate provider and the per-debate deadline.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from llm_council.core.config import settings
+from llm_council.services.debate_engine import DebateEngine
+from llm_council.models.schemas import ConfidenceLevel
+
+COMPLETION = '{"thesis": "%s", "supporting_points": ["a", "b"], "confidence": "high"}'
+NAMES = ["🦅 Macro Hawk", "🔬 Micro Forensic", "💧 Flow Detective", "📊 Tech Interpreter", "🤔 Skeptic"]
+PRICE_DATA = {"price": 180.0, "change_percent": 1.5, "volume": 1000}
+
+
+class DelayedClient:
+    """LLM client stand-in answering with its label after a fixed delay."""
+
+    def __init__(self, label: str, delay: float):
+        self.label = label
+        self.delay = delay
+        self.provider = SimpleNamespace(model=label)
+
+    async def stream_async(self, prompt: str, system: str = "", temperature: float = 0.7):
+        await asyncio.sleep(self.delay)
+        yield COMPLETION % self.label
+
+
+def make_engine(delays: dict, alternate: DelayedClient = None) -> DebateEngine:
+    engine = DebateEngine.__new__(DebateEngine)
+    engine.llm_providers = {name: DelayedClient("primary", delays.get(name, 0.01)) for name in NAMES}
+    engine.hedge_providers = {name: alternate for name in NAMES}
+    return engine
+
+
+def run_debate(engine: DebateEngine, budget: float, hedge_delay: float) -> tuple:
+    saved = settings.DEBATE_LATENCY_BUDGET, settings.DEBATE_HEDGE_DELAY, settings.LLM_STREAMING
+    settings.DEBATE_LATENCY_BUDGET, settings.DEBATE_HEDGE_DELAY, settings.LLM_STREAMING = budget, hedge_delay, True
+    try:
+        started = time.perf_counter()
+        result = asyncio.run(engine.debate_move_async("AAPL", price_data=PRICE_DATA))
+        return result, time.perf_counter() - started
+    finally:
+        settings.DEBATE_LATENCY_BUDGET, settings.DEBATE_HEDGE_DELAY, settings.LLM_STREAMING = saved
+
+
+def test_slow_agent_is_hedged_to_alternate_provider():
+    """A slow primary is raced by the alternate after the hedge delay."""
+    engine = make_engine({"🤔 Skeptic": 5.0}, alternate=DelayedClient("alternate", 0.01))
+    result, elapsed = run_debate(engine, budget=2.0, hedge_delay=0.1)
+
+    theses = {a.agent_name: a.thesis for a in result["agent_arguments"]}
+    assert theses["🤔 Skeptic"] == "alternate"
+    assert theses["🦅 Macro Hawk"] == "primary"
+    assert result["hedged_agents"] == ["🤔 Skeptic"]
+    assert result["timed_out_agents"] == []
+    assert elapsed < 1.0
+
+
+def test_agents_past_the_budget_get_fallback():
+    """With no usable alternate, the debate still ends at the budget."""
+    engine = make_engine({"🤔 Skeptic": 5.0, "🦅 Macro Hawk": 5.0}, alternate=None)
+    result, elapsed = run_debate(engine, budget=0.3, hedge_delay=0.1)
+
+    assert result["timed_out_agents"] == ["🦅 Macro Hawk", "🤔 Skeptic"]
+    assert result["hedged_agents"] == []
+    skeptic = next(a for a in result["agent_arguments"] if a.agent_name == "🤔 Skeptic")
+    assert skeptic.confidence == ConfidenceLevel.MODERATE
+    assert elapsed < 1.0
+
+
+if __name__ == "__main__":
+    test_slow_agent_is_hedged_to_alternate_provider()
+    test_agents_past_the_budget_get_fallback()
+    print("All debate hedging tests passed! ✓")
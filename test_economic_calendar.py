@@ -0,0 +1,102 @@
+"""
+Test Economic Calendar
+Checks that calendar fields are fetched once per symbol within their TTL,
+including under concurrent callers, that fallbacks after a failed fetch are
+not cached, and that a summary built from already-fetched events makes no
+fetch.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import services.economic_calendar as economic_calendar
+from services.economic_calendar import EconomicCalendarService
+
+
+class FakeMarketData:
+    """Counts info and news fetches; fails while ``failing`` is set."""
+
+    def __init__(self):
+        self.info_calls = 0
+        self.news_calls = 0
+        self.failing = False
+        self._lock = threading.Lock()
+
+    def get_info(self, symbol):
+        with self._lock:
+            self.info_calls += 1
+        time.sleep(0.02)
+        if self.failing:
+            raise RuntimeError("rate limited")
+        return {"symbol": symbol, "earningsDate": "2026-10-30", "trailingEps": 6.1}
+
+    def get_news(self, symbol):
+        with self._lock:
+            self.news_calls += 1
+        return [{"title": f"{symbol} headline {i}", "publisher": "Wire"} for i in range(8)]
+
+
+def make_service(monkeypatch, **ttls):
+    fake = FakeMarketData()
+    monkeypatch.setattr(economic_calendar, "get_market_data_service", lambda: fake)
+    return EconomicCalendarService(**ttls), fake
+
+
+def test_one_fetch_per_symbol(monkeypatch):
+    service, fake = make_service(monkeypatch)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(service.get_stock_events, ["aapl"] * 8))
+    assert (fake.info_calls, fake.news_calls) == (1, 1)
+    assert all(r["earnings_calendar"]["next_earnings_date"] == "2026-10-30" for r in results)
+    assert len(results[0]["recent_news"]) == 5
+
+    service.get_stock_events("AAPL")
+    service.get_market_summary("AAPL")
+    assert (fake.info_calls, fake.news_calls) == (1, 1)
+    assert service.get_stats()["misses"] == 3  # earnings, news, macro
+
+    service.get_stock_events("MSFT")
+    assert (fake.info_calls, fake.news_calls) == (2, 2)
+
+
+def test_fields_expire_independently(monkeypatch):
+    service, fake = make_service(monkeypatch, news_ttl=0.05)
+    service.get_stock_events("AAPL")
+    time.sleep(0.06)
+    service.get_stock_events("AAPL")
+    assert (fake.info_calls, fake.news_calls) == (1, 2)
+
+    service.invalidate("aapl")
+    service.get_stock_events("AAPL")
+    assert (fake.info_calls, fake.news_calls) == (2, 3)
+
+
+def test_fallback_not_cached(monkeypatch):
+    service, fake = make_service(monkeypatch)
+    fake.failing = True
+    events = service.get_stock_events("AAPL")
+    assert events["earnings_calendar"]["next_earnings_date"] is None
+
+    fake.failing = False
+    events = service.get_stock_events("AAPL")
+    assert events["earnings_calendar"]["next_earnings_date"] == "2026-10-30"
+    assert fake.info_calls == 2
+
+
+def test_summary_from_events():
+    service = EconomicCalendarService()
+    events = {
+        "earnings_calendar": {"next_earnings_date": "2026-10-30"},
+        "economic_events": ["CPI inflation data - Next week"],
+        "recent_news": [{"title": "Apple beats"}],
+    }
+    summary = service.get_market_summary("AAPL", events)
+    assert summary == ("Next earnings: 2026-10-30 | Economic calendar: CPI inflation data - Next week"
+                       " | Recent headlines: Apple beats")
+    assert service.get_stats()["misses"] == 0
+
+
+if __name__ == "__main__":
+    test_summary_from_events()
+    print("All economic calendar tests passed! ✓")
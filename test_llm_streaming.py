@@ -0,0 +1,99 @@
+"""
+Test LLM Streaming
+Checks incremental JSON parsing and that provider streams are parsed and
+aborted early once the agent's JSON object is complete.
+"""
+
+import asyncio
+import json
+import time
+
+from aiohttp import web
+
+from llm_council.services.json_stream import IncrementalJSONObject
+from llm_council.services.llm_client import LLMClient, LLMStreamError
+
+RESPONSE = '```json\n{"thesis": "AAPL up 2% on \\"strong\\" iPhone {demand}", "supporting_points": ["a"], "confidence": "high"}\n```'
+
+
+def test_incremental_parser_detects_object_end():
+    """Braces inside strings are ignored; text around the object is dropped."""
+    parser = IncrementalJSONObject()
+    chunks = [RESPONSE[i:i + 7] for i in range(0, len(RESPONSE), 7)]
+    partials = []
+
+    for chunk in chunks:
+        if parser.feed(chunk):
+            break
+        partials.append(parser.partial_string("thesis"))
+
+    assert parser.complete
+    assert json.loads(parser.document)["confidence"] == "high"
+    theses = [p for p in partials if p]
+    assert theses[-1].startswith('AAPL up 2% on "strong"')
+    assert all(b.startswith(a) for a, b in zip(theses, theses[1:]))
+
+
+async def stream_server(tail_delay: float):
+    """Mock OpenAI-compatible streaming endpoint with a slow trailing section."""
+    async def handle(request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        if body["messages"][-1]["content"] == "fail":
+            return web.json_response({"error": "upstream failure"}, status=500)
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for i in range(0, len(RESPONSE), 10):
+            delta = {"choices": [{"delta": {"content": RESPONSE[i:i + 10]}}]}
+            await response.write(f"data: {json.dumps(delta)}\n\n".encode())
+        await asyncio.sleep(tail_delay)  # e.g. the model rambling after the JSON
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v1"
+
+
+def test_stream_is_parsed_and_aborted_early():
+    """The stream yields deltas; closing it after the JSON skips the slow tail."""
+    async def scenario():
+        runner, base_url = await stream_server(tail_delay=2.0)
+        client = LLMClient(provider_type="mistral", api_key="test")
+        client.provider.base_url = base_url
+        try:
+            parser = IncrementalJSONObject()
+            started = time.perf_counter()
+            stream = client.stream_async("analyze")
+            async for chunk in stream:
+                if parser.feed(chunk):
+                    break
+            await stream.aclose()
+            elapsed = time.perf_counter() - started
+
+            try:
+                async for _ in client.stream_async("fail"):
+                    pass
+                failed = False
+            except LLMStreamError:
+                failed = True
+            return parser, elapsed, failed, client.get_stats()
+        finally:
+            await LLMClient.close_sessions()
+            await runner.cleanup()
+
+    parser, elapsed, failed, stats = asyncio.run(scenario())
+    assert json.loads(parser.document)["thesis"].startswith("AAPL up 2%")
+    assert elapsed < 1.0
+    assert failed
+    assert stats["call_count"] == 1
+
+
+if __name__ == "__main__":
+    test_incremental_parser_detects_object_end()
+    test_stream_is_parsed_and_aborted_early()
+    print("All LLM streaming tests passed! ✓")
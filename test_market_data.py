@@ -0,0 +1,151 @@
+"""
+Test Market Data Service
+Checks that history is fetched once and sliced, that Ticker objects and
+info are shared between consumers, that multi-symbol requests become a
+single batched download, and that the cache stays bounded. yfinance is
+replaced by in-process fakes.
+"""
+
+import pandas as pd
+
+import services.market_data as market_data
+from services.market_data import MarketDataService, slice_history
+
+
+def make_history(days: int = 60, start: float = 100.0) -> pd.DataFrame:
+    index = pd.bdate_range(end="2024-06-28", periods=days)
+    closes = [start + i for i in range(days)]
+    return pd.DataFrame({"Close": closes, "Volume": [1000] * days}, index=index)
+
+
+class FakeTicker:
+    created = 0
+
+    def __init__(self, symbol: str):
+        FakeTicker.created += 1
+        self.symbol = symbol
+        self.history_calls = []
+        self.info_calls = 0
+
+    def history(self, period: str):
+        self.history_calls.append(period)
+        return make_history()
+
+    @property
+    def info(self):
+        self.info_calls += 1
+        return {"symbol": self.symbol, "quoteType": "EQUITY"}
+
+
+def install_fakes(monkeypatch):
+    FakeTicker.created = 0
+    downloads = []
+
+    def download(symbols, **kwargs):
+        downloads.append(list(symbols))
+        frames = {symbol: make_history(start=100.0 * (i + 1)) for i, symbol in enumerate(symbols)}
+        return pd.concat(frames, axis=1)
+
+    monkeypatch.setattr(market_data.yf, "Ticker", FakeTicker)
+    monkeypatch.setattr(market_data.yf, "download", download)
+    return downloads
+
+
+def test_history_fetched_once_and_sliced(monkeypatch):
+    install_fakes(monkeypatch)
+    service = MarketDataService()
+
+    assert len(service.get_history("aapl", "2d")) == 2
+    assert len(service.get_history("AAPL", "5d")) == 5
+    month = service.get_history("AAPL", "1mo")
+    assert 19 <= len(month) <= 24
+
+    ticker = service.get_ticker("AAPL")
+    assert ticker.history_calls == ["3mo"]
+    assert FakeTicker.created == 1
+
+    # A wider window than the cached one triggers a new fetch
+    service.get_history("AAPL", "1y")
+    assert ticker.history_calls == ["3mo", "1y"]
+
+
+def test_info_shared_between_consumers(monkeypatch):
+    install_fakes(monkeypatch)
+    service = MarketDataService()
+
+    for _ in range(3):
+        assert service.get_info("MSFT")["symbol"] == "MSFT"
+    assert service.get_ticker("MSFT").info_calls == 1
+    assert service.get_stats()["hits"] == 2
+
+
+def test_batched_download_skips_cached_symbols(monkeypatch):
+    downloads = install_fakes(monkeypatch)
+    service = MarketDataService()
+    service.get_history("SPY", "5d")
+
+    histories = service.prefetch_history(["^VIX", "SPY", "QQQ"], period="5d")
+
+    assert downloads == [["^VIX", "QQQ"]]
+    assert set(histories) == {"^VIX", "SPY", "QQQ"}
+    assert histories["QQQ"]["Close"].iloc[-1] == make_history(start=200.0)["Close"].iloc[-1]
+
+    # Everything is cached now: no further downloads or Ticker history calls
+    service.prefetch_history(["^VIX", "QQQ"])
+    service.get_history("QQQ", "1d")
+    assert len(downloads) == 1
+    assert FakeTicker.created == 1
+
+
+def test_refresh_keeps_cached_history_on_empty_download(monkeypatch):
+    downloads = install_fakes(monkeypatch)
+    service = MarketDataService()
+    service.prefetch_history(["AAPL", "MSFT"])
+
+    # One symbol missing from the refresh keeps its cached frame
+    def partial(symbols, **kwargs):
+        downloads.append(list(symbols))
+        return pd.concat({"MSFT": make_history(start=300.0)}, axis=1)
+
+    monkeypatch.setattr(market_data.yf, "download", partial)
+    service.prefetch_history(["AAPL", "MSFT"], refresh=True)
+    assert len(service.get_history("AAPL", "5d")) == 5
+    assert service.get_history("MSFT", "1d")["Close"].iloc[-1] == make_history(start=300.0)["Close"].iloc[-1]
+
+    # A refresh that returns nothing at all is a failure and leaves the cache alone
+    monkeypatch.setattr(market_data.yf, "download", lambda symbols, **kwargs: pd.DataFrame())
+    try:
+        service.prefetch_history(["AAPL", "MSFT"], refresh=True)
+        failed = False
+    except ValueError:
+        failed = True
+    assert failed
+    assert len(service.get_history("AAPL", "5d")) == 5
+    assert len(service.get_history("MSFT", "5d")) == 5
+    assert FakeTicker.created == 0
+
+
+def test_entries_are_bounded_and_fetch_locks_dropped(monkeypatch):
+    install_fakes(monkeypatch)
+    service = MarketDataService(max_entries=3)
+    for symbol in ("AAPL", "MSFT", "NVDA"):
+        service.get_info(symbol)
+    service.get_info("AAPL")  # Most recently used
+    service.get_info("TSLA")
+
+    assert list(service._entries) == [("info", "NVDA"), ("info", "AAPL"), ("info", "TSLA")]
+    assert service.get_stats()["entries"] == 3
+    assert service.get_stats()["fetch_locks"] == 0
+    assert service.get_stats()["misses"] == 4
+
+
+def test_slice_history_period_semantics():
+    history = make_history()
+    assert len(slice_history(history, "5d")) == 5
+    assert slice_history(history, "1wk").index[0] > history.index[-1] - pd.Timedelta(days=7)
+    assert slice_history(pd.DataFrame(), "5d").empty
+
+
+if __name__ == "__main__":
+    test_slice_history_period_semantics()
+    print("All market data tests passed! ✓")
@@ -0,0 +1,106 @@
+"""
+Test Moderator
+Checks the local rule tier (clean, guaranteed-return, behaviour-label and
+hype posts) and that only ambiguous posts reach the LLM, concurrently and
+within the moderation deadline.
+"""
+
+import asyncio
+import time
+
+from agents.moderator import ModeratorAgent, screen_post
+
+CLEAN_X = "🚀 AAPL up 3.2% after earnings beat expectations. Watching guidance closely. #Trading"
+CLEAN_LINKEDIN = "Apple shares rose 3.2% today after quarterly earnings came in above consensus estimates."
+AMBIGUOUS_X = "AAPL with a huge move today 📈 after earnings. #Markets"
+AMBIGUOUS_LINKEDIN = "Apple posted an incredible quarter, and shares rose 3.2% on the results."
+
+
+def test_rule_tier_verdicts():
+    assert screen_post("x", CLEAN_X)["verdict"] == "POST"
+    assert screen_post("linkedin", CLEAN_LINKEDIN)["verdict"] == "POST"
+
+    blocked = screen_post("linkedin", "A guaranteed return on AAPL, it's risk-free.")
+    assert blocked["verdict"] == "BLOCK" and not blocked["escalate"]
+    assert blocked["signals"]["guarantees"] == ["guaranteed return", "risk-free"]
+
+    fomo = screen_post("x", "Last chance to get into AAPL 🚀", behavior_label="FOMO Trading")
+    assert fomo["verdict"] == "BLOCK" and "FOMO Trading" in fomo["reason"]
+    assert screen_post("x", "Last chance to get into AAPL 🚀")["verdict"] == "WARN"
+
+    hype = screen_post("x", "AAPL to the moon 🚀🚀🚀🚀 insane massive move, YOLO!")
+    assert hype["verdict"] == "WARN" and not hype["escalate"]
+
+    emojis = screen_post("linkedin", "Apple shares rose today 📈🔥 on strong results.")
+    assert emojis["escalate"] and emojis["signals"]["emoji_density"] > 0.05
+    assert screen_post("x", "Apple shares rose today 📈🔥 on strong results.")["verdict"] == "POST"
+
+    assert screen_post("x", "[Error: timeout]")["verdict"] == "BLOCK"
+
+    two_signals = "AAPL with a huge move after an incredible quarter 📈"
+    assert screen_post("x", two_signals)["escalate"]
+    assert not screen_post("x", two_signals, behavior_label="Revenge Trading")["escalate"]
+
+
+def test_rule_tier_is_fast():
+    start = time.perf_counter()
+    for _ in range(1000):
+        screen_post("x", CLEAN_X)
+        screen_post("linkedin", CLEAN_LINKEDIN)
+    assert (time.perf_counter() - start) / 2000 < 0.001
+
+
+class ReviewingModerator(ModeratorAgent):
+    """Moderator whose LLM tier is a scripted coroutine."""
+
+    def __init__(self, delay=0.2, **kwargs):
+        super().__init__(**kwargs)
+        self.api_key = "test-key"
+        self.delay = delay
+        self.prompts = []
+
+    async def _query_llm(self, prompt):
+        self.prompts.append(prompt)
+        await asyncio.wait_for(asyncio.sleep(self.delay), self.timeout)
+        return {"verdict": "POST", "reason": "Enthusiastic but factual."}
+
+
+def moderate(agent, x, linkedin, label="None"):
+    context = {"persona_post": {"x": x, "linkedin": linkedin}, "asset": "AAPL",
+               "price_change_pct": 3.2, "behavior_label": label}
+    return asyncio.run(agent.run_async(context))["moderation"]
+
+
+def test_only_ambiguous_posts_escalate():
+    agent = ReviewingModerator()
+    moderation = moderate(agent, CLEAN_X, CLEAN_LINKEDIN)
+    assert agent.prompts == []
+    assert {result["tier"] for result in moderation.values()} == {"rules"}
+    assert "escalate" not in moderation["x"]
+
+    start = time.perf_counter()
+    moderation = moderate(agent, AMBIGUOUS_X, AMBIGUOUS_LINKEDIN)
+    elapsed = time.perf_counter() - start
+    assert len(agent.prompts) == 2
+    assert elapsed < 0.35  # Both reviews ran concurrently
+    assert moderation["x"] == dict(moderation["x"], verdict="POST", tier="llm")
+
+
+def test_review_timeout_and_missing_key_keep_rule_verdict():
+    moderation = moderate(ReviewingModerator(delay=1.0, timeout=0.1), AMBIGUOUS_X, CLEAN_LINKEDIN)
+    assert moderation["x"]["verdict"] == "WARN" and moderation["x"]["tier"] == "rules"
+    assert "timed out" in moderation["x"]["reason"]
+
+    agent = ModeratorAgent()
+    agent.api_key = None
+    moderation = moderate(agent, AMBIGUOUS_X, CLEAN_LINKEDIN)
+    assert moderation["x"]["verdict"] == "WARN"
+    assert "unavailable" in moderation["x"]["reason"]
+
+
+if __name__ == "__main__":
+    test_rule_tier_verdicts()
+    test_rule_tier_is_fast()
+    test_only_ambiguous_posts_escalate()
+    test_review_timeout_and_missing_key_keep_rule_verdict()
+    print("All moderator tests passed! ✓")
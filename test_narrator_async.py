@@ -0,0 +1,151 @@
+"""
+Test Async Narrator
+Checks that the async summary methods match the sync ones, that unchanged
+sessions are served from the summary cache, that errors are not cached, and
+that the pipeline methods add historical trends from the trade archive.
+"""
+
+import asyncio
+import shutil
+import tempfile
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import agents.narrator as narrator_module
+from agents.narrator import NarratorAgent, get_summary_cache
+from llm_council.services.rate_limiter import RateLimiter
+from services.trade_archive import TradeArchive
+
+INSIGHTS = [{"type": "Revenge Trading", "severity": "High", "details": "3 losses in 8 minutes"}]
+SUMMARY = {"total_trades": 4, "net_pnl": -75.0, "win_rate": 25.0, "wins": 1, "losses": 3}
+CONTEXT = "Symbol: AAPL\nSentiment: NEGATIVE"
+
+
+class FakeCompletions:
+    """Chat completions stand-in usable from both the sync and async clients."""
+
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    def _respond(self, messages):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("upstream unavailable")
+        text = f"Narrative for {len(messages[1]['content'])} chars"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=SimpleNamespace(total_tokens=100),
+        )
+
+    def create(self, messages, **kwargs):
+        return self._respond(messages)
+
+
+class AsyncFakeCompletions(FakeCompletions):
+    async def create(self, messages, **kwargs):
+        return self._respond(messages)
+
+
+@contextmanager
+def unthrottled():
+    """Replace the shared Groq rate limiter with an unlimited one."""
+    original = narrator_module.get_rate_limiter
+    narrator_module.get_rate_limiter = lambda provider, model=None: RateLimiter("groq-test")
+    try:
+        yield
+    finally:
+        narrator_module.get_rate_limiter = original
+
+
+def make_narrator(completions, async_completions) -> NarratorAgent:
+    narrator = NarratorAgent.__new__(NarratorAgent)
+    narrator.persona_name = "The Trading Coach"
+    narrator.api_key = "test-key"
+    narrator.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    async_client = SimpleNamespace(chat=SimpleNamespace(completions=async_completions))
+    narrator._async_client = lambda: async_client
+    return narrator
+
+
+def test_async_summary_matches_sync_and_is_cached():
+    get_summary_cache().invalidate()
+    sync_calls, async_calls = FakeCompletions(), AsyncFakeCompletions()
+    narrator = make_narrator(sync_calls, async_calls)
+
+    async def scenario():
+        first = await narrator.generate_session_summary_async(INSIGHTS, CONTEXT, SUMMARY)
+        again = await narrator.generate_session_summary_async(INSIGHTS, CONTEXT, SUMMARY)
+        changed = await narrator.generate_session_summary_async(INSIGHTS, CONTEXT + "\nVIX: 30", SUMMARY)
+        trends = await narrator.generate_summary_with_trends_async(
+            INSIGHTS, CONTEXT, SUMMARY, trend_summary="⚠️ Worsening", historical_risk_score=10
+        )
+        return first, again, changed, trends
+
+    with unthrottled():
+        first, again, changed, trends = asyncio.run(scenario())
+        assert first == again == narrator.generate_session_summary(INSIGHTS, CONTEXT, SUMMARY)
+        assert changed != first
+        assert async_calls.calls == 3
+        assert "Historical Average: 10/100" in trends
+        assert trends == narrator.generate_summary_with_trends(
+            INSIGHTS, CONTEXT, SUMMARY, trend_summary="⚠️ Worsening", historical_risk_score=10
+        )
+    assert get_summary_cache().get_stats()["hits"] >= 1
+
+
+def test_errors_are_not_cached():
+    get_summary_cache().invalidate()
+    failing = AsyncFakeCompletions(fail=True)
+    narrator = make_narrator(FakeCompletions(), failing)
+
+    async def scenario():
+        first = await narrator.generate_session_summary_async(INSIGHTS, CONTEXT, SUMMARY)
+        second = await narrator.generate_session_summary_async(INSIGHTS, CONTEXT, SUMMARY)
+        return first, second
+
+    with unthrottled():
+        first, second = asyncio.run(scenario())
+    assert first.startswith("❌ Error generating narrative") and second == first
+    assert failing.calls == 2
+
+
+def test_pipeline_run_uses_archive_trends():
+    get_summary_cache().invalidate()
+    sync_calls, async_calls = FakeCompletions(), AsyncFakeCompletions()
+    narrator = make_narrator(sync_calls, async_calls)
+    archive = TradeArchive(tempfile.mkdtemp())
+    archive.append("ann", [
+        {"timestamp": f"2026-03-0{d} 10:0{i}:00", "symbol": "TSLA", "action": "BUY",
+         "price": 240.0, "pnl": -120.0, "status": "CLOSED"}
+        for d in range(2, 9) for i in range(4)
+    ])
+    original = narrator_module.get_trade_archive
+    narrator_module.get_trade_archive = lambda: archive
+    context = {"user_id": "ann", "insights": INSIGHTS, "market_opinions": ["🦅 Macro Hawk (HIGH): risk-off"],
+               "user_trades": [{"pnl": -75.0}, {"pnl": 25.0}]}
+    try:
+        with unthrottled():
+            with_trends = asyncio.run(narrator.run_async(dict(context)))["session_summary"]
+            without = asyncio.run(narrator.run_async(dict(context, user_id="nobody")))["session_summary"]
+
+            # The sync method gives the same result, even with an event loop running
+            async def sync_inside_loop():
+                return narrator.run(dict(context))["session_summary"]
+            sync_with_trends = asyncio.run(sync_inside_loop())
+    finally:
+        narrator_module.get_trade_archive = original
+        shutil.rmtree(archive.root)
+
+    assert "Historical Average:" in with_trends
+    assert without.startswith("Narrative for") and "Historical Average:" not in without
+    assert sync_with_trends == with_trends
+    assert async_calls.calls == 2
+    assert sync_calls.calls == 1
+
+
+if __name__ == "__main__":
+    test_async_summary_matches_sync_and_is_cached()
+    test_errors_are_not_cached()
+    test_pipeline_run_uses_archive_trends()
+    print("All async narrator tests passed! ✓")
@@ -0,0 +1,123 @@
+"""
+Test Async Persona
+Checks that both posts come from one JSON completion, that an unusable
+reply falls back to two concurrent calls, that 429s are retried and then
+answered with fallback posts, and that a slow call misses its deadline and
+gets the fallback posts too.
+"""
+
+import asyncio
+import json
+
+from aiohttp import web
+
+import agents.persona as persona_module
+from agents.persona import PersonaAgent
+from llm_council.services.llm_client import LLMClient
+from llm_council.services.rate_limiter import RateLimiter
+
+CONTEXT = {
+    "asset": "AAPL",
+    "price_change_pct": 3.2,
+    "market_opinions": ["Earnings beat.", "Momentum is strong."],
+}
+
+
+class FakeMistral:
+    """Local chat completions endpoint with scripted replies."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        payload = await request.json()
+        self.requests.append(payload)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            reply = self.replies.pop(0) if self.replies else "plain text"
+            if isinstance(reply, int):
+                return web.Response(status=reply, headers={"Retry-After": "0"})
+            if isinstance(reply, float):
+                await asyncio.sleep(reply)
+                reply = "too late"
+            await asyncio.sleep(0.05)
+            return web.json_response({"choices": [{"message": {"content": reply}}]})
+        finally:
+            self.in_flight -= 1
+
+
+async def run_persona(replies, call_timeout=5.0):
+    # Unthrottled limiter so concurrent calls reach the server together
+    limiter = RateLimiter("mistral-test")
+    get_rate_limiter = persona_module.get_rate_limiter
+    persona_module.get_rate_limiter = lambda provider, model=None: limiter
+
+    fake = FakeMistral(replies)
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", fake.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    agent = PersonaAgent()
+    agent.api_key = "test-key"
+    agent.base_url = f"http://127.0.0.1:{port}/v1/chat/completions"
+    agent.call_timeout = call_timeout
+    try:
+        context = await agent.run_async(dict(CONTEXT))
+    finally:
+        await LLMClient.close_sessions()
+        await runner.cleanup()
+        persona_module.get_rate_limiter = get_rate_limiter
+    return context["persona_post"], fake
+
+
+def test_single_json_completion():
+    posts, fake = asyncio.run(run_persona([json.dumps({"x": "🚀 AAPL up!", "linkedin": "AAPL rose 3.2%."})]))
+    assert posts == {"x": "🚀 AAPL up!", "linkedin": "AAPL rose 3.2%."}
+    assert len(fake.requests) == 1
+    assert fake.requests[0]["response_format"] == {"type": "json_object"}
+
+
+def test_malformed_json_falls_back_to_concurrent_calls():
+    posts, fake = asyncio.run(run_persona(["not json", "tweet text", "linkedin text"]))
+    assert len(fake.requests) == 3
+    assert fake.max_in_flight == 2
+    assert {posts["x"], posts["linkedin"]} == {"tweet text", "linkedin text"}
+    assert "response_format" not in fake.requests[1]
+
+
+def test_rate_limited_and_deadline():
+    posts, fake = asyncio.run(run_persona([429, 429]))
+    assert len(fake.requests) == 2
+    assert "Market signals detected" in posts["x"]
+
+    posts, _ = asyncio.run(run_persona([2.0], call_timeout=0.2))
+    assert "Market signals detected" in posts["x"]
+
+    # Per-format calls that miss the deadline also get the fallback post
+    posts, _ = asyncio.run(run_persona(["not json", 2.0, 2.0], call_timeout=0.2))
+    assert "Market signals detected" in posts["x"]
+    assert posts["linkedin"].startswith("Professional Market Analysis")
+
+
+def test_no_api_key_fallback():
+    agent = PersonaAgent()
+    agent.api_key = None
+    context = agent.run(dict(CONTEXT))
+    assert "AAPL just moved 3.2%" in context["persona_post"]["x"]
+    assert "5-agent LLM council" in context["persona_post"]["linkedin"]
+
+
+if __name__ == "__main__":
+    test_single_json_completion()
+    test_malformed_json_falls_back_to_concurrent_calls()
+    test_rate_limited_and_deadline()
+    test_no_api_key_fallback()
+    print("All persona async tests passed! ✓")
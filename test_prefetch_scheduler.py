@@ -0,0 +1,151 @@
+"""
+Test Prefetch Scheduler
+Checks the market-hours cadence, that a cycle refreshes the whole watchlist
+with one batched download that stays fresh until the next cycle, and that
+calendar fields are refetched only when they would expire before it, and
+that cycles run on their own thread with a timeout.
+yfinance is replaced by in-process fakes.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from llm_council.services.rate_limiter import Priority, current_priority, llm_priority
+import services.economic_calendar as economic_calendar
+import services.market_data as market_data
+import services.prefetch_scheduler as prefetch_scheduler
+from services.economic_calendar import EconomicCalendarService
+from services.market_data import MarketDataService
+from services.market_metrics import MarketMetricsService
+from services.prefetch_scheduler import FRESHNESS_MARGIN, PrefetchScheduler, market_is_open
+
+MONDAY_OPEN = datetime(2026, 10, 19, 14, 0, tzinfo=timezone.utc)  # 10:00 in New York
+MONDAY_EVENING = datetime(2026, 10, 19, 21, 0, tzinfo=timezone.utc)
+SATURDAY = datetime(2026, 10, 17, 15, 0, tzinfo=timezone.utc)
+
+
+def make_history(days: int = 60, start: float = 100.0) -> pd.DataFrame:
+    index = pd.bdate_range(end="2026-10-16", periods=days)
+    return pd.DataFrame({"Close": [start + i for i in range(days)], "Volume": [1000] * days}, index=index)
+
+
+class FakeTicker:
+    """Counts per-symbol fetches; history is only expected through the batched download."""
+
+    calls = []
+    lock = threading.Lock()
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def _count(self, kind):
+        with FakeTicker.lock:
+            FakeTicker.calls.append((kind, self.symbol))
+
+    def history(self, period):
+        self._count("history")
+        return make_history()
+
+    @property
+    def info(self):
+        self._count("info")
+        return {"symbol": self.symbol, "earningsDate": "2026-10-30"}
+
+    @property
+    def news(self):
+        self._count("news")
+        return [{"title": f"{self.symbol} headline"}]
+
+
+def install(monkeypatch):
+    FakeTicker.calls = []
+    downloads = []
+
+    def download(symbols, **kwargs):
+        downloads.append(list(symbols))
+        return pd.concat({symbol: make_history(start=20.0) for symbol in symbols}, axis=1)
+
+    monkeypatch.setattr(market_data.yf, "Ticker", FakeTicker)
+    monkeypatch.setattr(market_data.yf, "download", download)
+
+    # Short calendar news TTL so it expires before the next cycle
+    services = (MarketDataService(news_ttl=0), MarketMetricsService(), EconomicCalendarService(news_ttl=60))
+    monkeypatch.setattr(prefetch_scheduler, "get_market_data_service", lambda: services[0])
+    monkeypatch.setattr(prefetch_scheduler, "get_market_metrics_service", lambda: services[1])
+    monkeypatch.setattr(prefetch_scheduler, "get_economic_calendar_service", lambda: services[2])
+    monkeypatch.setattr(economic_calendar, "get_market_data_service", lambda: services[0])
+    monkeypatch.setattr("services.market_metrics.get_market_data_service", lambda: services[0])
+    return downloads, services
+
+
+def test_market_hours_cadence():
+    assert market_is_open(MONDAY_OPEN)
+    assert not market_is_open(MONDAY_EVENING)
+    assert not market_is_open(SATURDAY)
+
+    scheduler = PrefetchScheduler(["aapl", "AAPL", " msft "], market_interval=240, closed_interval=900)
+    assert scheduler.watchlist == ["AAPL", "MSFT"]
+    assert scheduler.interval(MONDAY_OPEN) == 240
+    assert scheduler.interval(SATURDAY) == 900
+
+
+def test_cycle_warms_shared_caches(monkeypatch):
+    downloads, (data, metrics, calendar) = install(monkeypatch)
+    scheduler = PrefetchScheduler(["AAPL", "MSFT"], market_interval=240)
+
+    report = scheduler.refresh_once(MONDAY_OPEN)
+    assert report["symbols"] == 2 and report["calendar_errors"] == 0
+    assert downloads == [["^VIX", "SPY", "AAPL", "MSFT"]]
+    assert metrics.vix_cache == make_history(start=20.0)["Close"].iloc[-1]
+
+    # Prefetched history outlives history_ttl until the next cycle is due
+    assert data._entries[("history", "AAPL")][2] == 240 + FRESHNESS_MARGIN
+
+    # Interactive reads are cache hits: no per-symbol history download
+    assert len(data.get_history("AAPL", "2d")) == 2
+    assert calendar.get_stock_events("MSFT")["earnings_calendar"]["next_earnings_date"] == "2026-10-30"
+    assert ("history", "AAPL") not in FakeTicker.calls
+    fetched = len(FakeTicker.calls)
+
+    # Next cycle downloads everything again but only refetches the expiring calendar field (news)
+    scheduler.refresh_once(MONDAY_OPEN)
+    assert len(downloads) == 2
+    assert sorted(FakeTicker.calls[fetched:]) == [("news", "AAPL"), ("news", "MSFT")]
+    assert scheduler.get_stats()["cycles"] == 2
+
+
+
+def test_cycles_run_on_their_own_thread():
+    scheduler = PrefetchScheduler(["AAPL"], cycle_timeout=0.2)
+    seen = []
+
+    def cycle(now=None):
+        seen.append((threading.current_thread().name, current_priority()))
+        time.sleep(float(len(seen) > 1))  # The second cycle overruns its timeout
+        return {"symbols": 1}
+
+    scheduler.refresh_once = cycle
+
+    async def scenario():
+        with llm_priority(Priority.BACKGROUND):
+            report = await scheduler.run_cycle()
+            try:
+                await scheduler.run_cycle()
+                timed_out = False
+            except asyncio.TimeoutError:
+                timed_out = True
+        return report, timed_out
+
+    assert asyncio.run(scenario()) == ({"symbols": 1}, True)
+    assert all(name.startswith("prefetch-cycle") for name, _ in seen)
+    assert [priority for _, priority in seen] == [Priority.BACKGROUND] * 2
+    scheduler.shutdown()
+
+if __name__ == "__main__":
+    test_market_hours_cadence()
+    test_cycles_run_on_their_own_thread()
+    print("All prefetch scheduler tests passed! ✓")
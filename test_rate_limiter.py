@@ -0,0 +1,122 @@
+"""
+Test LLM Rate Limiter
+Checks request pacing, priority admission, Retry-After pauses and that
+LLMClient retries a 429 through the shared limiter.
+"""
+
+import asyncio
+import threading
+import time
+
+from aiohttp import web
+
+from llm_council.services.llm_client import LLMClient
+from llm_council.services.rate_limiter import (
+    Priority,
+    RateLimiter,
+    llm_priority,
+    parse_retry_after,
+)
+
+
+def test_requests_are_paced_to_rps():
+    """At 10 rps the first 10 requests use the burst; the next 5 are paced."""
+    limiter = RateLimiter("test", rps=10)
+
+    async def scenario():
+        started = time.perf_counter()
+        for _ in range(15):
+            async with limiter.limit():
+                pass
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(scenario())
+    assert 0.4 < elapsed < 1.0
+
+
+def test_interactive_requests_go_first():
+    """Queued interactive work is admitted before queued background work."""
+    limiter = RateLimiter("test", rps=20, max_concurrency=1)
+    order = []
+
+    async def request(label: str, priority: Priority):
+        with llm_priority(priority):
+            async with limiter.limit():
+                order.append(label)
+                await asyncio.sleep(0.01)
+
+    async def scenario():
+        blocker = asyncio.create_task(request("first", Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        background = [asyncio.create_task(request(f"bg{i}", Priority.BACKGROUND)) for i in range(3)]
+        await asyncio.sleep(0)
+        interactive = [asyncio.create_task(request(f"ui{i}", Priority.INTERACTIVE)) for i in range(3)]
+        await asyncio.gather(blocker, *background, *interactive)
+
+    asyncio.run(scenario())
+    assert order == ["first", "ui0", "ui1", "ui2", "bg0", "bg1", "bg2"]
+
+
+def test_retry_after_pauses_sync_and_async_callers():
+    """A 429 penalty holds back both threaded and async callers."""
+    limiter = RateLimiter("test", rps=100)
+    limiter.penalize(retry_after=0.3)
+    admitted = {}
+
+    def threaded():
+        with limiter.limit_sync():
+            admitted["thread"] = time.perf_counter()
+
+    async def scenario():
+        started = time.perf_counter()
+        thread = threading.Thread(target=threaded)
+        thread.start()
+        async with limiter.limit():
+            admitted["async"] = time.perf_counter()
+        await asyncio.to_thread(thread.join)
+        return started
+
+    started = asyncio.run(scenario())
+    assert admitted["async"] - started >= 0.25
+    assert admitted["thread"] - started >= 0.25
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("soon") is None
+
+
+def test_client_retries_429_after_retry_after():
+    """LLMClient honours Retry-After and succeeds on the next attempt."""
+    calls = []
+
+    async def handle(request: web.Request) -> web.Response:
+        calls.append(time.perf_counter())
+        if len(calls) == 1:
+            return web.json_response({"error": "slow down"}, status=429, headers={"Retry-After": "0.3"})
+        return web.json_response({"choices": [{"message": {"content": "ok"}}]})
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+
+        client = LLMClient(provider_type="openrouter", api_key="test", model="test/limiter-model")
+        client.provider.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v1"
+        try:
+            return await client.complete_async("prompt")
+        finally:
+            await LLMClient.close_sessions()
+            await runner.cleanup()
+
+    assert asyncio.run(scenario()) == "ok"
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.25
+
+
+if __name__ == "__main__":
+    test_requests_are_paced_to_rps()
+    test_interactive_requests_go_first()
+    test_retry_after_pauses_sync_and_async_callers()
+    test_client_retries_429_after_retry_after()
+    print("All rate limiter tests passed! ✓")
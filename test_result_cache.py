@@ -0,0 +1,154 @@
+"""
+Test Async Result Cache
+Checks TTL, stale-while-revalidate, single-flight and LRU behaviour,
+plus the debate cache key buckets and which debates get cached.
+"""
+
+import asyncio
+
+from services.result_cache import AsyncResultCache
+from llm_council.models.schemas import AgentArgument, ConfidenceLevel
+from llm_council.services.debate_cache import _is_complete_debate, debate_cache_key
+from llm_council.services.rate_limiter import Priority, current_priority
+
+
+def make_counter(delay: float = 0.05):
+    calls = {"count": 0}
+
+    async def compute():
+        calls["count"] += 1
+        await asyncio.sleep(delay)
+        return f"result-{calls['count']}"
+
+    return calls, compute
+
+
+def test_concurrent_misses_share_one_computation():
+    """Single-flight: concurrent requests for one key run one computation."""
+    cache = AsyncResultCache("test", ttl=60)
+    calls, compute = make_counter()
+
+    async def scenario():
+        return await asyncio.gather(*[cache.get_or_compute("AAPL", compute) for _ in range(10)])
+
+    results = asyncio.run(scenario())
+    assert results == ["result-1"] * 10
+    assert calls["count"] == 1
+    assert cache.stats["coalesced"] == 9
+
+
+def test_stale_entries_are_served_while_refreshing():
+    """Stale-while-revalidate: stale value returned immediately, refreshed in background."""
+    cache = AsyncResultCache("test", ttl=0.05, stale_ttl=5)
+    calls, counted = make_counter(delay=0.01)
+    priorities = []
+
+    async def compute():
+        priorities.append(current_priority())
+        return await counted()
+
+    async def scenario():
+        first = await cache.get_or_compute("AAPL", compute)
+        await asyncio.sleep(0.1)  # entry is now stale
+        stale = await cache.get_or_compute("AAPL", compute)
+        await asyncio.sleep(0.05)  # let the background refresh finish
+        fresh = await cache.get_or_compute("AAPL", compute)
+        return first, stale, fresh
+
+    first, stale, fresh = asyncio.run(scenario())
+    assert (first, stale, fresh) == ("result-1", "result-1", "result-2")
+    assert cache.stats["stale_hits"] == 1
+    assert priorities == [Priority.INTERACTIVE, Priority.BACKGROUND]  # The refresh runs in the background
+
+
+def test_background_refresh_uses_refresh_factory():
+    """A stale hit refreshes with ``refresh``, not the caller's ``compute``."""
+    cache = AsyncResultCache("test", ttl=0.05, stale_ttl=5)
+    progress = []
+
+    def compute_for(request):
+        async def compute():
+            progress.append(request)  # Stands in for per-request callbacks
+            return f"from-{request}"
+        return compute
+
+    async def refresh():
+        return "refreshed"
+
+    async def scenario():
+        await cache.get_or_compute("AAPL", compute_for("first"), refresh=refresh)
+        await asyncio.sleep(0.1)
+        stale = await cache.get_or_compute("AAPL", compute_for("second"), refresh=refresh)
+        await asyncio.sleep(0.05)
+        return stale, await cache.get_or_compute("AAPL", compute_for("third"), refresh=refresh)
+
+    assert asyncio.run(scenario()) == ("from-first", "refreshed")
+    assert progress == ["first"]
+
+
+def test_expired_entries_and_lru_eviction():
+    """Entries past ttl + stale_ttl are recomputed; LRU capacity is enforced."""
+    cache = AsyncResultCache("test", ttl=0.01, stale_ttl=0.0, max_entries=2)
+    calls, compute = make_counter(delay=0)
+
+    async def scenario():
+        await cache.get_or_compute("a", compute)
+        await asyncio.sleep(0.02)
+        await cache.get_or_compute("a", compute)
+        await cache.get_or_compute("b", compute)
+        await cache.get_or_compute("c", compute)
+
+    asyncio.run(scenario())
+    assert calls["count"] == 4
+    assert cache.get_stats()["entries"] == 2
+
+
+def test_failures_are_not_cached():
+    """Errors propagate to every waiter and nothing is stored."""
+    cache = AsyncResultCache("test", ttl=60)
+
+    async def broken():
+        raise RuntimeError("LLM down")
+
+    async def scenario():
+        return await asyncio.gather(*[cache.get_or_compute("k", broken) for _ in range(3)],
+                                    return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_debate_cache_key_buckets():
+    """Small price moves share a key; different news does not."""
+    a = debate_cache_key("aapl", {"price": 187.31, "change_percent": 1.02}, "Earnings Thursday")
+    b = debate_cache_key("AAPL ", {"price": 187.44, "change_percent": 1.07}, "Earnings Thursday")
+    c = debate_cache_key("AAPL", {"price": 187.44, "change_percent": 1.07}, "Fed decision today")
+    d = debate_cache_key("AAPL", {"price": 187.44, "change_percent": 2.40}, "Earnings Thursday")
+
+    assert a == b
+    assert a != c
+    assert a != d
+
+
+def test_degraded_debates_are_not_cached():
+    def argument(name, is_fallback=False):
+        return AgentArgument(agent_name=name, thesis="t", supporting_points=[],
+                             confidence=ConfidenceLevel.HIGH, is_fallback=is_fallback)
+
+    real = [argument("🦅 Macro Hawk"), argument("🤔 Skeptic")]
+    assert _is_complete_debate({"agent_arguments": real, "timed_out_agents": []})
+    assert not _is_complete_debate({"agent_arguments": [], "timed_out_agents": []})
+    assert not _is_complete_debate({"agent_arguments": real, "timed_out_agents": ["🤔 Skeptic"]})
+    assert not _is_complete_debate({"agent_arguments": real[:1] + [argument("🤔 Skeptic", is_fallback=True)]})
+
+
+if __name__ == "__main__":
+    test_concurrent_misses_share_one_computation()
+    test_stale_entries_are_served_while_refreshing()
+    test_background_refresh_uses_refresh_factory()
+    test_expired_entries_and_lru_eviction()
+    test_failures_are_not_cached()
+    test_debate_cache_key_buckets()
+    test_degraded_debates_are_not_cached()
+    print("All result cache tests passed! ✓")
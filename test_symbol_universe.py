@@ -0,0 +1,94 @@
+"""
+Test Symbol Universe
+Checks exact and prefix lookups on the shipped universe, offline validation
+of known symbols, parsing of the Nasdaq symbol directory and the /symbols
+endpoint.
+"""
+
+import os
+import tempfile
+
+from fastapi.testclient import TestClient
+
+import main
+import services.asset_validator as asset_validator
+from services.asset_validator import AssetValidator
+from services.symbol_universe import SHIPPED_PATH, SymbolUniverse, parse_nasdaq_traded, write_universe
+from services.validation_cache import MemoryValidationBackend, ValidationCache
+
+NASDAQ_SAMPLE = """Nasdaq Traded|Symbol|Security Name|Listing Exchange|Market Category|ETF|Round Lot Size|Test Issue|Financial Status|CQS Symbol|NASDAQ Symbol|NextShares
+Y|AAPL|Apple Inc. - Common Stock|Q|Q|N|100|N|N||AAPL|N
+Y|BRK.B|Berkshire Hathaway Inc. - Class B|N| |N|100|N||BRK.B|BRK=B|N
+Y|QQQ|Invesco QQQ Trust, Series 1|Q|G|Y|100|N|N||QQQ|N
+Y|ZXZZT|NASDAQ TEST STOCK|Q|G|N|100|Y|N||ZXZZT|N
+Y|ABR$D|Arbor Realty Trust - 6.375% Series D Preferred|N| |N|100|N||ABRpD|ABR-D|N
+File Creation Time: 0918202521:32|||||||||||
+"""
+
+
+def shipped():
+    return SymbolUniverse.from_csv(SHIPPED_PATH)
+
+
+def test_lookup_and_prefix_search():
+    universe = shipped()
+    assert universe.lookup("aapl") == {"symbol": "AAPL", "name": "Apple Inc.", "type": "EQUITY"}
+    assert "BTC-USD" in universe and "EURUSD=X" in universe and "^VIX" in universe
+    assert "NOTREAL" not in universe
+
+    symbols = [row["symbol"] for row in universe.search("BTC")]
+    assert symbols == ["BTC-EUR", "BTC-USD", "ETH-BTC"]  # Symbol prefixes, then name words
+    assert universe.search("MS", limit=3)[0]["symbol"] == "MS"
+    assert len(universe.search("A", limit=4)) == 4
+
+    # Name prefixes when the symbol does not match
+    assert universe.search("apple")[0]["symbol"] == "AAPL"
+    assert universe.search("gold min")[0]["symbol"] == "GDX"
+    assert [row["type"] for row in universe.search("s", limit=5, asset_type="etf")] == ["ETF"] * 5
+    assert universe.search("BTC", asset_type="BOND") == []
+    assert universe.search("  ") == []
+
+
+def test_known_symbols_validate_offline(monkeypatch):
+    calls = []
+    monkeypatch.setattr(asset_validator, "get_market_data_service", lambda: calls.append(1))
+    validator = AssetValidator(cache=ValidationCache([MemoryValidationBackend()]), universe=shipped())
+    assert validator.validate_symbol(" spy ") == (True, None)
+    assert validator.validate_symbol("ETH-USD") == (True, None)
+    assert calls == []
+
+    # Unknown symbols still go to the network
+    assert validator.validate_symbol("NOTREAL")[0] is False
+    assert calls == [1]
+
+
+def test_parse_nasdaq_directory():
+    rows = parse_nasdaq_traded(NASDAQ_SAMPLE)
+    assert rows == [
+        {"symbol": "AAPL", "name": "Apple Inc.", "type": "EQUITY"},
+        {"symbol": "BRK-B", "name": "Berkshire Hathaway Inc.", "type": "EQUITY"},
+        {"symbol": "QQQ", "name": "Invesco QQQ Trust, Series 1", "type": "ETF"},
+    ]
+
+    path = os.path.join(tempfile.mkdtemp(), "universe.csv")
+    write_universe(path, rows)
+    assert len(SymbolUniverse.from_csv(path)) == 3
+
+
+def test_symbols_endpoint():
+    client = TestClient(main.app)
+    body = client.get("/symbols", params={"q": "tes", "limit": 2}).json()
+    assert body["results"][0]["symbol"] == "TSLA" or body["results"][0]["name"].lower().startswith("tes")
+    assert len(body["results"]) <= 2
+    assert body["universe_size"] > 0
+
+    crypto = client.get("/symbols", params={"q": "eth", "type": "CRYPTOCURRENCY"}).json()["results"]
+    assert {row["symbol"] for row in crypto} == {"ETH-BTC", "ETH-EUR", "ETH-USD"}
+    assert client.get("/symbols").status_code == 422
+
+
+if __name__ == "__main__":
+    test_lookup_and_prefix_search()
+    test_parse_nasdaq_directory()
+    test_symbols_endpoint()
+    print("All symbol universe tests passed! ✓")
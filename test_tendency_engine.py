@@ -0,0 +1,163 @@
+"""
+Test Tendency Engine
+Checks per-regime pattern frequencies, the all-regimes fallback, rebuilding
+from the trade archive, counting each session day once, and the
+/behaviour/predict-risk endpoint.
+"""
+
+import shutil
+import tempfile
+
+from fastapi.testclient import TestClient
+
+import main
+from agents.behaviour_agent import BehaviorMonitorAgent
+from services.tendency_engine import TendencyEngine, get_tendency_engine
+from services.trade_archive import TradeArchive
+
+REVENGE = [{"type": "Revenge Trading", "severity": "High", "details": "..."}]
+FOMO = [{"type": "FOMO Trading", "severity": "Medium", "details": "..."}]
+DISCIPLINED = [{"type": "Disciplined", "details": "..."}]
+
+
+def test_frequencies_by_regime_with_fallback():
+    engine = TendencyEngine(min_sessions=3)
+    assert engine.get_tendencies("u1") is None
+
+    for insights in (REVENGE, REVENGE, REVENGE, DISCIPLINED):
+        engine.record_session("u1", insights, "HIGH VOLATILITY")
+    engine.record_session("u1", FOMO, "LOW VOLATILITY")
+    engine.record_session("u1", DISCIPLINED, None)
+
+    high = engine.get_tendencies("u1", "HIGH VOLATILITY")
+    assert high["regime"] == "HIGH VOLATILITY"
+    assert high["sessions"] == 4
+    assert high["revenge_trading_tendency"] == 0.75
+    assert high["fomo_tendency"] == 0.0
+
+    # Too few LOW VOLATILITY sessions: all-regimes row
+    low = engine.get_tendencies("u1", "LOW VOLATILITY")
+    assert low["regime"] == "ALL"
+    assert low["sessions"] == 6
+    assert low["revenge_trading_tendency"] == 0.5
+    assert engine.tendency_for("u1", "Revenge Trading") == 0.5
+    assert engine.tendency_for("u1", "Impulsive Trading") == 0.0
+
+    # The tendencies drive predict_next_risk instead of the 0.3 defaults
+    prediction = BehaviorMonitorAgent().predict_next_risk({"consecutive_losses": 2}, high)
+    assert prediction["high_risk_predictions"] == ["Revenge Trading"]
+
+
+def test_rebuild_from_archive():
+    archive = TradeArchive(tempfile.mkdtemp())
+    trades = []
+    for day in range(1, 7):
+        for i in range(4):
+            pnl = -100.0 if day % 2 else 80.0
+            trades.append({"timestamp": f"2026-03-0{day} 10:0{i}:00", "symbol": "TSLA",
+                           "action": "BUY", "price": 240.0, "pnl": pnl, "status": "CLOSED"})
+    archive.append("ann", trades)
+
+    engine = TendencyEngine()
+    regimes = lambda day: "HIGH VOLATILITY" if day <= "2026-03-03" else "NORMAL VOLATILITY"
+    stats = engine.refresh_from_archive(archive, regime_for_day=regimes)
+    assert stats == {"users": 1, "sessions": 6}
+
+    high = engine.get_tendencies("ann", "HIGH VOLATILITY")
+    assert high["sessions"] == 3
+    assert high["revenge_trading_tendency"] == round(2 / 3, 3)
+    assert engine.get_tendencies("ann", "NORMAL VOLATILITY")["revenge_trading_tendency"] == round(1 / 3, 3)
+    assert engine.get_stats()["users"] == 1
+
+    shutil.rmtree(archive.root)
+
+
+def test_sessions_recorded_during_rebuild_are_kept():
+    archive = TradeArchive(tempfile.mkdtemp())
+    archive.append("bo", [{"timestamp": f"2026-03-0{day} 10:00:00", "symbol": "TSLA", "action": "BUY",
+                           "price": 240.0, "pnl": 80.0, "status": "CLOSED"} for day in range(1, 4)])
+
+    engine = TendencyEngine()
+    engine.record_session("bo", REVENGE, "HIGH VOLATILITY")  # Replaced by the rebuild
+
+    def regime_while_recording(day):
+        # A live session closes while the archive is being read
+        engine.record_session("bo", REVENGE, "HIGH VOLATILITY")
+        return "HIGH VOLATILITY"
+
+    assert engine.rebuild_user("bo", archive, regime_while_recording) == 3
+    tendencies = engine.get_tendencies("bo", "HIGH VOLATILITY")
+    assert tendencies["sessions"] == 6
+    assert tendencies["revenge_trading_tendency"] == 0.5
+    assert engine._rebuilding == {}
+
+    shutil.rmtree(archive.root)
+
+
+def test_session_days_are_counted_once():
+    archive = TradeArchive(tempfile.mkdtemp())
+    archive.append("cy", [{"timestamp": "2026-03-02 10:00:00", "symbol": "TSLA", "action": "BUY",
+                           "price": 240.0, "pnl": 80.0, "status": "CLOSED"}])
+
+    engine = TendencyEngine(min_sessions=1)
+    assert engine.record_session("cy", REVENGE, "HIGH VOLATILITY", day="2026-03-05")
+    assert not engine.record_session("cy", REVENGE, "HIGH VOLATILITY", day="2026-03-05")
+    assert engine.get_tendencies("cy")["sessions"] == 1
+
+    def regime_while_recording(day):
+        engine.record_session("cy", FOMO, None, day="2026-03-02")  # Already archived
+        engine.record_session("cy", FOMO, None, day="2026-03-06")
+        return None
+
+    engine.rebuild_user("cy", archive, regime_while_recording)
+    assert engine.get_tendencies("cy")["sessions"] == 2
+    assert not engine.record_session("cy", REVENGE, None, day="2026-03-02")
+
+    shutil.rmtree(archive.root)
+
+
+def test_predict_risk_endpoint(monkeypatch):
+    monkeypatch.setattr(main.get_market_metrics_service(), "get_vix", lambda: 25.0)
+    engine = get_tendency_engine()
+    for _ in range(3):
+        engine.record_session("endpoint-user", REVENGE, "HIGH VOLATILITY")
+
+    client = TestClient(main.app)
+    body = client.post("/behaviour/predict-risk", json={
+        "user_id": "endpoint-user", "consecutive_losses": 2
+    }).json()
+    assert body["market_regime"] == "HIGH VOLATILITY"
+    assert body["tendencies"]["revenge_trading_tendency"] == 1.0
+    assert body["prediction"]["high_risk_predictions"] == ["Revenge Trading"]
+    assert "100% of similar" in body["alerts"][0]
+
+    unknown = client.post("/behaviour/predict-risk", json={"user_id": "new-user"}).json()
+    assert unknown["tendencies"] is None
+    assert unknown["prediction"]["risk_level"] == "low"
+
+
+def test_predict_risk_without_vix(monkeypatch):
+    def vix_down():
+        raise main.StageTimeoutError("get_vix timed out")
+
+    monkeypatch.setattr(main.get_market_metrics_service(), "get_vix", vix_down)
+    engine = get_tendency_engine()
+    for _ in range(3):
+        engine.record_session("no-vix-user", REVENGE, "HIGH VOLATILITY")
+
+    response = TestClient(main.app).post("/behaviour/predict-risk", json={
+        "user_id": "no-vix-user", "consecutive_losses": 2
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["market_regime"] is None
+    assert body["tendencies"]["regime"] == "ALL"
+    assert body["prediction"]["high_risk_predictions"] == ["Revenge Trading"]
+
+
+if __name__ == "__main__":
+    test_frequencies_by_regime_with_fallback()
+    test_rebuild_from_archive()
+    test_sessions_recorded_during_rebuild_are_kept()
+    test_session_days_are_counted_once()
+    print("All tendency engine tests passed! ✓")
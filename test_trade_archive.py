@@ -0,0 +1,179 @@
+"""
+Test Trade Archive
+Checks month partitioning, memory-mapped reads, merging of late fills,
+append segments and their compaction, that archived columns give the same
+insights as the original trades, the historical trend summary, and that
+user ids cannot escape the root.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from agents.behaviour_engine import TradeColumns, detect_patterns
+from services.trade_archive import TradeArchive, history_trends, session_insights
+from services.trade_history import TradeHistoryService
+from services.trade_store import SQLiteTradeStore, generate_synthetic_trades
+
+
+def risk_scorer(insights):
+    weights = {"High": 25, "Medium": 15, "Positive": -20}
+    return max(0, min(100, sum(weights.get(i["severity"], 10) for i in insights)))
+
+
+def make_archive():
+    return TradeArchive(tempfile.mkdtemp())
+
+
+def revenge_day(day):
+    return [
+        {"timestamp": f"{day} 10:0{i}:00", "symbol": "TSLA", "action": "BUY",
+         "price": 240.0, "pnl": -120.0, "status": "CLOSED"}
+        for i in range(4)
+    ]
+
+
+def calm_day(day):
+    return [
+        {"timestamp": f"{day} {10 + i}:00:00", "symbol": "AAPL", "action": "SELL",
+         "price": 180.0, "pnl": 80.0, "status": "CLOSED"}
+        for i in range(3)
+    ]
+
+
+def test_partitions_and_memory_mapped_reads():
+    archive = make_archive()
+    trades = generate_synthetic_trades("u1", "AAPL", seed=1, sessions=70)
+    trades += generate_synthetic_trades("u1", "SPY", seed=1, sessions=70)
+    assert archive.append("u1", trades) == len(trades)
+
+    months = archive.months("u1")
+    assert months == sorted({t["timestamp"][:7] for t in trades})
+    assert archive.users() == ["u1"]
+
+    single = archive.load("u1", start_month=months[-1], end_month=months[-1])
+    assert isinstance(single.pnl, np.memmap) and not single.pnl.flags.writeable
+
+    columns = archive.load("u1")
+    original = TradeColumns.from_trades(trades)
+    assert np.array_equal(columns.ts, original.ts)
+    assert np.array_equal(columns.pnl, original.pnl)
+    assert [columns.trade(i)["symbol"] for i in range(len(columns))] == \
+        [original.trade(i)["symbol"] for i in range(len(original))]
+    assert columns.trade(0)["timestamp"] == original.trade(0)["timestamp"]
+    assert detect_patterns(columns) == detect_patterns(original)
+
+    shutil.rmtree(archive.root)
+
+
+def test_late_fills_merge_into_month():
+    archive = make_archive()
+    archive.append("ann", calm_day("2026-03-10"))
+    archive.append("ann", revenge_day("2026-03-05") + [{"timestamp": "bad", "symbol": "X", "pnl": 1.0}])
+
+    columns = archive.load("ann")
+    assert len(columns) == 7
+    assert np.all(np.diff(columns.ts) >= 0)
+    assert set(columns.symbol_names) == {"AAPL", "TSLA"}
+    assert [s["day"] for s in session_insights(columns)] == ["2026-03-05", "2026-03-10"]
+    assert archive.load("nobody").pnl.size == 0
+
+    shutil.rmtree(archive.root)
+
+
+def test_single_fills_append_segments_then_compact():
+    archive = make_archive()
+    days = [f"2026-03-{d:02d}" for d in range(2, 12)]
+    archive.append("ann", [t for day in days for t in calm_day(day)])
+    partition = archive._user_dir("ann") + "/2026-03"
+
+    # Fills ingested one at a time add segments instead of rewriting the month
+    for day in reversed(days[:5]):
+        archive.append("ann", revenge_day(day)[:1])
+    assert len(archive._segments(partition)) == 5
+    columns = archive.load("ann")
+    assert len(columns) == 35
+    assert np.all(np.diff(columns.ts) >= 0)
+    assert set(columns.symbol_names) == {"AAPL", "TSLA"}
+
+    assert archive.compact("ann") == 1
+    assert archive._segments(partition) == []
+    compacted = archive.load("ann")
+    assert isinstance(compacted.pnl, np.memmap)
+    assert np.array_equal(compacted.ts, columns.ts) and np.array_equal(compacted.pnl, columns.pnl)
+
+    # Segments holding as many trades as the compacted month trigger a compaction
+    for i in range(35):
+        archive.append("ann", [{"timestamp": f"2026-03-20 10:{i:02d}:00", "symbol": "MSFT", "pnl": 1.0}])
+    assert len(archive._segments(partition)) < 35
+    assert len(archive.load("ann")) == 70
+
+    shutil.rmtree(archive.root)
+
+
+def test_history_trends_compare_recent_sessions():
+    archive = make_archive()
+    days = [f"2026-0{m}-{d:02d}" for m in (4, 5) for d in range(1, 11)]
+    trades = []
+    for i, day in enumerate(days):
+        trades += revenge_day(day) if i < 12 or i % 2 else calm_day(day)
+    archive.append("bob", trades)
+
+    trends = history_trends(archive.load("bob"), risk_scorer, recent_sessions=8)
+    assert trends["sessions"] == 20
+    assert 0 < trends["historical_risk_score"] <= 100
+    assert "✅ Improving: Revenge Trading decreased by 50%" in trends["trend_summary"]
+    assert "✅ New strength: Calculated Risk" in trends["trend_summary"]
+
+    assert history_trends(archive.load("nobody"), risk_scorer)["historical_risk_score"] is None
+
+    shutil.rmtree(archive.root)
+
+
+def test_history_service_archives_recorded_fills():
+    archive = make_archive()
+    store = SQLiteTradeStore()
+    service = TradeHistoryService(store=store, seed_synthetic=False, archive=archive)
+    service.record_trades("cid", calm_day("2026-01-15") + calm_day("2026-02-02"))
+    assert archive.months("cid") == ["2026-01", "2026-02"]
+
+    assert archive.archive_from_store(store, "cid") == 6
+    assert len(archive.load("cid")) == 6
+
+    # Synthetic demo trades are seeded into the store but never archived
+    seeded = TradeHistoryService(store=store, seed_synthetic=True, archive=archive)
+    assert seeded.get_user_trades("TSLA", "demo")
+    assert archive.months("demo") == []
+
+    shutil.rmtree(archive.root)
+
+
+def test_user_ids_stay_inside_root():
+    parent = tempfile.mkdtemp()
+    archive = TradeArchive(os.path.join(parent, "archive"))
+    user_ids = ["..", ".", "a/../b", "j.doe"]
+    for user_id in user_ids:
+        archive.append(user_id, calm_day("2026-02-03"))
+    assert os.listdir(parent) == ["archive"]
+    assert archive.users() == sorted(user_ids)
+    assert len(archive.load("..")) == 3
+
+    try:
+        archive.append("", calm_day("2026-02-03"))
+        failed = False
+    except ValueError:
+        failed = True
+    assert failed
+
+    shutil.rmtree(parent)
+
+if __name__ == "__main__":
+    test_partitions_and_memory_mapped_reads()
+    test_late_fills_merge_into_month()
+    test_single_fills_append_segments_then_compact()
+    test_history_trends_compare_recent_sessions()
+    test_history_service_archives_recorded_fills()
+    test_user_ids_stay_inside_root()
+    print("All trade archive tests passed! ✓")
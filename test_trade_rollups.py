@@ -0,0 +1,130 @@
+"""
+Test Trade Rollups
+Checks that the store's running rollups match totals recomputed from the
+raw trades, including streaks after out-of-order inserts, and that
+TradeHistoryService builds its summary and persona from them.
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+
+from services.trade_history import TradeHistoryService, select_persona
+from services.trade_store import SQLiteTradeStore, load_synthetic_fixtures
+
+
+def expected_rollup(trades):
+    trades = sorted(trades, key=lambda t: t["timestamp"])
+    win_streak = loss_streak = max_win = max_loss = 0
+    for t in trades:
+        win_streak = win_streak + 1 if t["pnl"] > 0 else 0
+        loss_streak = loss_streak + 1 if t["pnl"] < 0 else 0
+        max_win, max_loss = max(max_win, win_streak), max(max_loss, loss_streak)
+    wins = sum(1 for t in trades if t["pnl"] > 0)
+    return {
+        "trades": len(trades),
+        "total_pnl": round(sum(t["pnl"] for t in trades), 2),
+        "wins": wins,
+        "losses": sum(1 for t in trades if t["pnl"] < 0),
+        "last_trade": trades[-1]["timestamp"],
+        "win_streak": win_streak,
+        "loss_streak": loss_streak,
+        "max_win_streak": max_win,
+        "max_loss_streak": max_loss,
+        "win_rate": round((wins / len(trades)) * 100, 1),
+    }
+
+
+def random_trades(rng, symbol, count):
+    return [
+        {"timestamp": f"2026-0{rng.randint(1, 3)}-{rng.randint(10, 28)} {rng.randint(9, 15):02d}:"
+                      f"{rng.randint(0, 59):02d}:{i % 60:02d}",
+         "symbol": symbol, "action": "SELL", "price": 100.0,
+         "pnl": rng.choice([0.0, round(rng.uniform(-300, 300), 2)]), "status": "CLOSED"}
+        for i in range(count)
+    ]
+
+
+def test_rollups_match_raw_trades():
+    store = SQLiteTradeStore(batch_size=5)
+    rng = random.Random(7)
+    history = {"AAPL": [], "TSLA": []}
+
+    # In-order batches keep streaks incremental; a shuffled batch marks them stale
+    for symbol in history:
+        batch = sorted(random_trades(rng, symbol, 40), key=lambda t: t["timestamp"])
+        store.insert_trades("u1", batch)
+        history[symbol].extend(batch)
+    late = random_trades(rng, "AAPL", 15)
+    store.insert_trades("u1", late)
+    history["AAPL"].extend(late)
+
+    for symbol, trades in history.items():
+        assert store.get_rollup("u1", symbol) == expected_rollup(trades)
+
+    overall = store.get_rollup("u1")
+    assert overall["trades"] == 95
+    assert "win_streak" not in overall
+    assert store.get_rollup("u1", "NVDA") is None
+    assert store.get_rollup("nobody") is None
+
+    days = store.get_daily_rollups("u1", "AAPL")
+    assert [d["day"] for d in days] == sorted({t["timestamp"][:10] for t in history["AAPL"]})
+    assert sum(d["trades"] for d in days) == len(history["AAPL"])
+    last_day = days[-1]["day"]
+    assert store.get_daily_rollups("u1", "AAPL", start_day=last_day) == days[-1:]
+    assert days[-1]["win_streak"] == expected_rollup(history["AAPL"])["win_streak"]
+
+    combined = store.get_daily_rollups("u1", end_day=last_day)
+    assert sum(d["trades"] for d in combined) == 55 + sum(
+        1 for t in history["TSLA"] if t["timestamp"][:10] <= last_day
+    )
+
+
+def test_rollups_rebuilt_for_existing_database():
+    path = os.path.join(tempfile.mkdtemp(), "trades.db")
+    store = SQLiteTradeStore(path)
+    load_synthetic_fixtures(store, ["u1"], ["SPY"], seed=2, sessions=6)
+    expected = store.get_rollup("u1", "SPY")
+    store.close()
+
+    # Simulate a database written before rollups existed
+    conn = sqlite3.connect(path)
+    conn.execute("DELETE FROM trade_rollups")
+    conn.execute("DELETE FROM trade_daily_rollups")
+    conn.commit()
+    conn.close()
+
+    reopened = SQLiteTradeStore(path)
+    assert reopened.get_rollup("u1", "SPY") == expected
+    reopened.close()
+
+
+def test_summary_and_persona_use_rollups():
+    service = TradeHistoryService(store=SQLiteTradeStore(), seed_synthetic=False)
+    trades = [
+        {"timestamp": f"2026-02-0{day} 10:00:00", "symbol": "MSFT", "action": "SELL",
+         "price": 380.0, "pnl": 100.0, "status": "CLOSED"}
+        for day in range(1, 8)
+    ]
+    service.record_trades("ann", trades)
+
+    summary = service.get_trading_summary("MSFT", "ann")
+    assert summary["total_trades"] == 7
+    assert summary["total_pnl"] == 700.0
+    assert summary["win_rate"] == 100.0
+    assert summary["win_streak"] == 7
+    assert summary["last_trade"] == "2026-02-07 10:00:00"
+    assert summary["persona_style"] == "professional" == service.auto_select_persona(trades)
+
+    assert service.get_trading_summary("MSFT", "bob")["persona_style"] == "coach"
+    assert select_persona(2, 50.0, 1) == "casual"
+    assert select_persona(4, -600.0, 3) == "coach"
+
+
+if __name__ == "__main__":
+    test_rollups_match_raw_trades()
+    test_rollups_rebuilt_for_existing_database()
+    test_summary_and_persona_use_rollups()
+    print("All trade rollup tests passed! ✓")
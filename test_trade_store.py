@@ -0,0 +1,98 @@
+"""
+Test Trade Store
+Checks bulk ingest, indexed filters and pagination on the SQLite store,
+deterministic fixtures, and TradeHistoryService reading through the store.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+from services.trade_history import TradeHistoryService
+from services.trade_store import (
+    SQLiteTradeStore,
+    create_trade_store,
+    generate_synthetic_trades,
+    load_synthetic_fixtures,
+)
+
+
+def make_trades(symbol, count, hour=9):
+    return [
+        {"timestamp": f"2026-02-07 {hour + i // 60:02d}:{i % 60:02d}:00", "symbol": symbol,
+         "action": "BUY", "price": 100.0 + i, "pnl": float(i - count // 2), "status": "CLOSED"}
+        for i in range(count)
+    ]
+
+
+def test_bulk_ingest_filters_and_pagination():
+    store = SQLiteTradeStore(batch_size=7)
+    assert store.insert_trades("alice", make_trades("AAPL", 30) + make_trades("TSLA", 5)) == 35
+    store.insert_trades("bob", make_trades("AAPL", 3))
+
+    assert store.count_trades("alice") == 35
+    assert store.count_trades("alice", symbol="AAPL") == 30
+    assert store.count_trades("alice", symbol="AAPL", start="2026-02-07 09:10:00", end="2026-02-07 09:19:00") == 10
+
+    first = store.query_trades("alice", symbol="AAPL", limit=10)
+    second = store.query_trades("alice", symbol="AAPL", limit=10, offset=10)
+    assert [t["timestamp"] for t in first][-1] < second[0]["timestamp"]
+    assert "quantity" not in first[0]
+
+    newest = store.query_trades("alice", symbol="AAPL", limit=1, newest_first=True)[0]
+    assert newest["timestamp"] == "2026-02-07 09:29:00"
+    assert store.query_trades("bob", symbol="TSLA") == []
+
+
+def test_pool_serves_concurrent_threads():
+    directory = tempfile.mkdtemp()
+    store = SQLiteTradeStore(os.path.join(directory, "trades.db"), pool_size=2)
+    errors = []
+
+    def ingest(user):
+        try:
+            store.insert_trades(user, make_trades("SPY", 20))
+            assert store.count_trades(user) == 20
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=ingest, args=(f"user{i}",)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    store.close()
+    shutil.rmtree(directory)
+
+
+def test_fixtures_are_deterministic():
+    assert generate_synthetic_trades("u1", "AAPL", seed=3) == generate_synthetic_trades("u1", "AAPL", seed=3)
+    assert generate_synthetic_trades("u1", "AAPL", seed=3) != generate_synthetic_trades("u2", "AAPL", seed=3)
+
+    store = create_trade_store("sqlite://:memory:")
+    inserted = load_synthetic_fixtures(store, ["u1", "u2"], ["AAPL", "SPY"], seed=3, sessions=5)
+    assert inserted == sum(store.count_trades(u) for u in ("u1", "u2"))
+
+
+def test_history_service_reads_and_seeds_once():
+    service = TradeHistoryService(store=SQLiteTradeStore(), seed_synthetic=True)
+    trades = service.get_user_trades("AAPL", "carol")
+    assert trades == generate_synthetic_trades("carol", "AAPL")
+    assert service.get_user_trades("AAPL", "carol") == trades
+
+    service.record_trades("dave", make_trades("NVDA", 60))
+    recent = service.get_user_trades("NVDA", "dave", limit=5)
+    assert [t["timestamp"][-8:] for t in recent] == ["09:55:00", "09:56:00", "09:57:00", "09:58:00", "09:59:00"]
+
+    empty = TradeHistoryService(store=SQLiteTradeStore(), seed_synthetic=False)
+    assert empty.get_trading_summary("AAPL", "erin")["total_trades"] == 0
+
+
+if __name__ == "__main__":
+    test_bulk_ingest_filters_and_pagination()
+    test_pool_serves_concurrent_threads()
+    test_fixtures_are_deterministic()
+    test_history_service_reads_and_seeds_once()
+    print("All trade store tests passed! ✓")
@@ -0,0 +1,124 @@
+"""
+Test Validation Cache
+Checks that valid and invalid symbols are cached with separate TTLs, that
+the on-disk tier is shared between validator instances (as between worker
+processes), that lower-tier hits are promoted, and that transient failures
+and broken tiers never stick.
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import services.asset_validator as asset_validator
+from services.asset_validator import AssetValidator
+from services.symbol_universe import SymbolUniverse
+from services.validation_cache import (
+    MemoryValidationBackend, SQLiteValidationBackend, ValidationCache, create_validation_cache
+)
+
+
+class FakeMarketData:
+    """Market data stand-in counting lookups; AAPL is real, BOOM raises."""
+
+    def __init__(self):
+        self.info_calls = 0
+
+    def get_info(self, symbol):
+        self.info_calls += 1
+        if symbol == "BOOM":
+            raise ConnectionError("connection reset")
+        if symbol != "AAPL":
+            return {}
+        return {"symbol": "AAPL", "quoteType": "EQUITY", "longName": "Apple Inc.", "currentPrice": 190.0}
+
+    def get_history(self, symbol, period="5d"):
+        return pd.DataFrame({"Close": [189.0, 190.0]})
+
+
+def validator_with(cache, monkeypatch):
+    fake = FakeMarketData()
+    monkeypatch.setattr(asset_validator, "get_market_data_service", lambda: fake)
+    # Empty universe so every symbol goes through the cache
+    return AssetValidator(cache=cache, universe=SymbolUniverse([])), fake
+
+
+def temp_db():
+    return os.path.join(tempfile.mkdtemp(), "validation.db")
+
+
+def test_positive_and_negative_entries(monkeypatch):
+    validator, fake = validator_with(create_validation_cache(temp_db()), monkeypatch)
+
+    assert validator.validate_symbol("aapl") == (True, None)
+    invalid = validator.validate_symbol("NOPE")
+    assert invalid == (False, "Symbol 'NOPE' not found or has no data")
+    assert fake.info_calls == 2
+
+    assert validator.validate_symbol("AAPL") == (True, None)
+    assert validator.validate_symbol("nope") == invalid
+    assert fake.info_calls == 2
+    assert validator.cache.get_stats()["memory_hits"] == 2
+
+    # Transient failures are retried on the next lookup
+    assert validator.validate_symbol("BOOM")[1] == "Unable to validate symbol 'BOOM'"
+    validator.validate_symbol("BOOM")
+    assert fake.info_calls == 4
+
+
+def test_separate_ttls():
+    cache = ValidationCache([MemoryValidationBackend()], valid_ttl=60, invalid_ttl=0.05)
+    cache.set("AAPL", True)
+    cache.set("NOPE", False, "not found")
+    time.sleep(0.1)
+    assert cache.get("AAPL") == {"valid": True, "error": None}
+    assert cache.get("NOPE") is None
+
+
+def test_disk_tier_shared_and_promoted(monkeypatch):
+    path = temp_db()
+    first, fake = validator_with(create_validation_cache(path), monkeypatch)
+    first.validate_symbol("AAPL")
+    first.validate_symbol("NOPE")
+
+    # A second process on the same host starts with an empty memory tier
+    second = AssetValidator(cache=create_validation_cache(path), universe=SymbolUniverse([]))
+    assert second.validate_symbol("AAPL") == (True, None)
+    assert second.validate_symbol("NOPE")[0] is False
+    assert fake.info_calls == 2
+    assert second.cache.get_stats()["sqlite_hits"] == 2
+
+    second.validate_symbol("AAPL")
+    assert second.cache.get_stats()["memory_hits"] == 1
+
+    second.cache.invalidate("AAPL")
+    assert SQLiteValidationBackend(path).get("AAPL") is None
+
+
+class BrokenBackend(MemoryValidationBackend):
+    name = "broken"
+
+    def get(self, symbol):
+        raise TimeoutError("network tier down")
+
+    def set(self, symbol, entry, expires_at):
+        raise TimeoutError("network tier down")
+
+
+def test_failing_tier_is_skipped(monkeypatch):
+    cache = ValidationCache([MemoryValidationBackend(), BrokenBackend()])
+    validator, fake = validator_with(cache, monkeypatch)
+    assert validator.validate_symbol("AAPL") == (True, None)
+    assert validator.validate_symbol("AAPL") == (True, None)
+    assert fake.info_calls == 1
+    assert cache.get_stats()["errors"] == 2
+
+    unavailable = create_validation_cache("", url="redis://localhost:1/0")
+    assert [tier.name for tier in unavailable.tiers][0] == "memory"
+
+
+if __name__ == "__main__":
+    test_separate_ttls()
+    print("All validation cache tests passed! ✓")